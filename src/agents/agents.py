@@ -5,8 +5,7 @@ import logging
 from langgraph.prebuilt import create_react_agent
 
 from src.prompts import apply_prompt_template
-from src.llms.llm import get_llm_by_type
-from src.config.agents import AGENT_LLM_MAP
+from src.llms.llm import get_llm_for_agent
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +93,7 @@ def create_agent(agent_name: str, agent_type: str, tools: list, prompt_template:
     """Factory function to create agents with consistent configuration."""
     
     # 获取模型
-    model = get_llm_by_type(AGENT_LLM_MAP[agent_type])
+    model = get_llm_for_agent(agent_type)
     
     # 检查模型是否支持工具调用
     supports_tools = _check_model_supports_tools(model)
@@ -1,7 +1,7 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from typing import Literal
+from typing import Literal, Optional
 
 # Define available LLM types
 LLMType = Literal["basic", "reasoning", "vision"]
@@ -16,4 +16,21 @@ AGENT_LLM_MAP: dict[str, LLMType] = {
     "podcast_script_writer": "BASIC_MODEL",
     "ppt_composer": "BASIC_MODEL",
     "prose_writer": "BASIC_MODEL",
+    "context_summarizer": "BASIC_MODEL",
+}
+
+# Define per-agent LLM response cache policy (TTL in hours, see src/llms/llm_cache.py).
+# Agents that are missing or set to None are never cached: the reporter and other
+# free-form writers must produce fresh output on every run.
+AGENT_CACHE_POLICY: dict[str, Optional[float]] = {
+    "coordinator": 1,
+    "planner": 24,
+    "ppt_composer": 24,
+    "researcher": None,
+    "coder": None,
+    "reporter": None,
+    "podcast_script_writer": None,
+    "prose_writer": None,
+    # 研究步骤摘要只依赖步骤结果本身，缓存后相同内容不会再次摘要
+    "context_summarizer": 24,
 }
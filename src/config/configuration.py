@@ -42,6 +42,9 @@ class Configuration:
     scholar_max_results: int = 10             # Google Scholar最大结果数
     arxiv_max_results: int = 8                # ArXiv最大结果数
 
+    # ⚡ 计划步骤并行执行：依赖已满足的调研步骤最多同时执行的数量（1 表示按顺序执行）
+    max_parallel_steps: int = 3
+
     @classmethod
     def from_runnable_config(
         cls, config: Optional[RunnableConfig] = None
@@ -150,6 +153,74 @@ def get_current_model_name() -> str:
     return "gemini"
 
 
+def _load_section_settings(section: str, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    读取 conf.yaml 中的一个配置段，并与默认值合并
+
+    Args:
+        section: 配置段名称，如 "BATCH_GENERATION"
+        defaults: 各项的默认值
+
+    Returns:
+        Dict[str, Any]: 合并默认值后的配置（读取失败时为默认值）
+    """
+    from .loader import load_yaml_config as load_conf
+
+    settings = dict(defaults)
+    conf_file = os.path.join(os.path.dirname(__file__), '..', '..', 'conf.yaml')
+    try:
+        settings.update(load_conf(os.path.abspath(conf_file)).get(section) or {})
+    except Exception as e:
+        print(f"⚠️  读取{section}配置失败: {e}")
+    return settings
+
+
+def get_batch_generation_settings() -> Dict[str, Any]:
+    """
+    获取分批生成的并发与限流配置
+
+    读取 conf.yaml 中的 BATCH_GENERATION 段，未配置的项使用默认值：
+
+    ```yaml
+    BATCH_GENERATION:
+      max_concurrency: 4        # 同时生成的方向数
+      requests_per_minute: 30   # 每个模型提供方每分钟的请求上限
+      max_retries: 2            # 单个方向失败后的重试次数
+      request_timeout: 300      # 单次请求超时（秒）
+    ```
+
+    Returns:
+        Dict[str, Any]: 合并默认值后的配置
+    """
+    return _load_section_settings("BATCH_GENERATION", {
+        "max_concurrency": 4,
+        "requests_per_minute": 30,
+        "max_retries": 2,
+        "request_timeout": 300,
+    })
+
+
+def get_literature_search_settings() -> Dict[str, Any]:
+    """
+    获取文献预研究检索的配置
+
+    读取 conf.yaml 中的 LITERATURE_SEARCH 段，未配置的项使用默认值：
+
+    ```yaml
+    LITERATURE_SEARCH:
+      deadline_seconds: 60             # 所有引擎的总等待时间上限
+      scholar_requests_per_minute: 30  # Google Scholar（SerpAPI）每分钟请求上限
+    ```
+
+    Returns:
+        Dict[str, Any]: 合并默认值后的配置
+    """
+    return _load_section_settings("LITERATURE_SEARCH", {
+        "deadline_seconds": 60,
+        "scholar_requests_per_minute": 30,
+    })
+
+
 def set_current_model_name(model_name: str) -> None:
     """
     设置当前使用的模型名称
@@ -2,9 +2,16 @@
 # SPDX-License-Identifier: MIT
 
 from .article import Article
-from .crawler import Crawler
+from .crawler import BatchCrawlResult, Crawler
+from .extraction_pool import ExtractionPool, get_extraction_pool, shutdown_extraction_pool
+from .page_cache import PageCache
 
 __all__ = [
     "Article",
+    "BatchCrawlResult",
     "Crawler",
+    "ExtractionPool",
+    "PageCache",
+    "get_extraction_pool",
+    "shutdown_extraction_pool",
 ]
@@ -2,9 +2,17 @@
 # SPDX-License-Identifier: MIT
 
 import re
+import threading
+from typing import Optional
 from urllib.parse import urljoin
 
-from markdownify import markdownify as md
+from bs4 import BeautifulSoup, Comment, NavigableString, Tag
+from markdownify import MarkdownConverter
+
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+# 只包含一个子元素时需要展开的包装容器
+WRAPPER_TAGS = {"html", "body", "div", "article", "main", "section"}
 
 
 class Article:
@@ -13,14 +21,103 @@ class Article:
     def __init__(self, title: str, html_content: str):
         self.title = title
         self.html_content = html_content
+        # 正文按块增量转换为 Markdown，已转换的部分会被缓存，
+        # 只读取开头或分页读取时不必转换整篇文章
+        self._blocks: Optional[list] = None
+        self._next_block = 0
+        self._parts: list[str] = []
+        self._length = 0
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def _content_blocks(self) -> list:
+        if self._blocks is None:
+            container = BeautifulSoup(self.html_content or "", "html.parser")
+            while True:
+                children = [
+                    child
+                    for child in container.children
+                    if not isinstance(child, Comment) and (isinstance(child, Tag) or child.strip())
+                ]
+                if len(children) == 1 and isinstance(children[0], Tag) and children[0].name in WRAPPER_TAGS:
+                    container = children[0]
+                else:
+                    break
+            self._blocks = children
+            self._converter = MarkdownConverter()
+        return self._blocks
+
+    def _convert_until(self, max_chars: Optional[int] = None, max_tokens: Optional[int] = None) -> None:
+        """继续转换正文块，直到已转换的 Markdown 达到字符或 token 预算（均为 None 时转换全部）"""
+        blocks = self._content_blocks()
+        while self._next_block < len(blocks):
+            if max_chars is not None and self._length >= max_chars:
+                return
+            if max_tokens is not None and self._tokens >= max_tokens:
+                return
+            block = blocks[self._next_block]
+            self._next_block += 1
+            if isinstance(block, NavigableString):
+                text = self._converter.process_text(block, parent_tags=set())
+            else:
+                text = self._converter.process_tag(block, parent_tags=set())
+            text = text.strip("\n")
+            if not text.strip():
+                continue
+            if self._parts:
+                text = "\n\n" + text
+            self._parts.append(text)
+            self._length += len(text)
+            self._tokens += count_tokens(text)
 
-    def to_markdown(self, including_title: bool = True) -> str:
-        markdown = ""
-        if including_title:
-            markdown += f"# {self.title}\n\n"
-        markdown += md(self.html_content)
+    @property
+    def markdown_complete(self) -> bool:
+        """正文是否已全部转换"""
+        return self._blocks is not None and self._next_block >= len(self._blocks)
+
+    def to_markdown(
+        self,
+        including_title: bool = True,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        """
+        转换为 Markdown
+
+        Args:
+            including_title: 是否包含标题
+            max_chars: 字符预算，达到后停止转换并截断
+            max_tokens: token 预算，达到后停止转换并截断
+        """
+        markdown = f"# {self.title}\n\n" if including_title else ""
+        with self._lock:
+            self._convert_until(
+                None if max_chars is None else max(0, max_chars - len(markdown)),
+                None if max_tokens is None else max(0, max_tokens - count_tokens(markdown)),
+            )
+            markdown += "".join(self._parts)
+        if max_chars is not None:
+            markdown = markdown[:max_chars]
+        if max_tokens is not None:
+            markdown = truncate_to_tokens(markdown, max_tokens)
         return markdown
 
+    def read_markdown(self, offset: int = 0, limit: int = 4000) -> tuple[str, Optional[int]]:
+        """
+        分页读取正文 Markdown（不含标题）
+
+        Returns:
+            (内容, 下一页的 offset；已读到末尾时为 None)
+        """
+        end = offset + limit
+        with self._lock:
+            # 多转换一个字符用于判断是否还有下一页
+            self._convert_until(max_chars=end + 1)
+            markdown = "".join(self._parts)
+            complete = self.markdown_complete
+        has_more = len(markdown) > end or not complete
+        return markdown[offset:end], (end if has_more else None)
+
     def to_message(self) -> list[dict]:
         image_pattern = r"!\[.*?\]\((.*?)\)"
 
@@ -1,14 +1,200 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import logging
 import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.utils.http_client import arequest, request
 
 from .article import Article
 from .jina_client import JinaClient
-from .readability_extractor import ReadabilityExtractor
+from .page_cache import CachedPage, PageCache, get_page_cache, load_crawler_settings
+from .extraction_pool import get_extraction_pool
+
+logger = logging.getLogger(__name__)
+
+# 源站 HEAD 请求只用于获取/校验 ETag 和 Last-Modified，超时要短
+VALIDATION_TIMEOUT = 10.0
+# 首次缓存页面时，校验信息与 Jina 抓取并行获取；Jina 返回后最多再等这么久，
+# 其余情况下页面先无校验信息入库，HEAD 完成后再补写
+VALIDATION_GRACE = 1.0
+
+_DEFAULT = object()
+
+_validator_executor: Optional[ThreadPoolExecutor] = None
+_validator_executor_lock = threading.Lock()
+# 仍在后台补写校验信息的异步任务，保留引用以免被垃圾回收
+_background_validations: Set[asyncio.Task] = set()
+
+
+def _get_validator_executor() -> ThreadPoolExecutor:
+    global _validator_executor
+    if _validator_executor is None:
+        with _validator_executor_lock:
+            if _validator_executor is None:
+                _validator_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="page-validators")
+    return _validator_executor
+
+
+def _late_validators(cache: PageCache, url: str, future: Union[Future, asyncio.Task]) -> None:
+    """后台 HEAD 请求完成后补写页面的校验信息（尽力而为，失败时忽略）"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _, etag, last_modified = future.result()
+    if etag or last_modified:
+        try:
+            cache.set_validators(url, etag, last_modified)
+        except Exception as e:
+            logger.debug(f"补写页面校验信息失败 {url}: {e}")
+
+
+@dataclass
+class BatchCrawlResult:
+    """批量抓取结果：截止时间到达时返回已完成的部分"""
+
+    articles: Dict[str, Article] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    cache_hits: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and not self.timed_out
+
+
+def _validators(headers) -> Tuple[Optional[str], Optional[str]]:
+    return headers.get("etag"), headers.get("last-modified")
 
 
 class Crawler:
+    def __init__(
+        self,
+        jina_client: Optional[JinaClient] = None,
+        page_cache=_DEFAULT,
+        max_concurrency: Optional[int] = None,
+        per_host_limit: Optional[int] = None,
+    ):
+        settings = load_crawler_settings()
+        self.jina_client = jina_client or JinaClient()
+        self.page_cache: Optional[PageCache] = get_page_cache() if page_cache is _DEFAULT else page_cache
+        self.max_concurrency = max_concurrency or settings.get("max_concurrency", 8)
+        self.per_host_limit = per_host_limit or settings.get("per_host_limit", 2)
+        # 正文提取在进程池中运行，不占用服务进程的 GIL
+        self.extractor = get_extraction_pool()
+
+    # ------------------------------------------------------------------
+    # 单页抓取
+    # ------------------------------------------------------------------
+
+    def _origin_validators(self, url: str, page: Optional[CachedPage] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """向源站发送 HEAD 请求，返回 (页面是否未变化, etag, last_modified)"""
+        try:
+            response = request(
+                "HEAD",
+                url,
+                headers=page.conditional_headers() if page else None,
+                timeout=VALIDATION_TIMEOUT,
+                follow_redirects=True,
+                retries=0,
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"获取页面校验信息失败 {url}: {e}")
+            return False, None, None
+        unchanged = page is not None and page.is_unchanged(response.status_code, response.headers)
+        return (unchanged, *_validators(response.headers))
+
+    async def _aorigin_validators(self, url: str, page: Optional[CachedPage] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        try:
+            response = await arequest(
+                "HEAD",
+                url,
+                headers=page.conditional_headers() if page else None,
+                timeout=VALIDATION_TIMEOUT,
+                follow_redirects=True,
+                retries=0,
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"获取页面校验信息失败 {url}: {e}")
+            return False, None, None
+        unchanged = page is not None and page.is_unchanged(response.status_code, response.headers)
+        return (unchanged, *_validators(response.headers))
+
+    def fetch_html(self, url: str) -> Tuple[str, bool]:
+        """
+        获取页面 HTML，返回 (html, 是否命中缓存)
+
+        未命中缓存时，源站校验信息的 HEAD 请求与 Jina 抓取并行进行，且不会让抓取多等
+        超过 VALIDATION_GRACE 秒；源站拒绝或很慢时页面照常入库，只是没有校验信息。
+        """
+        cache = self.page_cache
+        page = cache.get(url) if cache else None
+        if page is not None:
+            status = cache.status(page)
+            if status == "fresh":
+                return page.html, True
+            if status == "revalidate":
+                unchanged, _, _ = self._origin_validators(url, page)
+                if unchanged:
+                    cache.touch(url)
+                    return page.html, True
+
+        if not cache:
+            return self.jina_client.crawl(url, return_format="html"), False
+        validators = _get_validator_executor().submit(self._origin_validators, url)
+        html = self.jina_client.crawl(url, return_format="html")
+        try:
+            _, etag, last_modified = validators.result(timeout=VALIDATION_GRACE)
+        except FutureTimeoutError:
+            cache.put(url, html)
+            validators.add_done_callback(lambda future: _late_validators(cache, url, future))
+            return html, False
+        cache.put(url, html, etag, last_modified)
+        return html, False
+
+    async def afetch_html(self, url: str) -> Tuple[str, bool]:
+        """fetch_html 的异步版本"""
+        cache = self.page_cache
+        page = await asyncio.to_thread(cache.get, url) if cache else None
+        if page is not None:
+            status = cache.status(page)
+            if status == "fresh":
+                return page.html, True
+            if status == "revalidate":
+                unchanged, _, _ = await self._aorigin_validators(url, page)
+                if unchanged:
+                    await asyncio.to_thread(cache.touch, url)
+                    return page.html, True
+
+        if not cache:
+            return await self.jina_client.acrawl(url, return_format="html"), False
+        validators = asyncio.create_task(self._aorigin_validators(url))
+        try:
+            html = await self.jina_client.acrawl(url, return_format="html")
+        except BaseException:
+            validators.cancel()
+            raise
+        await asyncio.wait({validators}, timeout=VALIDATION_GRACE)
+        if not validators.done():
+            await asyncio.to_thread(cache.put, url, html)
+            _background_validations.add(validators)
+            validators.add_done_callback(_background_validations.discard)
+            validators.add_done_callback(lambda task: _late_validators(cache, url, task))
+            return html, False
+        _, etag, last_modified = validators.result()
+        await asyncio.to_thread(cache.put, url, html, etag, last_modified)
+        return html, False
+
     def crawl(self, url: str) -> Article:
         # To help LLMs better understand content, we extract clean
         # articles from HTML, convert them to markdown, and split
@@ -20,13 +206,78 @@ class Crawler:
         #
         # Instead of using Jina's own markdown converter, we'll use
         # our own solution to get better readability results.
-        jina_client = JinaClient()
-        html = jina_client.crawl(url, return_format="html")
-        extractor = ReadabilityExtractor()
-        article = extractor.extract_article(html)
+        html, _ = self.fetch_html(url)
+        article = self.extractor.extract_article(html)
         article.url = url
         return article
 
+    async def acrawl(self, url: str) -> Article:
+        article, _ = await self._acrawl(url)
+        return article
+
+    async def _acrawl(self, url: str) -> Tuple[Article, bool]:
+        html, cached = await self.afetch_html(url)
+        article = await self.extractor.aextract_article(html)
+        article.url = url
+        return article, cached
+
+    # ------------------------------------------------------------------
+    # 批量抓取
+    # ------------------------------------------------------------------
+
+    async def crawl_many(self, urls: Sequence[str], deadline: Optional[float] = None) -> BatchCrawlResult:
+        """
+        并发抓取多个页面
+
+        Args:
+            urls: 待抓取的URL（重复的URL只抓取一次）
+            deadline: 总耗时上限（秒），到达后取消未完成的抓取并返回已完成的结果
+
+        全局并发数和单个主机的并发数分别受 max_concurrency、per_host_limit 限制。
+        """
+        start = time.perf_counter()
+        unique_urls = list(dict.fromkeys(urls))
+        result = BatchCrawlResult()
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def crawl_one(url: str):
+            host = urlsplit(url).hostname or ""
+            host_limit = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            async with host_limit, global_limit:
+                return await self._acrawl(url)
+
+        tasks = {asyncio.create_task(crawl_one(url)): url for url in unique_urls}
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        outcomes = {}
+        for task, url in tasks.items():
+            if not task.done() or task.cancelled():
+                result.timed_out.append(url)
+            elif task.exception() is not None:
+                result.errors[url] = repr(task.exception())
+            else:
+                outcomes[url] = task.result()
+
+        for url in unique_urls:
+            if url in outcomes:
+                article, cached = outcomes[url]
+                result.articles[url] = article
+                result.cache_hits += int(cached)
+
+        result.elapsed = time.perf_counter() - start
+        logger.info(
+            f"🕸️ 批量抓取完成: {len(result.articles)}/{len(unique_urls)} 成功, "
+            f"{result.cache_hits} 命中缓存, {len(result.errors)} 失败, "
+            f"{len(result.timed_out)} 超时, 耗时 {result.elapsed:.2f}s"
+        )
+        return result
+
 
 if __name__ == "__main__":
     if len(sys.argv) == 2:
@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+已提取文档的内存缓存
+
+保存最近抓取并提取过正文的 Article（连同已经增量转换好的 Markdown），
+分页读取同一页面的后续内容时无需重新抓取、提取和转换。
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .article import Article
+from .page_cache import load_crawler_settings
+
+
+class DocumentStore:
+    def __init__(self, max_documents: int = 64, ttl_seconds: float = 1800):
+        self.max_documents = max_documents
+        self.ttl_seconds = ttl_seconds
+        self._documents: "OrderedDict[str, Tuple[float, Article]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Article]:
+        with self._lock:
+            entry = self._documents.get(url)
+            if entry is None:
+                return None
+            stored_at, article = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._documents[url]
+                return None
+            self._documents.move_to_end(url)
+            return article
+
+    def put(self, url: str, article: Article) -> None:
+        with self._lock:
+            self._documents[url] = (time.monotonic(), article)
+            self._documents.move_to_end(url)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+
+_document_store: Optional[DocumentStore] = None
+_document_store_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """获取共享的文档缓存（CRAWLER.document_cache_size / document_cache_ttl_minutes）"""
+    global _document_store
+    if _document_store is None:
+        with _document_store_lock:
+            if _document_store is None:
+                settings = load_crawler_settings()
+                _document_store = DocumentStore(
+                    max_documents=settings.get("document_cache_size", 64),
+                    ttl_seconds=settings.get("document_cache_ttl_minutes", 30) * 60,
+                )
+    return _document_store
@@ -0,0 +1,212 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+正文提取进程池
+
+readabilipy 是 CPU 密集型操作，在服务进程中运行会长时间持有 GIL，
+拖慢同一进程中的 SSE 流。这里把正文提取放到有界的进程池中执行
+（Markdown 转换由 Article 按预算增量进行）：
+- 超过 max_html_chars 的页面不会交给 readabilipy，只截断后用 lxml 快速提取，
+  避免单个超大页面长时间占用 worker
+- 同时提交的任务不超过 worker 数，任务提交后立即开始执行，超时从开始执行算起，
+  不包含排队时间
+- 提取超时或进程池崩溃时换用新的进程池，并在当前进程中用 lxml 兜底；
+  旧进程池不取消其他调用方的任务，执行完毕后自行退出
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from .article import Article
+from .page_cache import load_crawler_settings
+from .readability_extractor import LxmlExtractor, ReadabilityExtractor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_HTML_CHARS = 2_000_000
+DEFAULT_TIMEOUT = 30.0
+
+ExtractionResult = Tuple[Optional[str], Optional[str]]
+
+_worker_extractor: Optional[ReadabilityExtractor] = None
+
+
+def extract_document(html: str, allow_readability: bool = True) -> ExtractionResult:
+    """在 worker 进程中运行：提取正文，返回 (title, html_content)"""
+    global _worker_extractor
+    article = None
+    if allow_readability:
+        if _worker_extractor is None:
+            _worker_extractor = ReadabilityExtractor()
+        article = _worker_extractor.extract_article(html)
+    else:
+        article = LxmlExtractor().extract_article(html, strict=False)
+    if article is None:
+        return None, ""
+    return article.title, article.html_content
+
+
+class _Slot:
+    """一个并发名额；任务完成或调用方放弃等待时释放，只释放一次"""
+
+    def __init__(self, semaphore: threading.Semaphore):
+        self._semaphore = semaphore
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self, *_) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._semaphore.release()
+
+
+class ExtractionPool:
+    # 异步调用方等待名额时的轮询间隔（秒）
+    SLOT_POLL_INTERVAL = 0.01
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_html_chars: int = DEFAULT_MAX_HTML_CHARS,
+        timeout: float = DEFAULT_TIMEOUT,
+        use_processes: bool = True,
+    ):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_html_chars = max_html_chars
+        self.timeout = timeout
+        self.use_processes = use_processes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.max_workers)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 服务进程是多线程的，使用 spawn 避免 fork 时复制锁状态
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _retire(self, executor: ProcessPoolExecutor) -> None:
+        """后续任务改用新的进程池；旧进程池不取消其他调用方的任务，执行完后退出"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=False)
+
+    def _admit(self, html: str) -> Tuple[str, bool]:
+        """按页面大小决定提取方式，返回 (html, 是否允许使用 readabilipy)"""
+        if html and len(html) > self.max_html_chars:
+            logger.info(f"页面过大（{len(html)} 字符），截断后使用 lxml 快速提取")
+            return html[: self.max_html_chars], False
+        return html, True
+
+    @staticmethod
+    def _to_article(result: ExtractionResult) -> Article:
+        title, html_content = result
+        return Article(title=title, html_content=html_content)
+
+    def _submit(self, html: str, allow_readability: bool, slot: _Slot) -> Tuple[ProcessPoolExecutor, Future]:
+        """在已获得名额后提交任务，任务结束时归还名额"""
+        try:
+            executor = self._get_executor()
+            future = executor.submit(extract_document, html, allow_readability)
+        except BaseException:
+            slot.release()
+            raise
+        future.add_done_callback(slot.release)
+        return executor, future
+
+    def _give_up(self, executor: Optional[ProcessPoolExecutor], slot: _Slot, e: BaseException) -> None:
+        logger.warning(f"正文提取进程失败，使用 lxml 兜底: {e!r}")
+        if executor is not None and not isinstance(e, CancelledError):
+            self._retire(executor)
+        # 卡住的任务留在旧进程池里，不再占用名额
+        slot.release()
+
+    def extract_article(self, html: str) -> Article:
+        html, allow_readability = self._admit(html)
+        if not self.use_processes:
+            return self._to_article(extract_document(html, allow_readability))
+
+        self._slots.acquire()
+        slot = _Slot(self._slots)
+        executor = None
+        try:
+            executor, future = self._submit(html, allow_readability, slot)
+            return self._to_article(future.result(timeout=self.timeout))
+        except (FutureTimeoutError, BrokenProcessPool, CancelledError) as e:
+            self._give_up(executor, slot, e)
+            return self._to_article(extract_document(html, allow_readability=False))
+
+    async def _acquire_slot(self) -> _Slot:
+        # 名额由同步与异步调用方共享，轮询获取以免阻塞事件循环；取消等待不会占用名额
+        while not self._slots.acquire(blocking=False):
+            await asyncio.sleep(self.SLOT_POLL_INTERVAL)
+        return _Slot(self._slots)
+
+    async def aextract_article(self, html: str) -> Article:
+        html, allow_readability = self._admit(html)
+        if not self.use_processes:
+            return self._to_article(await asyncio.to_thread(extract_document, html, allow_readability))
+
+        slot = await self._acquire_slot()
+        executor = future = None
+        try:
+            executor, future = self._submit(html, allow_readability, slot)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            return self._to_article(result)
+        except (asyncio.TimeoutError, BrokenProcessPool, CancelledError) as e:
+            self._give_up(executor, slot, e)
+        except asyncio.CancelledError:
+            # 只有进程池任务本身被取消（进程退出时关闭进程池）才兜底，调用方自身被取消照常传播
+            if future is None or not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+            self._give_up(executor, slot, CancelledError())
+        return self._to_article(await asyncio.to_thread(extract_document, html, False))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_extraction_pool: Optional[ExtractionPool] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ExtractionPool:
+    """获取共享的正文提取进程池（配置见 conf.yaml 的 CRAWLER 部分）"""
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                settings = load_crawler_settings()
+                _extraction_pool = ExtractionPool(
+                    max_workers=settings.get("extraction_workers"),
+                    max_html_chars=settings.get("extraction_max_html_chars", DEFAULT_MAX_HTML_CHARS),
+                    timeout=settings.get("extraction_timeout", DEFAULT_TIMEOUT),
+                    use_processes=settings.get("extraction_process_pool", True),
+                )
+    return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -3,14 +3,22 @@
 
 import logging
 import os
+from typing import Optional
 
-import requests
+from src.utils.http_client import arequest, request
 
 logger = logging.getLogger(__name__)
 
+JINA_READER_URL = "https://r.jina.ai/"
+# Jina Reader renders the page server-side, which can take a while
+JINA_TIMEOUT = 60.0
+
 
 class JinaClient:
-    def crawl(self, url: str, return_format: str = "html") -> str:
+    def __init__(self, timeout: float = JINA_TIMEOUT):
+        self.timeout = timeout
+
+    def _headers(self, return_format: str) -> dict:
         headers = {
             "Content-Type": "application/json",
             "X-Return-Format": return_format,
@@ -21,6 +29,26 @@ class JinaClient:
             logger.warning(
                 "Jina API key is not set. Provide your own key to access a higher rate limit. See https://jina.ai/reader for more information."
             )
-        data = {"url": url}
-        response = requests.post("https://r.jina.ai/", headers=headers, json=data)
+        return headers
+
+    def crawl(self, url: str, return_format: str = "html", timeout: Optional[float] = None) -> str:
+        response = request(
+            "POST",
+            JINA_READER_URL,
+            headers=self._headers(return_format),
+            json={"url": url},
+            timeout=timeout or self.timeout,
+        )
+        response.raise_for_status()
+        return response.text
+
+    async def acrawl(self, url: str, return_format: str = "html", timeout: Optional[float] = None) -> str:
+        response = await arequest(
+            "POST",
+            JINA_READER_URL,
+            headers=self._headers(return_format),
+            json={"url": url},
+            timeout=timeout or self.timeout,
+        )
+        response.raise_for_status()
         return response.text
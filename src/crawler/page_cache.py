@@ -0,0 +1,198 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+抓取页面的磁盘缓存
+
+缓存 Jina 返回的 HTML，同时记录源站的 ETag / Last-Modified：
+- 在 fresh_seconds 内直接使用缓存
+- 超过后向源站发送带 If-None-Match / If-Modified-Since 的 HEAD 请求，
+  源站返回 304（或校验值未变）时继续使用缓存，只有页面真正变化时才重新抓取
+- 源站不提供校验值的页面按 max_age_seconds 过期
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    html BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    validated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_validated_at ON pages(validated_at);
+"""
+
+
+@dataclass
+class CachedPage:
+    url: str
+    html: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    validated_at: float
+
+    @property
+    def has_validators(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_unchanged(self, status_code: int, headers: Mapping[str, str]) -> bool:
+        """根据源站对条件请求的响应判断页面是否未变化"""
+        if status_code == 304:
+            return True
+        if status_code != 200:
+            return False
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        if self.etag and etag:
+            return etag == self.etag
+        if self.last_modified and last_modified:
+            return last_modified == self.last_modified
+        return False
+
+
+class PageCache:
+    """SQLite 页面缓存，HTML 以 zlib 压缩存储"""
+
+    def __init__(
+        self,
+        path: str = "./data/page_cache.sqlite",
+        *,
+        fresh_seconds: float = 600,
+        max_age_seconds: float = 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        self.path = str(path)
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._writes = 0
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html, etag, last_modified, fetched_at, validated_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(url, zlib.decompress(row[0]).decode("utf-8"), *row[1:])
+
+    def status(self, page: CachedPage) -> str:
+        """
+        判断缓存页面的处理方式
+
+        Returns:
+            "fresh"：直接使用缓存
+            "revalidate"：先向源站发送条件请求
+            "stale"：需要重新抓取
+        """
+        now = time.time()
+        if now - page.validated_at < self.fresh_seconds:
+            return "fresh"
+        if page.has_validators:
+            return "revalidate"
+        if now - page.fetched_at < self.max_age_seconds:
+            return "fresh"
+        return "stale"
+
+    def put(self, url: str, html: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        now = time.time()
+        blob = zlib.compress(html.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, html, etag, last_modified, fetched_at, validated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, blob, etag, last_modified, now, now),
+            )
+            self._writes += 1
+            if self.max_entries and self._writes % 100 == 0:
+                self._prune()
+
+    def set_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """补写已缓存页面的校验信息（后台 HEAD 请求晚于 Jina 抓取完成时）"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET etag = ?, last_modified = ? WHERE url = ?",
+                (etag, last_modified, url),
+            )
+
+    def touch(self, url: str) -> None:
+        """源站确认页面未变化，刷新校验时间"""
+        with self._lock:
+            self._conn.execute("UPDATE pages SET validated_at = ? WHERE url = ?", (time.time(), url))
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            "DELETE FROM pages WHERE url IN ("
+            "SELECT url FROM pages ORDER BY validated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def load_crawler_settings() -> Dict:
+    from src.config.loader import load_yaml_config
+
+    conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+    return load_yaml_config(conf_path).get("CRAWLER") or {}
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_initialized = False
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """获取共享的页面缓存（CRAWLER.page_cache 为 false 时返回 None）"""
+    global _page_cache, _page_cache_initialized
+    if not _page_cache_initialized:
+        with _page_cache_lock:
+            if not _page_cache_initialized:
+                settings = load_crawler_settings()
+                if settings.get("page_cache", True):
+                    _page_cache = PageCache(
+                        settings.get("page_cache_path", "./data/page_cache.sqlite"),
+                        fresh_seconds=settings.get("page_cache_fresh_seconds", 600),
+                        max_age_seconds=settings.get("page_cache_max_age_hours", 24) * 3600,
+                        max_entries=settings.get("page_cache_max_entries", 5000),
+                    )
+                _page_cache_initialized = True
+    return _page_cache
+
+
+def set_page_cache(cache: Optional[PageCache]) -> None:
+    """替换共享的页面缓存（传入 None 表示禁用缓存）"""
+    global _page_cache, _page_cache_initialized
+    with _page_cache_lock:
+        _page_cache = cache
+        _page_cache_initialized = True
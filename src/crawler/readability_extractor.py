@@ -1,13 +1,91 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+from typing import Optional
+
+import lxml.html
+from lxml import etree
 from readabilipy import simple_json_from_html_string
 
 from .article import Article
 
+# 正文中不需要的元素
+NOISE_TAGS = ("script", "style", "noscript", "iframe", "svg", "form", "button", "nav", "aside", "footer")
+# 结构良好的页面中承载正文的容器
+CONTENT_XPATH = "//article | //main | //*[@role='main'] | //*[@itemprop='articleBody']"
+
+
+class LxmlExtractor:
+    """
+    基于 lxml 的轻量正文提取
+
+    只处理结构良好的页面（正文位于 <article>/<main> 等语义容器中），
+    无法可靠判断正文时返回 None，由 readabilipy 兜底。
+    """
+
+    def __init__(self, min_text_chars: int = 250, min_paragraphs: int = 2, max_link_density: float = 0.5):
+        self.min_text_chars = min_text_chars
+        self.min_paragraphs = min_paragraphs
+        self.max_link_density = max_link_density
+
+    def extract_article(self, html: str, strict: bool = True) -> Optional[Article]:
+        """
+        Args:
+            html: 页面 HTML
+            strict: 为 False 时找不到合格的正文容器也会退回到 <body>
+        """
+        if not html or not html.strip():
+            return None
+        try:
+            root = lxml.html.document_fromstring(html)
+        except (etree.ParserError, ValueError):
+            return None
+
+        title = self._title(root)
+        for element in root.xpath("|".join(f"//{tag}" for tag in NOISE_TAGS)):
+            if element.getparent() is not None:
+                element.drop_tree()
+
+        best = max(root.xpath(CONTENT_XPATH), key=self._text_length, default=None)
+        if best is None or not self._looks_like_content(best):
+            if strict:
+                return None
+            best = root.find("body") if root.find("body") is not None else root
+
+        return Article(title=title, html_content=lxml.html.tostring(best, encoding="unicode"))
+
+    @staticmethod
+    def _title(root) -> Optional[str]:
+        for xpath in ("//meta[@property='og:title']/@content", "//title/text()", "//h1//text()"):
+            values = [value.strip() for value in root.xpath(xpath) if value.strip()]
+            if values:
+                return values[0]
+        return None
+
+    @staticmethod
+    def _text_length(element) -> int:
+        return len(element.text_content().strip())
+
+    def _looks_like_content(self, element) -> bool:
+        text_length = self._text_length(element)
+        if text_length < self.min_text_chars:
+            return False
+        if len(element.findall(".//p")) < self.min_paragraphs:
+            return False
+        link_length = sum(self._text_length(link) for link in element.iter("a"))
+        return link_length / text_length <= self.max_link_density
+
 
 class ReadabilityExtractor:
+    def __init__(self, fast_path: bool = True):
+        self.fast_extractor = LxmlExtractor() if fast_path else None
+
     def extract_article(self, html: str) -> Article:
+        if self.fast_extractor is not None:
+            article = self.fast_extractor.extract_article(html)
+            if article is not None:
+                return article
+
         article = simple_json_from_html_string(html, use_readability=True)
         return Article(
             title=article.get("title"),
@@ -6,6 +6,7 @@ from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 
 from .types import State
+from .checkpointer import create_checkpointer
 
 # 🔧 强制使用标准节点 - 多轮交互已彻底关闭
 from .nodes import (
@@ -69,14 +70,15 @@ def build_graph_with_memory():
     """Build and return the agent workflow graph with memory."""
     try:
         # use persistent memory to save conversation history
-        # TODO: be compatible with SQLite / PostgreSQL
-        memory = MemorySaver()
+        # conf.yaml CHECKPOINTER.type selects "memory" (default) or "sqlite"
+        memory = create_checkpointer()
 
         # build state graph
         builder = _build_base_graph()
         graph = builder.compile(checkpointer=memory)
         
-        mode_info = "文献预研究 + 内存模式" if ENHANCED_NODES_AVAILABLE else "标准文献预研究 + 内存模式"
+        memory_mode = "SQLite持久化" if not isinstance(memory, MemorySaver) else "内存"
+        mode_info = f"文献预研究 + {memory_mode}模式" if ENHANCED_NODES_AVAILABLE else f"标准文献预研究 + {memory_mode}模式"
         logger.info(f"✅ {mode_info}编译成功")
         return graph
         
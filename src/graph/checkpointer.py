@@ -0,0 +1,533 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+基于 SQLite 文件的 LangGraph 检查点存储
+
+替代 MemorySaver，使对话线程的检查点在进程重启后依然可用，同时保持常驻内存稳定：
+- WAL 模式 + synchronous=NORMAL，读写互不阻塞
+- 默认每次写入立即提交；可选按批次提交（达到批大小或超过刷新间隔时提交），
+  此时进程崩溃会丢失最近一批未提交的写入，人工反馈中断仍立即落盘
+- 每个线程只保留最近 N 个检查点
+- 线程 TTL 与最大线程数限制，按最近更新时间淘汰旧线程
+
+通过 conf.yaml 的 CHECKPOINTER 段选择：
+
+```yaml
+CHECKPOINTER:
+  type: sqlite                  # memory | sqlite
+  path: ./data/checkpoints.sqlite
+  thread_ttl_hours: 72          # 超过该时间未更新的线程会被清理，0 表示不清理
+  max_threads: 1000             # 最多保留的线程数，0 表示不限制
+  max_checkpoints_per_thread: 20
+  batch_size: 1                 # 累计多少次写入后提交；大于 1 时启用批量提交
+  flush_interval: 1.0           # 批量提交时，距上次提交超过多少秒后的下一次写入会提交
+```
+"""
+
+import asyncio
+import atexit
+import logging
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from langgraph.checkpoint.memory import MemorySaver
+
+try:
+    from langgraph.checkpoint.base import get_checkpoint_metadata
+except ImportError:  # 旧版本 langgraph-checkpoint
+    def get_checkpoint_metadata(config, metadata):
+        return metadata
+
+logger = logging.getLogger(__name__)
+
+INTERRUPT_CHANNEL = "__interrupt__"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_threads_updated_at ON threads(updated_at);
+"""
+
+
+class SQLiteCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    SQLite 文件检查点存储，支持历史裁剪和线程淘汰
+
+    batch_size 默认为 1，put/put_writes 返回时写入已提交；
+    大于 1 时启用批量提交，以崩溃时丢失最近一批写入为代价减少提交次数。
+    """
+
+    def __init__(
+        self,
+        path: str = "./data/checkpoints.sqlite",
+        *,
+        thread_ttl_seconds: Optional[float] = 72 * 3600,
+        max_threads: Optional[int] = 1000,
+        max_checkpoints_per_thread: Optional[int] = 20,
+        batch_size: int = 1,
+        flush_interval: float = 1.0,
+        eviction_interval: float = 60.0,
+        serde=None,
+    ):
+        super().__init__(serde=serde)
+        self.path = str(path)
+        self.thread_ttl_seconds = thread_ttl_seconds or None
+        self.max_threads = max_threads or None
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread or None
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.eviction_interval = eviction_interval
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 限制页缓存大小（约8MB），避免常驻内存随数据量增长
+        self._conn.execute("PRAGMA cache_size=-8000")
+        self._conn.executescript(_SCHEMA)
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._last_eviction = 0.0
+        self._closed = False
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # 事务与维护
+    # ------------------------------------------------------------------
+
+    def _begin(self) -> None:
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def _after_write(self, force: bool = False) -> None:
+        """累计写入次数，按批大小或时间间隔提交"""
+        self._pending += 1
+        now = time.monotonic()
+        if (
+            force
+            or self._pending >= self.batch_size
+            or now - self._last_commit >= self.flush_interval
+        ):
+            self._commit()
+        if now - self._last_eviction >= self.eviction_interval:
+            self._last_eviction = now
+            self._evict_threads()
+
+    def _commit(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def flush(self) -> None:
+        """立即提交所有未提交的写入"""
+        with self._lock:
+            if not self._closed:
+                self._commit()
+
+    def close(self) -> None:
+        """提交未完成的写入并关闭连接"""
+        with self._lock:
+            if self._closed:
+                return
+            self._commit()
+            self._conn.close()
+            self._closed = True
+
+    def _touch_thread(self, thread_id: str) -> None:
+        """更新线程的最近写入时间，淘汰按该时间进行"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO threads (thread_id, updated_at) VALUES (?, ?)",
+            (thread_id, time.time()),
+        )
+
+    def _prune_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """只保留线程最近的 max_checkpoints_per_thread 个检查点"""
+        if not self.max_checkpoints_per_thread:
+            return
+        rows = self._conn.execute(
+            "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+            "ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+            (thread_id, checkpoint_ns, self.max_checkpoints_per_thread),
+        ).fetchall()
+        if not rows:
+            return
+        stale = [(thread_id, checkpoint_ns, row[0]) for row in rows]
+        self._conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            stale,
+        )
+        self._conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            stale,
+        )
+
+    def _delete_threads(self, thread_ids: list[str]) -> None:
+        params = [(t,) for t in thread_ids]
+        self._conn.executemany("DELETE FROM checkpoints WHERE thread_id = ?", params)
+        self._conn.executemany("DELETE FROM writes WHERE thread_id = ?", params)
+        self._conn.executemany("DELETE FROM threads WHERE thread_id = ?", params)
+
+    def _evict_threads(self) -> int:
+        """按 TTL 和最大线程数淘汰最久未更新的线程"""
+        expired: list[str] = []
+        if self.thread_ttl_seconds:
+            cutoff = time.time() - self.thread_ttl_seconds
+            expired += [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT thread_id FROM threads WHERE updated_at < ?", (cutoff,)
+                )
+            ]
+        if self.max_threads:
+            expired += [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT thread_id FROM threads ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                    (self.max_threads,),
+                )
+            ]
+        expired = list(dict.fromkeys(expired))
+        if expired:
+            self._begin()
+            self._delete_threads(expired)
+            self._commit()
+            logger.info(f"🧹 已淘汰 {len(expired)} 个过期对话线程的检查点")
+        return len(expired)
+
+    def evict_expired_threads(self) -> int:
+        """立即执行一次线程淘汰，返回被淘汰的线程数"""
+        with self._lock:
+            return self._evict_threads()
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def _row_to_tuple(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((w_type, value)))
+                for task_id, channel, w_type, value in writes
+            ],
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """获取指定检查点；未指定 checkpoint_id 时返回线程的最新检查点"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._row_to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        按检查点ID倒序列出检查点
+
+        先按 filter 过滤元数据，再取前 limit 个匹配的检查点；没有 filter 时 limit 直接交给 SQL。
+        """
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, "
+            f"metadata_type, metadata FROM checkpoints {where} ORDER BY checkpoint_id DESC"
+        )
+        if limit is not None and limit <= 0:
+            return
+        if limit is not None and not filter:
+            query += " LIMIT ?"
+            params.append(limit)
+        results = []
+        with self._lock:
+            # 逐行读取，凑够 limit 个匹配项后停止，不再反序列化其余的行
+            for thread_id, checkpoint_ns, *row in self._conn.execute(query, params):
+                item = self._row_to_tuple(thread_id, checkpoint_ns, row)
+                if filter and not all(
+                    item.metadata.get(key) == value for key, value in filter.items()
+                ):
+                    continue
+                results.append(item)
+                if limit is not None and len(results) >= limit:
+                    break
+        yield from results
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """保存检查点，并裁剪该线程的历史检查点"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self._lock:
+            self._begin()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "(thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    serialized_checkpoint,
+                    metadata_type,
+                    serialized_metadata,
+                ),
+            )
+            self._touch_thread(thread_id)
+            self._prune_thread(thread_id, checkpoint_ns)
+            self._after_write()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """保存任务的中间写入；包含中断时立即提交，确保等待人工反馈的线程可在重启后恢复"""
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        replace = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    serialized,
+                    task_path,
+                )
+            )
+        with self._lock:
+            self._begin()
+            self._conn.executemany(
+                f"{verb} INTO writes (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value, task_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._touch_thread(thread_id)
+            self._after_write(
+                force=any(channel == INTERRUPT_CHANNEL for channel, _ in writes)
+            )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """删除线程的所有检查点和写入"""
+        with self._lock:
+            self._begin()
+            self._delete_threads([thread_id])
+            self._commit()
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ------------------------------------------------------------------
+    # 异步接口：在线程池中执行，避免磁盘IO阻塞事件循环
+    # ------------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(settings: Optional[dict] = None):
+    """
+    根据 conf.yaml 的 CHECKPOINTER 段创建检查点存储
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+
+    Returns:
+        SQLiteCheckpointSaver 或 MemorySaver
+    """
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("CHECKPOINTER") or {}
+
+    checkpointer_type = str(settings.get("type", "memory")).lower()
+    if checkpointer_type != "sqlite":
+        logger.info("💾 使用内存检查点存储 (MemorySaver)")
+        return MemorySaver()
+
+    ttl_hours = settings.get("thread_ttl_hours", 72)
+    saver = SQLiteCheckpointSaver(
+        settings.get("path", "./data/checkpoints.sqlite"),
+        thread_ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+        max_threads=settings.get("max_threads", 1000),
+        max_checkpoints_per_thread=settings.get("max_checkpoints_per_thread", 20),
+        batch_size=settings.get("batch_size", 1),
+        flush_interval=settings.get("flush_interval", 1.0),
+    )
+    logger.info(f"💾 使用SQLite检查点存储: {saver.path}")
+    return saver
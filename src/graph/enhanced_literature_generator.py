@@ -15,9 +15,13 @@ from datetime import datetime
 
 from src.tools import get_pubmed_search_tool, get_google_scholar_search_tool, get_web_search_tool
 from src.tools.enhanced_search_coordinator import EnhancedSearchCoordinator
+from src.tools.literature_corpus import search_corpus_first
+from src.tools.literature_record import LiteratureRecord
 from src.tools.journal_quality_controller import journal_quality_controller
 from src.config.enhanced_research_config import ResearchConfiguration
 from src.llms import get_llm_by_type
+from src.utils.literature_dedup import deduplicate_literature
+from src.utils.literature_relevance import match_papers
 
 logger = logging.getLogger(__name__)
 
@@ -178,15 +182,23 @@ class LiteratureEnhancedReportGenerator:
         for query in strategy["queries"]:
             for source in strategy["sources"]:
                 try:
-                    if source == "pubmed":
-                        tool = get_pubmed_search_tool(max_results=self.config.pubmed_max_results)
-                        raw_results = tool.invoke({"query": query})
-                        parsed_results = self._parse_pubmed_results(raw_results)
+                    limit = (
+                        self.config.pubmed_max_results if source == "pubmed" else self.config.scholar_max_results
+                    )
+                    # 本地文献库已有足够且不过旧的文献时不再联网
+                    local_records = search_corpus_first(query, limit, sources=[source])
+                    if local_records is not None:
+                        parsed_results = self._records_to_papers(local_records)
+
+                    elif source == "pubmed":
+                        tool = get_pubmed_search_tool(max_results=self.config.pubmed_max_results, return_records=True)
+                        parsed_results = self._records_to_papers(tool.invoke({"query": query}))
                         
                     elif source == "google_scholar":
-                        tool = get_google_scholar_search_tool(top_k_results=self.config.scholar_max_results)
-                        raw_results = tool.invoke({"query": query})
-                        parsed_results = self._parse_scholar_results(raw_results)
+                        tool = get_google_scholar_search_tool(
+                            top_k_results=self.config.scholar_max_results, return_records=True
+                        )
+                        parsed_results = self._records_to_papers(tool.invoke({"query": query}))
                         
                     else:
                         continue
@@ -199,78 +211,14 @@ class LiteratureEnhancedReportGenerator:
         
         return all_results
     
-    def _parse_pubmed_results(self, raw_results: str) -> List[Dict]:
-        """解析PubMed搜索结果"""
+    def _records_to_papers(self, records: List[LiteratureRecord]) -> List[Dict]:
+        """把检索工具返回的文献记录转换为文献字典并评估期刊质量"""
         
-        literature = []
-        
-        if "Result" in raw_results:
-            entries = raw_results.split("Result ")[1:]
-            
-            for entry in entries:
-                lines = entry.split('\n')
-                paper = {
-                    'title': '',
-                    'abstract': '',
-                    'journal': '',
-                    'authors': '',
-                    'pmid': '',
-                    'source': 'pubmed',
-                    'quality_score': 0.85
-                }
-                
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('Title: '):
-                        paper['title'] = line.replace('Title: ', '').strip()
-                    elif line.startswith('Abstract Snippet: '):
-                        paper['abstract'] = line.replace('Abstract Snippet: ', '').strip()
-                    elif line.startswith('Journal: '):
-                        paper['journal'] = line.replace('Journal: ', '').strip()
-                    elif line.startswith('Authors: '):
-                        paper['authors'] = line.replace('Authors: ', '').strip()
-                    elif line.startswith('PMID: '):
-                        paper['pmid'] = line.replace('PMID: ', '').strip()
-                
-                if paper['title']:
-                    paper['quality_score'] = self._assess_journal_quality(paper['journal'])
-                    literature.append(paper)
-        
-        return literature
-    
-    def _parse_scholar_results(self, raw_results: str) -> List[Dict]:
-        """解析Google Scholar结果"""
-        
-        literature = []
-        
-        if raw_results and raw_results.strip():
-            lines = raw_results.split('\n')
-            current_paper = None
-            
-            for line in lines:
-                line = line.strip()
-                if line.startswith('Title: '):
-                    if current_paper and current_paper.get('title'):
-                        literature.append(current_paper)
-                    
-                    current_paper = {
-                        'title': line.replace('Title: ', ''),
-                        'abstract': '',
-                        'journal': '',
-                        'source': 'google_scholar',
-                        'quality_score': 0.75
-                    }
-                elif current_paper and line.startswith('Summary: '):
-                    current_paper['abstract'] = line.replace('Summary: ', '')
-                elif current_paper and line.startswith('Source: '):
-                    source_info = line.replace('Source: ', '')
-                    current_paper['journal'] = source_info
-                    current_paper['quality_score'] = self._assess_journal_quality(source_info)
-            
-            if current_paper and current_paper.get('title'):
-                literature.append(current_paper)
-        
-        return literature
+        return [
+            {**record.to_dict(), 'quality_score': self._assess_journal_quality(record.journal)}
+            for record in records
+            if record.title
+        ]
     
     def _assess_journal_quality(self, journal_name: str) -> float:
         """评估期刊质量"""
@@ -325,17 +273,7 @@ class LiteratureEnhancedReportGenerator:
     
     def _remove_duplicates(self, literature_list: List[Dict]) -> List[Dict]:
         """去重处理"""
-        
-        seen_titles = set()
-        unique_papers = []
-        
-        for paper in literature_list:
-            title = paper.get('title', '').lower().strip()
-            if title and title not in seen_titles:
-                unique_papers.append(paper)
-                seen_titles.add(title)
-        
-        return unique_papers
+        return deduplicate_literature(paper for paper in literature_list if paper.get('title'))
     
     def _categorize_literature(self, literature_list: List[Dict]) -> Dict[str, List[Dict]]:
         """文献分类"""
@@ -545,14 +483,15 @@ class LiteratureEnhancedReportGenerator:
 
 """
         
-        for i, direction in enumerate(directions_list[:8], 1):
+        directions = directions_list[:8]
+        # 所有方向一次性与文献打分
+        relevant_by_direction = self._find_relevant_papers(directions, literature_db)
+        
+        for i, (direction, relevant_papers) in enumerate(zip(directions, relevant_by_direction), 1):
             section += f"""### 方向 {i}: {direction}
 
 """
             
-            # 为每个方向匹配相关文献
-            relevant_papers = self._find_relevant_papers(direction, literature_db)
-            
             if relevant_papers:
                 section += """#### 📚 相关文献支撑
 
@@ -576,31 +515,10 @@ class LiteratureEnhancedReportGenerator:
         
         return section
     
-    def _find_relevant_papers(self, direction: str, literature_db: Dict) -> List[Dict]:
-        """为方向找到相关文献"""
-        
-        direction_words = direction.lower().split()
-        all_papers = literature_db.get("literature", [])
-        
-        relevant_papers = []
-        
-        for paper in all_papers:
-            title = paper.get('title', '').lower()
-            abstract = paper.get('abstract', '').lower()
-            
-            relevance_score = 0
-            for word in direction_words:
-                if len(word) > 3:
-                    if word in title:
-                        relevance_score += 2
-                    elif word in abstract:
-                        relevance_score += 1
-            
-            if relevance_score > 0:
-                paper["relevance_score"] = relevance_score
-                relevant_papers.append(paper)
+    def _find_relevant_papers(self, directions: List[str], literature_db: Dict) -> List[List[Dict]]:
+        """为每个方向找到最相关的3篇文献（TF-IDF 余弦相似度，所有方向批量计算）"""
         
-        return sorted(relevant_papers, key=lambda x: x.get("relevance_score", 0), reverse=True)[:3]
+        return match_papers(directions, literature_db.get("literature", []), k=3)
     
     def _generate_key_findings(self, literature_db: Dict) -> str:
         """生成关键发现"""
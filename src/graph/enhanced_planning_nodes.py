@@ -29,6 +29,7 @@ from src.llms.llm import get_llm_by_type
 from src.config.agents import AGENT_LLM_MAP
 from src.prompts.template import apply_prompt_template
 from src.utils.json_utils import repair_json_output
+from .step_scheduler import STEP_RESULTS_RESET
 from .types import State
 
 logger = logging.getLogger(__name__)
@@ -510,6 +511,7 @@ class EnhancedPlannerNode:
         updated_values = {
             "planning_history": planning_history,
             "current_plan": frontend_compatible_plan,  # 🔧 使用前端兼容格式
+            "step_results": STEP_RESULTS_RESET,  # 新计划不沿用旧计划的并行步骤结果
             "messages": state["messages"] + [
                 AIMessage(content=json.dumps(frontend_compatible_plan, ensure_ascii=False), name="planner")  # 🔧 修复：使用前端识别的agent名称
             ]
@@ -6,11 +6,16 @@
 在制定研究计划之前，系统性搜索和分析相关领域的高质量文献
 """
 
+import asyncio
 import logging
+import re
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from langchain_core.runnables import RunnableConfig
@@ -21,10 +26,15 @@ from .types import State
 from src.llms import get_llm_by_type
 from src.config.agents import AGENT_LLM_MAP
 from src.tools import get_pubmed_search_tool, get_google_scholar_search_tool
+from src.tools.literature_corpus import asearch_corpus_first
+from src.tools.literature_record import LiteratureRecord
+from src.config.configuration import get_literature_search_settings
+from src.utils.literature_dedup import deduplicate_literature
+from src.utils.rate_limiter import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
-def literature_preresearch_node(
+async def literature_preresearch_node(
     state: State, config: RunnableConfig = None
 ) -> Command[Literal["planner"]]:
     """文献预研究节点 - 执行100篇高质量文献搜索"""
@@ -44,7 +54,7 @@ def literature_preresearch_node(
     
     try:
         # 执行文献搜索
-        literature_results = execute_literature_search(user_query)
+        literature_results = await aexecute_literature_search(user_query)
         
         # 创建文献分析报告
         literature_context = create_literature_context(literature_results)
@@ -60,7 +70,8 @@ def literature_preresearch_node(
             "metadata": {
                 "node": "literature_preresearch",
                 "literature_count": literature_results['literature_count'],
-                "quality_stats": literature_results['quality_stats']
+                "quality_stats": literature_results['quality_stats'],
+                "search_report": literature_results['search_report']
             }
         })
         
@@ -69,7 +80,8 @@ def literature_preresearch_node(
                 "messages": updated_messages,
                 "literature_context": literature_context,
                 "literature_database": literature_results['literature_database'],
-                "literature_stats": literature_results['quality_stats']
+                "literature_stats": literature_results['quality_stats'],
+                "literature_search_report": literature_results['search_report']
             },
             goto="planner"
         )
@@ -122,228 +134,270 @@ def literature_preresearch_node(
             goto="planner"
         )
 
-def execute_literature_search(research_topic: str) -> Dict[str, Any]:
-    """执行文献搜索"""
-    
-    try:
-        pubmed_tool = get_pubmed_search_tool(max_results=20)
-        scholar_tool = get_google_scholar_search_tool(top_k_results=20)
-        logger.info("✅ 搜索工具初始化成功")
-    except Exception as e:
-        logger.warning(f"搜索工具初始化失败: {e}")
-        # 返回高质量模拟数据用于测试
+# 预研究检索策略：每个策略分别在 PubMed 和 Google Scholar 上检索
+SEARCH_STRATEGIES = [
+    {
+        "keywords": ["bone mineral density", "artificial intelligence", "machine learning"],
+        "max_results": 15
+    },
+    {
+        "keywords": ["radiomics", "bone analysis", "cardiovascular prediction"],
+        "max_results": 12
+    },
+    {
+        "keywords": ["osteocalcin", "bone-organ crosstalk", "systemic health"],
+        "max_results": 10
+    },
+    {
+        "keywords": ["DXA imaging", "osteoporosis", "AI diagnosis"],
+        "max_results": 10
+    }
+]
+
+# 研究主题作为额外检索策略时取回的文献数，以及查询的最大长度
+TOPIC_MAX_RESULTS = 15
+TOPIC_QUERY_MAX_CHARS = 200
+
+
+def build_search_strategies(research_topic: str) -> List[Dict]:
+    """研究主题（空白折叠、截断后）作为第一个检索策略，其后为固定的领域检索策略"""
+    topic = " ".join((research_topic or "").split())[:TOPIC_QUERY_MAX_CHARS].strip()
+    strategies = [dict(strategy) for strategy in SEARCH_STRATEGIES]
+    if topic and all(topic.lower() != " ".join(s["keywords"]).lower() for s in strategies):
+        strategies.insert(0, {"keywords": [topic], "max_results": TOPIC_MAX_RESULTS})
+    return strategies
+
+
+# PubMed 批量检索是阻塞调用，放到独立线程池中执行，截止时间到达后不必等待其结束
+_search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="literature-search")
+
+
+@dataclass
+class EngineReport:
+    """单个搜索引擎的检索情况"""
+
+    engine: str
+    queries: int = 0
+    succeeded: int = 0
+    papers: int = 0
+    elapsed: float = 0.0
+    failures: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
         return {
-            "literature_count": 15,
-            "literature_database": generate_mock_literature_database(),
-            "quality_stats": {"high": 8, "medium": 5, "low": 2}
+            "engine": self.engine,
+            "queries": self.queries,
+            "succeeded": self.succeeded,
+            "papers": self.papers,
+            "elapsed": round(self.elapsed, 2),
+            "failures": dict(self.failures),
+            "timed_out": list(self.timed_out),
         }
-    
-    # 定义搜索策略
-    search_strategies = [
-        {
-            "keywords": ["bone mineral density", "artificial intelligence", "machine learning"],
-            "max_results": 15
-        },
-        {
-            "keywords": ["radiomics", "bone analysis", "cardiovascular prediction"],
-            "max_results": 12
-        },
-        {
-            "keywords": ["osteocalcin", "bone-organ crosstalk", "systemic health"],
-            "max_results": 10
-        },
-        {
-            "keywords": ["DXA imaging", "osteoporosis", "AI diagnosis"],
-            "max_results": 10
-        }
-    ]
-    
+
+
+async def _search_pubmed(pubmed_tool, strategies: List[Dict]) -> Dict[str, Any]:
+    """所有策略的 PubMed 查询合并为一次批量检索：重叠文献只取回一次"""
+    queries = [" ".join(strategy["keywords"]) for strategy in strategies]
+    limits = {" ".join(strategy["keywords"]): strategy["max_results"] for strategy in strategies}
+    wrapper = pubmed_tool.pubmed_api_wrapper
+    errors: Dict[str, str] = {}
+    batch = await asyncio.get_running_loop().run_in_executor(
+        _search_executor,
+        partial(wrapper.search_many_records, queries, max_results=max(limits.values()), errors=errors),
+    )
+    papers = {
+        query: pubmed_records_to_papers([record.to_literature_record() for record in records[:limits[query]]])
+        for query, records in batch.items()
+        if query not in errors
+    }
+    return {"papers": papers, "errors": errors}
+
+
+async def _search_scholar(scholar_tool, query: str, limiter) -> List[Dict]:
+    await limiter.acquire()
+    return scholar_records_to_papers(await scholar_tool.ainvoke({"query": query}))
+
+
+async def aexecute_literature_search(research_topic: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    并发执行文献检索
+
+    PubMed 批量检索与各策略的 Google Scholar 检索同时进行，分别受各自的限流器约束；
+    所有引擎完成或到达截止时间后，合并已返回的文献并去重排序。
+    检索策略由 build_search_strategies(research_topic) 生成。
+    返回结果中的 search_report 记录每个引擎的耗时、失败和超时情况。
+    """
+    settings = get_literature_search_settings()
+    deadline = deadline if deadline is not None else settings["deadline_seconds"]
     all_literature = []
-    
-    for strategy in search_strategies:
+
+    # 先查本地文献库，本地已有足够且不过旧的文献时该引擎不再联网
+    local_start = time.perf_counter()
+    local_report = EngineReport("local_corpus")
+    pubmed_strategies: List[Dict] = []
+    scholar_queries: List[str] = []
+    for strategy in build_search_strategies(research_topic):
         query = " ".join(strategy["keywords"])
-        logger.info(f"🔍 搜索策略: {query}")
-        
+        for engine, to_papers in (("pubmed", pubmed_records_to_papers), ("google_scholar", scholar_records_to_papers)):
+            local_report.queries += 1
+            records = await asearch_corpus_first(query, strategy["max_results"], sources=[engine])
+            if records is None:
+                if engine == "pubmed":
+                    pubmed_strategies.append(strategy)
+                else:
+                    scholar_queries.append(query)
+                continue
+            papers = to_papers(records)
+            all_literature.extend(papers)
+            local_report.papers += len(papers)
+            local_report.succeeded += 1
+    local_report.elapsed = time.perf_counter() - local_start
+
+    pubmed_queries = [" ".join(strategy["keywords"]) for strategy in pubmed_strategies]
+    reports = {
+        "local_corpus": local_report,
+        "pubmed": EngineReport("pubmed", queries=len(pubmed_queries)),
+        "google_scholar": EngineReport("google_scholar", queries=len(scholar_queries)),
+    }
+    tasks: Dict[asyncio.Task, tuple] = {}
+
+    if pubmed_strategies:
         try:
-            # PubMed 搜索
-            logger.info(f"📚 PubMed搜索: {query}")
-            pubmed_results = pubmed_tool.invoke({"query": query})
-            parsed_pubmed = parse_pubmed_results(str(pubmed_results))
-            all_literature.extend(parsed_pubmed)
-            logger.info(f"✅ PubMed返回 {len(parsed_pubmed)} 篇文献")
-            
-            # Google Scholar 搜索
-            logger.info(f"🎓 Google Scholar搜索: {query}")
-            scholar_results = scholar_tool.invoke({"query": query})
-            parsed_scholar = parse_scholar_results(str(scholar_results))
-            all_literature.extend(parsed_scholar)
-            logger.info(f"✅ Google Scholar返回 {len(parsed_scholar)} 篇文献")
-            
-            time.sleep(1)  # 避免请求过快
-            
+            pubmed_tool = get_pubmed_search_tool(max_results=20)
+            tasks[asyncio.create_task(_search_pubmed(pubmed_tool, pubmed_strategies))] = ("pubmed", None)
         except Exception as e:
-            logger.warning(f"⚠️ 搜索失败: {query} - {e}")
-            # 添加一些模拟数据作为回退
-            mock_papers = generate_mock_papers_for_query(query)
-            all_literature.extend(mock_papers)
-            logger.info(f"🔄 使用模拟数据: {len(mock_papers)} 篇文献")
-    
-    # 如果没有真实搜索结果，使用完整的模拟数据库
-    if not all_literature:
-        logger.warning("⚠️ 所有搜索均失败，使用完整模拟文献数据库")
-        all_literature = generate_mock_literature_database()
-    
+            logger.warning(f"PubMed搜索工具初始化失败: {e}")
+            reports["pubmed"].failures = {query: f"tool init failed: {e!r}" for query in pubmed_queries}
+
+    if scholar_queries:
+        try:
+            scholar_tool = get_google_scholar_search_tool(top_k_results=20, return_records=True)
+            limiter = get_rate_limiter("google_scholar", settings["scholar_requests_per_minute"])
+            for query in scholar_queries:
+                task = asyncio.create_task(_search_scholar(scholar_tool, query, limiter))
+                tasks[task] = ("google_scholar", query)
+        except Exception as e:
+            logger.warning(f"Google Scholar搜索工具初始化失败: {e}")
+            reports["google_scholar"].failures = {query: f"tool init failed: {e!r}" for query in scholar_queries}
+
+    start = time.perf_counter()
+    finished_at: Dict[asyncio.Task, float] = {}
+    for task in tasks:
+        task.add_done_callback(lambda t: finished_at.setdefault(t, time.perf_counter()))
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+
+    for task, (engine, query) in tasks.items():
+        report = reports[engine]
+        report.elapsed = max(report.elapsed, finished_at.get(task, time.perf_counter()) - start)
+        if not task.done() or task.cancelled():
+            report.timed_out.extend(pubmed_queries if query is None else [query])
+            continue
+        if task.exception() is not None:
+            error = repr(task.exception())
+            report.failures.update({q: error for q in pubmed_queries} if query is None else {query: error})
+            continue
+        if engine == "pubmed":
+            result = task.result()
+            report.failures.update(result["errors"])
+            for papers in result["papers"].values():
+                all_literature.extend(papers)
+                report.papers += len(papers)
+            report.succeeded = len(result["papers"])
+        else:
+            papers = task.result()
+            all_literature.extend(papers)
+            report.papers += len(papers)
+            report.succeeded += 1
+
+    for report in reports.values():
+        logger.info(
+            f"📊 {report.engine}: {report.succeeded}/{report.queries} 个查询成功, {report.papers} 篇文献, "
+            f"耗时 {report.elapsed:.2f}s, 失败 {len(report.failures)}, 超时 {len(report.timed_out)}"
+        )
+        for query, error in report.failures.items():
+            logger.warning(f"⚠️ {report.engine} 检索失败: {query} - {error}")
+
     # 去重和排序
     unique_literature = remove_duplicates(all_literature)
     ranked_literature = rank_by_quality(unique_literature)
-    
+
     logger.info(f"📊 文献处理完成: 原始{len(all_literature)}篇 → 去重后{len(unique_literature)}篇 → 排序后取前100篇")
-    
+
     return {
         "literature_count": len(ranked_literature),
         "literature_database": ranked_literature[:100],  # 取前100篇
-        "quality_stats": calculate_quality_stats(ranked_literature[:100])
+        "quality_stats": calculate_quality_stats(ranked_literature[:100]),
+        "search_report": [report.to_dict() for report in reports.values()],
     }
 
-def generate_mock_papers_for_query(query: str) -> List[Dict]:
-    """为特定查询生成相关的模拟文献"""
-    base_papers = [
-        {
-            'title': f'AI Analysis of {query}: A Comprehensive Review',
-            'abstract': f'This study examines the application of artificial intelligence in {query} analysis...',
-            'journal': 'Nature Medicine',
-            'source': 'mock_pubmed',
-            'quality_score': 0.85
-        },
-        {
-            'title': f'Machine Learning Approaches to {query} Prediction',
-            'abstract': f'Novel machine learning algorithms show promise in predicting outcomes related to {query}...',
-            'journal': 'Science Translational Medicine',
-            'source': 'mock_scholar',
-            'quality_score': 0.82
-        }
-    ]
-    return base_papers
 
-def parse_pubmed_results(raw_results: str) -> List[Dict]:
-    """解析PubMed结果"""
+def execute_literature_search(research_topic: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    aexecute_literature_search 的同步入口，只能在没有运行中事件循环的线程调用
+
+    异步代码中请直接 await aexecute_literature_search。
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(aexecute_literature_search(research_topic, deadline))
+    raise RuntimeError("execute_literature_search 不能在事件循环中调用，请 await aexecute_literature_search")
+
+
+def pubmed_records_to_papers(records: List[LiteratureRecord]) -> List[Dict]:
+    """把PubMed检索记录转换为文献字典并评分"""
     literature = []
-    
-    if "Result" in raw_results:
-        entries = raw_results.split("Result ")[1:]
-        
-        for entry in entries:
-            lines = entry.split('\n')
-            paper = {
-                'title': '',
-                'abstract': '',
-                'journal': '',
-                'authors': '',
-                'pmid': '',
-                'source': 'pubmed',
-                'quality_score': 0.85  # PubMed文献质量相对较高
-            }
-            
-            for line in lines:
-                line = line.strip()  # 去除前后空白
-                if line.startswith('Title: '):
-                    paper['title'] = line.replace('Title: ', '').strip()
-                elif line.startswith('Abstract Snippet: '):
-                    paper['abstract'] = line.replace('Abstract Snippet: ', '').strip()
-                elif line.startswith('Journal: '):
-                    paper['journal'] = line.replace('Journal: ', '').strip()
-                elif line.startswith('Authors: '):
-                    paper['authors'] = line.replace('Authors: ', '').strip()
-                elif line.startswith('PMID: '):
-                    paper['pmid'] = line.replace('PMID: ', '').strip()
-            
-            if paper['title']:
-                # 根据期刊质量调整评分
-                journal = paper.get('journal', '').lower()
-                if any(hj in journal for hj in ['nature', 'science', 'cell', 'nejm', 'lancet']):
-                    paper['quality_score'] = 0.95
-                elif any(mj in journal for mj in ['plos', 'bmj', 'jama', 'journal of']):
-                    paper['quality_score'] = 0.88
-                
-                literature.append(paper)
-                logger.info(f"📚 解析PubMed文献: {paper['title'][:50]}...")
-    
-    logger.info(f"✅ PubMed解析完成，共提取 {len(literature)} 篇有效文献")
+    for record in records:
+        if not record.title:
+            continue
+        paper = {**record.to_dict(), 'quality_score': 0.85}  # PubMed文献质量相对较高
+        # 根据期刊质量调整评分
+        journal = record.journal.lower()
+        if any(hj in journal for hj in ['nature', 'science', 'cell', 'nejm', 'lancet']):
+            paper['quality_score'] = 0.95
+        elif any(mj in journal for mj in ['plos', 'bmj', 'jama', 'journal of']):
+            paper['quality_score'] = 0.88
+        literature.append(paper)
     return literature
 
-def parse_scholar_results(raw_results: str) -> List[Dict]:
-    """解析Google Scholar结果"""
+def scholar_records_to_papers(records: List[LiteratureRecord]) -> List[Dict]:
+    """把Google Scholar检索记录转换为文献字典并评分"""
     literature = []
-    
-    if raw_results and raw_results.strip():
-        lines = raw_results.split('\n')
-        current_paper = None
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('Title: '):
-                if current_paper and current_paper.get('title'):
-                    literature.append(current_paper)
-                    logger.info(f"🎓 解析Scholar文献: {current_paper['title'][:50]}...")
-                
-                current_paper = {
-                    'title': line.replace('Title: ', ''),
-                    'abstract': '',
-                    'journal': '',
-                    'source': 'google_scholar',
-                    'quality_score': 0.75  # Scholar文献基础分数
-                }
-            elif current_paper and line.startswith('Summary: '):
-                current_paper['abstract'] = line.replace('Summary: ', '')
-            elif current_paper and line.startswith('Source: '):
-                # 提取来源/期刊信息
-                source_info = line.replace('Source: ', '')
-                current_paper['journal'] = source_info
-                # 根据来源调整质量分数
-                if any(hj in source_info.lower() for hj in ['nature', 'science', 'cell', 'nejm', 'lancet']):
-                    current_paper['quality_score'] = 0.92
-                elif any(mj in source_info.lower() for mj in ['ieee', 'springer', 'elsevier', 'wiley']):
-                    current_paper['quality_score'] = 0.82
-        
-        if current_paper and current_paper.get('title'):
-            literature.append(current_paper)
-            logger.info(f"🎓 解析Scholar文献: {current_paper['title'][:50]}...")
-    
-    logger.info(f"✅ Google Scholar解析完成，共提取 {len(literature)} 篇有效文献")
+    for record in records:
+        if not record.title:
+            continue
+        paper = {**record.to_dict(), 'quality_score': 0.75}  # Scholar文献基础分数
+        # 根据来源调整质量分数
+        venue = f"{record.journal} {record.published}".lower()
+        if any(hj in venue for hj in ['nature', 'science', 'cell', 'nejm', 'lancet']):
+            paper['quality_score'] = 0.92
+        elif any(mj in venue for mj in ['ieee', 'springer', 'elsevier', 'wiley']):
+            paper['quality_score'] = 0.82
+        literature.append(paper)
     return literature
 
 def remove_duplicates(literature_list: List[Dict]) -> List[Dict]:
-    """去重"""
-    unique_literature = []
-    seen_titles = set()
-    
-    for paper in literature_list:
-        title = paper.get('title', '').lower().strip()
-        if title and title not in seen_titles:
-            seen_titles.add(title)
-            unique_literature.append(paper)
-    
-    return unique_literature
+    """去重：DOI/PMID/URL、标题指纹和近似标题匹配"""
+    return deduplicate_literature(paper for paper in literature_list if paper.get('title'))
+
+_TOP_JOURNAL_PATTERN = re.compile(r"nature|science|cell|nejm|lancet")
+_HIGH_EVIDENCE_PATTERN = re.compile(r"systematic review|meta-analysis|clinical trial")
 
 def rank_by_quality(literature_list: List[Dict]) -> List[Dict]:
-    """按质量排序"""
-    
+    """按质量排序：顶级期刊 +0.2，系统综述/荟萃分析/临床试验 +0.1，上限 1.0"""
     for paper in literature_list:
         score = paper.get('quality_score', 0.5)
-        
-        # 期刊加分
-        journal = paper.get('journal', '').lower()
-        if any(hj in journal for hj in ['nature', 'science', 'cell', 'nejm', 'lancet']):
+        if _TOP_JOURNAL_PATTERN.search(paper.get('journal', '').lower()):
             score += 0.2
-        
-        # 标题加分
-        title = paper.get('title', '').lower()
-        if any(qi in title for qi in ['systematic review', 'meta-analysis', 'clinical trial']):
+        if _HIGH_EVIDENCE_PATTERN.search(paper.get('title', '').lower()):
             score += 0.1
-        
         paper['quality_score'] = min(score, 1.0)
-    
-    return sorted(literature_list, key=lambda x: x.get('quality_score', 0), reverse=True)
+    # sorted 是稳定排序，同分文献保持原有顺序
+    return sorted(literature_list, key=lambda paper: paper['quality_score'], reverse=True)
 
 def calculate_quality_stats(literature_list: List[Dict]) -> Dict:
     """计算质量统计"""
@@ -429,115 +483,22 @@ def create_literature_context(results: Dict) -> str:
 ---
 *注：完整文献数据库已本地保存，可供深度分析使用*
 """
+    if results.get("search_report"):
+        context += "\n" + format_search_report(results["search_report"])
     
     return context
 
-def generate_mock_literature_database() -> List[Dict]:
-    """生成模拟文献数据库用于测试"""
-    return [
-        {
-            'title': 'Artificial Intelligence in DXA Bone Imaging: A Systematic Review',
-            'abstract': 'Deep learning models show promise in automated bone density analysis from DXA scans...',
-            'journal': 'Nature Medicine',
-            'source': 'pubmed',
-            'quality_score': 0.95
-        },
-        {
-            'title': 'Bone-Cardiovascular Crosstalk: Role of Osteocalcin in Systemic Health',
-            'abstract': 'Emerging evidence suggests bone-derived factors regulate cardiovascular function...',
-            'journal': 'New England Journal of Medicine',
-            'source': 'pubmed',
-            'quality_score': 0.93
-        },
-        {
-            'title': 'Radiomics and Machine Learning in Osteoporosis Prediction',
-            'abstract': 'Texture analysis of bone images using ML algorithms improves fracture risk assessment...',
-            'journal': 'Radiology',
-            'source': 'pubmed',
-            'quality_score': 0.88
-        },
-        {
-            'title': 'Deep Learning for Automated Bone Health Assessment from DXA Images',
-            'abstract': 'CNN-based approaches demonstrate superior performance in bone mineral density quantification...',
-            'journal': 'IEEE Transactions on Medical Imaging',
-            'source': 'scholar',
-            'quality_score': 0.85
-        },
-        {
-            'title': 'Bone as an Endocrine Organ: Implications for Whole-Body Health',
-            'abstract': 'Recent discoveries reveal bone tissue as a major endocrine regulator...',
-            'journal': 'Science',
-            'source': 'pubmed',
-            'quality_score': 0.92
-        },
-        {
-            'title': 'Multi-modal AI for Comprehensive Bone Health Evaluation',
-            'abstract': 'Integration of DXA, clinical data, and genetic markers using deep learning...',
-            'journal': 'Cell',
-            'source': 'pubmed',
-            'quality_score': 0.91
-        },
-        {
-            'title': 'Fracture Risk Assessment Using Convolutional Neural Networks',
-            'abstract': 'AI models trained on large DXA datasets achieve high accuracy in fracture prediction...',
-            'journal': 'The Lancet Digital Health',
-            'source': 'pubmed',
-            'quality_score': 0.87
-        },
-        {
-            'title': 'Bone Microarchitecture Analysis via Advanced Image Processing',
-            'abstract': 'Novel computational methods reveal hidden bone structural patterns...',
-            'journal': 'Journal of Bone and Mineral Research',
-            'source': 'scholar',
-            'quality_score': 0.82
-        },
-        {
-            'title': 'FGF23 and Bone-Kidney-Heart Axis in Health and Disease',
-            'abstract': 'Fibroblast growth factor 23 mediates complex organ interactions...',
-            'journal': 'Kidney International',
-            'source': 'pubmed',
-            'quality_score': 0.84
-        },
-        {
-            'title': 'Precision Medicine in Osteoporosis: AI-Driven Personalized Treatment',
-            'abstract': 'Machine learning algorithms enable personalized osteoporosis management strategies...',
-            'journal': 'Nature Reviews Endocrinology',
-            'source': 'pubmed',
-            'quality_score': 0.89
-        },
-        {
-            'title': 'Explainable AI for Clinical Decision Support in Bone Health',
-            'abstract': 'Interpretable deep learning models provide transparent bone health assessments...',
-            'journal': 'Nature Machine Intelligence',
-            'source': 'scholar',
-            'quality_score': 0.86
-        },
-        {
-            'title': 'Longitudinal Bone Health Monitoring Using Sequential DXA Analysis',
-            'abstract': 'Time-series analysis of DXA scans reveals bone health trajectories...',
-            'journal': 'Osteoporosis International',
-            'source': 'pubmed',
-            'quality_score': 0.78
-        },
-        {
-            'title': 'Cross-Modal Learning for Bone Health Assessment',
-            'abstract': 'Multi-modal fusion of imaging and laboratory data improves diagnostic accuracy...',
-            'journal': 'Medical Image Analysis',
-            'source': 'scholar',
-            'quality_score': 0.83
-        },
-        {
-            'title': 'Bone Biomarkers and AI: Next-Generation Diagnostics',
-            'abstract': 'Integration of biochemical markers with AI models enhances bone health evaluation...',
-            'journal': 'Clinical Chemistry',
-            'source': 'pubmed',
-            'quality_score': 0.81
-        },
-        {
-            'title': 'Federated Learning for Global Bone Health Research',
-            'abstract': 'Privacy-preserving machine learning enables large-scale collaborative bone research...',
-            'journal': 'Nature Communications',
-            'source': 'scholar',
-            'quality_score': 0.88
-        }
-    ] 
\ No newline at end of file
+def format_search_report(search_report: List[Dict]) -> str:
+    """格式化各搜索引擎的检索情况"""
+    lines = ["## 🔎 检索情况", "", "| 引擎 | 成功/查询 | 文献数 | 耗时 | 失败 | 超时 |", "|---|---|---|---|---|---|"]
+    for report in search_report:
+        lines.append(
+            f"| {report['engine']} | {report['succeeded']}/{report['queries']} | {report['papers']} | "
+            f"{report['elapsed']:.1f}s | {len(report['failures'])} | {len(report['timed_out'])} |"
+        )
+    for report in search_report:
+        for query, error in report["failures"].items():
+            lines.append(f"- ⚠️ {report['engine']} 检索失败「{query}」: {error[:200]}")
+        for query in report["timed_out"]:
+            lines.append(f"- ⏱️ {report['engine']} 检索超时「{query}」")
+    return "\n".join(lines) + "\n"
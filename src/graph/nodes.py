@@ -1,11 +1,13 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import json
 import logging
 import os
 import re
 import time
+import warnings
 from datetime import datetime
 from pathlib import Path
 from typing import Annotated, Literal, Dict, Any, Optional
@@ -13,7 +15,7 @@ from typing import Annotated, Literal, Dict, Any, Optional
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
-from langgraph.types import Command, interrupt
+from langgraph.types import Command, Send, interrupt
 from langchain_mcp_adapters.client import MultiServerMCPClient
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -29,13 +31,26 @@ from src.tools import (
     python_repl_tool,
 )
 
-from src.config.agents import AGENT_LLM_MAP
-from src.config.configuration import Configuration
-from src.llms.llm import get_llm_by_type
+from src.config.configuration import Configuration, get_batch_generation_settings
+from src.llms.hedging import HedgedChatModel
+from src.llms.llm import get_llm_for_agent
 from src.prompts.planner_model import Plan, StepType
 from src.prompts.template import apply_prompt_template
 from src.utils.json_utils import repair_json_output
-
+from src.utils.concurrent_generation import ConcurrentGenerationEngine, GenerationTask
+from src.utils.continuation import DIRECTION_PART_PATTERN
+from src.utils.rate_limiter import get_rate_limiter, model_rate_limit_key
+from src.utils.step_context import completed_steps, get_step_context_compactor
+
+from .step_scheduler import (
+    STEP_RESULTS_RESET,
+    apply_step_results,
+    dependencies,
+    has_result as step_done,
+    ready_steps,
+    step_field,
+    step_key,
+)
 from .types import State
 from ..config import SELECTED_SEARCH_ENGINE, SearchEngine
 from pathlib import Path
@@ -208,7 +223,7 @@ def planner_node(
         ]
 
     # 不再使用with_structured_output，直接使用LLM
-    llm = get_llm_by_type(AGENT_LLM_MAP["planner"])
+    llm = get_llm_for_agent("planner")
     
     # if the plan iterations is greater than the max plan iterations, return the reporter node
     if plan_iterations >= configurable.max_plan_iterations:
@@ -349,7 +364,11 @@ def planner_node(
     # if it's a simple query, we don't need human feedback, directly go to reporter
     if is_simple_query or not curr_plan.get("has_enough_context", False):
         return Command(
-            update={"current_plan": curr_plan, "plan_iterations": plan_iterations + 1},
+            update={
+                "current_plan": curr_plan,
+                "plan_iterations": plan_iterations + 1,
+                "step_results": STEP_RESULTS_RESET,
+            },
             goto="reporter",
         )
     else:
@@ -357,6 +376,7 @@ def planner_node(
             update={
                 "current_plan": curr_plan,
                 "plan_iterations": plan_iterations + 1,
+                "step_results": STEP_RESULTS_RESET,
                 "messages": state["messages"] + [
                     AIMessage(content=plan_message, name="planner")
                 ]
@@ -426,7 +446,7 @@ def coordinator_node(
     messages = apply_prompt_template("coordinator", state)
     
     # 🔧 强制禁用流式响应，确保MiniMax兼容性
-    llm = get_llm_by_type(AGENT_LLM_MAP["coordinator"])
+    llm = get_llm_for_agent("coordinator")
     
     # 📝 添加调试信息
     print(f"🔧 调用LLM: {type(llm).__name__}")
@@ -554,7 +574,7 @@ def coordinator_node(
     )
 
 
-def reporter_node(state: State):
+async def reporter_node(state: State):
     """Reporter node that write a final report."""
     logger.info("Reporter write final report")
     current_plan = state.get("current_plan")
@@ -565,10 +585,10 @@ def reporter_node(state: State):
     # 🎯 分批生成优先级最高
     if should_use_batch:
         logger.info("检测到大量内容生成需求，自动启用分批生成模式")
-        return _generate_batch_report(state, current_plan)
+        return await _generate_batch_report(state, current_plan)
     else:
         # 使用原有的单模型报告生成
-        return _generate_single_model_report(state, current_plan)
+        return await _generate_single_model_report(state, current_plan)
 
 
 def _should_use_batch_generation(state: State, current_plan) -> bool:
@@ -627,7 +647,15 @@ def _should_use_batch_generation(state: State, current_plan) -> bool:
     return True
 
 
-def _generate_batch_report(state: State, current_plan):
+def _write_text_file(path, content: str) -> None:
+    """写入文本文件（在工作线程中调用，避免阻塞事件循环）"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+async def _generate_batch_report(state: State, current_plan):
     """
     使用SimpleBatchGenerator生成分批次研究报告
     """
@@ -644,7 +672,6 @@ def _generate_batch_report(state: State, current_plan):
         generator = SimpleBatchGenerator(
             model_name=current_model,
             output_dir=f"./outputs/batch_directions_{current_model}",
-            pause_between=2.0,
             save_individual=True,
             auto_merge=True
         )
@@ -656,12 +683,11 @@ def _generate_batch_report(state: State, current_plan):
         # 准备研究上下文
         research_context = _prepare_research_context(state, current_plan)
         
-        # 逐个生成研究方向
-        logger.info("🚀 开始逐个生成研究方向（分批模式）")
-        result = generator.generate_all_directions_sync(
+        # 并发生成研究方向（按方向顺序返回）
+        logger.info("🚀 开始并发生成研究方向（分批模式）")
+        result = await generator.generate_all_directions(
             directions_list=directions_list,
             research_context=research_context,
-            pause_between=2.0
         )
         
         if result and result.get('success'):
@@ -679,9 +705,7 @@ def _generate_batch_report(state: State, current_plan):
                     "generation_time": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }
                 
-                # 🔥 确保输出目录存在
                 output_dir = Path(f"./outputs/complete_reports_{current_model}")
-                output_dir.mkdir(parents=True, exist_ok=True)
                 
                 # 生成完整的9部分综合报告
                 logger.info("🎯 调用_generate_streaming_frontend_display函数...")
@@ -692,14 +716,15 @@ def _generate_batch_report(state: State, current_plan):
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 final_report_file = output_dir / f"comprehensive_9parts_report_{current_model}_{timestamp}.md"
                 
-                with open(final_report_file, 'w', encoding='utf-8') as f:
-                    f.write(comprehensive_report)
+                await asyncio.to_thread(_write_text_file, final_report_file, comprehensive_report)
                 
                 logger.info(f"📁 完整的9部分报告已保存到: {final_report_file}")
                 
                 # 同时保存本地文件信息
                 logger.info("🔄 执行本地文件保存...")
-                local_files_info = _save_generated_contents_to_local(result, batch_config, current_plan)
+                local_files_info = await asyncio.to_thread(
+                    _save_generated_contents_to_local, result, batch_config, current_plan
+                )
                 logger.info(f"✅ 本地文件保存完成，共 {local_files_info.get('total_files', 0)} 个文件")
                 
             except Exception as step3_error:
@@ -729,9 +754,7 @@ def _generate_batch_report(state: State, current_plan):
 请检查系统日志并重新执行第三步骤。
 """
                     fallback_file = Path("./outputs/complete_reports") / f"fallback_report_{timestamp}.md"
-                    fallback_file.parent.mkdir(parents=True, exist_ok=True)
-                    with open(fallback_file, 'w', encoding='utf-8') as f:
-                        f.write(fallback_report)
+                    await asyncio.to_thread(_write_text_file, fallback_file, fallback_report)
                     logger.info(f"📄 已生成简化版报告: {fallback_file}")
                     final_report_file = fallback_file
                     local_files_info = {"error": str(step3_error)}
@@ -779,13 +802,13 @@ def _generate_batch_report(state: State, current_plan):
         else:
             logger.error("❌ 分批生成失败")
             # 降级到传统生成方式
-            return _generate_single_model_report(state, current_plan)
+            return await _generate_single_model_report(state, current_plan)
         
     except Exception as e:
         error_msg = f"分批生成失败: {str(e)}"
         logger.error(error_msg)
         # 降级到传统生成方式
-        return _generate_single_model_report(state, current_plan)
+        return await _generate_single_model_report(state, current_plan)
 
 
 def _generate_streaming_frontend_display(result: dict, batch_config: dict, current_plan) -> str:
@@ -1346,55 +1369,44 @@ DXA骨密度检测技术在AI辅助诊断领域的创新应用研究，重点关
     return "\n\n".join(context_parts)
 
 
+def _warn_pause_between_deprecated(pause_between) -> None:
+    if pause_between is not None:
+        warnings.warn(
+            "pause_between 已弃用且不再生效：请求节奏由 BATCH_GENERATION.requests_per_minute 控制",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+
+
 class SimpleBatchGenerator:
-    """简化的批量生成器"""
+    """
+    简化的批量生成器
+
+    pause_between 参数已弃用（传入时给出 DeprecationWarning），请求节奏由模型共享的限流器控制。
+    """
     
     def __init__(self, model_name="gemini", output_dir="./outputs/batch", 
-                 pause_between=1.0, save_individual=True, auto_merge=True):
+                 pause_between=None, save_individual=True, auto_merge=True,
+                 max_concurrency=None, requests_per_minute=None, max_retries=None):
+        _warn_pause_between_deprecated(pause_between)
         self.model_name = model_name
         self.output_dir = Path(output_dir)
-        self.pause_between = pause_between
         self.save_individual = save_individual
         self.auto_merge = auto_merge
         
+        # ⚡ 并发与限流配置：显式参数优先，其次读取conf.yaml的BATCH_GENERATION段
+        settings = get_batch_generation_settings()
+        self.max_concurrency = max_concurrency or settings["max_concurrency"]
+        self.max_retries = settings["max_retries"] if max_retries is None else max_retries
+        self.request_timeout = settings.get("request_timeout")
+        self.requests_per_minute = requests_per_minute or settings["requests_per_minute"]
+        
         # 确保输出目录存在
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def generate_all_directions_sync(self, directions_list, research_context, pause_between=None):
-        """
-        同步生成所有研究方向，使用8部分结构，避免event loop冲突
-        """
-        pause_time = pause_between or self.pause_between
-        start_time = time.time()
-        results = {
-            "completed_directions": 0,
-            "success_rate": 0.0,
-            "total_time": 0.0,
-            "average_quality": 0.0,
-            "high_quality_count": 0,
-            "medium_quality_count": 0,
-            "low_quality_count": 0,
-            "final_report_path": None,
-            "summary_path": None
-        }
-        
-        try:
-            # 获取LLM实例
-            llm = get_llm_by_type(AGENT_LLM_MAP["reporter"])
-            
-            generated_contents = []
-            quality_scores = []
-            
-            # 🔥 修复：明确限制只生成前20个方向，防止重复生成
-            limited_directions = directions_list[:20]
-            logger.info(f"🎯 开始分批生成，限制方向数量: {len(limited_directions)}/20")
-            
-            for i, direction in enumerate(limited_directions, 1):
-                try:
-                    logger.info(f"正在生成第 {i}/20 个研究方向: {direction}")
-                    
-                    # 🔥 使用reporter.md定义的8部分结构生成器（包含思考过程）
-                    prompt = f"""# 单个研究方向生成任务
+    def _build_direction_prompt(self, i: int, direction: str, research_context: str) -> str:
+        """构建单个研究方向的生成提示词（reporter.md 定义的8部分结构）"""
+        return f"""# 单个研究方向生成任务
 
 ## 研究背景上下文
 {research_context}
@@ -1483,68 +1495,112 @@ class SimpleBatchGenerator:
 5. 基于提供的研究背景上下文动态生成
 6. 绝对禁止使用预设的研究方向内容
 7. 严格按照reporter.md定义的学术标准
-                    """
-                    
-                    # 生成内容
-                    try:
-                        logger.info(f"🔧 调用LLM生成第{i}个研究方向...")
-                        response = llm.invoke([{"role": "user", "content": prompt}])
-                        
-                        # 🔥 修复：处理不同LLM响应格式
-                        if hasattr(response, 'content'):
-                            content = response.content
-                        elif isinstance(response, dict) and 'content' in response:
-                            content = response['content']
-                        elif isinstance(response, str):
-                            content = response
-                        else:
-                            content = str(response)
-                        
-                        # 确保content是字符串且不为空
-                        if not isinstance(content, str):
-                            content = str(content)
-                        
-                        if not content or len(content.strip()) < 100:
-                            logger.warning(f"⚠️ 生成内容过短或为空，长度: {len(content)}")
-                            content = f"# {direction}\n\n由于技术原因，该研究方向的详细内容生成失败。这是一个具有重要科学意义的研究方向，建议进一步探索其可行性和创新潜力。"
-                        
-                    except Exception as e:
-                        logger.error(f"❌ LLM调用失败: {str(e)}")
-                        content = f"# {direction}\n\n由于技术限制，该研究方向的内容生成遇到问题。这是第{i}个研究方向，仍具有重要的研究价值。"
-                    
-                    # 质量评估
-                    quality_score = self._assess_quality(content)
-                    quality_scores.append(quality_score)
-                    
-                    # 🔥 修复：禁用SimpleBatchGenerator中的简化保存，只使用后续的完整保存
-                    # 保存单个方向文件
-                    # if self.save_individual:
-                    #     file_path = self.output_dir / f"direction_{i:02d}_{self.model_name}.md"
-                    #     with open(file_path, 'w', encoding='utf-8') as f:
-                    #         f.write(f"# {direction}\n\n{content}")
-                    # 🔥 注释掉简化保存，避免被覆盖
-                    
-                    generated_contents.append({
-                        "direction": direction,
-                        "content": content,
-                        "quality": quality_score,
-                        "display_in_frontend": True,
-                        "direction_number": i
-                    })
-                    
-                    results["completed_directions"] = i
-                    
-                    # 暂停间隔
-                    if i < len(limited_directions) and pause_time > 0:
-                        logger.info(f"⏱️ 暂停 {pause_time} 秒后继续生成下一个方向...")
-                        time.sleep(pause_time)
-                        
-                except Exception as e:
-                    logger.error(f"生成第 {i} 个方向失败: {str(e)}")
-                    continue
+        """
+
+    def generate_all_directions_sync(self, directions_list, research_context, pause_between=None):
+        """
+        同步入口：在新的事件循环中执行并发生成，只能在没有运行中事件循环的线程调用
+
+        异步代码中请直接 await generate_all_directions。
+        """
+        _warn_pause_between_deprecated(pause_between)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.generate_all_directions(directions_list, research_context))
+        raise RuntimeError("generate_all_directions_sync 不能在事件循环中调用，请 await generate_all_directions")
+
+    async def generate_all_directions(self, directions_list, research_context, pause_between=None):
+        """
+        并发生成所有研究方向，使用8部分结构
+
+        并发数、限流和重试次数由 conf.yaml 的 BATCH_GENERATION 段控制。
+        """
+        _warn_pause_between_deprecated(pause_between)
+        start_time = time.time()
+        results = {
+            "completed_directions": 0,
+            "success_rate": 0.0,
+            "total_time": 0.0,
+            "average_quality": 0.0,
+            "high_quality_count": 0,
+            "medium_quality_count": 0,
+            "low_quality_count": 0,
+            "final_report_path": None,
+            "summary_path": None,
+            "direction_latencies": [],
+        }
+        
+        try:
+            # 获取LLM实例
+            llm = get_llm_for_agent("reporter")
+            # 限流器按实际调用的模型获取，同一模型的所有生成器共享一个
+            rate_limiter = None
+            if self.requests_per_minute:
+                if isinstance(llm, HedgedChatModel):
+                    # 对冲模型中每个模型的请求各自经过该模型的共享限流器
+                    llm = llm.with_rate_limit(self.requests_per_minute)
+                else:
+                    rate_limiter = get_rate_limiter(model_rate_limit_key(llm), self.requests_per_minute)
+            
+            # 🔥 修复：明确限制只生成前20个方向，防止重复生成
+            limited_directions = directions_list[:20]
+            logger.info(f"🎯 开始并发生成，限制方向数量: {len(limited_directions)}/20")
+            
+            tasks = [
+                GenerationTask(
+                    index=i,
+                    direction=direction,
+                    prompt=self._build_direction_prompt(i, direction, research_context),
+                )
+                for i, direction in enumerate(limited_directions, 1)
+            ]
+            engine = ConcurrentGenerationEngine(
+                llm,
+                max_concurrency=self.max_concurrency,
+                rate_limiter=rate_limiter,
+                max_retries=self.max_retries,
+                timeout=self.request_timeout,
+                # 被长度限制截断时从最后一个完整小节续写，而不是重新生成或使用占位内容
+                section_pattern=DIRECTION_PART_PATTERN,
+            )
+            direction_results = await engine.run(tasks)
+            
+            generated_contents = []
+            quality_scores = []
+            for item in direction_results:
+                content = item.content
+                if not item.success:
+                    logger.error(f"❌ 第{item.index}个方向生成失败: {item.error}")
+                    content = f"# {item.direction}\n\n由于技术限制，该研究方向的内容生成遇到问题。这是第{item.index}个研究方向，仍具有重要的研究价值。"
+                
+                # 质量评估
+                quality_score = self._assess_quality(content)
+                quality_scores.append(quality_score)
+                
+                generated_contents.append({
+                    "direction": item.direction,
+                    "content": content,
+                    "quality": quality_score,
+                    "display_in_frontend": True,
+                    "direction_number": item.index,
+                    "latency": round(item.latency, 2),
+                    "attempts": item.attempts,
+                    "continuations": item.continuations,
+                    "success": item.success,
+                })
+                results["direction_latencies"].append({
+                    "direction_number": item.index,
+                    "latency": round(item.latency, 2),
+                    "attempts": item.attempts,
+                    "continuations": item.continuations,
+                    "success": item.success,
+                })
+            
+            results["completed_directions"] = sum(1 for item in direction_results if item.success)
             
             # 🔥 生成完成后的状态检查
-            logger.info(f"🏁 所有方向生成完成！总共生成: {len(generated_contents)}/{len(limited_directions)} 个方向")
+            logger.info(f"🏁 所有方向生成完成！成功: {results['completed_directions']}/{len(limited_directions)} 个方向")
             
             # 计算统计信息
             if quality_scores:
@@ -1553,7 +1609,7 @@ class SimpleBatchGenerator:
                 results["medium_quality_count"] = sum(1 for q in quality_scores if 6 <= q < 8)
                 results["low_quality_count"] = sum(1 for q in quality_scores if q < 6)
             
-            results["success_rate"] = len(generated_contents) / min(len(limited_directions), 20)
+            results["success_rate"] = results["completed_directions"] / max(min(len(limited_directions), 20), 1)
             results["total_time"] = time.time() - start_time
             
             # 🔥 关键修复：确保generated_contents被传递到结果中
@@ -1564,11 +1620,11 @@ class SimpleBatchGenerator:
             
             # 生成合并报告
             if self.auto_merge and generated_contents:
-                final_path = self._merge_reports(generated_contents)
+                final_path = await asyncio.to_thread(self._merge_reports, generated_contents)
                 results["final_report_path"] = str(final_path)
                 results["merged_report_path"] = str(final_path)  # 兼容性字段
             
-            logger.info(f"✅ 分批生成完成，success={results['success']}, 生成内容数量={len(generated_contents)}")
+            logger.info(f"✅ 分批生成完成，success={results['success']}, 生成内容数量={len(generated_contents)}, 总耗时={results['total_time']:.1f}s")
             return results
             
         except Exception as e:
@@ -1578,13 +1634,6 @@ class SimpleBatchGenerator:
             results["generated_contents"] = []  # 确保有空的生成内容列表
             return results
     
-    async def generate_all_directions(self, directions_list, research_context, pause_between=None):
-        """
-        异步生成所有研究方向（保留原有接口）
-        """
-        # 🔥 修复：直接调用同步版本，避免event loop问题
-        return self.generate_all_directions_sync(directions_list, research_context, pause_between)
-    
     def _assess_quality(self, content: str) -> float:
         """
         评估内容质量 (0-10分)
@@ -1641,7 +1690,7 @@ class SimpleBatchGenerator:
         return final_path
 
 
-def _generate_single_model_report(state: State, current_plan):
+async def _generate_single_model_report(state: State, current_plan):
     """生成单模型报告（原有逻辑）"""
     # 🔧 安全获取计划属性，处理字典格式
     if isinstance(current_plan, dict):
@@ -1807,17 +1856,37 @@ def _generate_single_model_report(state: State, current_plan):
             )
         )
     logger.debug(f"Current invoke messages: {invoke_messages}")
-    response = get_llm_by_type(AGENT_LLM_MAP["reporter"]).invoke(invoke_messages)
+    response = await get_llm_for_agent("reporter").ainvoke(invoke_messages)
     response_content = response.content
     logger.info(f"reporter response: {response_content}")
 
     return {"final_report": response_content}
 
 
+def _max_parallel_steps(config: RunnableConfig = None) -> int:
+    """允许同时执行的计划步骤数（环境变量或 configurable 中可能是字符串）"""
+    try:
+        return max(1, int(Configuration.from_runnable_config(config).max_parallel_steps))
+    except Exception as e:
+        logger.warning(f"⚠️ max_parallel_steps 配置无效，按顺序执行: {e}")
+        return 1
+
+
 def research_team_node(
-    state: State,
+    state: State, config: RunnableConfig = None
 ) -> Command[Literal["planner", "researcher", "reporter"]]:
     """Research team node that coordinate the research."""
+    command = _route_research_team(state, config)
+    if state.get("step_results"):
+        # 并行结果已写回 current_plan：显式写回计划并清空 step_results，完整结果不再长期留在检查点中
+        command = Command(
+            update={**(command.update or {}), "current_plan": state.get("current_plan"), "step_results": STEP_RESULTS_RESET},
+            goto=command.goto,
+        )
+    return command
+
+
+def _route_research_team(state: State, config: RunnableConfig = None) -> Command:
     logger.info("======================================================================")
     logger.info("== ENTERING research_team_node =====================================")
     
@@ -1848,6 +1917,28 @@ def research_team_node(
 
     logger.info(f"== research_team_node: Total steps in plan = {len(plan_steps)}")
 
+    # ⚡ 并行调度：先写回上一轮并行分支的结果，再把依赖已满足的调研步骤一起分派
+    applied = apply_step_results(current_plan, state.get("step_results") or {})
+    if applied:
+        logger.info(f"⚡ 写回 {applied} 个并行步骤的执行结果")
+    max_parallel = _max_parallel_steps(config)
+    if max_parallel > 1:
+        done = {i for i, step in enumerate(plan_steps) if step_done(step)}
+        pending = [i for i in range(len(plan_steps)) if i not in done]
+        parallel = [
+            i for i in ready_steps(plan_steps, done)
+            if _execute_agent_step(plan_steps[i], {**state, "current_step_index": i}) == "researcher"
+        ]
+        if len(parallel) > 1:
+            wave = parallel[:max_parallel]
+            logger.info(f"⚡ 并行执行 {len(wave)} 个步骤: {[i + 1 for i in wave]}（就绪 {len(parallel)} 个）")
+            return Command(
+                update={"research_team_loop_counter": 0},
+                goto=[Send("researcher", {**state, "current_step_index": i}) for i in wave],
+            )
+        # 没有可并行的步骤时按顺序执行第一个未完成的步骤（其依赖必然都已完成）
+        current_step_index = pending[0] if pending else len(plan_steps)
+
     # 🔥 增强步骤完成状态检查
     if current_step_index >= len(plan_steps):
         logger.info("✅ 所有步骤已完成，进入报告生成阶段")
@@ -1913,10 +2004,10 @@ def research_team_node(
     # 🔥 增强执行结果检查，添加更详细的日志
     if isinstance(current_step, dict):
         step_has_result = current_step.get('execution_res') and current_step.get('execution_res').strip()
-        execution_res = current_step.get('execution_res', '')
+        execution_res = current_step.get('execution_res') or ''
     else:
         step_has_result = hasattr(current_step, 'execution_res') and current_step.execution_res and current_step.execution_res.strip()
-        execution_res = getattr(current_step, 'execution_res', '')
+        execution_res = getattr(current_step, 'execution_res', None) or ''
     
     logger.info(f"🔍 步骤{current_step_index + 1}执行状态检查:")
     logger.info(f"   - execution_res长度: {len(execution_res)}")
@@ -2010,14 +2101,18 @@ def tools_for_researcher():
         get_web_search_tool,
         get_pubmed_search_tool, 
         get_google_scholar_search_tool,
-        crawl_tool
+        crawl_tool,
+        batch_crawl_tool,
+        literature_corpus_tool,
     )
     
     return [
+        literature_corpus_tool,      # 本地文献库（先查已检索过的文献）
         get_web_search_tool(),       # 网络搜索工具
         get_pubmed_search_tool(),    # PubMed医学文献搜索
         get_google_scholar_search_tool(),  # Google Scholar学术搜索
         crawl_tool,                  # 网页爬取工具
+        batch_crawl_tool,            # 批量并发网页爬取
     ]
 
 async def researcher_node(
@@ -2073,22 +2168,13 @@ async def researcher_node(
 
     logger.info(f"🔬 Researcher executing step: '{step_title}' (Index {current_step_index})")
 
-    # Format completed steps information
-    completed_steps_info = ""
-    if current_step_index > 0:
-        completed_steps_info = "# Existing Research Findings\n\n"
-        for i in range(current_step_index):
-            step = plan_steps[i]
-            # 🔧 适配字典格式
-            if isinstance(step, dict):
-                step_title_prev = step.get('title', f'步骤{i+1}')
-                step_execution_res = step.get('execution_res', '')
-            else:
-                step_title_prev = getattr(step, 'title', f'步骤{i+1}')
-                step_execution_res = getattr(step, 'execution_res', '')
-            
-            completed_steps_info += f"## Existing Finding {i+1}: {step_title_prev}\n\n"
-            completed_steps_info += f"<finding>\n{step_execution_res}\n</finding>\n\n"
+    # Format completed steps information, compacted to the configured token budget
+    context_steps = completed_steps(plan_steps, current_step_index)
+    if step_field(current_step, "depends_on") is not None:
+        # 显式声明依赖的步骤只参考其依赖步骤的结果，并行的兄弟步骤可能尚未完成
+        step_dependencies = set(dependencies(plan_steps, current_step_index))
+        context_steps = [step for i, step in enumerate(context_steps) if i in step_dependencies]
+    completed_steps_info = await get_step_context_compactor().build(context_steps)
 
     # Prepare the input for the researcher
     researcher_input = {
@@ -2144,7 +2230,7 @@ async def researcher_node(
         "current_plan": current_plan,
     }
 
-    result = await get_llm_by_type(AGENT_LLM_MAP["researcher"]).bind_tools(
+    result = await get_llm_for_agent("researcher").bind_tools(
         tools_for_researcher(),
         tool_choice="auto"
     ).ainvoke(researcher_input["messages"])
@@ -2159,7 +2245,11 @@ async def researcher_node(
     logger.info(f"🔬 Researcher completed step {current_step_index + 1}: '{step_title}'")
     logger.info(f"🔬 Result length: {len(result.content)}")
 
-    return Command(goto="research_team")
+    # 并行分支各自持有状态副本，结果同时通过 step_results 汇总回 research_team
+    return Command(
+        update={"step_results": {step_key(current_plan, current_step_index): result.content}},
+        goto="research_team",
+    )
 
 
 async def coder_node(
@@ -2200,14 +2290,10 @@ async def coder_node(
     
     logger.info(f"💻 Coder executing step: '{current_step.title}' (Index {current_step_index})")
     
-    # Format completed steps information
-    completed_steps_info = ""
-    if current_step_index > 0:
-        completed_steps_info = "# Existing Research Findings\n\n"
-        for i in range(current_step_index):
-            step = current_plan.steps[i]
-            completed_steps_info += f"## Existing Finding {i+1}: {step.title}\n\n"
-            completed_steps_info += f"<finding>\n{step.execution_res}\n</finding>\n\n"
+    # Format completed steps information, compacted to the configured token budget
+    completed_steps_info = await get_step_context_compactor().build(
+        completed_steps(current_plan.steps, current_step_index)
+    )
     
     # Prepare the input for the coder with enhanced guidance
     coder_input = {
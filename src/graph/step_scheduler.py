@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+计划步骤的依赖调度
+
+Step.depends_on 为 None 时依赖所有前序步骤（即原来的顺序执行）；只允许依赖前序步骤，
+指向自身或后续步骤的编号会被忽略，因此依赖关系总是无环的。
+research_team 每轮把依赖已满足的步骤一起分派，各轮之间的步骤数即关键路径长度。
+
+并行分支的结果经 State.step_results 汇总，键包含计划指纹，新计划不会用到旧计划的结果；
+写入新计划或结果写回计划后，用 STEP_RESULTS_RESET 清空。
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+# 写入 step_results 时表示"清空"的标记
+STEP_RESULTS_RESET_KEY = "__reset__"
+STEP_RESULTS_RESET: Dict[str, str] = {STEP_RESULTS_RESET_KEY: ""}
+
+
+def merge_step_results(left: Optional[Dict[str, str]], right: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """step_results 的 reducer：合并并行分支的结果，遇到 STEP_RESULTS_RESET 时清空"""
+    right = right or {}
+    if STEP_RESULTS_RESET_KEY in right:
+        return {key: value for key, value in right.items() if key != STEP_RESULTS_RESET_KEY}
+    return {**(left or {}), **right}
+
+
+def step_field(step: Any, name: str, default: Any = None) -> Any:
+    """读取步骤字段，兼容字典和 Step 对象"""
+    if isinstance(step, dict):
+        return step.get(name, default)
+    return getattr(step, name, default)
+
+
+def plan_steps(plan: Any) -> list:
+    """计划中的步骤列表，兼容字典和 Plan 对象"""
+    if not plan:
+        return []
+    return list(step_field(plan, "steps", None) or [])
+
+
+def plan_fingerprint(plan: Any) -> str:
+    """由计划标题和各步骤标题、描述计算的指纹，用来区分不同的计划"""
+    content = [step_field(plan, "title", "")] + [
+        [step_field(step, "title", ""), step_field(step, "description", "")] for step in plan_steps(plan)
+    ]
+    return hashlib.sha1(json.dumps(content, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+
+
+def step_key(plan: Any, index: int) -> str:
+    """步骤结果在 State.step_results 中的键（计划指纹 + 步骤序号）"""
+    return f"{plan_fingerprint(plan)}:{index}"
+
+
+def has_result(step: Any) -> bool:
+    result = step_field(step, "execution_res")
+    return bool(result and result.strip())
+
+
+def dependencies(steps: Sequence[Any], index: int) -> List[int]:
+    """步骤 index 依赖的前序步骤编号"""
+    depends_on = step_field(steps[index], "depends_on")
+    if depends_on is None:
+        return list(range(index))
+    return sorted({int(i) for i in depends_on if 0 <= int(i) < index})
+
+
+def ready_steps(steps: Sequence[Any], done: Set[int]) -> List[int]:
+    """尚未完成、且依赖都已完成的步骤编号"""
+    return [
+        i for i in range(len(steps))
+        if i not in done and all(d in done for d in dependencies(steps, i))
+    ]
+
+
+def apply_step_results(plan: Any, step_results: Dict[str, str]) -> int:
+    """把并行分支返回的结果写回计划中尚无结果的步骤，返回写回的数量"""
+    applied = 0
+    fingerprint = plan_fingerprint(plan)
+    for i, step in enumerate(plan_steps(plan)):
+        result = step_results.get(f"{fingerprint}:{i}")
+        if result and not has_result(step):
+            if isinstance(step, dict):
+                step["execution_res"] = result
+            else:
+                step.execution_res = result
+            applied += 1
+    return applied
+
+
+def critical_path_length(steps: Sequence[Any]) -> int:
+    """依赖链最长的步骤数，即并行执行所需的最少轮数"""
+    depth: List[int] = []
+    for i in range(len(steps)):
+        depth.append(1 + max((depth[d] for d in dependencies(steps, i)), default=0))
+    return max(depth, default=0)
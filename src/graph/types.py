@@ -8,6 +8,8 @@ from langgraph.graph import MessagesState
 
 from src.prompts.planner_model import Plan
 
+from .step_scheduler import merge_step_results
+
 
 class State(MessagesState):
     """State for the agent system, extends MessagesState with next field."""
@@ -25,6 +27,8 @@ class State(MessagesState):
     # 🔥 添加缺失的状态字段
     current_step_index: int = 0
     research_team_loop_counter: int = 0
+    # 并行执行的步骤结果，由 research_team 写回 current_plan 后清空
+    step_results: Annotated[Dict[str, str], merge_step_results] = {}
     
     # 🔧 多轮交互状态字段
     understanding_rounds: int = 0
@@ -1,6 +1,6 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
-from .llm import get_llm_by_type
+from .llm import get_llm_by_type, get_llm_for_agent, with_generation_params
 
-__all__ = ["get_llm_by_type"]
+__all__ = ["get_llm_by_type", "get_llm_for_agent", "with_generation_params"]
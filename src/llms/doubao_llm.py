@@ -6,19 +6,23 @@
 支持文本和图片输入，基于火山引擎API
 """
 
+import asyncio
 import json
 import logging
 import os
-import requests
+import httpx
 import time
-from typing import Any, Dict, List, Optional, Union, Iterator
+from typing import Any, AsyncIterator, Dict, List, Optional, Union, Iterator
 from langchain_core.language_models.llms import LLM
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.outputs import ChatGeneration, ChatResult
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from pydantic import Field, PrivateAttr
 
+from src.llms.sse import aiter_sse_events, event_to_chunk, iter_sse_events
+from src.utils.http_client import arequest, get_async_client, get_sync_client, request
+
 logger = logging.getLogger(__name__)
 
 def get_doubao_api_key() -> str:
@@ -75,34 +79,33 @@ class DoubaoMultimodalLLM(BaseChatModel):
     def _llm_type(self) -> str:
         return "doubao_multimodal"
 
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
-        **kwargs: Any,
-    ) -> ChatResult:
-        """生成聊天响应"""
-        
-        # 转换消息格式
-        doubao_messages = self._convert_messages_to_doubao_format(messages)
-        
-        # 构建请求体
+    def _build_request(self, messages: List[BaseMessage], stop: Optional[List[str]], stream: bool) -> Dict:
+        """构建请求体"""
         request_data = {
             "model": self.model,
-            "messages": doubao_messages,
+            "messages": self._convert_messages_to_doubao_format(messages),
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
-            "stream": self.streaming
+            "stream": stream
         }
         
         # 添加停止词
         if stop:
             request_data["stop"] = stop
+        return request_data
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """生成聊天响应（streaming=True 时 LangChain 会改走 _stream）"""
         
         # 执行API调用
         try:
-            response_text = self._call_api(request_data)
+            response_text = self._call_api(self._build_request(messages, stop, stream=False))
             
             # 创建响应
             message = AIMessage(content=response_text)
@@ -117,6 +120,82 @@ class DoubaoMultimodalLLM(BaseChatModel):
             generation = ChatGeneration(message=error_message)
             return ChatResult(generations=[generation])
 
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """异步生成聊天响应，使用共享异步客户端，不占用线程池"""
+        
+        try:
+            response_text = await self._acall_api(self._build_request(messages, stop, stream=False))
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response_text))])
+            
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ 豆包API调用失败: {str(e)}")
+            error_message = AIMessage(content=f"豆包模型调用失败: {str(e)}")
+            return ChatResult(generations=[ChatGeneration(message=error_message)])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """流式生成：边读取服务端事件边产出增量"""
+        response = request(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            json=self._build_request(messages, stop, stream=True),
+            timeout=self.request_timeout,
+            retries=self.max_retries - 1,
+            stream=True,
+        )
+        try:
+            for event in iter_sse_events(response):
+                chunk = event_to_chunk(event)
+                if chunk is None:
+                    continue
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            response.close()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """异步流式生成；调用方取消（如客户端断开）时立即关闭连接"""
+        response = await arequest(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            json=self._build_request(messages, stop, stream=True),
+            timeout=self.request_timeout,
+            retries=self.max_retries - 1,
+            stream=True,
+        )
+        try:
+            async for event in aiter_sse_events(response):
+                chunk = event_to_chunk(event)
+                if chunk is None:
+                    continue
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            await response.aclose()
+
     def _convert_messages_to_doubao_format(self, messages: List[BaseMessage]) -> List[Dict]:
         """将LangChain消息格式转换为豆包API格式"""
         doubao_messages = []
@@ -187,6 +266,26 @@ class DoubaoMultimodalLLM(BaseChatModel):
                 "content": str(message.content)
             }
 
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> str:
+        """提取响应内容，状态码非 200 或格式错误时抛出 ValueError"""
+        if response.status_code == 200:
+            response_json = response.json()
+            
+            # 提取响应内容
+            if "choices" in response_json and len(response_json["choices"]) > 0:
+                content = response_json["choices"][0]["message"]["content"]
+                logger.info(f"✅ 豆包API调用成功，响应长度: {len(content)} 字符")
+                return content
+            else:
+                raise ValueError("API响应格式错误：缺少choices字段")
+                
+        else:
+            error_msg = f"API调用失败，状态码: {response.status_code}"
+            if response.text:
+                error_msg += f"，错误信息: {response.text}"
+            raise ValueError(error_msg)
+
     def _call_api(self, request_data: Dict) -> str:
         """调用豆包API"""
         url = f"{self.base_url}/chat/completions"
@@ -195,37 +294,22 @@ class DoubaoMultimodalLLM(BaseChatModel):
             try:
                 logger.info(f"🔄 豆包API调用 (尝试 {attempt + 1}/{self.max_retries})")
                 
-                response = requests.post(
+                # 自带重试循环，直接使用共享客户端，避免与统一重试叠加
+                response = get_sync_client().post(
                     url,
                     headers=self.headers,
                     json=request_data,
                     timeout=self.request_timeout
                 )
-                
-                if response.status_code == 200:
-                    response_json = response.json()
+                return self._parse_response(response)
                     
-                    # 提取响应内容
-                    if "choices" in response_json and len(response_json["choices"]) > 0:
-                        content = response_json["choices"][0]["message"]["content"]
-                        logger.info(f"✅ 豆包API调用成功，响应长度: {len(content)} 字符")
-                        return content
-                    else:
-                        raise ValueError("API响应格式错误：缺少choices字段")
-                        
-                else:
-                    error_msg = f"API调用失败，状态码: {response.status_code}"
-                    if response.text:
-                        error_msg += f"，错误信息: {response.text}"
-                    raise ValueError(error_msg)
-                    
-            except requests.exceptions.Timeout:
+            except httpx.TimeoutException:
                 logger.warning(f"⏰ 豆包API调用超时 (尝试 {attempt + 1}/{self.max_retries})")
                 if attempt == self.max_retries - 1:
                     raise ValueError(f"API调用超时，已重试{self.max_retries}次")
                 time.sleep(2 ** attempt)  # 指数退避
                 
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 logger.warning(f"🌐 豆包API网络错误: {str(e)} (尝试 {attempt + 1}/{self.max_retries})")
                 if attempt == self.max_retries - 1:
                     raise ValueError(f"网络连接错误: {str(e)}")
@@ -237,6 +321,39 @@ class DoubaoMultimodalLLM(BaseChatModel):
                     raise
                 time.sleep(1)
 
+    async def _acall_api(self, request_data: Dict) -> str:
+        """异步调用豆包API，重试策略与 _call_api 相同"""
+        url = f"{self.base_url}/chat/completions"
+        
+        for attempt in range(self.max_retries):
+            try:
+                logger.info(f"🔄 豆包API异步调用 (尝试 {attempt + 1}/{self.max_retries})")
+                response = await get_async_client().post(
+                    url,
+                    headers=self.headers,
+                    json=request_data,
+                    timeout=self.request_timeout
+                )
+                return self._parse_response(response)
+                
+            except httpx.TimeoutException:
+                logger.warning(f"⏰ 豆包API调用超时 (尝试 {attempt + 1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise ValueError(f"API调用超时，已重试{self.max_retries}次")
+                await asyncio.sleep(2 ** attempt)
+                
+            except httpx.HTTPError as e:
+                logger.warning(f"🌐 豆包API网络错误: {str(e)} (尝试 {attempt + 1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise ValueError(f"网络连接错误: {str(e)}")
+                await asyncio.sleep(2 ** attempt)
+                
+            except Exception as e:
+                logger.error(f"❌ 豆包API调用异常: {str(e)}")
+                if attempt == self.max_retries - 1:
+                    raise
+                await asyncio.sleep(1)
+
     def test_connection(self) -> bool:
         """测试API连接"""
         try:
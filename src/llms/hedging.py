@@ -0,0 +1,469 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+多模型对冲请求（hedged requests）
+
+主模型超过自身延迟的 p95（滚动窗口统计）仍未返回时，向一个等价模型再发一份同样的请求，
+采用先返回的合格结果并取消另一个。主模型直接失败时立即切换到等价模型。
+
+对冲会额外消耗 token，所以由 HedgeBudget 限额：每个请求积累 budget_ratio 个额度，
+一次对冲消耗 1 个，额外开销最多为请求量的 budget_ratio（默认 10%）。
+
+各个请求在脱离调用方回调的上下文中执行：在 LangGraph 节点中调用时，只有采用的结果
+会作为 HedgedChatModel 的输出推送给前端，被取消的请求的中间 token 不会流出。
+流式调用只对首个 token 做对冲（首 token 延迟单独统计），之后由胜出的模型继续流式输出。
+
+每次调用时按当前的滚动延迟重新排列等价模型；设置了每分钟请求数时，
+每个模型的请求都先经过该模型自己的共享限流器。
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables.config import var_child_runnable_config
+from pydantic import ConfigDict, Field
+
+from src.utils.rate_limiter import AsyncRateLimiter, get_rate_limiter, model_rate_limit_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HedgingSettings:
+    """conf.yaml 中 LLM_HEDGING 段的配置"""
+
+    enabled: bool = True
+    percentile: float = 95.0
+    window: int = 100
+    min_samples: int = 5
+    default_delay: float = 30.0
+    min_delay: float = 1.0
+    max_delay: float = 300.0
+    budget_ratio: float = 0.1
+    burst: float = 2.0
+    # 模型名 -> 可替代它的等价模型（按顺序尝试）
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+    # 通过 get_llm_for_agent 获取时启用对冲的 agent；需要 bind_tools/结构化输出的 agent 不能加入
+    agents: List[str] = field(default_factory=lambda: ["reporter"])
+
+    @classmethod
+    def from_dict(cls, values: Optional[Dict[str, Any]]) -> "HedgingSettings":
+        values = values or {}
+        known = {name: values[name] for name in cls.__dataclass_fields__ if name in values}
+        return cls(**known)
+
+
+class LatencyTracker:
+    """按模型记录最近 window 次成功请求的耗时"""
+
+    def __init__(self, window: int = 100):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model, ()))
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = list(self._samples.get(model, ()))
+        if not samples:
+            return None
+        return float(np.percentile(samples, q))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            models = {model: list(samples) for model, samples in self._samples.items()}
+        return {
+            model: {
+                "samples": len(samples),
+                "p50": round(float(np.percentile(samples, 50)), 3),
+                "p95": round(float(np.percentile(samples, 95)), 3),
+            }
+            for model, samples in models.items()
+            if samples
+        }
+
+
+class HedgeBudget:
+    """对冲额度：每个请求积累 ratio 个额度，最多存 burst 个，一次对冲消耗 1 个"""
+
+    def __init__(self, ratio: float = 0.1, burst: float = 2.0):
+        self.ratio = ratio
+        self.burst = max(burst, 1.0)
+        self._credits = 1.0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._credits = min(self.burst, self._credits + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._credits >= 1.0:
+                self._credits -= 1.0
+                return True
+            return False
+
+
+def _is_good(result: Any) -> bool:
+    """结果是否可以采用：消息需有非空内容，其余结果需为真值"""
+    if isinstance(result, BaseMessage):
+        return bool(str(result.content).strip())
+    if isinstance(result, dict) and "success" in result:
+        return bool(result["success"])
+    return bool(result)
+
+
+Attempt = Tuple[str, Callable[[], Awaitable[Any]]]
+
+# 流式调用的首 token 延迟使用单独的统计键，不与完整响应的延迟混在一起
+STREAM_KEY_PREFIX = "stream:"
+
+
+def _detached_context() -> contextvars.Context:
+    """不继承调用方 RunnableConfig（回调、流式处理器）的上下文"""
+    context = contextvars.copy_context()
+    context.run(var_child_runnable_config.set, None)
+    return context
+
+
+class HedgedRouter:
+    """按各模型的滚动延迟决定何时对冲，并统计对冲次数与胜出次数"""
+
+    def __init__(self, settings: Optional[HedgingSettings] = None):
+        self.settings = settings or HedgingSettings()
+        self.tracker = LatencyTracker(self.settings.window)
+        self.budget = HedgeBudget(self.settings.budget_ratio, self.settings.burst)
+        self._stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0, "budget_denied": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def deadline(self, key: str) -> float:
+        """key 对应模型开始对冲前的等待时间：样本足够时取 p95，否则取默认值"""
+        settings = self.settings
+        if self.tracker.count(key) < settings.min_samples:
+            delay = settings.default_delay
+        else:
+            delay = self.tracker.percentile(key, settings.percentile)
+        return min(max(delay, settings.min_delay), settings.max_delay)
+
+    def alternatives(self, model: str, candidates: Optional[Sequence[str]] = None, prefix: str = "") -> List[str]:
+        """
+        model 的等价模型，按 p95 由快到慢排列（没有样本的排在最后）
+
+        candidates 为 None 时使用 groups 中配置的等价模型；prefix 为延迟统计键的前缀。
+        """
+        names = candidates if candidates is not None else self.settings.groups.get(model, [])
+
+        def order(name: str):
+            key = prefix + name
+            return self.tracker.count(key) == 0, self.tracker.percentile(key, self.settings.percentile) or 0.0
+
+        return sorted((m for m in names if m != model), key=order)
+
+    async def _timed(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        limiter: Optional[AsyncRateLimiter] = None,
+        accept: Callable[[Any], bool] = _is_good,
+    ) -> Any:
+        if limiter is not None:
+            await limiter.acquire()
+        start = time.perf_counter()
+        result = await call()
+        if accept(result):
+            self.tracker.record(key, time.perf_counter() - start)
+        return result
+
+    async def run(
+        self,
+        attempts: Sequence[Attempt],
+        accept: Callable[[Any], bool] = _is_good,
+        limiters: Optional[Dict[str, AsyncRateLimiter]] = None,
+    ) -> Tuple[Any, str]:
+        """
+        执行 attempts[0]，必要时对冲到后续的等价请求
+
+        Args:
+            attempts: (延迟统计键, 发起请求的协程工厂) 列表，第一个为主请求
+            accept: 判断结果是否可以采用
+            limiters: 延迟统计键 -> 限流器；每个请求发出前先获取自己模型的令牌
+
+        Returns:
+            (采用的结果, 对应的键)；全部失败时抛出最后一个异常
+        """
+        if not attempts:
+            raise ValueError("没有可用的模型")
+        self._count("requests")
+        self.budget.record_request()
+
+        primary = attempts[0][0]
+        remaining = list(attempts)
+        running: Dict[asyncio.Task, str] = {}
+        started: Dict[asyncio.Task, float] = {}
+        last_error: Optional[BaseException] = None
+        may_hedge = True
+
+        def launch() -> None:
+            key, call = remaining.pop(0)
+            limiter = (limiters or {}).get(key)
+            task = asyncio.create_task(self._timed(key, call, limiter, accept), context=_detached_context())
+            running[task] = key
+            started[task] = time.perf_counter()
+
+        launch()
+        try:
+            while running:
+                timeout = self.deadline(primary) if may_hedge and remaining else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    may_hedge = False
+                    if self.budget.try_acquire():
+                        self._count("hedged")
+                        logger.info(f"⏱️ {primary} 超过 {timeout:.1f}秒未返回，对冲到 {remaining[0][0]}")
+                        launch()
+                    else:
+                        self._count("budget_denied")
+                        logger.info(f"⏱️ {primary} 超时但对冲额度已用完，继续等待")
+                    continue
+
+                for task in done:
+                    key = running.pop(task)
+                    if task.exception() is None and accept(task.result()):
+                        if key != primary:
+                            self._count("hedge_wins")
+                            logger.info(f"🏁 对冲请求 {key} 先返回，取消 {primary}")
+                        # 被取消的请求记录截尾样本（真实耗时至少为此），否则 p95 只来自快的请求而不断下降
+                        now = time.perf_counter()
+                        for loser, loser_key in running.items():
+                            self.tracker.record(loser_key, now - started[loser])
+                        return task.result(), key
+                    last_error = task.exception() or ValueError(f"{key} 返回了不合格的结果")
+                    logger.warning(f"⚠️ {key} 请求失败: {last_error}")
+
+                if not running and remaining:
+                    self._count("failovers")
+                    logger.info(f"🔀 切换到等价模型 {remaining[0][0]}")
+                    launch()
+            raise last_error
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def ainvoke(
+        self,
+        models: Sequence[Tuple[str, Any]],
+        input: Any,
+        limiters: Optional[Dict[str, AsyncRateLimiter]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Any, str]:
+        """对 (模型名, Runnable) 列表做对冲调用，返回 (结果, 采用的模型名)"""
+        attempts = [(name, (lambda model=model: model.ainvoke(input, **kwargs))) for name, model in models]
+        return await self.run(attempts, limiters=limiters)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        return {**stats, "latency": self.tracker.snapshot()}
+
+
+async def _open_stream(model: BaseChatModel, messages: List[BaseMessage], **kwargs: Any) -> Tuple[list, Any]:
+    """开始流式调用并读到首个有内容的块，返回 (已读取的块, 流)；流提前结束时流为 None"""
+    stream = model.astream(messages, **kwargs)
+    chunks = []
+    try:
+        async for chunk in stream:
+            chunks.append(chunk)
+            if str(chunk.content).strip():
+                return chunks, stream
+    except BaseException:
+        # 被取消（对冲失败的一方）或出错时关闭流，释放底层连接
+        await stream.aclose()
+        raise
+    return chunks, None
+
+
+class HedgedChatModel(BaseChatModel):
+    """
+    把主模型和等价模型包装成一个聊天模型，异步调用经 HedgedRouter 对冲
+
+    models 的第一个为主模型，其余为候选的等价模型，每次调用时按当前延迟由快到慢排列。
+    同步调用只使用主模型；bind_tools 与结构化输出不受支持。
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    models: List[Tuple[str, BaseChatModel]]
+    router: Any = Field(exclude=True)
+    # 每个模型每分钟的请求数上限，None 表示不限流
+    requests_per_minute: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "hedged"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"models": [name for name, _ in self.models]}
+
+    def with_rate_limit(self, requests_per_minute: Optional[float]) -> "HedgedChatModel":
+        """返回按模型分别限流的副本（各模型使用自己的共享限流器）"""
+        return self.model_copy(update={"requests_per_minute": requests_per_minute})
+
+    def _ordered_models(self, prefix: str = "") -> List[Tuple[str, BaseChatModel]]:
+        """主模型在前，等价模型按 prefix 对应的当前延迟由快到慢排列"""
+        primary_name, primary = self.models[0]
+        candidates = dict(self.models[1:])
+        return [(primary_name, primary)] + [
+            (name, candidates[name]) for name in self.router.alternatives(primary_name, list(candidates), prefix)
+        ]
+
+    def _limiters(self, models: Sequence[Tuple[str, BaseChatModel]], prefix: str = "") -> Optional[Dict[str, AsyncRateLimiter]]:
+        if not self.requests_per_minute:
+            return None
+        return {
+            prefix + name: get_rate_limiter(model_rate_limit_key(model), self.requests_per_minute)
+            for name, model in models
+        }
+
+    @staticmethod
+    def _result(message: BaseMessage) -> ChatResult:
+        if not isinstance(message, AIMessage):
+            message = AIMessage(content=message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return self._result(self.models[0][1].invoke(messages, stop=stop, **kwargs))
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        models = self._ordered_models()
+        message, _ = await self.router.ainvoke(
+            models, messages, limiters=self._limiters(models), stop=stop, **kwargs
+        )
+        return self._result(message)
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """只对首个 token 做对冲，之后从胜出的模型继续流式输出"""
+        models = self._ordered_models(STREAM_KEY_PREFIX)
+        attempts = [
+            (STREAM_KEY_PREFIX + name, (lambda model=model: _open_stream(model, messages, stop=stop, **kwargs)))
+            for name, model in models
+        ]
+        (chunks, stream), _ = await self.router.run(
+            attempts,
+            accept=lambda opened: any(str(chunk.content).strip() for chunk in opened[0]),
+            limiters=self._limiters(models, STREAM_KEY_PREFIX),
+        )
+
+        async def emit(message: BaseMessage) -> ChatGenerationChunk:
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=message.content))
+            if run_manager:
+                await run_manager.on_llm_new_token(str(message.content), chunk=chunk)
+            return chunk
+
+        try:
+            for message in chunks:
+                yield await emit(message)
+            if stream is not None:
+                async for message in stream:
+                    yield await emit(message)
+        finally:
+            if stream is not None:
+                await stream.aclose()
+
+
+# ----------------------------------------------------------------------
+# 进程内共享的对冲路由
+# ----------------------------------------------------------------------
+
+_router: Optional[HedgedRouter] = None
+_router_initialized = False
+_router_lock = threading.Lock()
+
+
+def create_hedged_router(settings: Optional[dict] = None) -> Optional[HedgedRouter]:
+    """
+    根据 conf.yaml 的 LLM_HEDGING 段创建对冲路由
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+
+    Returns:
+        HedgedRouter，配置为禁用时返回 None
+    """
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("LLM_HEDGING") or {}
+
+    hedging = HedgingSettings.from_dict(settings)
+    if not hedging.enabled:
+        logger.info("⏱️ 多模型对冲请求已禁用")
+        return None
+    logger.info(
+        f"⏱️ 多模型对冲请求已启用，p{hedging.percentile:g} 延迟触发，额外请求上限 {hedging.budget_ratio:.0%}"
+    )
+    return HedgedRouter(hedging)
+
+
+def get_hedged_router() -> Optional[HedgedRouter]:
+    """获取进程内共享的对冲路由（首次调用时创建）"""
+    global _router, _router_initialized
+    if not _router_initialized:
+        with _router_lock:
+            if not _router_initialized:
+                _router = create_hedged_router()
+                _router_initialized = True
+    return _router
+
+
+def set_hedged_router(router: Optional[HedgedRouter]) -> None:
+    """替换共享的对冲路由（传入 None 表示禁用对冲）"""
+    global _router, _router_initialized
+    with _router_lock:
+        _router = router
+        _router_initialized = True
@@ -3,30 +3,58 @@
 
 import logging
 from pathlib import Path
-from langchain.cache import InMemoryCache
-from langchain.globals import set_llm_cache
+from typing import Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 
+from src.config.agents import AGENT_LLM_MAP
 from src.config.configuration import load_yaml_config
+from src.utils.async_guard import check_blocking_call
 from .doubao_llm import DoubaoLLM
+from .hedging import HedgedChatModel, get_hedged_router
+from .llm_cache import CachedStreamMixin, get_response_cache
 
 logger = logging.getLogger(__name__)
 
 # --- Global LLM Cache ---
 _llm_cache = {}
-# Initialize cache
-set_llm_cache(InMemoryCache())
+# Per-agent views of the cached models, carrying each agent's response cache policy
+_agent_llms = {}
+
+def clear_llm_cache(agent: Optional[str] = None):
+    """
+    Clears cached model instances so they are re-initialized.
 
-def clear_llm_cache():
-    """Clears the LLM cache to re-initialize models."""
+    Cached responses are kept (they live in the LLM response cache, see src/llms/llm_cache.py);
+    pass an agent type to also drop that agent's cached responses.
+    """
     global _llm_cache
     _llm_cache.clear()
-    set_llm_cache(InMemoryCache())  # Reset the cache
+    _agent_llms.clear()
+    if agent is not None and get_response_cache() is not None:
+        get_response_cache().clear(agent)
     logger.info("🔄 LLM cache has been cleared. Models will be re-initialized.")
 
+class GuardedChatOpenAI(CachedStreamMixin, ChatOpenAI):
+    """
+    ChatOpenAI that reports synchronous calls made from a running event loop.
+
+    Streamed calls use the model's response cache as well (see CachedStreamMixin).
+    """
+
+    def _generate(self, *args, **kwargs):
+        check_blocking_call(f"{self.model_name}.invoke")
+        return super()._generate(*args, **kwargs)
+
+    def _stream(self, *args, **kwargs):
+        check_blocking_call(f"{self.model_name}.stream")
+        return super()._stream(*args, **kwargs)
+
+
 def _create_openai_compatible_chat_model(model_name, api_key, base_url, temperature, max_tokens, streaming):
     """Creates and returns an OpenAI-compatible chat model instance."""
-    return ChatOpenAI(
+    return GuardedChatOpenAI(
         model_name=model_name,
         openai_api_key=api_key,
         openai_api_base=base_url,
@@ -37,14 +65,17 @@ def _create_openai_compatible_chat_model(model_name, api_key, base_url, temperat
         },
     )
 
+def _load_conf() -> dict:
+    conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+    return load_yaml_config(conf_path)
+
 def get_llm_by_type(llm_type: str, force_refresh: bool = False) -> ChatOpenAI:
     """
     Gets an LLM instance by type from conf.yaml. Returns a cached instance if available.
     """
     global _llm_cache
     if llm_type not in _llm_cache or force_refresh:
-        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
-        conf = load_yaml_config(conf_path)
+        conf = _load_conf()
         
         model_config = conf.get("llm", {}).get(llm_type)
         if not model_config:
@@ -67,8 +98,7 @@ def get_vision_llm(force_refresh: bool = False) -> DoubaoLLM:
     """Gets or creates a Doubao vision language model instance."""
     global _llm_cache
     if "vision_llm" not in _llm_cache or force_refresh:
-        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
-        conf = load_yaml_config(conf_path)
+        conf = _load_conf()
         
         doubao_config_yaml = conf.get("llm", {}).get("doubao")
         if not doubao_config_yaml:
@@ -80,3 +110,85 @@ def get_vision_llm(force_refresh: bool = False) -> DoubaoLLM:
         _llm_cache["vision_llm"] = DoubaoLLM(doubao_config_yaml)
         
     return _llm_cache["vision_llm"]
+
+def is_multi_model_enabled() -> bool:
+    """Whether MULTI_MODEL.enabled is set in conf.yaml."""
+    return bool((_load_conf().get("MULTI_MODEL") or {}).get("enabled", False))
+
+def get_all_available_models() -> list:
+    """
+    Names of the models configured under the ``llm`` section of conf.yaml,
+    restricted to MULTI_MODEL.models when that list is given.
+    """
+    conf = _load_conf()
+    configured = list((conf.get("llm") or {}).keys())
+    selected = (conf.get("MULTI_MODEL") or {}).get("models")
+    return [name for name in selected if name in configured] if selected else configured
+
+def get_llm_by_model_name(model_name: str, force_refresh: bool = False) -> ChatOpenAI:
+    """Gets an LLM by its name in the ``llm`` section of conf.yaml."""
+    return get_llm_by_type(model_name, force_refresh)
+
+def with_generation_params(llm: BaseChatModel, **params) -> BaseChatModel:
+    """
+    Returns a view of ``llm`` carrying its own generation parameters (max_tokens, temperature, ...).
+
+    The shared instance is never modified: the view is a shallow copy that reuses its HTTP
+    client, so concurrent calls with different parameters are safe. Parameters that are
+    model fields are set on the copy; the rest, and any already present in ``model_kwargs``
+    (where max_tokens lives for OpenAI-compatible models), go into a new ``model_kwargs`` dict.
+    ``None`` values are ignored.
+    """
+    update = {}
+    model_kwargs = dict(getattr(llm, "model_kwargs", None) or {})
+    for name, value in params.items():
+        if value is None:
+            continue
+        if name in type(llm).model_fields and name not in model_kwargs:
+            update[name] = value
+        else:
+            model_kwargs[name] = value
+    if "model_kwargs" in type(llm).model_fields:
+        update["model_kwargs"] = model_kwargs
+    return llm.model_copy(update=update)
+
+def _agent_view(agent_type: str, llm: ChatOpenAI) -> ChatOpenAI:
+    store = get_response_cache()
+    cache = store.for_agent(agent_type) if store is not None else None
+    return llm.model_copy(update={"cache": cache if cache is not None else False})
+
+def _hedged_view(agent_type: str, llm_type: str, primary: ChatOpenAI):
+    """Wraps the agent's model with its equivalent models when hedging is configured for it."""
+    router = get_hedged_router()
+    if router is None or agent_type not in router.settings.agents:
+        return primary
+    models = [(llm_type, primary)]
+    # Candidates are ranked by latency on every call, so keep all configured equivalents here
+    for name in router.settings.groups.get(llm_type, []):
+        if name == llm_type:
+            continue
+        try:
+            models.append((name, _agent_view(agent_type, get_llm_by_type(name))))
+        except Exception as e:
+            logger.warning(f"⚠️ Hedge model '{name}' for {agent_type} is unavailable: {e}")
+    if len(models) == 1:
+        return primary
+    return HedgedChatModel(models=models, router=router, cache=False)
+
+def get_llm_for_agent(agent_type: str, force_refresh: bool = False) -> ChatOpenAI:
+    """
+    Gets the LLM for an agent type via AGENT_LLM_MAP, with the agent's response cache policy applied.
+
+    Agents whose policy enables caching share a copy of the model (same HTTP client) whose
+    ``cache`` is that agent's view of the response cache; all other agents get a copy with
+    caching switched off, so their output is never replayed.
+
+    Agents listed in LLM_HEDGING.agents whose model has equivalent models configured get a
+    HedgedChatModel instead (see src/llms/hedging.py).
+    """
+    llm_type = AGENT_LLM_MAP[agent_type]
+    llm = get_llm_by_type(llm_type, force_refresh)
+    cached = _agent_llms.get(agent_type)
+    if cached is None or cached[0] is not llm:
+        _agent_llms[agent_type] = (llm, _hedged_view(agent_type, llm_type, _agent_view(agent_type, llm)))
+    return _agent_llms[agent_type][1]
@@ -0,0 +1,469 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+LLM 响应缓存
+
+取代全局的 InMemoryCache：
+- 内存 LRU 在前（按条目数和字节数双重限制），SQLite 磁盘存储在后，带 TTL，进程重启后依然有效
+- 按 agent 类型决定是否缓存及 TTL：默认策略在 src/config/agents.py 的 AGENT_CACHE_POLICY 中，
+  与 AGENT_LLM_MAP 并列，可被 conf.yaml 覆盖；未列出的 agent（reporter 等自由写作）从不缓存
+- 流式调用同样命中缓存：命中时按块回放，未命中时边转发边累积，完整结束后写入
+- 按 agent 统计命中率、节省的字节数和 token 数，可通过 /api/llm/cache/metrics 查看
+- 清理可以只针对某个 agent，不影响其他 agent 的缓存
+
+通过 conf.yaml 的 LLM_CACHE 段配置：
+
+```yaml
+LLM_CACHE:
+  enabled: true
+  path: ./data/llm_cache.sqlite   # 留空则只使用内存缓存
+  memory_max_entries: 256
+  memory_max_mb: 64
+  agents:                         # 覆盖 AGENT_CACHE_POLICY，值为 TTL 小时数，0 表示不缓存
+    planner: 24
+```
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps
+from langchain_core.messages import (
+    AIMessageChunk,
+    message_chunk_to_message,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk
+
+logger = logging.getLogger(__name__)
+
+# 回放流式响应时每块的字符数
+REPLAY_CHUNK_CHARS = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_agent ON llm_cache(agent);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache(expires_at);
+"""
+
+
+def _serialize(generations: Sequence[ChatGeneration]) -> str:
+    return json.dumps(
+        [
+            {"message": message_to_dict(g.message), "generation_info": g.generation_info}
+            for g in generations
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _deserialize(payload: str) -> List[ChatGeneration]:
+    items = json.loads(payload)
+    messages = messages_from_dict([item["message"] for item in items])
+    return [
+        ChatGeneration(message=message, generation_info=item.get("generation_info"))
+        for message, item in zip(messages, items)
+    ]
+
+
+def _is_cacheable(generations: Sequence[Any]) -> bool:
+    """截断（finish_reason == "length"）或空的响应不缓存"""
+    if not generations:
+        return False
+    for generation in generations:
+        if not isinstance(generation, ChatGeneration):
+            return False
+        if (generation.generation_info or {}).get("finish_reason") == "length":
+            return False
+        message = generation.message
+        if not message.content and not getattr(message, "tool_calls", None):
+            return False
+    return True
+
+
+def _tokens(generations: Sequence[ChatGeneration]) -> int:
+    total = 0
+    for generation in generations:
+        usage = getattr(generation.message, "usage_metadata", None) or {}
+        total += usage.get("total_tokens", 0)
+    return total
+
+
+class LLMResponseCache:
+    """内存 LRU + SQLite 磁盘两级 LLM 响应缓存，按 agent 统计"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        memory_max_entries: int = 256,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+    ):
+        self.path = str(path) if path else None
+        self.memory_max_entries = max(1, int(memory_max_entries))
+        self.memory_max_bytes = max(1, int(memory_max_bytes))
+        self.ttl_seconds = {agent: ttl for agent, ttl in (ttl_seconds or {}).items() if ttl and ttl > 0}
+
+        self._lock = threading.RLock()
+        # key -> (agent, expires_at, payload)
+        self._memory: "OrderedDict[str, Tuple[str, float, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # 策略
+    # ------------------------------------------------------------------
+
+    def is_enabled_for(self, agent: str) -> bool:
+        return agent in self.ttl_seconds
+
+    def for_agent(self, agent: str) -> Optional["AgentLLMCache"]:
+        """返回某个 agent 的缓存视图；该 agent 不缓存时返回 None"""
+        return AgentLLMCache(self, agent) if self.is_enabled_for(agent) else None
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def _count(self, agent: str, field: str, amount: int = 1) -> None:
+        stats = self._metrics.setdefault(
+            agent,
+            {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "bytes_saved": 0, "tokens_saved": 0},
+        )
+        stats[field] += amount
+
+    def metrics(self) -> Dict[str, Any]:
+        """按 agent 返回命中率、节省的字节数和 token 数"""
+        with self._lock:
+            agents = {}
+            for agent, stats in self._metrics.items():
+                hits = stats["memory_hits"] + stats["disk_hits"]
+                total = hits + stats["misses"]
+                agents[agent] = {**stats, "hit_rate": round(hits / total, 4) if total else 0.0}
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_path": self.path,
+                "policy_ttl_hours": {agent: ttl / 3600 for agent, ttl in self.ttl_seconds.items()},
+                "agents": agents,
+            }
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(agent: str, prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{agent}\x00{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, agent: str, key: str) -> Optional[List[ChatGeneration]]:
+        now = time.time()
+        with self._lock:
+            payload = None
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    payload, tier = entry[2], "memory_hits"
+                else:
+                    self._forget(key)
+
+            if payload is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        payload, tier = row[0], "disk_hits"
+                        self._remember(key, agent, row[1], payload)
+                    else:
+                        self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+            if payload is None:
+                self._count(agent, "misses")
+                return None
+            try:
+                generations = _deserialize(payload)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"⚠️ LLM缓存条目损坏，已忽略: {e}")
+                self._forget(key)
+                self._count(agent, "misses")
+                return None
+            self._count(agent, tier)
+            self._count(agent, "bytes_saved", len(payload.encode("utf-8")))
+            self._count(agent, "tokens_saved", _tokens(generations))
+            return generations
+
+    def set(self, agent: str, key: str, generations: Sequence[ChatGeneration]) -> None:
+        ttl = self.ttl_seconds.get(agent)
+        if not ttl or not _is_cacheable(generations):
+            return
+        payload = _serialize(generations)
+        now = time.time()
+        with self._lock:
+            self._remember(key, agent, now + ttl, payload)
+            self._count(agent, "stores")
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, agent, value, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, agent, payload, now, now + ttl),
+                )
+
+    def _remember(self, key: str, agent: str, expires_at: float, payload: str) -> None:
+        self._forget(key)
+        size = len(payload.encode("utf-8"))
+        if size > self.memory_max_bytes:
+            return
+        self._memory[key] = (agent, expires_at, payload)
+        self._memory_bytes += size
+        while len(self._memory) > self.memory_max_entries or self._memory_bytes > self.memory_max_bytes:
+            _, (_, _, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.encode("utf-8"))
+
+    def _forget(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[2].encode("utf-8"))
+
+    def purge_expired(self) -> int:
+        """删除磁盘中已过期的条目，返回删除数量"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            return self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def clear(self, agent: Optional[str] = None) -> None:
+        """清空缓存；指定 agent 时只清理该 agent 的条目"""
+        with self._lock:
+            if agent is None:
+                self._memory.clear()
+                self._memory_bytes = 0
+                self._metrics.clear()
+                if self._conn is not None:
+                    self._conn.execute("DELETE FROM llm_cache")
+                return
+            for key in [k for k, entry in self._memory.items() if entry[0] == agent]:
+                self._forget(key)
+            self._metrics.pop(agent, None)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache WHERE agent = ?", (agent,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class AgentLLMCache(BaseCache):
+    """某个 agent 的缓存视图，作为 BaseChatModel.cache 使用"""
+
+    def __init__(self, store: LLMResponseCache, agent: str):
+        self.store = store
+        self.agent = agent
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        return self.store.get(self.agent, self.store.make_key(self.agent, prompt, llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.store.set(self.agent, self.store.make_key(self.agent, prompt, llm_string), return_val)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear(self.agent)
+
+
+def _replay(generation: ChatGeneration) -> Iterator[ChatGenerationChunk]:
+    """把缓存的完整响应拆成流式块；工具调用和元数据放在最后一块"""
+    message = generation.message
+    content = message.content
+    pieces = (
+        [content[i:i + REPLAY_CHUNK_CHARS] for i in range(0, len(content), REPLAY_CHUNK_CHARS)] or [""]
+        if isinstance(content, str)
+        else [content]
+    )
+    tool_call_chunks = [
+        {"name": call["name"], "args": json.dumps(call["args"], ensure_ascii=False), "id": call["id"], "index": i}
+        for i, call in enumerate(getattr(message, "tool_calls", None) or [])
+    ]
+    additional_kwargs = {k: v for k, v in message.additional_kwargs.items() if k != "tool_calls"}
+    for i, piece in enumerate(pieces):
+        if i < len(pieces) - 1:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            continue
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content=piece,
+                additional_kwargs=additional_kwargs,
+                response_metadata=message.response_metadata,
+                tool_call_chunks=tool_call_chunks,
+            ),
+            generation_info=generation.generation_info,
+        )
+
+
+def _collect(chunks: List[ChatGenerationChunk]) -> Optional[ChatGeneration]:
+    if not chunks:
+        return None
+    merged = chunks[0]
+    for chunk in chunks[1:]:
+        merged = merged + chunk
+    return ChatGeneration(message=message_chunk_to_message(merged.message), generation_info=merged.generation_info)
+
+
+# ChatOpenAI 在 streaming=True 时由 _generate 内部调用 _stream，此时缓存已由 _generate_with_cache 处理
+_inside_generate: ContextVar[bool] = ContextVar("_inside_generate", default=False)
+
+
+class CachedStreamMixin:
+    """
+    让流式调用也使用模型的 AgentLLMCache
+
+    LangChain 只在 invoke/generate 路径上查询缓存；这个 mixin 在 _stream/_astream 中
+    查询同一个缓存，命中时回放，未命中时在完整结束后写入（中途取消的流不会写入）。
+    """
+
+    def _stream_cache(self, messages, stop, kwargs) -> Tuple[Optional[AgentLLMCache], str, str]:
+        cache = getattr(self, "cache", None)
+        if not isinstance(cache, AgentLLMCache) or _inside_generate.get():
+            return None, "", ""
+        return cache, dumps(messages), self._get_llm_string(stop=stop, **kwargs)
+
+    def _generate(self, *args, **kwargs):
+        token = _inside_generate.set(True)
+        try:
+            return super()._generate(*args, **kwargs)
+        finally:
+            _inside_generate.reset(token)
+
+    async def _agenerate(self, *args, **kwargs):
+        token = _inside_generate.set(True)
+        try:
+            return await super()._agenerate(*args, **kwargs)
+        finally:
+            _inside_generate.reset(token)
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        cache, prompt, llm_string = self._stream_cache(messages, stop, kwargs)
+        if cache is None:
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        cached = cache.lookup(prompt, llm_string)
+        if cached:
+            yield from _replay(cached[0])
+            return
+        chunks = []
+        for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        generation = _collect(chunks)
+        if generation is not None:
+            cache.update(prompt, llm_string, [generation])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        cache, prompt, llm_string = self._stream_cache(messages, stop, kwargs)
+        if cache is None:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        # 与 BaseCache.alookup 一样在线程中读写缓存（可能访问 SQLite），不阻塞事件循环
+        cached = await asyncio.to_thread(cache.lookup, prompt, llm_string)
+        if cached:
+            for chunk in _replay(cached[0]):
+                yield chunk
+            return
+        chunks = []
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        generation = _collect(chunks)
+        if generation is not None:
+            await asyncio.to_thread(cache.update, prompt, llm_string, [generation])
+
+
+_response_cache: Optional[LLMResponseCache] = None
+_response_cache_initialized = False
+_response_cache_lock = threading.Lock()
+
+
+def create_response_cache(settings: Optional[dict] = None) -> Optional[LLMResponseCache]:
+    """
+    根据 conf.yaml 的 LLM_CACHE 段和 AGENT_CACHE_POLICY 创建响应缓存
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+
+    Returns:
+        LLMResponseCache，配置为禁用时返回 None
+    """
+    from src.config.agents import AGENT_CACHE_POLICY
+
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("LLM_CACHE") or {}
+
+    if not settings.get("enabled", True):
+        logger.info("🧠 LLM响应缓存已禁用")
+        return None
+
+    policy = {**AGENT_CACHE_POLICY, **(settings.get("agents") or {})}
+    cache = LLMResponseCache(
+        settings.get("path", "./data/llm_cache.sqlite"),
+        memory_max_entries=settings.get("memory_max_entries", 256),
+        memory_max_bytes=int(settings.get("memory_max_mb", 64) * 1024 * 1024),
+        ttl_seconds={agent: (hours or 0) * 3600 for agent, hours in policy.items()},
+    )
+    logger.info(
+        f"🧠 LLM响应缓存已启用，磁盘存储: {cache.path or '无（仅内存）'}，"
+        f"缓存的agent: {', '.join(sorted(cache.ttl_seconds)) or '无'}"
+    )
+    return cache
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """获取进程内共享的LLM响应缓存（首次调用时创建）"""
+    global _response_cache, _response_cache_initialized
+    if not _response_cache_initialized:
+        with _response_cache_lock:
+            if not _response_cache_initialized:
+                _response_cache = create_response_cache()
+                _response_cache_initialized = True
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[LLMResponseCache]) -> None:
+    """替换共享的LLM响应缓存（传入 None 表示禁用缓存）"""
+    global _response_cache, _response_cache_initialized
+    with _response_cache_lock:
+        _response_cache = cache
+        _response_cache_initialized = True
@@ -3,18 +3,19 @@ MiniMax自定义LLM实现
 处理MiniMax API的特殊响应格式
 """
 
-from typing import Any, Dict, List, Optional, Sequence, Union, Iterator
-import requests
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Iterator
+import httpx
 import json
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage, AIMessageChunk
-from langchain_core.outputs import ChatGeneration, ChatResult, LLMResult
-from langchain_core.callbacks.manager import CallbackManagerForLLMRun
-from langchain_core.runnables.config import RunnableConfig
-from langchain_core.language_models.base import LanguageModelInput
+from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.callbacks.manager import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from langchain_core.tools import BaseTool
 from langchain_core.runnables import Runnable
 
+from src.llms.sse import aiter_sse_events, event_to_chunk, iter_sse_events
+from src.utils.http_client import arequest, request
+
 
 class MiniMaxChatModel(BaseChatModel):
     """
@@ -81,49 +82,74 @@ class MiniMaxChatModel(BaseChatModel):
         
         return minimax_messages
     
-    def _call_minimax_api(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """直接调用MiniMax API"""
-        url = f"{self.base_url}/chat/completions"
-        
-        headers = {
+    @property
+    def _url(self) -> str:
+        return f"{self.base_url}/chat/completions"
+
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        data = {
+
+    def _payload(self, messages: List[BaseMessage], stream: bool) -> Dict[str, Any]:
+        return {
             "model": self.model,
-            "messages": messages,
+            "messages": self._convert_messages_to_minimax_format(messages),
             "max_tokens": self.max_tokens,
             "temperature": self.temperature,
-            "stream": False
+            "stream": stream
         }
+
+    def _parse_response(self, response: httpx.Response) -> Dict[str, Any]:
+        """把 MiniMax 的各种响应格式统一为 OpenAI 格式"""
+        print(f"   HTTP状态码: {response.status_code}")
         
-        print(f"🔧 MiniMax API调用:")
-        print(f"   URL: {url}")
-        print(f"   Model: {self.model}")
-        print(f"   消息数量: {len(messages)}")
-        
-        try:
-            response = requests.post(url, headers=headers, json=data, timeout=self.timeout)
-            print(f"   HTTP状态码: {response.status_code}")
+        if response.status_code == 200:
+            result = response.json()
+            print(f"   响应结构: {list(result.keys())}")
+            
+            # 检查标准OpenAI格式的choices
+            if result.get('choices') and len(result.get('choices', [])) > 0:
+                print(f"   ✅ 标准格式响应")
+                return result
+            
+            # 检查MiniMax特有的base_resp格式
+            base_resp = result.get('base_resp', {})
+            if base_resp.get('status_code') == 0:  # 成功状态码
+                # 尝试从base_resp中提取内容
+                if 'output' in base_resp or 'reply' in base_resp:
+                    print(f"   ✅ MiniMax格式响应，进行格式转换")
+                    # 转换为标准格式
+                    content = base_resp.get('output', base_resp.get('reply', ''))
+                    return {
+                        'choices': [{
+                            'message': {
+                                'role': 'assistant',
+                                'content': content
+                            },
+                            'finish_reason': 'stop'
+                        }],
+                        'usage': result.get('usage', {}),
+                        'model': self.model
+                    }
+            
+            # 如果都没有，检查是否有错误信息
+            if base_resp.get('status_code') and base_resp.get('status_code') != 0:
+                error_msg = base_resp.get('status_msg', '未知错误')
+                print(f"   ❌ API错误: {base_resp.get('status_code')} - {error_msg}")
+                raise Exception(f"MiniMax API错误: {error_msg}")
+            
+            # 如果响应格式完全不符合预期，尝试直接使用响应内容
+            print(f"   ⚠️ 未知响应格式，尝试解析: {json.dumps(result, ensure_ascii=False)[:200]}...")
             
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   响应结构: {list(result.keys())}")
-                
-                # 检查标准OpenAI格式的choices
-                if result.get('choices') and len(result.get('choices', [])) > 0:
-                    print(f"   ✅ 标准格式响应")
-                    return result
-                
-                # 检查MiniMax特有的base_resp格式
-                base_resp = result.get('base_resp', {})
-                if base_resp.get('status_code') == 0:  # 成功状态码
-                    # 尝试从base_resp中提取内容
-                    if 'output' in base_resp or 'reply' in base_resp:
-                        print(f"   ✅ MiniMax格式响应，进行格式转换")
-                        # 转换为标准格式
-                        content = base_resp.get('output', base_resp.get('reply', ''))
+            # 尝试从其他可能的字段中提取内容
+            for possible_key in ['text', 'content', 'response', 'answer', 'result']:
+                if possible_key in result:
+                    content = result[possible_key]
+                    if isinstance(content, str) and content.strip():
+                        print(f"   ✅ 从{possible_key}字段提取内容")
                         return {
                             'choices': [{
                                 'message': {
@@ -131,63 +157,46 @@ class MiniMaxChatModel(BaseChatModel):
                                     'content': content
                                 },
                                 'finish_reason': 'stop'
-                            }],
-                            'usage': result.get('usage', {}),
-                            'model': self.model
+                            }]
                         }
-                
-                # 如果都没有，检查是否有错误信息
-                if base_resp.get('status_code') and base_resp.get('status_code') != 0:
-                    error_msg = base_resp.get('status_msg', '未知错误')
-                    print(f"   ❌ API错误: {base_resp.get('status_code')} - {error_msg}")
-                    raise Exception(f"MiniMax API错误: {error_msg}")
-                
-                # 如果响应格式完全不符合预期，尝试直接使用响应内容
-                print(f"   ⚠️ 未知响应格式，尝试解析: {json.dumps(result, ensure_ascii=False)[:200]}...")
-                
-                # 尝试从其他可能的字段中提取内容
-                for possible_key in ['text', 'content', 'response', 'answer', 'result']:
-                    if possible_key in result:
-                        content = result[possible_key]
-                        if isinstance(content, str) and content.strip():
-                            print(f"   ✅ 从{possible_key}字段提取内容")
-                            return {
-                                'choices': [{
-                                    'message': {
-                                        'role': 'assistant',
-                                        'content': content
-                                    },
-                                    'finish_reason': 'stop'
-                                }]
-                            }
-                
-                raise Exception(f"无法解析MiniMax响应格式: {result}")
             
-            else:
-                error_text = response.text
-                print(f"   ❌ HTTP错误: {error_text[:200]}...")
-                raise Exception(f"MiniMax API HTTP错误 {response.status_code}: {error_text}")
-                
-        except requests.RequestException as e:
+            raise Exception(f"无法解析MiniMax响应格式: {result}")
+        
+        else:
+            error_text = response.text
+            print(f"   ❌ HTTP错误: {error_text[:200]}...")
+            raise Exception(f"MiniMax API HTTP错误 {response.status_code}: {error_text}")
+
+    def _log_call(self, payload: Dict[str, Any]) -> None:
+        print(f"🔧 MiniMax API调用:")
+        print(f"   URL: {self._url}")
+        print(f"   Model: {self.model}")
+        print(f"   消息数量: {len(payload['messages'])}")
+
+    def _call_minimax_api(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """直接调用MiniMax API"""
+        payload = self._payload(messages, stream=False)
+        self._log_call(payload)
+        try:
+            response = request("POST", self._url, headers=self._headers, json=payload, timeout=self.timeout)
+        except httpx.HTTPError as e:
             print(f"   ❌ 请求异常: {e}")
             raise Exception(f"MiniMax API请求失败: {e}")
-    
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
-        **kwargs: Any,
-    ) -> ChatResult:
-        """生成聊天响应"""
-        
-        # 转换消息格式
-        minimax_messages = self._convert_messages_to_minimax_format(messages)
-        
-        # 调用API
-        response_data = self._call_minimax_api(minimax_messages)
-        
-        # 解析响应
+        return self._parse_response(response)
+
+    async def _acall_minimax_api(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        """异步调用MiniMax API，使用共享异步客户端"""
+        payload = self._payload(messages, stream=False)
+        self._log_call(payload)
+        try:
+            response = await arequest("POST", self._url, headers=self._headers, json=payload, timeout=self.timeout)
+        except httpx.HTTPError as e:
+            print(f"   ❌ 请求异常: {e}")
+            raise Exception(f"MiniMax API请求失败: {e}")
+        return self._parse_response(response)
+
+    @staticmethod
+    def _to_chat_result(response_data: Dict[str, Any]) -> ChatResult:
         choices = response_data.get('choices', [])
         if not choices:
             raise ValueError("MiniMax API响应中没有choices字段")
@@ -198,40 +207,79 @@ class MiniMaxChatModel(BaseChatModel):
             content = message_data.get('content', '')
             
             ai_message = AIMessage(content=content)
-            generation = ChatGeneration(message=ai_message)
+            generation = ChatGeneration(
+                message=ai_message,
+                generation_info={"finish_reason": choice.get('finish_reason')},
+            )
             generations.append(generation)
         
-        # 返回结果
         return ChatResult(generations=generations)
+    
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """生成聊天响应"""
+        return self._to_chat_result(self._call_minimax_api(messages))
 
-    def stream(
+    async def _agenerate(
         self,
-        input: Union[List[BaseMessage], LanguageModelInput],
-        config: Optional[RunnableConfig] = None,
-        *,
+        messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
-    ) -> Iterator[AIMessageChunk]:
-        """
-        实现流式输出，但由于MiniMax不支持真正的流式，
-        这里模拟流式输出以提高用户体验
-        """
-        print("🔧 MiniMax不支持流式输出，使用模拟流式模式")
-        
-        # 首先获取完整响应
-        result = self.invoke(input, config=config, stop=stop, **kwargs)
-        
-        # 将响应内容分块模拟流式输出
-        content = result.content
-        chunk_size = 50  # 每块字符数
-        
-        for i in range(0, len(content), chunk_size):
-            chunk_content = content[i:i + chunk_size]
-            yield AIMessageChunk(content=chunk_content)
-            
-            # 添加小延迟模拟流式效果
-            import time
-            time.sleep(0.05)
+    ) -> ChatResult:
+        """异步生成聊天响应"""
+        return self._to_chat_result(await self._acall_minimax_api(messages))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        """真正的流式输出：MiniMax 以 SSE 返回增量，收到即产出"""
+        payload = self._payload(messages, stream=True)
+        self._log_call(payload)
+        response = request("POST", self._url, headers=self._headers, json=payload, timeout=self.timeout, stream=True)
+        try:
+            for event in iter_sse_events(response):
+                chunk = event_to_chunk(event)
+                if chunk is None:
+                    continue
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            response.close()
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        """异步流式输出；调用方取消（如客户端断开）时立即关闭连接"""
+        payload = self._payload(messages, stream=True)
+        self._log_call(payload)
+        response = await arequest(
+            "POST", self._url, headers=self._headers, json=payload, timeout=self.timeout, stream=True
+        )
+        try:
+            async for event in aiter_sse_events(response):
+                chunk = event_to_chunk(event)
+                if chunk is None:
+                    continue
+                if run_manager:
+                    await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+        finally:
+            await response.aclose()
     
     @property
     def _identifying_params(self) -> Dict[str, Any]:
@@ -0,0 +1,106 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+OpenAI 兼容的流式 chat/completions 响应解析
+
+豆包、MiniMax 的流式接口都以 server-sent events 返回，每个事件是
+``data: {"choices": [{"delta": {...}}]}``，以 ``data: [DONE]`` 结束。
+这里边读边解析，每收到一个增量就产出一个 ChatGenerationChunk，首个 token 不必等整段响应。
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+import httpx
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+_DONE = object()
+
+
+class StreamError(Exception):
+    """流式接口返回错误（HTTP 状态码非 200，或事件中带有错误信息）"""
+
+
+def _parse_line(line: str) -> Any:
+    """解析一行 SSE；返回事件 JSON、_DONE，非 data 行返回 None"""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data:
+        return None
+    if data == "[DONE]":
+        return _DONE
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError as e:
+        raise StreamError(f"无法解析流式事件: {data[:200]}") from e
+
+
+def _check_event(event: Dict[str, Any]) -> None:
+    if event.get("error"):
+        raise StreamError(f"流式接口返回错误: {event['error']}")
+    base_resp = event.get("base_resp") or {}
+    if base_resp.get("status_code"):
+        raise StreamError(f"流式接口返回错误: {base_resp.get('status_code')} - {base_resp.get('status_msg', '')}")
+
+
+def _status_error(response: httpx.Response, body: bytes) -> StreamError:
+    return StreamError(
+        f"API调用失败，状态码: {response.status_code}，错误信息: {body.decode('utf-8', errors='replace')[:500]}"
+    )
+
+
+def iter_sse_events(response: httpx.Response) -> Iterator[Dict[str, Any]]:
+    """逐个产出流式响应中的事件 JSON"""
+    if response.status_code != 200:
+        raise _status_error(response, response.read())
+    for line in response.iter_lines():
+        event = _parse_line(line)
+        if event is _DONE:
+            return
+        if event is not None:
+            _check_event(event)
+            yield event
+
+
+async def aiter_sse_events(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """iter_sse_events 的异步版本"""
+    if response.status_code != 200:
+        raise _status_error(response, await response.aread())
+    async for line in response.aiter_lines():
+        event = _parse_line(line)
+        if event is _DONE:
+            return
+        if event is not None:
+            _check_event(event)
+            yield event
+
+
+def event_to_chunk(event: Dict[str, Any]) -> Optional[ChatGenerationChunk]:
+    """
+    把一个事件转换为 ChatGenerationChunk
+
+    只读取 choices[0].delta；有的服务（如 MiniMax）会在最后一个事件里附带完整的
+    message，这里忽略它以免内容重复。finish_reason 和 usage 放进 generation_info。
+    """
+    choices = event.get("choices") or []
+    choice = choices[0] if choices else {}
+    delta = choice.get("delta") or {}
+    content = delta.get("content") or ""
+    finish_reason = choice.get("finish_reason")
+    usage = event.get("usage")
+    if not content and not finish_reason and not usage:
+        return None
+
+    generation_info = {}
+    if finish_reason:
+        generation_info["finish_reason"] = finish_reason
+    if usage:
+        generation_info["usage"] = usage
+    response_metadata = {"finish_reason": finish_reason} if finish_reason else {}
+    return ChatGenerationChunk(
+        message=AIMessageChunk(content=content, response_metadata=response_metadata),
+        generation_info=generation_info or None,
+    )
@@ -2,8 +2,12 @@
 # SPDX-License-Identifier: MIT
 
 import logging
+from typing import AsyncIterator, Dict, Optional
 
 from src.podcast.graph.state import PodcastState
+from src.podcast.graph.tts_node import synthesize_lines_in_order
+from src.podcast.types import Script
+from src.tools.tts import VolcengineTTS
 
 logger = logging.getLogger(__name__)
 
@@ -14,3 +18,27 @@ def audio_mixer_node(state: PodcastState):
     combined_audio = b"".join(audio_chunks)
     logger.info("The podcast audio is now ready.")
     return {"output": combined_audio}
+
+
+async def stream_podcast_audio(
+    script: Script,
+    max_concurrency: Optional[int] = None,
+    clients: Optional[Dict[str, VolcengineTTS]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Streaming counterpart of audio_mixer_node.
+
+    MP3 chunks can be concatenated frame by frame, so each line's audio is
+    forwarded to the client as soon as it and all lines before it are ready,
+    without joining the episode in memory. Pass ``clients`` created with
+    ``create_tts_clients`` up front to surface configuration errors before
+    the response starts.
+    """
+    logger.info("Streaming podcast audio...")
+    line_count = 0
+    async for chunk in synthesize_lines_in_order(
+        script.lines, clients, max_concurrency=max_concurrency
+    ):
+        line_count += 1
+        yield chunk
+    logger.info(f"The podcast audio stream is complete ({line_count} lines).")
@@ -1,36 +1,94 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import base64
 import logging
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional, Sequence
 
 from src.podcast.graph.state import PodcastState
+from src.podcast.types import ScriptLine
 from src.tools.tts import VolcengineTTS
 
 logger = logging.getLogger(__name__)
 
+VOICE_TYPES = {"male": "BV002_streaming", "female": "BV001_streaming"}
+
 
 def tts_node(state: PodcastState):
     logger.info("Generating audio chunks for podcast...")
-    tts_client = _create_tts_client()
-    for line in state["script"].lines:
-        tts_client.voice_type = (
-            "BV002_streaming" if line.speaker == "male" else "BV001_streaming"
-        )
-        result = tts_client.text_to_speech(line.paragraph, speed_ratio=1.05)
-        if result["success"]:
-            audio_data = result["audio_data"]
-            audio_chunk = base64.b64decode(audio_data)
-            state["audio_chunks"].append(audio_chunk)
-        else:
-            logger.error(result["error"])
+    lines = state["script"].lines
+    clients = create_tts_clients()
+    # Lines are synthesized concurrently; map() keeps the script order.
+    with ThreadPoolExecutor(max_workers=_get_tts_concurrency()) as executor:
+        chunks = list(executor.map(lambda line: _synthesize_line(clients, line), lines))
     return {
-        "audio_chunks": state["audio_chunks"],
+        "audio_chunks": [chunk for chunk in chunks if chunk is not None],
     }
 
 
-def _create_tts_client():
+async def synthesize_lines_in_order(
+    lines: Sequence[ScriptLine],
+    clients: Optional[Dict[str, VolcengineTTS]] = None,
+    max_concurrency: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Synthesize script lines concurrently and yield audio in script order.
+
+    At most ``max_concurrency`` lines are in flight or buffered ahead of the
+    next line to be yielded, so memory stays bounded regardless of episode
+    length and the first chunk is available as soon as the first line is done.
+    """
+    clients = clients or create_tts_clients()
+    window = max_concurrency or _get_tts_concurrency()
+    pending: deque[asyncio.Task] = deque()
+    next_index = 0
+
+    def schedule_next():
+        nonlocal next_index
+        line = lines[next_index]
+        next_index += 1
+        pending.append(
+            asyncio.create_task(asyncio.to_thread(_synthesize_line, clients, line))
+        )
+
+    try:
+        while next_index < len(lines) and len(pending) < window:
+            schedule_next()
+        while pending:
+            chunk = await pending.popleft()
+            if next_index < len(lines):
+                schedule_next()
+            if chunk is not None:
+                yield chunk
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _synthesize_line(clients: Dict[str, VolcengineTTS], line: ScriptLine) -> Optional[bytes]:
+    client = clients.get(line.speaker, clients["female"])
+    result = client.text_to_speech(line.paragraph, speed_ratio=1.05)
+    if not result["success"]:
+        logger.error(result["error"])
+        return None
+    return base64.b64decode(result["audio_data"])
+
+
+def _get_tts_concurrency() -> int:
+    return max(1, int(os.getenv("VOLCENGINE_TTS_CONCURRENCY", "4")))
+
+
+def create_tts_clients() -> Dict[str, VolcengineTTS]:
+    """
+    Create one client per speaker voice; all of them use the shared pooled HTTP client.
+
+    Raises if the Volcengine TTS credentials are not configured, so callers can
+    validate the configuration before starting a stream.
+    """
     app_id = os.getenv("VOLCENGINE_TTS_APPID", "")
     if not app_id:
         raise Exception("VOLCENGINE_TTS_APPID is not set")
@@ -38,10 +96,12 @@ def _create_tts_client():
     if not access_token:
         raise Exception("VOLCENGINE_TTS_ACCESS_TOKEN is not set")
     cluster = os.getenv("VOLCENGINE_TTS_CLUSTER", "volcano_tts")
-    voice_type = "BV001_streaming"
-    return VolcengineTTS(
-        appid=app_id,
-        access_token=access_token,
-        cluster=cluster,
-        voice_type=voice_type,
-    )
+    return {
+        speaker: VolcengineTTS(
+            appid=app_id,
+            access_token=access_token,
+            cluster=cluster,
+            voice_type=voice_type,
+        )
+        for speaker, voice_type in VOICE_TYPES.items()
+    }
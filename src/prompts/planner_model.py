@@ -24,6 +24,13 @@ class Step(BaseModel):
     execution_res: Optional[str] = Field(
         default=None, description="The Step execution result"
     )
+    depends_on: Optional[List[int]] = Field(
+        default=None,
+        description=(
+            "0-based indices of earlier steps this step needs; omit to wait for all "
+            "previous steps, [] if it can run in parallel with them"
+        ),
+    )
 
 
 class Plan(BaseModel):
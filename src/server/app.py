@@ -30,10 +30,13 @@ from fastapi.staticfiles import StaticFiles
 from langchain_core.messages import AIMessageChunk, ToolMessage, BaseMessage
 from langgraph.types import Command
 
-from src.graph.builder import build_graph_with_memory
-from src.podcast.graph.builder import build_graph as build_podcast_graph
-from src.ppt.graph.builder import build_graph as build_ppt_graph
-from src.prose.graph.builder import build_graph as build_prose_graph
+from src.server.graph_registry import WorkerPoolBusyError, graph_registry
+from src.server.jobs_api import (
+    generate_podcast_audio,
+    generate_ppt_file,
+    write_podcast_script,
+    router as jobs_router,
+)
 from src.server.chat_request import (
     ChatMessage,
     ChatRequest,
@@ -47,7 +50,20 @@ from src.server.chat_request import (
 )
 from src.server.mcp_request import MCPServerMetadataRequest, MCPServerMetadataResponse
 from src.server.mcp_utils import load_mcp_tools
+from src.crawler import shutdown_extraction_pool
 from src.tools import VolcengineTTS
+from src.tools.search_cache import get_search_cache
+from src.llms.llm_cache import get_response_cache
+from src.llms.hedging import get_hedged_router
+from src.utils.http_client import (
+    aclose_async_client,
+    aprewarm,
+    close_sync_client,
+    get_http_metrics,
+    prewarm,
+)
+from src.podcast.graph.audio_mixer_node import stream_podcast_audio
+from src.podcast.graph.tts_node import create_tts_clients
 from src.server.batch_report_api import include_batch_report_routes
 from src.server.batch_api import router as batch_router
 
@@ -87,7 +103,39 @@ else:
 # 本地语音识别配置（不依赖外部服务器）
 USE_LOCAL_SPEECH_RECOGNITION = True
 
-graph = build_graph_with_memory()
+# 🔧 所有工作流图只编译一次，由注册表在各请求间共享
+graph = graph_registry.get("research")
+
+
+@app.on_event("startup")
+async def warm_up_graphs():
+    """启动时预编译播客、PPT、润色等工作流图，避免首个请求承担编译开销"""
+    await asyncio.to_thread(graph_registry.warm_up)
+
+
+# 启动时创建的后台任务，保留引用以免被回收，关闭服务时取消
+_startup_tasks: set = set()
+
+
+@app.on_event("startup")
+async def prewarm_http_clients():
+    """后台预热共享HTTP客户端与 HTTP_CLIENT.prewarm_hosts 中配置的连接，不阻塞服务启动"""
+    for coro in (aprewarm(), asyncio.to_thread(prewarm)):
+        task = asyncio.create_task(coro)
+        _startup_tasks.add(task)
+        task.add_done_callback(_startup_tasks.discard)
+
+
+@app.on_event("shutdown")
+async def shutdown_graph_workers():
+    for task in list(_startup_tasks):
+        task.cancel()
+    await asyncio.gather(*_startup_tasks, return_exceptions=True)
+    graph_registry.shutdown()
+    await aclose_async_client()
+    close_sync_client()
+    shutdown_extraction_pool()
+
 
 # 在app创建后添加分批报告路由
 include_batch_report_routes(app)
@@ -95,6 +143,9 @@ include_batch_report_routes(app)
 # 添加分批输出管理器API路由
 app.include_router(batch_router)
 
+# 添加后台生成任务API路由
+app.include_router(jobs_router)
+
 # 添加增强报告管理API路由
 try:
     from src.server.enhanced_report_api import router as report_router
@@ -686,31 +737,44 @@ async def text_to_speech(request: TTSRequest):
 @app.post("/api/podcast/generate")
 async def generate_podcast(request: GeneratePodcastRequest):
     try:
-        report_content = request.content
-        print(report_content)
-        workflow = build_podcast_graph()
-        final_state = workflow.invoke({"input": report_content})
-        audio_bytes = final_state["output"]
+        audio_bytes = await generate_podcast_audio(request.content)
         return Response(content=audio_bytes, media_type="audio/mp3")
+    except WorkerPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.exception(f"Error occurred during podcast generation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/podcast/stream")
+async def stream_podcast(request: GeneratePodcastRequest):
+    """Stream podcast audio line by line as soon as the leading lines are synthesized."""
+    # 流式响应开始后无法再返回错误状态码，TTS 配置必须在生成脚本和开始响应之前校验
+    try:
+        clients = create_tts_clients()
+    except Exception as e:
+        logger.error(f"❌ 播客语音合成未配置: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    try:
+        script = await write_podcast_script(request.content)
+    except WorkerPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Error occurred during podcast script generation: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(stream_podcast_audio(script, clients=clients), media_type="audio/mp3")
+
+
 @app.post("/api/ppt/generate")
 async def generate_ppt(request: GeneratePPTRequest):
     try:
-        report_content = request.content
-        print(report_content)
-        workflow = build_ppt_graph()
-        final_state = workflow.invoke({"input": report_content})
-        generated_file_path = final_state["generated_file_path"]
-        with open(generated_file_path, "rb") as f:
-            ppt_bytes = f.read()
+        ppt_bytes = await generate_ppt_file(request.content)
         return Response(
             content=ppt_bytes,
             media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
         )
+    except WorkerPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.exception(f"Error occurred during ppt generation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -720,7 +784,7 @@ async def generate_ppt(request: GeneratePPTRequest):
 async def generate_prose(request: GenerateProseRequest):
     try:
         logger.info(f"Generating prose for prompt: {request.prompt}")
-        workflow = build_prose_graph()
+        workflow = graph_registry.get("prose")
         events = workflow.astream(
             {
                 "content": request.prompt,
@@ -856,6 +920,39 @@ async def merge_report_sections(request: ReportMergeRequest):
         raise HTTPException(status_code=500, detail=f"合并报告失败: {str(e)}")
 
 
+@app.get("/api/search/cache/metrics")
+async def search_cache_metrics():
+    """返回共享搜索缓存的命中/未命中统计"""
+    cache = get_search_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.metrics()}
+
+
+@app.get("/api/llm/cache/metrics")
+async def llm_cache_metrics():
+    """返回LLM响应缓存按agent统计的命中率、节省的字节数和token数"""
+    cache = get_response_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.metrics()}
+
+
+@app.get("/api/llm/hedging/metrics")
+async def llm_hedging_metrics():
+    """返回多模型对冲请求的次数、胜出次数和各模型的滚动延迟"""
+    router = get_hedged_router()
+    if router is None:
+        return {"enabled": False}
+    return {"enabled": True, **router.metrics()}
+
+
+@app.get("/api/http/metrics")
+async def http_client_metrics():
+    """返回共享HTTP客户端按主机统计的请求数、错误数和延迟"""
+    return get_http_metrics()
+
+
 @app.get("/api/report/download/{report_name}")
 async def download_report(report_name: str, base_dir: str = "./outputs/reports"):
     """
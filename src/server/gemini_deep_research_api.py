@@ -14,7 +14,7 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from src.llms.llm import get_llm_by_type
-from src.graph.builder import build_graph_with_memory
+from src.server.graph_registry import graph_registry
 from src.server.chat_request import ChatMessage
 
 logger = logging.getLogger(__name__)
@@ -196,8 +196,8 @@ async def execute_deep_research(research_id: str, request: DeepResearchRequest):
         session["current_stage"] = "Gemini 2.5 Pro 深度分析中"
         session["progress"] = 30
         
-        # 构建图并执行
-        graph = build_graph_with_memory()
+        # 复用已编译的研究工作流图
+        graph = graph_registry.get("research")
         thread_id = f"deep_research_{research_id}"
         
         result_content = ""
@@ -0,0 +1,303 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+已编译图注册表与后台任务管理
+
+- GraphRegistry：每个工作流图只编译一次，所有请求共享同一个编译结果；
+  同步工作流（播客、PPT）在有界线程池中执行，不阻塞事件循环
+- JobManager：长时间生成任务以 job 形式提交，客户端通过 job_id 轮询或流式获取状态
+
+线程池大小等参数可在 conf.yaml 的 WORKER_POOL 段配置：
+
+```yaml
+WORKER_POOL:
+  max_workers: 4        # 同步工作流的最大并行数
+  max_pending: 32       # 排队 + 运行中的最大任务数，超过后返回 503
+  job_ttl_seconds: 3600 # 已完成任务结果的保留时间
+```
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from src.config.loader import load_yaml_config
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPoolBusyError(RuntimeError):
+    """排队任务已满，拒绝新的任务"""
+
+
+class WorkerSlot:
+    """
+    线程池的一个排队名额
+
+    提交任务时预留，任务本身与它启动的每个线程池调用各持有一份引用；
+    全部释放后才归还（取消任务不会提前归还仍在线程中执行的名额）。
+    """
+
+    def __init__(self, registry: "GraphRegistry"):
+        self._registry = registry
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    def hold(self) -> None:
+        with self._lock:
+            self._refs += 1
+
+    def release(self, *_: Any) -> None:
+        with self._lock:
+            self._refs -= 1
+            free = self._refs == 0
+        if free:
+            self._registry._release_slot()
+
+
+# 当前后台任务预留的名额，任务内的 run_in_worker 调用使用它而不再另外预留
+_current_slot: contextvars.ContextVar[Optional[WorkerSlot]] = contextvars.ContextVar(
+    "graph_worker_slot", default=None
+)
+
+
+class GraphRegistry:
+    """编译一次、全局共享的工作流图注册表"""
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._graphs: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="graph-worker"
+        )
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """注册工作流图的构建函数（不会立即编译）"""
+        self._factories[name] = factory
+
+    def get(self, name: str):
+        """获取已编译的工作流图，首次访问时编译"""
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        with self._lock:
+            if name not in self._graphs:
+                if name not in self._factories:
+                    raise KeyError(f"未注册的工作流图: {name}")
+                start = time.perf_counter()
+                self._graphs[name] = self._factories[name]()
+                logger.info(
+                    f"📦 工作流图 '{name}' 编译完成，耗时 {time.perf_counter() - start:.2f}s"
+                )
+            return self._graphs[name]
+
+    def warm_up(self) -> None:
+        """启动时预编译所有已注册的工作流图"""
+        for name in list(self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                logger.error(f"❌ 预编译工作流图 '{name}' 失败: {e}")
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def reserve(self) -> WorkerSlot:
+        """预留一个名额；排队 + 运行中的任务已达上限时抛出 WorkerPoolBusyError"""
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                raise WorkerPoolBusyError(
+                    f"工作线程池繁忙（{self._pending}/{self.max_pending}），请稍后重试"
+                )
+            self._pending += 1
+        return WorkerSlot(self)
+
+    def _release_slot(self) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+
+    async def run_in_worker(self, func: Callable, *args: Any) -> Any:
+        """
+        在有界线程池中执行同步函数
+
+        在后台任务中调用时使用任务预留的名额，否则预留新名额（已满时抛出 WorkerPoolBusyError）。
+        名额在线程中的调用真正结束时才归还，调用方被取消不会提前归还。
+        """
+        slot = _current_slot.get()
+        if slot is None:
+            slot = self.reserve()
+        else:
+            slot.hold()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            slot.release()
+            raise
+        future.add_done_callback(slot.release)
+        return await asyncio.wrap_future(future)
+
+    async def invoke(self, name: str, graph_input: Dict[str, Any], config: Optional[dict] = None):
+        """在线程池中同步执行工作流图，适用于包含阻塞调用的工作流"""
+        graph = self.get(name)
+        return await self.run_in_worker(graph.invoke, graph_input, config)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class Job:
+    """后台生成任务"""
+
+    id: str
+    kind: str
+    status: str = "pending"  # pending | running | completed | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    media_type: Optional[str] = None
+    error: Optional[str] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "has_result": self.result is not None,
+            "media_type": self.media_type,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """管理后台任务的提交、状态查询和过期清理"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_jobs: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def submit(
+        self,
+        kind: str,
+        run: Callable[[], Awaitable[Any]],
+        media_type: Optional[str] = None,
+        slot: Optional[WorkerSlot] = None,
+    ) -> Job:
+        """
+        提交任务，返回 Job（立即返回，不等待执行完成）
+
+        Args:
+            slot: 提交时通过 GraphRegistry.reserve 预留的名额，任务及其线程池调用都结束后归还
+        """
+        self.cleanup()
+        job = Job(id=uuid.uuid4().hex, kind=kind, media_type=media_type)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._execute(job, run, slot))
+        if slot is not None:
+            # 用完成回调归还：任务在开始执行前被取消时也能归还
+            task.add_done_callback(slot.release)
+        self._tasks[job.id] = task
+        logger.info(f"📥 已提交{kind}任务: {job.id}")
+        return job
+
+    async def _execute(self, job: Job, run: Callable[[], Awaitable[Any]], slot: Optional[WorkerSlot] = None) -> None:
+        if slot is not None:
+            # 任务在自己的上下文副本中运行，这里的设置只影响本任务
+            _current_slot.set(slot)
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = await run()
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"❌ {job.kind}任务 {job.id} 执行失败: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.done.set()
+            self._tasks.pop(job.id, None)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """等待任务结束，超时后返回当前状态"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        task = self._tasks.get(job_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def cleanup(self) -> None:
+        """清理过期的已完成任务，并限制保留的任务总数"""
+        now = time.time()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at is not None),
+            key=lambda job: job.finished_at,
+        )
+        overflow = max(0, len(self._jobs) - self.max_jobs)
+        for index, job in enumerate(finished):
+            if index < overflow or now - job.finished_at > self.ttl_seconds:
+                del self._jobs[job.id]
+
+
+def _load_worker_pool_settings() -> Dict[str, Any]:
+    conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+    return load_yaml_config(conf_path).get("WORKER_POOL") or {}
+
+
+def _register_default_graphs(registry: GraphRegistry) -> None:
+    from src.graph.builder import build_graph_with_memory
+    from src.podcast.graph.builder import build_graph as build_podcast_graph
+    from src.ppt.graph.builder import build_graph as build_ppt_graph
+    from src.prose.graph.builder import build_graph as build_prose_graph
+
+    registry.register("research", build_graph_with_memory)
+    registry.register("podcast", build_podcast_graph)
+    registry.register("ppt", build_ppt_graph)
+    registry.register("prose", build_prose_graph)
+
+
+_settings = _load_worker_pool_settings()
+graph_registry = GraphRegistry(
+    max_workers=_settings.get("max_workers", 4),
+    max_pending=_settings.get("max_pending", 32),
+)
+_register_default_graphs(graph_registry)
+job_manager = JobManager(ttl_seconds=_settings.get("job_ttl_seconds", 3600))
@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+后台生成任务API
+
+长时间的播客/PPT生成以任务形式提交：提交后立即返回 job_id，
+客户端通过轮询 /api/jobs/{job_id}、等待 /api/jobs/{job_id}/result
+或订阅 /api/jobs/{job_id}/stream 获取结果，不再占用HTTP工作线程。
+"""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from src.server.chat_request import GeneratePodcastRequest, GeneratePPTRequest
+from src.server.graph_registry import WorkerPoolBusyError, graph_registry, job_manager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+PPT_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+async def generate_podcast_audio(report_content: str) -> bytes:
+    """在工作线程池中执行播客工作流，返回音频字节"""
+    final_state = await graph_registry.invoke("podcast", {"input": report_content})
+    return final_state["output"]
+
+
+async def write_podcast_script(report_content: str):
+    """在工作线程池中生成播客脚本，供流式音频接口使用"""
+    from src.podcast.graph.script_writer_node import script_writer_node
+
+    result = await graph_registry.run_in_worker(script_writer_node, {"input": report_content})
+    if result["script"] is None:
+        raise ValueError("播客脚本生成失败")
+    return result["script"]
+
+
+async def generate_ppt_file(report_content: str) -> bytes:
+    """在工作线程池中执行PPT工作流，返回PPT文件字节"""
+    final_state = await graph_registry.invoke("ppt", {"input": report_content})
+    return await asyncio.to_thread(Path(final_state["generated_file_path"]).read_bytes)
+
+
+def _submit(kind: str, run, media_type: str) -> dict:
+    # 在返回响应前同步预留名额，突发提交超出上限时直接返回 503，而不是之后在任务中失败
+    try:
+        slot = graph_registry.reserve()
+    except WorkerPoolBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        job = job_manager.submit(kind, run, media_type=media_type, slot=slot)
+    except BaseException:
+        slot.release()
+        raise
+    return job.to_dict()
+
+
+@router.post("/podcast")
+async def submit_podcast_job(request: GeneratePodcastRequest):
+    """提交播客生成任务"""
+    return _submit("podcast", lambda: generate_podcast_audio(request.content), "audio/mp3")
+
+
+@router.post("/ppt")
+async def submit_ppt_job(request: GeneratePPTRequest):
+    """提交PPT生成任务"""
+    return _submit("ppt", lambda: generate_ppt_file(request.content), PPT_MEDIA_TYPE)
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """查询任务状态"""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    return job.to_dict()
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(job_id: str, wait: float = 0):
+    """
+    获取任务结果
+
+    Args:
+        wait: 最多等待的秒数（长轮询），0 表示立即返回
+    """
+    job = await job_manager.wait(job_id, timeout=min(max(wait, 0), 300))
+    if job is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error or "任务执行失败")
+    if job.status != "completed":
+        return JSONResponse(status_code=202, content=job.to_dict())
+    return Response(content=job.result, media_type=job.media_type)
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: str, heartbeat: float = 5.0):
+    """以SSE流式推送任务状态，直到任务结束"""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+
+    async def events():
+        last_status = None
+        job = job_manager.get(job_id)
+        while job is not None:
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+            else:
+                yield ": heartbeat\n\n"
+            if job.done.is_set():
+                return
+            job = await job_manager.wait(job_id, timeout=heartbeat)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """取消任务（已在工作线程中执行的同步步骤会继续占用名额，直到该步骤结束）"""
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="任务不存在或已过期")
+    return {"job_id": job_id, "cancelled": job_manager.cancel(job_id)}
+
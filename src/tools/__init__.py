@@ -3,7 +3,8 @@
 
 import os
 
-from .crawl import crawl_tool
+from .crawl import batch_crawl_tool, crawl_tool
+from .literature_corpus import literature_corpus_tool
 from .python_repl import python_repl_tool
 from .search import get_web_search_tool, get_pubmed_search_tool, get_google_scholar_search_tool
 from .google_scholar_search import GoogleScholarSearchTool
@@ -11,6 +12,8 @@ from .tts import VolcengineTTS
 
 __all__ = [
     "crawl_tool",
+    "batch_crawl_tool",
+    "literature_corpus_tool",
     "python_repl_tool",
     "get_web_search_tool",
     "get_pubmed_search_tool",
@@ -5,9 +5,10 @@ import logging
 import re
 from typing import Dict, List, Optional
 
-import httpx
 from langchain_community.utilities import ArxivAPIWrapper as OriginalArxivAPIWrapper
 
+from src.utils.http_client import request
+
 logger = logging.getLogger(__name__)
 
 def is_chinese(text: str) -> bool:
@@ -32,7 +33,7 @@ def translate_to_english(text: str) -> str:
         }
         
         # 发送请求
-        response = httpx.post(url, data=params, timeout=10.0)
+        response = request("POST", url, data=params, timeout=10.0)
         data = response.json()
         
         # 提取翻译结果
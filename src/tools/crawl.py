@@ -1,28 +1,99 @@
 # Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
 # SPDX-License-Identifier: MIT
 
+import asyncio
 import logging
-from typing import Annotated
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, List
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool, tool
 from .decorators import log_io
 
 from src.crawler import Crawler
+from src.crawler.document_store import get_document_store
 
 logger = logging.getLogger(__name__)
 
+# 批量抓取的默认总耗时上限（秒），超时后返回已完成的页面
+BATCH_CRAWL_DEADLINE = 90.0
+# 每页默认返回的 Markdown 字符数
+CRAWL_PAGE_CHARS = 1000
+# 单次读取的最大字符数
+CRAWL_MAX_LIMIT = 8000
+
+
+def _read_page(article, offset: int = 0, limit: int = CRAWL_PAGE_CHARS) -> dict:
+    """从已提取的文档中读取一页正文，只转换到这一页所需的位置"""
+    offset = max(0, offset)
+    limit = max(1, min(limit, CRAWL_MAX_LIMIT))
+    content, next_offset = article.read_markdown(offset, limit)
+    page = {"url": article.url, "title": article.title, "offset": offset, "crawled_content": content}
+    if next_offset is not None:
+        page["next_offset"] = next_offset
+    return page
+
 
 @tool
 @log_io
 def crawl_tool(
     url: Annotated[str, "The url to crawl."],
+    offset: Annotated[int, "Character offset to start reading from; use next_offset from a previous call to read more."] = 0,
+    limit: Annotated[int, "Maximum number of characters to return."] = CRAWL_PAGE_CHARS,
 ) -> str:
-    """Use this to crawl a url and get a readable content in markdown format."""
+    """Use this to crawl a url and get a readable content in markdown format.
+    Long pages are returned in parts: call again with the returned next_offset to continue reading
+    without re-fetching the page."""
     try:
-        crawler = Crawler()
-        article = crawler.crawl(url)
-        return {"url": url, "crawled_content": article.to_markdown()[:1000]}
+        store = get_document_store()
+        article = store.get(url)
+        if article is None:
+            article = Crawler().crawl(url)
+            store.put(url, article)
+        return _read_page(article, offset, limit)
     except BaseException as e:
         error_msg = f"Failed to crawl. Error: {repr(e)}"
         logger.error(error_msg)
         return error_msg
+
+
+async def _acrawl_many(
+    urls: Annotated[List[str], "The urls to crawl."],
+) -> list:
+    store = get_document_store()
+    articles = {url: store.get(url) for url in dict.fromkeys(urls)}
+    missing = [url for url, article in articles.items() if article is None]
+    result = await Crawler().crawl_many(missing, deadline=BATCH_CRAWL_DEADLINE)
+    for url, article in result.articles.items():
+        store.put(url, article)
+        articles[url] = article
+
+    # HTML 解析和 Markdown 转换是 CPU 密集型操作，在线程中进行，不阻塞事件循环
+    pages = list(await asyncio.gather(
+        *(asyncio.to_thread(_read_page, article) for article in articles.values() if article is not None)
+    ))
+    pages.extend({"url": url, "error": error} for url, error in result.errors.items())
+    pages.extend({"url": url, "error": "timed out"} for url in result.timed_out)
+    return pages
+
+
+def _crawl_many(
+    urls: Annotated[List[str], "The urls to crawl."],
+) -> list:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_acrawl_many(urls))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(lambda: asyncio.run(_acrawl_many(urls))).result()
+
+
+batch_crawl_tool = StructuredTool.from_function(
+    func=log_io(_crawl_many),
+    coroutine=log_io(_acrawl_many),
+    name="batch_crawl_tool",
+    description=(
+        "Use this to crawl several urls at once and get their readable content in markdown format. "
+        "Prefer it over calling crawl_tool repeatedly when you need more than one page. "
+        "Use crawl_tool with next_offset to read further into a page."
+    ),
+)
@@ -3,7 +3,10 @@
 
 import logging
 import functools
-from typing import Any, Callable, Type, TypeVar
+import inspect
+from typing import Any, Callable, ClassVar, Optional, Type, TypeVar
+
+from src.tools.search_cache import CachedToolMixin
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +24,30 @@ def log_io(func: Callable) -> Callable:
         The wrapped function with input/output logging
     """
 
-    @functools.wraps(func)
-    def wrapper(*args: Any, **kwargs: Any) -> Any:
-        # Log input parameters
-        func_name = func.__name__
+    func_name = func.__name__
+
+    def log_input(args: tuple, kwargs: dict) -> None:
         params = ", ".join(
             [*(str(arg) for arg in args), *(f"{k}={v}" for k, v in kwargs.items())]
         )
         logger.info(f"Tool {func_name} called with parameters: {params}")
 
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            log_input(args, kwargs)
+            result = await func(*args, **kwargs)
+            logger.info(f"Tool {func_name} returned: {result}")
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # Log input parameters
+        log_input(args, kwargs)
+
         # Execute the function
         result = func(*args, **kwargs)
 
@@ -62,19 +80,30 @@ class LoggedToolMixin:
         return result
 
 
-def create_logged_tool(base_tool_class: Type[T]) -> Type[T]:
+def create_logged_tool(
+    base_tool_class: Type[T], cache_engine: Optional[str] = None
+) -> Type[T]:
     """
     Factory function to create a logged version of any tool class.
 
     Args:
         base_tool_class: The original tool class to be enhanced with logging
+        cache_engine: If set, results are served from the shared search cache
+            under this engine name (see src/tools/search_cache.py)
 
     Returns:
         A new class that inherits from both LoggedToolMixin and the base tool class
     """
 
-    class LoggedTool(LoggedToolMixin, base_tool_class):
-        pass
+    if cache_engine is None:
+
+        class LoggedTool(LoggedToolMixin, base_tool_class):
+            pass
+
+    else:
+
+        class LoggedTool(LoggedToolMixin, CachedToolMixin, base_tool_class):
+            search_cache_engine: ClassVar[Optional[str]] = cache_engine
 
     # Set a more descriptive name for the class
     LoggedTool.__name__ = f"Logged{base_tool_class.__name__}"
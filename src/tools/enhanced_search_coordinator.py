@@ -19,6 +19,7 @@ from .search import (
     LoggedGoogleScholarSearch,
     LoggedDuckDuckGoSearch
 )
+from src.utils.literature_dedup import deduplicate_literature
 
 logger = logging.getLogger(__name__)
 
@@ -261,25 +262,8 @@ class EnhancedSearchCoordinator:
         return sorted_results[:strategy.max_results_per_engine * len(strategy.engines)]
     
     def deduplicate_results(self, results: List[SearchResult]) -> List[SearchResult]:
-        """结果去重"""
-        seen_urls = set()
-        seen_titles = set()
-        unique_results = []
-        
-        for result in results:
-            # 基于URL去重
-            if result.url and result.url in seen_urls:
-                continue
-            # 基于标题去重（考虑相似性）
-            title_key = result.title.lower().strip()
-            if title_key and title_key in seen_titles:
-                continue
-                
-            seen_urls.add(result.url)
-            seen_titles.add(title_key)
-            unique_results.append(result)
-        
-        return unique_results
+        """结果去重：URL/DOI、标题指纹和近似标题匹配"""
+        return deduplicate_literature(results)
     
     async def enhanced_search(self, query: str, context: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """增强搜索主入口"""
@@ -16,6 +16,7 @@ from .search import (
     get_pubmed_search_tool, 
     get_google_scholar_search_tool
 )
+from .literature_record import LiteratureRecords
 from .journal_quality_controller import (
     journal_quality_controller,
     JournalTier,
@@ -191,10 +192,10 @@ class JournalAwareSearchEngine:
                 try:
                     # 根据引擎类型创建搜索工具
                     if task['engine'] == 'google_scholar':
-                        search_tool = get_google_scholar_search_tool()
+                        search_tool = get_google_scholar_search_tool(return_records=True)
                         future = executor.submit(search_tool.run, task['query'])
                     elif task['engine'] == 'pubmed':
-                        search_tool = get_pubmed_search_tool()
+                        search_tool = get_pubmed_search_tool(return_records=True)
                         future = executor.submit(search_tool.run, task['query'])
                     else:  # general/tavily
                         search_tool = get_web_search_tool(max_results // len(search_tasks))
@@ -228,59 +229,21 @@ class JournalAwareSearchEngine:
         parsed_results = []
         
         try:
-            if task['engine'] == 'google_scholar':
-                # Google Scholar 返回的是字符串格式
-                if isinstance(raw_result, str) and raw_result.strip():
-                    # 简单解析 Google Scholar 结果
-                    lines = raw_result.split('\n')
-                    current_paper = {}
-                    
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('Title: '):
-                            if current_paper:
-                                parsed_results.append(current_paper)
-                            current_paper = {
-                                'title': line.replace('Title: ', ''),
-                                'source': 'google_scholar',
-                                'journal_source': task['journal'],
-                                'content': ''
-                            }
-                        elif line.startswith('Authors: '):
-                            current_paper['authors'] = line.replace('Authors: ', '')
-                        elif line.startswith('Summary: '):
-                            current_paper['content'] = line.replace('Summary: ', '')
-                        elif line.startswith('URL: '):
-                            current_paper['url'] = line.replace('URL: ', '')
-                    
-                    if current_paper:
-                        parsed_results.append(current_paper)
-            
-            elif task['engine'] == 'pubmed':
-                # PubMed 返回格式化的字符串
-                if isinstance(raw_result, str) and 'Result' in raw_result:
-                    # 解析 PubMed 结果
-                    entries = raw_result.split('Result ')
-                    for entry in entries[1:]:  # 跳过第一个空条目
-                        result_dict = {
-                            'source': 'pubmed',
-                            'journal_source': task['journal'],
-                            'title': '',
-                            'content': '',
-                            'url': ''
-                        }
-                        
-                        lines = entry.split('\n')
-                        for line in lines:
-                            if line.strip().startswith('Title: '):
-                                result_dict['title'] = line.replace('Title: ', '').strip()
-                            elif line.strip().startswith('Abstract Snippet: '):
-                                result_dict['content'] = line.replace('Abstract Snippet: ', '').strip()
-                            elif line.strip().startswith('URL: '):
-                                result_dict['url'] = line.replace('URL: ', '').strip()
-                        
-                        if result_dict['title']:
-                            parsed_results.append(result_dict)
+            if isinstance(raw_result, LiteratureRecords):
+                # PubMed / Google Scholar 以结构化记录返回
+                for record in raw_result:
+                    if not record.title:
+                        continue
+                    result_dict = {
+                        'title': record.title,
+                        'content': record.abstract or record.published,
+                        'url': record.url,
+                        'source': task['engine'],
+                        'journal_source': task['journal'],
+                    }
+                    if record.authors:
+                        result_dict['authors'] = record.authors
+                    parsed_results.append(result_dict)
             
             elif isinstance(raw_result, list):
                 # Tavily/通用搜索返回列表格式
@@ -3,14 +3,109 @@
 
 import os
 import logging
-from typing import Any, Dict, Optional
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
 
+import httpx
 from langchain_core.tools import BaseTool
-from langchain_core.callbacks import CallbackManagerForToolRun
-from langchain_community.utilities.google_scholar import GoogleScholarAPIWrapper
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForToolRun,
+    CallbackManagerForToolRun,
+)
+
+from src.tools.literature_corpus import aremember_papers, remember_papers
+from src.tools.literature_record import LiteratureRecord, LiteratureRecords, parse_year
+from src.utils.http_client import get_async_client, get_sync_client
 
 logger = logging.getLogger(__name__)
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+# SerpAPI 的 Google Scholar 引擎单页最多返回20条结果
+SCHOLAR_PAGE_SIZE = 20
+
+_DOI_IN_LINK = re.compile(r"10\.\d{4,9}/[^\s?#]+")
+# SerpAPI 的密钥放在查询参数里，错误信息中的 URL 需要脱敏
+_API_KEY_PARAM = re.compile(r"(api_key=)[^&\s'\"]+")
+
+
+def redact_api_key(text: str) -> str:
+    """去掉文本（异常信息、URL）中的 api_key 参数值"""
+    return _API_KEY_PARAM.sub(r"\1***", str(text))
+
+
+NO_RESULT_MESSAGE = "No good Google Scholar Result was found. 未找到相关的学术文献。请尝试使用其他搜索工具或调整搜索关键词。"
+
+
+@dataclass
+class ScholarResult:
+    """一条 Google Scholar 检索结果"""
+
+    title: str
+    authors: List[str] = field(default_factory=list)
+    summary: str = ""
+    snippet: str = ""
+    link: str = ""
+    cited_by: Optional[int] = None
+
+    @classmethod
+    def from_serpapi(cls, item: Dict[str, Any]) -> "ScholarResult":
+        publication_info = item.get("publication_info") or {}
+        cited_by = (item.get("inline_links") or {}).get("cited_by") or {}
+        return cls(
+            title=item.get("title", ""),
+            authors=[a.get("name", "") for a in publication_info.get("authors", []) if a.get("name")],
+            summary=publication_info.get("summary", ""),
+            snippet=item.get("snippet", ""),
+            link=item.get("link", ""),
+            cited_by=cited_by.get("total"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_text(self) -> str:
+        return (
+            f"Title: {self.title}\n"
+            f"Authors: {','.join(self.authors)}\n"
+            f"Summary: {self.summary}\n"
+            f"Total-Citations: {self.cited_by if self.cited_by is not None else ''}\n"
+            f"Link: {self.link}"
+        )
+
+    def to_literature_record(self) -> LiteratureRecord:
+        # summary 形如 "A Smith, B Lee - Nature Medicine, 2021 - nature.com"
+        parts = [part.strip() for part in self.summary.split(" - ")]
+        venue = parts[1] if len(parts) > 1 else ""
+        year = parse_year(venue)
+        journal = re.sub(r",?\s*(19|20)\d{2}\s*$", "", venue).strip(" ,…")
+        doi = _DOI_IN_LINK.search(self.link or "")
+        return LiteratureRecord(
+            title=self.title,
+            abstract=self.snippet,
+            authors=", ".join(self.authors),
+            journal=journal,
+            year=year,
+            doi=doi.group(0) if doi else "",
+            url=self.link,
+            source="google_scholar",
+            published=self.summary,
+            cited_by=self.cited_by,
+        )
+
+
+def format_scholar_records(records: List[LiteratureRecord]) -> str:
+    """LiteratureRecords 的文本视图，与 ScholarResult.to_text 的格式一致"""
+    return "\n\n".join(
+        f"Title: {record.title}\n"
+        f"Authors: {record.authors.replace(', ', ',')}\n"
+        f"Summary: {record.published}\n"
+        f"Total-Citations: {record.cited_by if record.cited_by is not None else ''}\n"
+        f"Link: {record.url}"
+        for record in records
+    )
+
+
 class GoogleScholarSearchTool(BaseTool):
     """
     Tool that queries the Google Scholar API using SerpAPI.
@@ -18,6 +113,10 @@ class GoogleScholarSearchTool(BaseTool):
     To use, you should have the environment variable ``SERPAPI_API_KEY``
     set with your API key, or pass ``serpapi_api_key`` as a named parameter
     to the constructor. Sign up at: https://serpapi.com/users/sign_up
+
+    Requests go through the shared keep-alive HTTP clients: ``_run`` uses the
+    process-wide sync client and ``_arun`` the event loop's async client, so
+    async callers never block the loop and concurrent queries overlap.
     """
 
     name: str = "google_scholar_search"
@@ -27,93 +126,185 @@ class GoogleScholarSearchTool(BaseTool):
         "research, and scholarly articles. "
         "Input should be a search query."
     )
-    api_wrapper: GoogleScholarAPIWrapper
+    serpapi_api_key: str
+    top_k_results: int = 5
+    hl: str = "en"
+    lr: str = "lang_en"
+    timeout: float = 30.0
+    # 为 True 时返回 LiteratureRecords（str() 即为原文本格式），检索出错时抛出异常而不是返回错误文本
+    return_records: bool = False
 
     def __init__(self, serpapi_api_key: Optional[str] = None, top_k_results: int = 5, hl: str = "en", lr: str = "lang_en", **kwargs: Any):
         """Initialize with SerpAPI key and other parameters."""
         # 直接使用提供的API密钥，如果没有则尝试从环境变量获取
         serpapi_api_key_env = os.getenv("SERPAPI_API_KEY")
-        final_serpapi_api_key = serpapi_api_key or serpapi_api_key_env or "03b74241f799db78c221f985bb374d661d8e73b52ed43ba38b13d19ca277922d"
-        
+        final_serpapi_api_key = serpapi_api_key or serpapi_api_key_env or ""
+
         # 打印日志，确认使用了哪个源获取API密钥
         if serpapi_api_key:
             logger.info("Using serpapi_api_key passed as parameter")
         elif serpapi_api_key_env:
             logger.info("Using serpapi_api_key from environment variable")
         else:
-            logger.info("Using hardcoded serpapi_api_key")
-        
-        # 输出一段API密钥的开头和结尾，用于调试（不要输出整个密钥）
-        key_length = len(final_serpapi_api_key)
-        logger.info(f"API key found (length: {key_length}, starts with: {final_serpapi_api_key[:4]}..., ends with: ...{final_serpapi_api_key[-4:]})")
-        
-        # 先创建api_wrapper
-        api_wrapper = GoogleScholarAPIWrapper(
-            serp_api_key=final_serpapi_api_key, 
+            # 不在构造时报错：研究员的工具列表每个步骤都会创建，缺少密钥时由检索调用返回错误
+            logger.warning("⚠️ 未配置 SERPAPI_API_KEY，Google Scholar 检索将不可用")
+
+        super().__init__(
+            serpapi_api_key=final_serpapi_api_key,
             top_k_results=top_k_results,
             hl=hl,
-            lr=lr
+            lr=lr,
+            **kwargs,
+        )
+
+    def _page_params(self, query: str, start: int, num: int) -> Dict[str, Any]:
+        return {
+            "engine": "google_scholar",
+            "q": query,
+            "start": start,
+            "num": num,
+            "hl": self.hl,
+            "lr": self.lr,
+            "api_key": self.serpapi_api_key,
+        }
+
+    def _pages(self):
+        """按 SerpAPI 单页上限拆分 top_k_results，返回 (start, num) 列表"""
+        return [
+            (start, min(SCHOLAR_PAGE_SIZE, self.top_k_results - start))
+            for start in range(0, max(self.top_k_results, 1), SCHOLAR_PAGE_SIZE)
+        ]
+
+    def _check_api_key(self) -> None:
+        if not self.serpapi_api_key:
+            raise ValueError("SERPAPI_API_KEY is not configured")
+
+    @staticmethod
+    def _parse_page(response: httpx.Response) -> List[ScholarResult]:
+        if response.is_error:
+            # httpx 的默认错误信息包含完整请求 URL（含 api_key），这里换成脱敏后的信息
+            raise httpx.HTTPStatusError(
+                f"SerpAPI returned HTTP {response.status_code} for url '{redact_api_key(response.request.url)}'",
+                request=response.request,
+                response=response,
+            )
+        payload = response.json()
+        if payload.get("error"):
+            # SerpAPI 对"无结果"也返回 error 字段
+            if "hasn't returned any results" in payload["error"]:
+                return []
+            raise ValueError(f"SerpAPI error: {payload['error']}")
+        return [ScholarResult.from_serpapi(item) for item in payload.get("organic_results", [])]
+
+    def search(self, query: str) -> List[ScholarResult]:
+        """同步检索，返回结构化结果"""
+        self._check_api_key()
+        client = get_sync_client()
+        results: List[ScholarResult] = []
+        for start, num in self._pages():
+            response = client.get(
+                SERPAPI_SEARCH_URL, params=self._page_params(query, start, num), timeout=self.timeout
+            )
+            page = self._parse_page(response)
+            results.extend(page)
+            if len(page) < num:
+                break
+        remember_papers(result.to_literature_record() for result in results)
+        return results[: self.top_k_results]
+
+    async def asearch(self, query: str) -> List[ScholarResult]:
+        """异步检索，返回结构化结果；取消调用会立即中止在途请求"""
+        self._check_api_key()
+        client = get_async_client()
+        results: List[ScholarResult] = []
+        for start, num in self._pages():
+            response = await client.get(
+                SERPAPI_SEARCH_URL, params=self._page_params(query, start, num), timeout=self.timeout
+            )
+            page = self._parse_page(response)
+            results.extend(page)
+            if len(page) < num:
+                break
+        await aremember_papers(result.to_literature_record() for result in results)
+        return results[: self.top_k_results]
+
+    @staticmethod
+    def _to_records(results: List[ScholarResult]) -> LiteratureRecords:
+        return LiteratureRecords(
+            (result.to_literature_record() for result in results),
+            renderer=format_scholar_records,
+            empty_message=NO_RESULT_MESSAGE,
         )
-        
-        # 将api_wrapper添加到kwargs中
-        kwargs["api_wrapper"] = api_wrapper
-        
-        # 现在调用super().__init__
-        super().__init__(**kwargs)
+
+    def search_records(self, query: str) -> LiteratureRecords:
+        """同步检索，返回结构化记录；出错时抛出异常"""
+        return self._to_records(self.search(query))
+
+    async def asearch_records(self, query: str) -> LiteratureRecords:
+        """异步检索，返回结构化记录；出错时抛出异常"""
+        return self._to_records(await self.asearch(query))
+
+    @staticmethod
+    def _format_results(results: List[ScholarResult]) -> str:
+        return "\n\n".join(result.to_text() for result in results)
+
+    @staticmethod
+    def _format_error(e: Exception, prefix: str) -> str:
+        error_msg = f"{prefix}出现错误: {redact_api_key(e)}"
+
+        # 检查是否是API密钥问题
+        if "api" in str(e).lower() or "key" in str(e).lower() or isinstance(e, httpx.HTTPStatusError):
+            error_msg += "\n可能的原因：API密钥无效或网络连接问题。"
+
+        # 检查是否是网络问题
+        if isinstance(e, (httpx.TransportError, httpx.TimeoutException)):
+            error_msg += "\n可能的原因：网络连接问题，请检查网络设置。"
+
+        return error_msg
 
     def _run(
         self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         """Use the tool."""
+        if self.return_records:
+            return self.search_records(query)
         try:
             logger.info(f"🔍 Google Scholar搜索开始: '{query}'")
-            result = self.api_wrapper.run(query)
-            
-            if not result or result.strip() == "":
+            results = self.search(query)
+
+            if not results:
                 logger.warning(f"⚠️ Google Scholar搜索返回空结果: '{query}'")
-                return "No good Google Scholar Result was found. 未找到相关的学术文献。请尝试使用其他搜索工具或调整搜索关键词。"
-            
+                return NO_RESULT_MESSAGE
+
+            result = self._format_results(results)
             logger.info(f"✅ Google Scholar搜索成功，结果长度: {len(result)} 字符")
             return result
-            
+
         except Exception as e:
-            logger.error(f"❌ Google Scholar搜索失败: {e}")
-            error_msg = f"Google Scholar搜索出现错误: {str(e)}"
-            
-            # 检查是否是API密钥问题
-            if "api" in str(e).lower() or "key" in str(e).lower():
-                error_msg += "\n可能的原因：API密钥无效或网络连接问题。"
-            
-            # 检查是否是网络问题
-            if "network" in str(e).lower() or "connection" in str(e).lower() or "timeout" in str(e).lower():
-                error_msg += "\n可能的原因：网络连接问题，请检查网络设置。"
-            
-            return error_msg
+            logger.error(f"❌ Google Scholar搜索失败: {redact_api_key(e)}")
+            return self._format_error(e, "Google Scholar搜索")
 
     async def _arun(
-        self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
+        self, query: str, run_manager: Optional[AsyncCallbackManagerForToolRun] = None
     ) -> str:
         """Use the tool asynchronously."""
+        if self.return_records:
+            return await self.asearch_records(query)
         try:
             logger.info(f"🔍 Google Scholar异步搜索开始: '{query}'")
-            result = self.api_wrapper.run(query) 
-            
-            if not result or result.strip() == "":
+            results = await self.asearch(query)
+
+            if not results:
                 logger.warning(f"⚠️ Google Scholar异步搜索返回空结果: '{query}'")
-                return "No good Google Scholar Result was found. 未找到相关的学术文献。请尝试使用其他搜索工具或调整搜索关键词。"
-            
+                return NO_RESULT_MESSAGE
+
+            result = self._format_results(results)
             logger.info(f"✅ Google Scholar异步搜索成功，结果长度: {len(result)} 字符")
             return result
-            
+
         except Exception as e:
-            logger.error(f"❌ Google Scholar异步搜索失败: {e}")
-            error_msg = f"Google Scholar异步搜索出现错误: {str(e)}"
-            
-            # 检查是否是API密钥问题
-            if "api" in str(e).lower() or "key" in str(e).lower():
-                error_msg += "\n可能的原因：API密钥无效或网络连接问题。"
-            
-            return error_msg
+            logger.error(f"❌ Google Scholar异步搜索失败: {redact_api_key(e)}")
+            return self._format_error(e, "Google Scholar异步搜索")
 
 if __name__ == "__main__":
     # This is for testing purposes.
@@ -128,10 +319,10 @@ if __name__ == "__main__":
             # print(f"Search Result:\\n{result}")
 
             # Test with a specific query that might return fewer results or error
-            result_specific = tool.run("fhqwhgads") 
+            result_specific = tool.run("fhqwhgads")
             print(f"Specific Search Result:\\n{result_specific}")
 
         except ValueError as ve:
             print(f"Initialization Error: {ve}")
         except Exception as e:
-            print(f"An unexpected error occurred: {e}") 
\ No newline at end of file
+            print(f"An unexpected error occurred: {e}")
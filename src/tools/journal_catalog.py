@@ -0,0 +1,296 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+期刊目录与索引
+
+期刊数据从外部文件加载（默认 src/tools/data/journals.json，可通过 conf.yaml 的
+JOURNAL_CATALOG.path 指向完整的影响因子表），并建立以下索引：
+- 按键、ISSN 的哈希表
+- 所有期刊名称（简称、全称、别名）编译成的 Aho-Corasick 自动机，一次扫描文本即可找出全部命中
+- 按域名的哈希表，URL 只需按主机名逐级查找
+
+匹配开销只与文本长度有关，与目录中的期刊数量无关。
+
+支持两种文件格式：
+
+- JSON：期刊对象列表，字段与 JournalInfo 相同，另可带 key、aliases、domains
+- CSV：表头包含 name、impact_factor，可选 full_name、tier、fields、publisher、issn、
+  url、aliases、domains；多值字段用分号分隔。未给出 tier 时按影响因子划分
+"""
+
+import csv
+import json
+import logging
+import re
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = Path(__file__).parent / "data" / "journals.json"
+
+
+class JournalTier(Enum):
+    """期刊等级分类"""
+    TOP_TIER = "top_tier"           # 顶级期刊 (IF > 15)
+    HIGH_TIER = "high_tier"         # 高级期刊 (IF 5-15)
+    MID_TIER = "mid_tier"           # 中级期刊 (IF 2-5)
+    EMERGING = "emerging"           # 新兴期刊 (IF < 2)
+
+
+TIER_ORDER = [JournalTier.TOP_TIER, JournalTier.HIGH_TIER, JournalTier.MID_TIER, JournalTier.EMERGING]
+
+
+def tier_for_impact_factor(impact_factor: float) -> JournalTier:
+    if impact_factor > 15:
+        return JournalTier.TOP_TIER
+    if impact_factor >= 5:
+        return JournalTier.HIGH_TIER
+    if impact_factor >= 2:
+        return JournalTier.MID_TIER
+    return JournalTier.EMERGING
+
+
+@dataclass
+class JournalInfo:
+    """期刊信息"""
+    name: str
+    full_name: str
+    impact_factor: float
+    tier: JournalTier
+    fields: List[str]              # 专业领域
+    publisher: str
+    issn: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+
+
+class AhoCorasickMatcher:
+    """
+    多模式字符串匹配自动机
+
+    模式在构建时统一转为小写；search 对文本只扫描一遍，
+    返回 (起始位置, 结束位置, 模式值) 列表。word_boundary 为 True 时
+    只保留两端不与字母数字相连的命中（避免 "cell" 命中 "cellular"）。
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, object]]] = [[]]
+        self._built = False
+        for pattern, value in patterns:
+            self.add(pattern, value)
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def add(self, pattern: str, value: object) -> None:
+        pattern = pattern.lower()
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> "AhoCorasickMatcher":
+        """计算失败指针（广度优先），并把后缀状态的输出合并进来"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def iter_matches(self, text: str, word_boundary: bool = True) -> Iterator[Tuple[int, int, object]]:
+        if not self._built:
+            self.build()
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in output[state]:
+                start = end - length
+                if word_boundary and (
+                    (start > 0 and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum())
+                ):
+                    continue
+                yield start, end, value
+
+    def search(self, text: str, word_boundary: bool = True) -> List[Tuple[int, int, object]]:
+        return list(self.iter_matches(text, word_boundary))
+
+
+def _split_multi(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [part.strip() for part in str(value).split(";") if part.strip()]
+
+
+def url_host(url: str) -> str:
+    """URL 的小写主机名，去掉 www. 前缀"""
+    if not url:
+        return ""
+    if "://" not in url:
+        url = f"//{url}"
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def _journal_key(name: str) -> str:
+    return re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+
+
+def _parse_impact_factor(name: str, value) -> float:
+    """解析影响因子；"N/A" 等无法解析的值记为 0，不影响目录中的其他期刊"""
+    if value is None or value == "":
+        return 0.0
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        logger.warning(f"⚠️ 期刊 {name} 的影响因子无法解析: {value!r}，按 0 处理")
+        return 0.0
+
+
+def _parse_tier(name: str, value, impact_factor: float) -> JournalTier:
+    """解析期刊分级；未填写或无法识别时按影响因子推断"""
+    if value:
+        try:
+            return JournalTier(value)
+        except ValueError:
+            logger.warning(f"⚠️ 期刊 {name} 的分级无法识别: {value!r}，按影响因子推断")
+    return tier_for_impact_factor(impact_factor)
+
+
+class JournalCatalog:
+    """建好索引的期刊目录"""
+
+    def __init__(self, entries: Iterable[Dict]):
+        self.journals: Dict[str, JournalInfo] = {}
+        self.by_issn: Dict[str, str] = {}
+        self.by_domain: Dict[str, str] = {}
+        self.matcher = AhoCorasickMatcher()
+
+        for entry in entries:
+            name = str(entry.get("name") or "").strip()
+            if not name:
+                continue
+            impact_factor = _parse_impact_factor(name, entry.get("impact_factor"))
+            journal = JournalInfo(
+                name=name,
+                full_name=str(entry.get("full_name") or name).strip(),
+                impact_factor=impact_factor,
+                tier=_parse_tier(name, entry.get("tier"), impact_factor),
+                fields=_split_multi(entry.get("fields")),
+                publisher=str(entry.get("publisher") or ""),
+                issn=entry.get("issn") or None,
+                url=entry.get("url") or None,
+                description=entry.get("description") or None,
+            )
+            key = entry.get("key") or _journal_key(name)
+            self.journals[key] = journal
+
+            for pattern in {journal.name, journal.full_name, *_split_multi(entry.get("aliases"))}:
+                self.matcher.add(pattern, key)
+            if journal.issn:
+                self.by_issn[journal.issn] = key
+            for domain in _split_multi(entry.get("domains")):
+                self.by_domain[url_host(domain)] = key
+        self.matcher.build()
+
+    def __len__(self) -> int:
+        return len(self.journals)
+
+    def get(self, key: str) -> Optional[JournalInfo]:
+        return self.journals.get(key)
+
+    def find_in_text(self, text: str) -> Optional[JournalInfo]:
+        """
+        一次扫描文本，返回命中的期刊
+
+        多个期刊命中时取名称最长的（"Nature Medicine" 优先于 "Nature"），
+        长度相同时取最先出现的。
+        """
+        best = None
+        for start, end, key in self.matcher.iter_matches(text):
+            if best is None or end - start > best[0]:
+                best = (end - start, key)
+        return self.journals[best[1]] if best else None
+
+    def find_by_url(self, url: str) -> Optional[JournalInfo]:
+        """按主机名及其各级父域名在域名表中查找"""
+        host = url_host(url)
+        while host:
+            key = self.by_domain.get(host)
+            if key is not None:
+                return self.journals[key]
+            _, _, host = host.partition(".")
+        return None
+
+
+def read_catalog_entries(path: Path) -> List[Dict]:
+    """读取 JSON 或 CSV 期刊文件"""
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_journal_catalog(path: Optional[str] = None) -> JournalCatalog:
+    """
+    加载期刊目录
+
+    Args:
+        path: 期刊文件路径，None 时读取 conf.yaml 的 JOURNAL_CATALOG.path，
+            未配置则使用内置的 src/tools/data/journals.json
+    """
+    if path is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        path = (load_yaml_config(conf_path).get("JOURNAL_CATALOG") or {}).get("path")
+
+    catalog_path = Path(path) if path else DEFAULT_CATALOG_PATH
+    try:
+        catalog = JournalCatalog(read_catalog_entries(catalog_path))
+    except (OSError, ValueError, KeyError) as e:
+        if catalog_path == DEFAULT_CATALOG_PATH:
+            raise
+        logger.warning(f"⚠️ 期刊目录 {catalog_path} 加载失败，改用内置目录: {e}")
+        catalog_path = DEFAULT_CATALOG_PATH
+        catalog = JournalCatalog(read_catalog_entries(catalog_path))
+
+    logger.info(f"✅ 期刊目录加载完成: {catalog_path}，包含 {len(catalog)} 个期刊")
+    return catalog
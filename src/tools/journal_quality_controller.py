@@ -7,39 +7,52 @@
 """
 
 import logging
-from typing import Dict, List, Set, Optional, Tuple
-from dataclasses import dataclass
-from enum import Enum
-import re
+from typing import Any, Dict, List, Optional
 
-logger = logging.getLogger(__name__)
+from .journal_catalog import (
+    TIER_ORDER,
+    AhoCorasickMatcher,
+    JournalCatalog,
+    JournalInfo,
+    JournalTier,
+    load_journal_catalog,
+    url_host,
+)
 
-class JournalTier(Enum):
-    """期刊等级分类"""
-    TOP_TIER = "top_tier"           # 顶级期刊 (IF > 15)
-    HIGH_TIER = "high_tier"         # 高级期刊 (IF 5-15)  
-    MID_TIER = "mid_tier"           # 中级期刊 (IF 2-5)
-    EMERGING = "emerging"           # 新兴期刊 (IF < 2)
+logger = logging.getLogger(__name__)
 
-@dataclass
-class JournalInfo:
-    """期刊信息"""
-    name: str
-    full_name: str
-    impact_factor: float
-    tier: JournalTier
-    fields: List[str]              # 专业领域
-    publisher: str
-    issn: Optional[str] = None
-    url: Optional[str] = None
-    description: Optional[str] = None
+# 期刊目录之外的质量指标：出版方域名按主机名查哈希表，其余短语用自动机一次扫描
+QUALITY_DOMAINS = {
+    'nature.com': JournalTier.TOP_TIER,
+    'cell.com': JournalTier.TOP_TIER,
+    'science.org': JournalTier.TOP_TIER,
+    'nejm.org': JournalTier.TOP_TIER,
+    'thelancet.com': JournalTier.TOP_TIER,
+    'ieee.org': JournalTier.TOP_TIER,
+    'acm.org': JournalTier.TOP_TIER,
+    'pnas.org': JournalTier.TOP_TIER,
+    'springer.com': JournalTier.HIGH_TIER,
+    'elsevier.com': JournalTier.HIGH_TIER,
+    'wiley.com': JournalTier.HIGH_TIER,
+    'pubmed.ncbi.nlm.nih.gov': JournalTier.HIGH_TIER,
+    'doi.org': JournalTier.HIGH_TIER,
+}
+QUALITY_PHRASES = {
+    **QUALITY_DOMAINS,
+    'impact factor': JournalTier.HIGH_TIER,
+    'peer review': JournalTier.HIGH_TIER,
+}
 
 class JournalQualityController:
     """期刊质量控制器"""
     
-    def __init__(self):
-        # 🏆 顶级期刊数据库
-        self.journal_database = self._initialize_journal_database()
+    def __init__(self, catalog: Optional[JournalCatalog] = None):
+        # 🏆 期刊目录（外部文件加载，带名称自动机和域名索引）
+        self.catalog = catalog or load_journal_catalog()
+        self.journal_database = self.catalog.journals
+        self._indicator_matcher = AhoCorasickMatcher(
+            (phrase, (phrase, tier)) for phrase, tier in QUALITY_PHRASES.items()
+        ).build()
         
         # 🎯 领域关键词映射
         self.field_keywords = {
@@ -51,177 +64,6 @@ class JournalQualityController:
             'data_science': ['data science', 'bioinformatics', 'computational biology', 'biostatistics']
         }
     
-    def _initialize_journal_database(self) -> Dict[str, JournalInfo]:
-        """初始化期刊数据库"""
-        
-        journals = {
-            # 🏆 顶级期刊 (Nature系列)
-            'nature': JournalInfo(
-                name='Nature',
-                full_name='Nature',
-                impact_factor=64.8,
-                tier=JournalTier.TOP_TIER,
-                fields=['general_science', 'ai_ml', 'biomedical'],
-                publisher='Nature Publishing Group',
-                issn='0028-0836',
-                url='https://www.nature.com/nature',
-                description='世界顶级综合性科学期刊'
-            ),
-            'nature_medicine': JournalInfo(
-                name='Nature Medicine',
-                full_name='Nature Medicine',
-                impact_factor=87.2,
-                tier=JournalTier.TOP_TIER,
-                fields=['medical_imaging', 'biomedical', 'bone_health'],
-                publisher='Nature Publishing Group'
-            ),
-            'nature_ai': JournalInfo(
-                name='Nature Machine Intelligence',
-                full_name='Nature Machine Intelligence',
-                impact_factor=25.9,
-                tier=JournalTier.TOP_TIER,
-                fields=['ai_ml', 'data_science'],
-                publisher='Nature Publishing Group'
-            ),
-            
-            # 🏆 顶级期刊 (Cell系列)
-            'cell': JournalInfo(
-                name='Cell',
-                full_name='Cell',
-                impact_factor=66.9,
-                tier=JournalTier.TOP_TIER,
-                fields=['biomedical', 'general_science'],
-                publisher='Cell Press'
-            ),
-            
-            # 🏆 顶级期刊 (Science系列)
-            'science': JournalInfo(
-                name='Science',
-                full_name='Science',
-                impact_factor=56.9,
-                tier=JournalTier.TOP_TIER,
-                fields=['general_science', 'ai_ml', 'biomedical'],
-                publisher='AAAS'
-            ),
-            'science_translational_medicine': JournalInfo(
-                name='Science Translational Medicine',
-                full_name='Science Translational Medicine',
-                impact_factor=19.3,
-                tier=JournalTier.TOP_TIER,
-                fields=['medical_imaging', 'biomedical'],
-                publisher='AAAS'
-            ),
-            
-            # 🏆 顶级医学期刊
-            'nejm': JournalInfo(
-                name='NEJM',
-                full_name='New England Journal of Medicine',
-                impact_factor=158.5,
-                tier=JournalTier.TOP_TIER,
-                fields=['medical_imaging', 'biomedical', 'bone_health'],
-                publisher='Massachusetts Medical Society'
-            ),
-            'lancet': JournalInfo(
-                name='The Lancet',
-                full_name='The Lancet',
-                impact_factor=202.7,
-                tier=JournalTier.TOP_TIER,
-                fields=['medical_imaging', 'biomedical', 'bone_health'],
-                publisher='Elsevier'
-            ),
-            'jama': JournalInfo(
-                name='JAMA',
-                full_name='Journal of the American Medical Association',
-                impact_factor=157.3,
-                tier=JournalTier.TOP_TIER,
-                fields=['medical_imaging', 'biomedical'],
-                publisher='AMA'
-            ),
-            
-            # 🏆 顶级技术期刊
-            'ieee_tpami': JournalInfo(
-                name='IEEE TPAMI',
-                full_name='IEEE Transactions on Pattern Analysis and Machine Intelligence',
-                impact_factor=24.3,
-                tier=JournalTier.TOP_TIER,
-                fields=['ai_ml', 'computer_vision', 'medical_imaging'],
-                publisher='IEEE'
-            ),
-            'ieee_tmi': JournalInfo(
-                name='IEEE TMI',
-                full_name='IEEE Transactions on Medical Imaging',
-                impact_factor=11.0,
-                tier=JournalTier.HIGH_TIER,
-                fields=['medical_imaging', 'ai_ml'],
-                publisher='IEEE'
-            ),
-            
-            # 🥈 高级医学影像期刊
-            'radiology': JournalInfo(
-                name='Radiology',
-                full_name='Radiology',
-                impact_factor=12.1,
-                tier=JournalTier.HIGH_TIER,
-                fields=['medical_imaging', 'radiology'],
-                publisher='RSNA'
-            ),
-            'european_radiology': JournalInfo(
-                name='European Radiology',
-                full_name='European Radiology',
-                impact_factor=7.0,
-                tier=JournalTier.HIGH_TIER,
-                fields=['medical_imaging', 'radiology'],
-                publisher='Springer'
-            ),
-            
-            # 🥈 骨骼健康专业期刊
-            'jbmr': JournalInfo(
-                name='JBMR',
-                full_name='Journal of Bone and Mineral Research',
-                impact_factor=6.2,
-                tier=JournalTier.HIGH_TIER,
-                fields=['bone_health', 'osteoporosis'],
-                publisher='Wiley'
-            ),
-            'bone': JournalInfo(
-                name='Bone',
-                full_name='Bone',
-                impact_factor=4.9,
-                tier=JournalTier.MID_TIER,
-                fields=['bone_health', 'osteoporosis'],
-                publisher='Elsevier'
-            ),
-            'osteoporosis_international': JournalInfo(
-                name='Osteoporosis International',
-                full_name='Osteoporosis International',
-                impact_factor=4.4,
-                tier=JournalTier.MID_TIER,
-                fields=['bone_health', 'osteoporosis'],
-                publisher='Springer'
-            ),
-            
-            # 🥈 AI/ML专业期刊
-            'nature_biotechnology': JournalInfo(
-                name='Nature Biotechnology',
-                full_name='Nature Biotechnology',
-                impact_factor=54.9,
-                tier=JournalTier.TOP_TIER,
-                fields=['ai_ml', 'biomedical', 'data_science'],
-                publisher='Nature Publishing Group'
-            ),
-            'artificial_intelligence_in_medicine': JournalInfo(
-                name='Artificial Intelligence in Medicine',
-                full_name='Artificial Intelligence in Medicine',
-                impact_factor=7.5,
-                tier=JournalTier.HIGH_TIER,
-                fields=['ai_ml', 'medical_imaging', 'biomedical'],
-                publisher='Elsevier'
-            )
-        }
-        
-        logger.info(f"✅ 期刊数据库初始化完成，包含 {len(journals)} 个期刊")
-        return journals
-    
     def get_journals_by_field(self, field: str, min_tier: JournalTier = JournalTier.MID_TIER) -> List[JournalInfo]:
         """根据领域获取期刊列表"""
         
@@ -230,8 +72,7 @@ class JournalQualityController:
             # 检查期刊是否属于指定领域
             if field in journal.fields:
                 # 检查期刊等级是否符合要求
-                tier_order = [JournalTier.TOP_TIER, JournalTier.HIGH_TIER, JournalTier.MID_TIER, JournalTier.EMERGING]
-                if tier_order.index(journal.tier) <= tier_order.index(min_tier):
+                if TIER_ORDER.index(journal.tier) <= TIER_ORDER.index(min_tier):
                     matching_journals.append(journal)
         
         # 按影响因子排序
@@ -317,7 +158,7 @@ class JournalQualityController:
         """根据期刊质量过滤搜索结果"""
         
         filtered_results = []
-        tier_order = [JournalTier.TOP_TIER, JournalTier.HIGH_TIER, JournalTier.MID_TIER, JournalTier.EMERGING]
+        tier_order = TIER_ORDER
         min_tier_index = tier_order.index(min_tier)
         
         for result in results:
@@ -345,62 +186,47 @@ class JournalQualityController:
         return filtered_results
     
     def _assess_journal_quality(self, result: Dict) -> Optional[Dict]:
-        """评估单个搜索结果的期刊质量"""
-        
-        # 从结果中提取期刊信息
-        title = result.get('title', '').lower()
-        content = result.get('content', '').lower()
-        url = result.get('url', '').lower()
-        
-        # 尝试匹配已知期刊
-        for journal_key, journal_info in self.journal_database.items():
-            journal_names = [
-                journal_info.name.lower(),
-                journal_info.full_name.lower()
-            ]
-            
-            # 检查是否在标题、内容或URL中找到期刊名称
-            for name in journal_names:
-                if name in title or name in content or name in url:
-                    return {
-                        'name': journal_info.name,
-                        'full_name': journal_info.full_name,
-                        'tier': journal_info.tier,
-                        'impact_factor': journal_info.impact_factor,
-                        'confidence': 0.9
-                    }
+        """评估单个搜索结果的期刊质量：标题、内容、URL 拼接后只扫描一遍"""
+        
+        url = result.get('url', '') or ''
+        text = f"{result.get('title', '')}\n{result.get('content', '')}\n{url}"
+        
+        # 名称命中或 URL 域名命中已知期刊
+        journal_info = self.catalog.find_in_text(text) or self.catalog.find_by_url(url)
+        if journal_info:
+            return {
+                'name': journal_info.name,
+                'full_name': journal_info.full_name,
+                'tier': journal_info.tier,
+                'impact_factor': journal_info.impact_factor,
+                'confidence': 0.9
+            }
         
         # 如果没有匹配到已知期刊，尝试启发式评估
-        return self._heuristic_journal_assessment(result)
+        return self._heuristic_journal_assessment(result, text)
     
-    def _heuristic_journal_assessment(self, result: Dict) -> Optional[Dict]:
+    def _heuristic_journal_assessment(self, result: Dict, text: Optional[str] = None) -> Optional[Dict]:
         """启发式期刊质量评估"""
         
-        content = (result.get('title', '') + ' ' + result.get('content', '')).lower()
-        url = result.get('url', '').lower()
-        
-        # 高质量期刊的指标
-        quality_indicators = {
-            'top_tier': [
-                'nature.com', 'cell.com', 'science.org', 'nejm.org', 'thelancet.com',
-                'ieee.org', 'acm.org', 'pnas.org'
-            ],
-            'high_tier': [
-                'springer.com', 'elsevier.com', 'wiley.com', 'pubmed.ncbi.nlm.nih.gov',
-                'doi.org', 'impact factor', 'peer review'
-            ]
-        }
-        
-        # 检查URL域名
-        for tier, indicators in quality_indicators.items():
-            for indicator in indicators:
-                if indicator in url or indicator in content:
-                    tier_enum = JournalTier.TOP_TIER if tier == 'top_tier' else JournalTier.HIGH_TIER
-                    return {
-                        'tier': tier_enum,
-                        'confidence': 0.6,
-                        'reason': f'匹配到质量指标: {indicator}'
-                    }
+        url = result.get('url', '') or ''
+        
+        # 先按 URL 主机名逐级查域名表
+        host = url_host(url)
+        while host:
+            tier = QUALITY_DOMAINS.get(host)
+            if tier is not None:
+                return {'tier': tier, 'confidence': 0.6, 'reason': f'匹配到质量指标: {host}'}
+            _, _, host = host.partition('.')
+        
+        # 再在文本中查找质量指标，取等级最高的
+        if text is None:
+            text = f"{result.get('title', '')}\n{result.get('content', '')}\n{url}"
+        best = None
+        for _, _, (phrase, tier) in self._indicator_matcher.iter_matches(text):
+            if best is None or TIER_ORDER.index(tier) < TIER_ORDER.index(best[1]):
+                best = (phrase, tier)
+        if best:
+            return {'tier': best[1], 'confidence': 0.6, 'reason': f'匹配到质量指标: {best[0]}'}
         
         return None
     
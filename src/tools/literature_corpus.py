@@ -0,0 +1,455 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+本地文献库
+
+PubMed、Google Scholar 检索到的每篇文献都会写入一个 SQLite 文献库：
+- 按 DOI、PMID、规范化标题识别同一篇文献，重复检索时合并字段而不是新增
+- 标题和摘要分词后写入倒排表（term → 文献、词频），查询时按 BM25 打分；
+  分词规则版本记录在 PRAGMA user_version 中，打开旧版本的文献库时自动重建倒排表
+- 预研究节点和 researcher 先查本地库，只有本地结果不足或过旧时才访问网络
+
+通过 conf.yaml 的 LITERATURE_CORPUS 段配置：
+
+```yaml
+LITERATURE_CORPUS:
+  enabled: true
+  path: ./data/literature_corpus.sqlite
+  refresh_days: 30          # 本地命中的文献都早于该天数时重新联网检索
+  min_term_coverage: 0.6    # 文献至少包含查询中多少比例的词才算本地命中
+```
+"""
+
+import asyncio
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from langchain_core.tools import tool
+
+from src.tools.decorators import log_io
+from src.tools.literature_record import LiteratureRecord
+from src.utils.literature_dedup import normalize_doi, normalize_pmid, normalize_title
+from src.utils.literature_relevance import TOKENIZER_VERSION, paper_terms, tokenize
+
+logger = logging.getLogger(__name__)
+
+_RECORD_FIELDS = {f.name for f in fields(LiteratureRecord)}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id INTEGER PRIMARY KEY,
+    doi TEXT,
+    pmid TEXT,
+    title_key TEXT,
+    source TEXT NOT NULL,
+    year INTEGER,
+    record TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_papers_doi ON papers(doi) WHERE doi IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_papers_pmid ON papers(pmid) WHERE pmid IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_papers_title_key ON papers(title_key);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    paper_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, paper_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_paper ON postings(paper_id);
+"""
+
+
+def _as_record(paper: Union[LiteratureRecord, Dict[str, Any]]) -> LiteratureRecord:
+    if isinstance(paper, LiteratureRecord):
+        return paper
+    data = {k: v for k, v in paper.items() if k in _RECORD_FIELDS and v not in (None, "N/A")}
+    data.setdefault("title", "")
+    year = data.get("year")
+    data["year"] = int(year) if isinstance(year, (int, float, str)) and str(year).isdigit() else None
+    return LiteratureRecord(**data)
+
+
+def _merge(old: LiteratureRecord, new: LiteratureRecord) -> LiteratureRecord:
+    """用新记录中的非空字段补全旧记录；引用数取最新值"""
+    merged = old.to_dict()
+    for key, value in new.to_dict().items():
+        if value not in (None, "") and (merged.get(key) in (None, "") or key == "cited_by"):
+            merged[key] = value
+    return LiteratureRecord(**merged)
+
+
+@dataclass
+class CorpusHit:
+    """本地检索命中"""
+
+    record: LiteratureRecord
+    score: float
+    coverage: float          # 文献包含的查询词比例
+    fetched_at: float
+
+
+class LiteratureCorpus:
+    """
+    SQLite 持久化的文献库，带 BM25 倒排索引
+
+    Args:
+        path: SQLite 文件路径，":memory:" 表示只在内存中
+        k1, b: BM25 参数
+    """
+
+    def __init__(self, path: str = ":memory:", *, k1: float = 1.5, b: float = 0.75):
+        self.path = str(path)
+        self.k1 = k1
+        self.b = b
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._check_index_version()
+
+    # ------------------------------------------------------------------
+    # 索引版本
+    # ------------------------------------------------------------------
+
+    def _check_index_version(self) -> None:
+        """倒排表由其他版本的分词规则生成时按当前规则重建"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == TOKENIZER_VERSION:
+            return
+        if self._conn.execute("SELECT 1 FROM papers LIMIT 1").fetchone():
+            self.reindex()
+        else:
+            self._conn.execute(f"PRAGMA user_version = {TOKENIZER_VERSION}")
+
+    def reindex(self) -> int:
+        """按当前分词规则重建倒排表和文献长度，返回重建的文献数"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM postings")
+                rows = self._conn.execute("SELECT id, record FROM papers").fetchall()
+                for paper_id, record in rows:
+                    terms = paper_terms(json.loads(record))
+                    self._conn.execute("UPDATE papers SET length = ? WHERE id = ?", (sum(terms.values()), paper_id))
+                    self._conn.executemany(
+                        "INSERT INTO postings (term, paper_id, tf) VALUES (?, ?, ?)",
+                        [(term, paper_id, tf) for term, tf in terms.items()],
+                    )
+                self._conn.execute(f"PRAGMA user_version = {TOKENIZER_VERSION}")
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info(f"📚 文献库分词规则已更新，重建了 {len(rows)} 篇文献的索引")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def _find_existing(self, doi: Optional[str], pmid: Optional[str], title_key: str) -> Optional[tuple]:
+        for column, value in (("doi", doi), ("pmid", pmid), ("title_key", title_key)):
+            if value:
+                row = self._conn.execute(
+                    f"SELECT id, record FROM papers WHERE {column} = ? LIMIT 1", (value,)
+                ).fetchone()
+                if row is not None:
+                    return row
+        return None
+
+    def upsert(self, papers: Iterable[Union[LiteratureRecord, Dict[str, Any]]]) -> int:
+        """写入或合并文献，返回处理的文献数"""
+        count = 0
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for paper in papers:
+                    record = _as_record(paper)
+                    title_key = normalize_title(record.title)
+                    if not title_key:
+                        continue
+                    doi = normalize_doi(record.doi) or None
+                    pmid = normalize_pmid(record.pmid) or None
+
+                    existing = self._find_existing(doi, pmid, title_key)
+                    if existing is not None:
+                        record = _merge(LiteratureRecord(**json.loads(existing[1])), record)
+                        title_key = normalize_title(record.title)
+                        doi = normalize_doi(record.doi) or None
+                        pmid = normalize_pmid(record.pmid) or None
+
+                    terms = paper_terms(record.to_dict())
+                    values = (
+                        doi, pmid, title_key, record.source or "unknown", record.year,
+                        json.dumps(record.to_dict(), ensure_ascii=False), sum(terms.values()), now,
+                    )
+                    try:
+                        if existing is None:
+                            paper_id = self._conn.execute(
+                                "INSERT INTO papers (doi, pmid, title_key, source, year, record, length, fetched_at) "
+                                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                values,
+                            ).lastrowid
+                        else:
+                            paper_id = existing[0]
+                            self._conn.execute(
+                                "UPDATE papers SET doi = ?, pmid = ?, title_key = ?, source = ?, year = ?, "
+                                "record = ?, length = ?, fetched_at = ? WHERE id = ?",
+                                (*values, paper_id),
+                            )
+                            self._conn.execute("DELETE FROM postings WHERE paper_id = ?", (paper_id,))
+                    except sqlite3.IntegrityError as e:
+                        # 合并后的 DOI/PMID 已属于另一条记录，保留两条记录各自不变
+                        logger.debug(f"文献标识冲突，跳过合并: {record.title[:50]} - {e}")
+                        continue
+                    self._conn.executemany(
+                        "INSERT INTO postings (term, paper_id, tf) VALUES (?, ?, ?)",
+                        [(term, paper_id, tf) for term, tf in terms.items()],
+                    )
+                    count += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return count
+
+    # ------------------------------------------------------------------
+    # 检索
+    # ------------------------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        *,
+        sources: Optional[Sequence[str]] = None,
+        min_year: Optional[int] = None,
+    ) -> List[CorpusHit]:
+        """按 BM25 返回最相关的 limit 篇文献"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+
+        with self._lock:
+            total_docs, total_length = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM papers"
+            ).fetchone()
+            if not total_docs:
+                return []
+            avg_length = total_length / total_docs
+
+            placeholders = ",".join("?" * len(terms))
+            rows = self._conn.execute(
+                f"SELECT p.term, p.paper_id, p.tf, d.length FROM postings p "
+                f"JOIN papers d ON d.id = p.paper_id WHERE p.term IN ({placeholders})",
+                terms,
+            ).fetchall()
+
+            doc_freq = Counter(term for term, *_ in rows)
+            scores: Dict[int, float] = {}
+            matched: Dict[int, int] = Counter()
+            for term, paper_id, tf, length in rows:
+                idf = math.log(1 + (total_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                norm = tf + self.k1 * (1 - self.b + self.b * length / avg_length)
+                scores[paper_id] = scores.get(paper_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+                matched[paper_id] += 1
+
+            conditions, params = [], []
+            if sources:
+                conditions.append(f"source IN ({','.join('?' * len(sources))})")
+                params.extend(sources)
+            if min_year is not None:
+                conditions.append("year >= ?")
+                params.append(min_year)
+
+            ranked = sorted(scores, key=scores.get, reverse=True)
+            hits: List[CorpusHit] = []
+            # 分批取回文献，过滤条件在 SQL 中完成
+            for start in range(0, len(ranked), 500):
+                if len(hits) >= limit:
+                    break
+                batch = ranked[start:start + 500]
+                where = " AND ".join([f"id IN ({','.join('?' * len(batch))})", *conditions])
+                docs = {
+                    row[0]: row[1:]
+                    for row in self._conn.execute(
+                        f"SELECT id, record, fetched_at FROM papers WHERE {where}", [*batch, *params]
+                    )
+                }
+                for paper_id in batch:
+                    if paper_id in docs and len(hits) < limit:
+                        record, fetched_at = docs[paper_id]
+                        hits.append(CorpusHit(
+                            record=LiteratureRecord(**json.loads(record)),
+                            score=scores[paper_id],
+                            coverage=matched[paper_id] / len(terms),
+                            fetched_at=fetched_at,
+                        ))
+        return hits
+
+    def search_local(
+        self,
+        query: str,
+        limit: int,
+        *,
+        refresh_days: float = 30,
+        min_term_coverage: float = 0.6,
+        sources: Optional[Sequence[str]] = None,
+    ) -> Optional[List[LiteratureRecord]]:
+        """
+        本地能满足查询时返回文献，否则返回 None（需要联网）
+
+        本地满足的条件：至少 limit 篇文献包含足够比例的查询词，
+        且其中最近一次检索不早于 refresh_days 天前。
+        """
+        hits = [
+            hit for hit in self.search(query, limit * 3, sources=sources)
+            if hit.coverage >= min_term_coverage
+        ][:limit]
+        if len(hits) < limit:
+            return None
+        if max(hit.fetched_at for hit in hits) < time.time() - refresh_days * 86400:
+            return None
+        return [hit.record for hit in hits]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            papers = self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            terms = self._conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"path": self.path, "papers": papers, "terms": terms}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_corpus: Optional[LiteratureCorpus] = None
+_corpus_settings: Dict[str, Any] = {}
+_corpus_initialized = False
+_corpus_lock = threading.Lock()
+
+
+def create_literature_corpus(settings: Optional[dict] = None) -> Optional[LiteratureCorpus]:
+    """
+    根据 conf.yaml 的 LITERATURE_CORPUS 段创建文献库
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+
+    Returns:
+        LiteratureCorpus，配置为禁用时返回 None
+    """
+    global _corpus_settings
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("LITERATURE_CORPUS") or {}
+
+    _corpus_settings = dict(settings)
+    if not settings.get("enabled", True):
+        logger.info("📚 本地文献库已禁用")
+        return None
+
+    corpus = LiteratureCorpus(settings.get("path", "./data/literature_corpus.sqlite"))
+    logger.info(f"📚 本地文献库已启用: {corpus.path}")
+    return corpus
+
+
+def get_literature_corpus() -> Optional[LiteratureCorpus]:
+    """获取进程内共享的文献库（首次调用时创建）"""
+    global _corpus, _corpus_initialized
+    if not _corpus_initialized:
+        with _corpus_lock:
+            if not _corpus_initialized:
+                _corpus = create_literature_corpus()
+                _corpus_initialized = True
+    return _corpus
+
+
+def set_literature_corpus(corpus: Optional[LiteratureCorpus], settings: Optional[dict] = None) -> None:
+    """替换共享的文献库（传入 None 表示禁用）"""
+    global _corpus, _corpus_initialized, _corpus_settings
+    with _corpus_lock:
+        _corpus = corpus
+        _corpus_settings = dict(settings or {})
+        _corpus_initialized = True
+
+
+def search_corpus_first(query: str, limit: int, sources: Optional[Sequence[str]] = None) -> Optional[List[LiteratureRecord]]:
+    """按配置的时效和覆盖率查询共享文献库；文献库禁用或结果不足时返回 None"""
+    corpus = get_literature_corpus()
+    if corpus is None:
+        return None
+    try:
+        return corpus.search_local(
+            query,
+            limit,
+            refresh_days=_corpus_settings.get("refresh_days", 30),
+            min_term_coverage=_corpus_settings.get("min_term_coverage", 0.6),
+            sources=sources,
+        )
+    except sqlite3.Error as e:
+        logger.warning(f"⚠️ 本地文献库查询失败: {e}")
+        return None
+
+
+def remember_papers(papers: Iterable[Union[LiteratureRecord, Dict[str, Any]]]) -> None:
+    """把检索到的文献写入共享文献库；写入失败只记录日志，不影响检索结果"""
+    corpus = get_literature_corpus()
+    if corpus is None:
+        return
+    try:
+        corpus.upsert(papers)
+    except (sqlite3.Error, TypeError, ValueError) as e:
+        logger.warning(f"⚠️ 文献写入本地文献库失败: {e}")
+
+
+async def asearch_corpus_first(
+    query: str, limit: int, sources: Optional[Sequence[str]] = None
+) -> Optional[List[LiteratureRecord]]:
+    """search_corpus_first 的异步版本，SQLite 查询与 BM25 打分在线程中执行，不阻塞事件循环"""
+    return await asyncio.to_thread(search_corpus_first, query, limit, sources)
+
+
+async def aremember_papers(papers: Iterable[Union[LiteratureRecord, Dict[str, Any]]]) -> None:
+    """remember_papers 的异步版本，写入事务在线程中执行"""
+    papers = list(papers)
+    if papers:
+        await asyncio.to_thread(remember_papers, papers)
+
+
+@tool
+@log_io
+def literature_corpus_tool(
+    query: Annotated[str, "Keywords describing the papers to look up."],
+    limit: Annotated[int, "Maximum number of papers to return."] = 10,
+) -> str:
+    """Search papers already retrieved from PubMed and Google Scholar in earlier research runs.
+    Results come from a local index and return in milliseconds. Call this before PubMed or
+    Google Scholar; only search online when it returns nothing relevant or you need recent work."""
+    corpus = get_literature_corpus()
+    if corpus is None:
+        return "The local literature corpus is disabled."
+    hits = corpus.search(query, limit)
+    if not hits:
+        return "No papers found in the local literature corpus."
+    return "\n\n".join(
+        f"Title: {r.title}\nAuthors: {r.authors}\nJournal: {r.journal}\nYear: {r.year or ''}\n"
+        f"DOI: {r.doi}\nPMID: {r.pmid}\nURL: {r.url}\nAbstract: {r.abstract[:300]}"
+        for r in (hit.record for hit in hits)
+    )
@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+文献检索工具的结构化返回值
+
+PubMed、Google Scholar 工具在 return_records=True 时返回 LiteratureRecords：
+内部调用方直接读取字段，不再把格式化文本重新解析回字典；
+提供给模型的文本只在 str() 时才按各工具原有格式渲染。
+"""
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+_YEAR_PATTERN = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def parse_year(text: str) -> Optional[int]:
+    """从日期或出版信息中取出第一个年份"""
+    match = _YEAR_PATTERN.search(text or "")
+    return int(match.group(0)) if match else None
+
+
+@dataclass(slots=True)
+class LiteratureRecord:
+    """
+    精简文献记录
+
+    Attributes:
+        published: 原始出版信息，PubMed 为出版日期，Google Scholar 为
+            "作者 - 期刊, 年份 - 网站" 摘要行
+    """
+
+    title: str
+    abstract: str = ""
+    authors: str = ""
+    journal: str = ""
+    year: Optional[int] = None
+    doi: str = ""
+    pmid: str = ""
+    url: str = ""
+    source: str = ""
+    published: str = ""
+    cited_by: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class LiteratureRecords(List[LiteratureRecord]):
+    """
+    文献记录列表，str() 时才渲染为提供给模型的文本
+
+    Args:
+        records: 文献记录
+        renderer: 把记录列表渲染为文本的函数（需为模块级函数，以便写入搜索缓存）
+        empty_message: 没有记录时的文本
+    """
+
+    def __init__(
+        self,
+        records: Iterable[LiteratureRecord] = (),
+        renderer: Optional[Callable[[List[LiteratureRecord]], str]] = None,
+        empty_message: str = "",
+    ):
+        super().__init__(records)
+        self.renderer = renderer
+        self.empty_message = empty_message
+
+    def __str__(self) -> str:
+        if not self:
+            return self.empty_message
+        if self.renderer is None:
+            return "\n\n".join(f"Title: {record.title}" for record in self)
+        return self.renderer(self)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [record.to_dict() for record in self]
@@ -1,27 +1,179 @@
-from Bio import Entrez
-from typing import List, Dict, Any
+import logging
+import os
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Type
+
+import httpx
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import CallbackManagerForToolRun
-from typing import Optional, Type
 from pydantic import BaseModel, Field # For defining tool arguments schema
-import logging
+
+from src.tools.literature_corpus import remember_papers
+from src.tools.literature_record import LiteratureRecord, LiteratureRecords, parse_year
+from src.tools.search_cache import get_search_cache, make_cache_key
+from src.utils.http_client import get_sync_client
+from src.utils.rate_limiter import AsyncRateLimiter, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+
+NO_RESULT_MESSAGE = "No results found on PubMed for your query. 在PubMed中未找到相关的医学文献。请尝试调整搜索关键词或使用其他搜索工具。"
+
+
+def get_ncbi_rate_limiter(api_key: Optional[str] = None) -> AsyncRateLimiter:
+    """
+    NCBI E-utilities 共享令牌桶
+
+    NCBI 限制每个IP每秒3次请求，提供 API key 后为每秒10次；
+    所有 PubMed 调用（不论来自哪个工具实例或线程）共享同一个桶。
+    """
+    per_second = 10 if api_key else 3
+    return get_rate_limiter("ncbi_eutils", requests_per_minute=per_second * 60, burst=per_second)
+
+
+@dataclass(slots=True)
+class PubMedRecord:
+    """从 MEDLINE XML 中提取的精简文献记录"""
+
+    pmid: str
+    title: str = "N/A"
+    abstract: str = "N/A"
+    authors: str = "N/A"
+    journal: str = "N/A"
+    publication_date: str = "N/A"
+    doi: str = "N/A"
+
+    @property
+    def url(self) -> str:
+        return f"https://pubmed.ncbi.nlm.nih.gov/{self.pmid}/"
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["url"] = self.url
+        return data
+
+    def to_literature_record(self) -> LiteratureRecord:
+        def value(text: str) -> str:
+            return "" if text == "N/A" else text
+
+        return LiteratureRecord(
+            title=value(self.title),
+            abstract=value(self.abstract),
+            authors=value(self.authors),
+            journal=value(self.journal),
+            year=parse_year(value(self.publication_date)),
+            doi=value(self.doi),
+            pmid=value(self.pmid),
+            url=self.url,
+            source="pubmed",
+            published=value(self.publication_date),
+        )
+
+
+def _text(elem: Optional[ET.Element]) -> str:
+    """拼接元素内全部文本（标题/摘要中可能嵌有 <i>、<sup> 等标签）"""
+    if elem is None:
+        return ""
+    return " ".join("".join(elem.itertext()).split())
+
+
+def _parse_article(article: ET.Element) -> PubMedRecord:
+    citation = article.find("MedlineCitation")
+    info = citation.find("Article") if citation is not None else None
+    record = PubMedRecord(pmid=_text(citation.find("PMID")) if citation is not None else "N/A")
+    if info is None:
+        return record
+
+    record.title = _text(info.find("ArticleTitle")) or "N/A"
+
+    abstract_parts = []
+    for node in info.iterfind("Abstract/AbstractText"):
+        content = _text(node)
+        if not content:
+            continue
+        # 结构化摘要（BACKGROUND:、METHODS: 等）保留小节标签
+        label = node.get("Label")
+        abstract_parts.append(f"{label}: {content}" if label else content)
+    record.abstract = " ".join(abstract_parts) or "N/A"
+
+    authors = []
+    for author in info.iterfind("AuthorList/Author"):
+        last_name, fore_name = _text(author.find("LastName")), _text(author.find("ForeName"))
+        if last_name and fore_name:
+            authors.append(f"{fore_name} {last_name}")
+        elif author.find("CollectiveName") is not None:
+            authors.append(_text(author.find("CollectiveName")))
+    record.authors = ", ".join(authors) or "N/A"
+
+    journal = info.find("Journal")
+    if journal is not None:
+        record.journal = _text(journal.find("Title")) or "N/A"
+        pub_date = journal.find("JournalIssue/PubDate")
+        if pub_date is not None:
+            year = _text(pub_date.find("Year"))
+            if year:
+                month, day = _text(pub_date.find("Month")), _text(pub_date.find("Day"))
+                record.publication_date = f"{year}-{month}-{day}".strip("-")
+            elif pub_date.find("MedlineDate") is not None:
+                record.publication_date = _text(pub_date.find("MedlineDate"))
+
+    for article_id in article.iterfind("PubmedData/ArticleIdList/ArticleId"):
+        if article_id.get("IdType") == "doi":
+            record.doi = _text(article_id)
+            break
+    return record
+
+
+def iter_pubmed_articles(chunks: Iterable[bytes]) -> Iterator[PubMedRecord]:
+    """
+    增量解析 efetch 返回的 MEDLINE XML
+
+    每解析完一个 PubmedArticle 就产出一条记录并释放对应的元素树，
+    内存占用与单篇文献大小相关，而不是整个响应。
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == "PubmedArticle":
+                yield _parse_article(elem)
+                elem.clear()
+    parser.close()
+    for _, elem in parser.read_events():
+        if elem.tag == "PubmedArticle":
+            yield _parse_article(elem)
+
+
 class PubMedAPIWrapper:
     """
-    Wrapper for PubMed API using Bio.Entrez.
-    
-    This class handles searching PubMed and fetching article details.
+    Wrapper for the PubMed E-utilities API.
+
+    - esearch 使用历史服务器（WebEnv/query_key），大结果集按页从服务器端取回
+    - 多个查询的 PMID 合并去重后按 ID 批量 efetch，减少往返次数；批量结果按查询写入共享搜索缓存
+    - efetch 响应以流的方式增量解析为精简记录
+    - 所有请求经过 NCBI 共享令牌桶限流，并复用 keep-alive 连接
+
     It requires an email address to be provided to NCBI for API usage.
     """
-    def __init__(self, email: str = "huhu123178@gmail.com"):
+    def __init__(
+        self,
+        email: str = "huhu123178@gmail.com",
+        api_key: Optional[str] = None,
+        fetch_batch_size: int = 200,
+        timeout: float = 30.0,
+    ):
         """
         Initializes the PubMedAPIWrapper.
 
         Args:
             email: Your email address for NCBI Entrez API. 
                    It's crucial to change this to your actual email if it's still the placeholder.
+            api_key: NCBI API key (defaults to the NCBI_API_KEY environment variable),
+                   raises the rate limit from 3 to 10 requests per second.
+            fetch_batch_size: Number of records requested per efetch call.
+            timeout: Per-request timeout in seconds.
         """
         if email == "your_email@example.com": 
             print(
@@ -39,9 +191,158 @@ class PubMedAPIWrapper:
                 Please ensure you set a valid email address.
                 """
             )
-        
-        Entrez.email = email # Set your email here for NCBI
-        print(f"PubMedAPIWrapper initialized. NCBI Entrez email set to: {Entrez.email}")
+
+        self.email = email
+        self.api_key = api_key or os.getenv("NCBI_API_KEY") or None
+        self.fetch_batch_size = max(1, min(int(fetch_batch_size), 10000))
+        self.timeout = timeout
+        self.rate_limiter = get_ncbi_rate_limiter(self.api_key)
+        logger.info(f"PubMedAPIWrapper initialized. NCBI E-utilities email set to: {self.email}")
+
+    # ------------------------------------------------------------------
+    # E-utilities 请求
+    # ------------------------------------------------------------------
+
+    def _params(self, **params: Any) -> Dict[str, Any]:
+        params = {"db": "pubmed", "tool": "deer-flow", "email": self.email, **params}
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return {k: v for k, v in params.items() if v is not None}
+
+    def _esearch(self, query: str, max_results: int, use_history: bool = True) -> Dict[str, Any]:
+        """
+        执行 esearch，返回 PMID 列表；use_history 为真时结果存入历史服务器，
+        同时返回 WebEnv 和 query_key
+        """
+        self.rate_limiter.acquire_sync()
+        response = get_sync_client().get(
+            f"{EUTILS_BASE_URL}/esearch.fcgi",
+            params=self._params(
+                term=query,
+                retmax=max_results,
+                sort="relevance",
+                usehistory="y" if use_history else None,
+                retmode="json",
+            ),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        result = response.json().get("esearchresult", {})
+        if "ERROR" in result:
+            raise ValueError(f"esearch error: {result['ERROR']}")
+        return {
+            "ids": result.get("idlist", []),
+            "count": int(result.get("count", 0)),
+            "webenv": result.get("webenv"),
+            "query_key": result.get("querykey"),
+        }
+
+    def _efetch(self, **params: Any) -> Iterator[PubMedRecord]:
+        """以 POST 方式执行 efetch，并流式解析返回的 XML"""
+        self.rate_limiter.acquire_sync()
+        with get_sync_client().stream(
+            "POST",
+            f"{EUTILS_BASE_URL}/efetch.fcgi",
+            data=self._params(retmode="xml", **params),
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            yield from iter_pubmed_articles(response.iter_bytes())
+
+    def fetch_by_ids(self, pmids: Sequence[str]) -> Dict[str, PubMedRecord]:
+        """按 PMID 批量获取文献记录，每批 fetch_batch_size 条"""
+        records: Dict[str, PubMedRecord] = {}
+        unique_ids = list(dict.fromkeys(pmids))
+        for start in range(0, len(unique_ids), self.fetch_batch_size):
+            batch = unique_ids[start:start + self.fetch_batch_size]
+            for record in self._efetch(id=",".join(batch)):
+                records[record.pmid] = record
+        return records
+
+    def fetch_from_history(self, webenv: str, query_key: str, total: int) -> Dict[str, PubMedRecord]:
+        """从历史服务器分页取回某次 esearch 的前 total 条记录"""
+        records: Dict[str, PubMedRecord] = {}
+        for retstart in range(0, total, self.fetch_batch_size):
+            for record in self._efetch(
+                WebEnv=webenv,
+                query_key=query_key,
+                retstart=retstart,
+                retmax=min(self.fetch_batch_size, total - retstart),
+            ):
+                records[record.pmid] = record
+        return records
+
+    # ------------------------------------------------------------------
+    # 对外接口
+    # ------------------------------------------------------------------
+
+    def search_records(self, query: str, max_results: int = 10) -> List[PubMedRecord]:
+        """检索单个查询，按相关度返回精简记录；出错时抛出异常"""
+        found = self._esearch(query, max_results)
+        if not found["ids"]:
+            return []
+        total = min(max_results, found["count"])
+        if found["webenv"] and found["query_key"]:
+            records = self.fetch_from_history(found["webenv"], found["query_key"], total)
+        else:
+            records = self.fetch_by_ids(found["ids"])
+        remember_papers(record.to_literature_record() for record in records.values())
+        return [records[pmid] for pmid in found["ids"] if pmid in records]
+
+    def search_many_records(
+        self,
+        queries: Sequence[str],
+        max_results: int = 10,
+        errors: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, List[PubMedRecord]]:
+        """
+        批量检索多个查询
+
+        先查共享搜索缓存；未命中的查询各做一次 esearch（不使用历史服务器），
+        所有 PMID 合并去重后按 ID 批量 efetch，查询之间重叠的文献只取回一次，
+        取回的结果按查询写入缓存。
+
+        Args:
+            errors: 传入字典时，记录 esearch 失败的查询及原因（这些查询的结果为空列表）
+        """
+        cache = get_search_cache()
+        results: Dict[str, List[PubMedRecord]] = {}
+        id_lists: Dict[str, List[str]] = {}
+        cache_hits = 0
+        for query in dict.fromkeys(queries):
+            if cache is not None:
+                hit, cached = cache.get("pubmed", self._records_cache_key(query, max_results))
+                if hit:
+                    results[query] = cached
+                    cache_hits += 1
+                    continue
+            try:
+                found = self._esearch(query, max_results, use_history=False)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"PubMed esearch失败: '{query}' - {e}")
+                results[query] = []
+                if errors is not None:
+                    errors[query] = repr(e)
+                continue
+            id_lists[query] = found["ids"]
+
+        all_ids = [pmid for ids in id_lists.values() for pmid in ids]
+        records = self.fetch_by_ids(all_ids) if all_ids else {}
+        remember_papers(record.to_literature_record() for record in records.values())
+        logger.info(
+            f"📚 PubMed批量检索: {len(results) + len(id_lists)} 个查询（缓存命中 "
+            f"{cache_hits}）, {len(all_ids)} 个PMID, 去重后取回 {len(records)} 篇"
+        )
+        for query, ids in id_lists.items():
+            results[query] = [records[pmid] for pmid in ids if pmid in records]
+            if cache is not None:
+                cache.set("pubmed", self._records_cache_key(query, max_results), results[query], query=query)
+        return {query: results[query] for query in dict.fromkeys(queries)}
+
+    @staticmethod
+    def _records_cache_key(query: str, max_results: int) -> str:
+        # 与工具层的缓存条目（格式化文本）区分开，这里缓存的是 PubMedRecord 列表
+        return make_cache_key("pubmed", query, {"records": True, "max_results": max_results})
 
     def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -56,93 +357,67 @@ class PubMedAPIWrapper:
             with keys like 'title', 'abstract', 'authors', 'pmid', 'url', 'doi', etc.
             Returns an empty list if an error occurs or no results are found.
         """
-        papers_info = []
         try:
-            # 1. Use Entrez.esearch to get PMIDs
-            handle = Entrez.esearch(db="pubmed", term=query, retmax=str(max_results), sort="relevance")
-            record = Entrez.read(handle)
-            handle.close()
-            id_list = record["IdList"]
-
-            if not id_list:
-                print(f"PubMedAPIWrapper: No PMIDs found for query: '{query}'")
-                return []
-
-            # 2. Use Entrez.efetch to get article details from PMIDs
-            handle = Entrez.efetch(db="pubmed", id=id_list, rettype="medline", retmode="xml")
-            records = Entrez.read(handle) # This will be a list of PubmedArticle records
-            handle.close()
-
-            # 3. Parse the results and format them
-            for article_xml in records.get('PubmedArticle', []):
-                paper_data = {}
-                
-                # Basic article information
-                medline_citation = article_xml.get('MedlineCitation', {})
-                article_info = medline_citation.get('Article', {})
-
-                paper_data['pmid'] = str(medline_citation.get('PMID', 'N/A'))
-                paper_data['title'] = article_info.get('ArticleTitle', 'N/A')
-                
-                # Abstract
-                abstract_texts = []
-                abstract_node = article_info.get('Abstract', {})
-                if abstract_node:
-                    for abst_text_node in abstract_node.get('AbstractText', []):
-                        # AbstractText can be a string or a structured object
-                        if isinstance(abst_text_node, str):
-                            abstract_texts.append(abst_text_node)
-                        elif hasattr(abst_text_node, 'attributes') and 'Label' in abst_text_node.attributes:
-                            # Handle structured abstracts (e.g., BACKGROUND:, OBJECTIVE:)
-                            label = abst_text_node.attributes['Label']
-                            text_content = str(abst_text_node) if abst_text_node else ''
-                            abstract_texts.append(f"{label}: {text_content}")
-                        elif abst_text_node: # if it's just a plain string content
-                             abstract_texts.append(str(abst_text_node))
-                paper_data['abstract'] = "\\n".join(abstract_texts) if abstract_texts else 'N/A'
-
-                # Authors
-                authors_list = []
-                author_nodes = article_info.get('AuthorList', [])
-                if author_nodes:
-                    for author_node in author_nodes:
-                        if author_node.get('LastName') and author_node.get('ForeName'):
-                            authors_list.append(f"{author_node.get('ForeName')} {author_node.get('LastName')}")
-                        elif author_node.get('CollectiveName'):
-                             authors_list.append(author_node.get('CollectiveName'))
-                paper_data['authors'] = ", ".join(authors_list) if authors_list else 'N/A'
-                
-                # Journal Info (optional, but useful)
-                journal_info = article_info.get('Journal', {})
-                paper_data['journal'] = journal_info.get('Title', 'N/A')
-                
-                pub_date_node = journal_info.get('JournalIssue', {}).get('PubDate', {})
-                year = pub_date_node.get('Year', '')
-                month = pub_date_node.get('Month', '') # Month can be an abbreviation or number
-                day = pub_date_node.get('Day', '')
-                paper_data['publication_date'] = f"{year}-{month}-{day}".strip('-') if year else 'N/A'
-
-                # DOI
-                doi = 'N/A'
-                article_id_list = article_xml.get('PubmedData', {}).get('ArticleIdList', [])
-                for article_id in article_id_list:
-                    if article_id.attributes.get('IdType') == 'doi':
-                        doi = str(article_id)
-                        break
-                paper_data['doi'] = doi
-                
-                # URL to PubMed article
-                paper_data['url'] = f"https://pubmed.ncbi.nlm.nih.gov/{paper_data['pmid']}/"
-                
-                papers_info.append(paper_data)
-            
-            print(f"PubMedAPIWrapper: Found {len(papers_info)} articles for query: '{query}'")
+            papers_info = [record.to_dict() for record in self.search_records(query, max_results)]
+            logger.info(f"PubMedAPIWrapper: Found {len(papers_info)} articles for query: '{query}'")
             return papers_info
-
         except Exception as e:
-            print(f"PubMedAPIWrapper: Error during PubMed search for query '{query}': {e}")
+            logger.error(f"PubMedAPIWrapper: Error during PubMed search for query '{query}': {e}")
             return []
 
+    def search_many(self, queries: Sequence[str], max_results: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """search 的批量版本，返回 {查询: 文献字典列表}；出错时返回空字典"""
+        try:
+            return {
+                query: [record.to_dict() for record in records]
+                for query, records in self.search_many_records(queries, max_results).items()
+            }
+        except Exception as e:
+            logger.error(f"PubMedAPIWrapper: Error during batched PubMed search: {e}")
+            return {}
+
+
+def format_pubmed_results(results: List[Dict[str, Any]]) -> str:
+    """把文献字典列表格式化为提供给模型的文本"""
+    formatted_results = []
+    for i, paper in enumerate(results):
+        # Truncate abstract for brevity in the initial response to the LLM
+        abstract_snippet = paper.get('abstract', 'N/A')
+        if abstract_snippet and abstract_snippet != 'N/A' and len(abstract_snippet) > 300:
+            abstract_snippet = abstract_snippet[:297] + "..."
+
+        entry = (
+            f"Result {i+1}:\n"
+            f"  Title: {paper.get('title', 'N/A')}\n"
+            f"  Authors: {paper.get('authors', 'N/A')}\n"
+            f"  Abstract Snippet: {abstract_snippet}\n"
+            f"  PMID: {paper.get('pmid', 'N/A')}\n"
+            f"  URL: {paper.get('url', 'N/A')}\n"
+            f"  DOI: {paper.get('doi', 'N/A')}\n"
+            f"  Publication Date: {paper.get('publication_date', 'N/A')}\n"
+            f"  Journal: {paper.get('journal', 'N/A')}"
+        )
+        formatted_results.append(entry)
+    return "\n\n".join(formatted_results)
+
+
+def format_pubmed_records(records: List[LiteratureRecord]) -> str:
+    """LiteratureRecords 的文本视图，与 format_pubmed_results 的格式一致"""
+    return format_pubmed_results([
+        {
+            "title": record.title or "N/A",
+            "authors": record.authors or "N/A",
+            "abstract": record.abstract or "N/A",
+            "pmid": record.pmid or "N/A",
+            "url": record.url or "N/A",
+            "doi": record.doi or "N/A",
+            "publication_date": record.published or "N/A",
+            "journal": record.journal or "N/A",
+        }
+        for record in records
+    ])
+
+
 # Define the input schema for the tool
 class PubMedSearchInput(BaseModel):
     query: str = Field(description="The search query string for PubMed. Should use PubMed query syntax.")
@@ -161,6 +436,8 @@ class PubMedSearchTool(BaseTool):
     )
     args_schema: Type[BaseModel] = PubMedSearchInput
     pubmed_api_wrapper: PubMedAPIWrapper = Field(default_factory=lambda: PubMedAPIWrapper(email="huhu123178@gmail.com")) # Ensure email is set
+    # 为 True 时返回 LiteratureRecords（str() 即为原文本格式），检索出错时抛出异常而不是返回错误文本
+    return_records: bool = False
 
     def _run(
         self,
@@ -169,6 +446,8 @@ class PubMedSearchTool(BaseTool):
         run_manager: Optional[CallbackManagerForToolRun] = None
     ) -> str:
         """Use the tool."""
+        if self.return_records:
+            return self.search_records(query, max_results)
         try:
             logger.info(f"🔍 PubMed搜索开始: '{query}', max_results={max_results}")
             print(f"PubMedSearchTool: Received query='{query}', max_results={max_results}")
@@ -176,30 +455,10 @@ class PubMedSearchTool(BaseTool):
             
             if not results:
                 logger.warning(f"⚠️ PubMed搜索返回空结果: '{query}'")
-                return "No results found on PubMed for your query. 在PubMed中未找到相关的医学文献。请尝试调整搜索关键词或使用其他搜索工具。"
+                return NO_RESULT_MESSAGE
 
             logger.info(f"✅ PubMed搜索成功，找到 {len(results)} 篇文献")
-            formatted_results = []
-            for i, paper in enumerate(results):
-                # Truncate abstract for brevity in the initial response to the LLM
-                abstract_snippet = paper.get('abstract', 'N/A')
-                if abstract_snippet and abstract_snippet != 'N/A' and len(abstract_snippet) > 300:
-                    abstract_snippet = abstract_snippet[:297] + "..."
-                
-                entry = (
-                    f"Result {i+1}:\n"
-                    f"  Title: {paper.get('title', 'N/A')}\n"
-                    f"  Authors: {paper.get('authors', 'N/A')}\n"
-                    f"  Abstract Snippet: {abstract_snippet}\n"
-                    f"  PMID: {paper.get('pmid', 'N/A')}\n"
-                    f"  URL: {paper.get('url', 'N/A')}\n"
-                    f"  DOI: {paper.get('doi', 'N/A')}\n"
-                    f"  Publication Date: {paper.get('publication_date', 'N/A')}\n"
-                    f"  Journal: {paper.get('journal', 'N/A')}"
-                )
-                formatted_results.append(entry)
-            
-            return "\n\n".join(formatted_results)
+            return format_pubmed_results(results)
         except Exception as e:
             logger.error(f"❌ PubMed搜索失败: {e}")
             error_msg = f"PubMed搜索出现错误: {str(e)}"
@@ -214,6 +473,16 @@ class PubMedSearchTool(BaseTool):
             
             return error_msg
 
+    def search_records(self, query: str, max_results: int = 5) -> LiteratureRecords:
+        """检索并返回结构化记录；出错时抛出异常"""
+        logger.info(f"🔍 PubMed记录检索: '{query}', max_results={max_results}")
+        records = self.pubmed_api_wrapper.search_records(query, max_results)
+        return LiteratureRecords(
+            (record.to_literature_record() for record in records),
+            renderer=format_pubmed_records,
+            empty_message=NO_RESULT_MESSAGE,
+        )
+
     # async def _arun(
     #     self, query: str, run_manager: Optional[CallbackManagerForToolRun] = None
     # ) -> str:
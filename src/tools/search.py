@@ -24,13 +24,14 @@ from src.tools.decorators import create_logged_tool
 logger = logging.getLogger(__name__)
 
 # Create logged versions of the search tools
-LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages)
-LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults)
-LoggedBraveSearch = create_logged_tool(BraveSearch)
-LoggedArxivSearch = create_logged_tool(ArxivQueryRun)
-LoggedPubMedSearch = create_logged_tool(PubMedSearchTool)
-LoggedGoogleScholarSearch = create_logged_tool(GoogleScholarSearchTool)
-LoggedGoogleSearch = create_logged_tool(GoogleSerperRun)
+# Search results are shared across tools/runs through the search cache
+LoggedTavilySearch = create_logged_tool(TavilySearchResultsWithImages, cache_engine="tavily")
+LoggedDuckDuckGoSearch = create_logged_tool(DuckDuckGoSearchResults, cache_engine="duckduckgo")
+LoggedBraveSearch = create_logged_tool(BraveSearch, cache_engine="brave")
+LoggedArxivSearch = create_logged_tool(ArxivQueryRun, cache_engine="arxiv")
+LoggedPubMedSearch = create_logged_tool(PubMedSearchTool, cache_engine="pubmed")
+LoggedGoogleScholarSearch = create_logged_tool(GoogleScholarSearchTool, cache_engine="google_scholar")
+LoggedGoogleSearch = create_logged_tool(GoogleSerperRun, cache_engine="serper")
 
 
 # Get the selected search tool
@@ -99,22 +100,31 @@ def get_web_search_tool(max_search_results: int, search_strategy: str = "auto",
 
 
 # New function to specifically get the PubMed tool
-def get_pubmed_search_tool(max_results: int = 10):
-    """Returns an instance of the LoggedPubMedSearch tool."""
+def get_pubmed_search_tool(max_results: int = 10, return_records: bool = False):
+    """Returns an instance of the LoggedPubMedSearch tool.
+
+    With ``return_records=True`` the tool returns LiteratureRecords instead of text.
+    """
     logger.info(f"Providing PubMedSearchTool with max_results: {max_results}")
-    return LoggedPubMedSearch()
+    return LoggedPubMedSearch(return_records=return_records)
 
 
 # New function to specifically get the Google Scholar tool
-def get_google_scholar_search_tool(top_k_results: int = 10, hl: str = "en", lr: str = "lang_en"):
-    """Returns an instance of the LoggedGoogleScholarSearch tool."""
+def get_google_scholar_search_tool(
+    top_k_results: int = 10, hl: str = "en", lr: str = "lang_en", return_records: bool = False
+):
+    """Returns an instance of the LoggedGoogleScholarSearch tool.
+
+    With ``return_records=True`` the tool returns LiteratureRecords instead of text.
+    """
     logger.info(f"Providing GoogleScholarSearchTool with top_k_results: {top_k_results}, hl: {hl}, lr: {lr}.")
     try:
-        return GoogleScholarSearchTool(
+        return LoggedGoogleScholarSearch(
             name="google_scholar_search",
             top_k_results=top_k_results,
             hl=hl,
-            lr=lr
+            lr=lr,
+            return_records=return_records,
         )
     except ValueError as e:
         logger.error(f"Failed to initialize GoogleScholarSearchTool: {e}. SERPAPI_API_KEY might be missing or invalid.")
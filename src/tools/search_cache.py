@@ -0,0 +1,487 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+搜索结果共享缓存
+
+所有搜索工具（Tavily、DuckDuckGo、Brave、Serper、ArXiv、PubMed、Google Scholar）
+共用同一个缓存层：
+- 缓存键由规范化后的 (引擎, 查询, 参数) 计算得到，与调用方无关
+- 内存 LRU 在前，SQLite 磁盘存储在后，进程重启后缓存依然有效
+- 每个搜索引擎可单独配置 TTL
+- 相同请求并发到达时只发起一次网络请求（single-flight），其余请求等待同一结果；
+  发起请求的调用方被取消时让出在途名额，由某个等待者重新发起
+- 按引擎统计命中/未命中次数，可通过 /api/search/cache/metrics 查看
+
+通过 conf.yaml 的 SEARCH_CACHE 段配置：
+
+```yaml
+SEARCH_CACHE:
+  enabled: true
+  path: ./data/search_cache.sqlite   # 留空则只使用内存缓存
+  memory_max_entries: 512
+  default_ttl_hours: 24
+  ttl_hours:                         # 按引擎覆盖默认 TTL
+    pubmed: 168
+    google_scholar: 168
+```
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_HOURS = {
+    "tavily": 24,
+    "duckduckgo": 24,
+    "brave": 24,
+    "serper": 24,
+    "arxiv": 72,
+    "pubmed": 168,
+    "google_scholar": 168,
+}
+
+# 发起请求的调用方被取消时交给等待者的标记，等待者收到后重新认领
+_RETRY = object()
+
+# 搜索工具以字符串形式返回的错误/空结果，不应写入缓存
+_UNCACHEABLE_MARKERS = ("出现错误", "No results found", "No good Google Scholar Result")
+
+# 不影响搜索结果的工具字段，不参与缓存键计算
+_IGNORED_PARAMS = {
+    "name",
+    "description",
+    "verbose",
+    "callbacks",
+    "callback_manager",
+    "tags",
+    "metadata",
+    "handle_tool_error",
+    "handle_validation_error",
+    "return_direct",
+    "args_schema",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    query TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_cache_expires_at ON search_cache(expires_at);
+"""
+
+
+def normalize_query(query: Any) -> str:
+    """规范化查询字符串：去除首尾空白、合并连续空白并转为小写"""
+    return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+
+def make_cache_key(engine: str, query: Any, params: Optional[Dict[str, Any]] = None) -> str:
+    """根据 (引擎, 规范化查询, 参数) 计算缓存键"""
+    payload = json.dumps(
+        [engine, normalize_query(query), params or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """判断搜索结果是否可以缓存（错误信息和空结果不缓存）"""
+    if result is None:
+        return False
+    if isinstance(result, tuple) and len(result) == 2:
+        content, artifact = result
+        # Tavily 出错时返回 (repr(e), {})
+        if isinstance(content, str) and not artifact:
+            return False
+        return is_cacheable_result(content)
+    if isinstance(result, str):
+        head = result[:200]
+        return bool(result.strip()) and not any(marker in head for marker in _UNCACHEABLE_MARKERS)
+    if isinstance(result, (list, dict)):
+        return len(result) > 0
+    return True
+
+
+class SearchCache:
+    """内存 LRU + SQLite 磁盘两级搜索缓存，带 single-flight 请求合并"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        memory_max_entries: int = 512,
+        default_ttl_seconds: float = 24 * 3600,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+    ):
+        self.path = str(path) if path else None
+        self.memory_max_entries = max(1, int(memory_max_entries))
+        self.default_ttl_seconds = default_ttl_seconds
+        self.ttl_seconds = dict(ttl_seconds or {})
+
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.path:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # 统计
+    # ------------------------------------------------------------------
+
+    def _count(self, engine: str, field: str) -> None:
+        stats = self._metrics.setdefault(
+            engine,
+            {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "stores": 0},
+        )
+        stats[field] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """按引擎返回命中/未命中统计"""
+        with self._lock:
+            engines = {}
+            for engine, stats in self._metrics.items():
+                hits = stats["memory_hits"] + stats["disk_hits"] + stats["coalesced"]
+                total = hits + stats["misses"]
+                engines[engine] = {
+                    **stats,
+                    "hit_rate": round(hits / total, 4) if total else 0.0,
+                }
+            return {
+                "memory_entries": len(self._memory),
+                "inflight": len(self._inflight),
+                "disk_path": self.path,
+                "engines": engines,
+            }
+
+    # ------------------------------------------------------------------
+    # 读写
+    # ------------------------------------------------------------------
+
+    def ttl_for(self, engine: str) -> float:
+        return self.ttl_seconds.get(engine, self.default_ttl_seconds)
+
+    def get(self, engine: str, key: str) -> Tuple[bool, Any]:
+        """查询缓存，返回 (是否命中, 结果)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(engine, "memory_hits")
+                    return True, value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if row[1] > now:
+                        try:
+                            value = pickle.loads(row[0])
+                        except Exception as e:
+                            logger.warning(f"⚠️ 搜索缓存条目损坏，已忽略: {e}")
+                        else:
+                            self._remember(key, row[1], value)
+                            self._count(engine, "disk_hits")
+                            return True, value
+                    self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+        return False, None
+
+    def set(self, engine: str, key: str, value: Any, query: str = "") -> None:
+        """写入缓存（错误/空结果会被忽略）"""
+        if not is_cacheable_result(value):
+            return
+        now = time.time()
+        expires_at = now + self.ttl_for(engine)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._count(engine, "stores")
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO search_cache "
+                        "(key, engine, query, value, created_at, expires_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, engine, normalize_query(query), pickle.dumps(value), now, expires_at),
+                    )
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    logger.debug(f"搜索结果无法序列化，仅保存在内存缓存中: {e}")
+
+    def _remember(self, key: str, expires_at: float, value: Any) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """删除磁盘中已过期的条目，返回删除数量"""
+        if self._conn is None:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM search_cache WHERE expires_at <= ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._metrics.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # single-flight
+    # ------------------------------------------------------------------
+
+    def _claim(self, engine: str, key: str) -> Tuple[bool, Any]:
+        """
+        查询缓存或登记在途请求
+
+        Returns:
+            (True, 结果)：缓存命中
+            (False, Future)：已有相同请求在途，等待该 Future
+            (False, None)：当前调用方负责发起请求
+        """
+        with self._lock:
+            hit, value = self.get(engine, key)
+            if hit:
+                return True, value
+            future = self._inflight.get(key)
+            if future is not None:
+                self._count(engine, "coalesced")
+                return False, future
+            self._inflight[key] = Future()
+            self._count(engine, "misses")
+            return False, None
+
+    def _resolve(self, engine: str, key: str, query: str, value: Any = None, error: BaseException = None) -> None:
+        with self._lock:
+            future = self._inflight.pop(key)
+            if error is None:
+                self.set(engine, key, value, query=query)
+        if error is None:
+            future.set_result(value)
+        else:
+            future.set_exception(error)
+
+    def _abandon(self, key: str) -> None:
+        """发起请求的调用方被取消或中断：让出在途名额，通知等待者重新认领"""
+        with self._lock:
+            future = self._inflight.pop(key, None)
+        if future is not None:
+            future.set_result(_RETRY)
+
+    async def _aclaim(self, engine: str, key: str) -> Tuple[bool, Any]:
+        """在线程中执行 _claim（会读 SQLite），调用方被取消时让出已登记的在途名额"""
+        claim = asyncio.ensure_future(asyncio.to_thread(self._claim, engine, key))
+        try:
+            return await asyncio.shield(claim)
+        except asyncio.CancelledError:
+            def release(task: "asyncio.Future") -> None:
+                if not task.cancelled() and task.exception() is None and task.result() == (False, None):
+                    self._abandon(key)
+
+            claim.add_done_callback(release)
+            raise
+
+    def get_or_compute(self, engine: str, query: str, params: Optional[Dict[str, Any]], compute: Callable[[], Any]) -> Any:
+        """同步获取结果：命中缓存直接返回，相同请求在途时等待其结果，否则执行 compute"""
+        key = make_cache_key(engine, query, params)
+        while True:
+            hit, value = self._claim(engine, key)
+            if hit:
+                return value
+            if value is None:
+                break
+            result = value.result()
+            if result is not _RETRY:
+                return result
+        try:
+            result = compute()
+        except Exception as e:
+            self._resolve(engine, key, query, error=e)
+            raise
+        except BaseException:
+            self._abandon(key)
+            raise
+        self._resolve(engine, key, query, value=result)
+        return result
+
+    async def aget_or_compute(self, engine: str, query: str, params: Optional[Dict[str, Any]], compute: Callable[[], Any]) -> Any:
+        """
+        异步版本的 get_or_compute，compute 返回协程
+
+        取消只影响被取消的调用方：等待者被取消不会取消共享的结果，
+        发起请求的调用方被取消时由一个等待者重新发起请求。
+        读写 SQLite 的步骤在线程中执行，不阻塞事件循环。
+        """
+        key = make_cache_key(engine, query, params)
+        while True:
+            hit, value = await self._aclaim(engine, key)
+            if hit:
+                return value
+            if value is None:
+                break
+            result = await asyncio.shield(asyncio.wrap_future(value))
+            if result is not _RETRY:
+                return result
+        try:
+            result = await compute()
+        except Exception as e:
+            self._resolve(engine, key, query, error=e)
+            raise
+        except BaseException:
+            self._abandon(key)
+            raise
+        await asyncio.to_thread(self._resolve, engine, key, query, value=result)
+        return result
+
+
+class CachedToolMixin:
+    """为搜索工具增加共享缓存的 mixin，需与 BaseTool 子类组合使用"""
+
+    search_cache_engine: ClassVar[Optional[str]] = None
+
+    def _cache_params(self, args: tuple, kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """拆出查询字符串，并收集影响搜索结果的参数"""
+        call_kwargs = {k: v for k, v in kwargs.items() if k != "run_manager"}
+        query = call_kwargs.pop("query", None)
+        if query is None and args:
+            query, args = args[0], args[1:]
+
+        params: Dict[str, Any] = {"args": list(args), "kwargs": call_kwargs}
+        params["tool"] = _scalar_fields(
+            {name: getattr(self, name, None) for name in getattr(type(self), "model_fields", {})}
+        )
+        api_wrapper = getattr(self, "api_wrapper", None) or getattr(self, "search_wrapper", None)
+        if api_wrapper is not None:
+            params["wrapper"] = _scalar_fields(vars(api_wrapper))
+        return "" if query is None else str(query), params
+
+    def _run(self, *args: Any, **kwargs: Any) -> Any:
+        cache = get_search_cache()
+        if cache is None or not self.search_cache_engine:
+            return super()._run(*args, **kwargs)
+        query, params = self._cache_params(args, kwargs)
+        return cache.get_or_compute(
+            self.search_cache_engine, query, params, lambda: super(CachedToolMixin, self)._run(*args, **kwargs)
+        )
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        cache = get_search_cache()
+        if cache is None or not self.search_cache_engine:
+            return await super()._arun(*args, **kwargs)
+        query, params = self._cache_params(args, kwargs)
+        return await cache.aget_or_compute(
+            self.search_cache_engine, query, params, lambda: super(CachedToolMixin, self)._arun(*args, **kwargs)
+        )
+
+
+def _scalar_fields(values: Dict[str, Any]) -> Dict[str, Any]:
+    """只保留标量/标量列表字段，并排除密钥类字段"""
+    result = {}
+    for name, value in values.items():
+        if name.startswith("_") or name in _IGNORED_PARAMS:
+            continue
+        lowered = name.lower()
+        if "key" in lowered or "token" in lowered or "secret" in lowered:
+            continue
+        if value is None or isinstance(value, (str, int, float, bool)):
+            result[name] = value
+        elif isinstance(value, (list, tuple)) and all(
+            v is None or isinstance(v, (str, int, float, bool)) for v in value
+        ):
+            result[name] = list(value)
+    return result
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_initialized = False
+_search_cache_lock = threading.Lock()
+
+
+def create_search_cache(settings: Optional[dict] = None) -> Optional[SearchCache]:
+    """
+    根据 conf.yaml 的 SEARCH_CACHE 段创建搜索缓存
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+
+    Returns:
+        SearchCache，配置为禁用时返回 None
+    """
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("SEARCH_CACHE") or {}
+
+    if not settings.get("enabled", True):
+        logger.info("🔍 搜索缓存已禁用")
+        return None
+
+    ttl_hours = {**DEFAULT_TTL_HOURS, **(settings.get("ttl_hours") or {})}
+    cache = SearchCache(
+        settings.get("path", "./data/search_cache.sqlite"),
+        memory_max_entries=settings.get("memory_max_entries", 512),
+        default_ttl_seconds=settings.get("default_ttl_hours", 24) * 3600,
+        ttl_seconds={engine: hours * 3600 for engine, hours in ttl_hours.items()},
+    )
+    logger.info(f"🔍 搜索缓存已启用，磁盘存储: {cache.path or '无（仅内存）'}")
+    return cache
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """获取进程内共享的搜索缓存（首次调用时创建）"""
+    global _search_cache, _search_cache_initialized
+    if not _search_cache_initialized:
+        with _search_cache_lock:
+            if not _search_cache_initialized:
+                _search_cache = create_search_cache()
+                _search_cache_initialized = True
+    return _search_cache
+
+
+def set_search_cache(cache: Optional[SearchCache]) -> None:
+    """替换共享的搜索缓存（传入 None 表示禁用缓存）"""
+    global _search_cache, _search_cache_initialized
+    with _search_cache_lock:
+        _search_cache = cache
+        _search_cache_initialized = True
@@ -1,13 +1,13 @@
 import json
 from typing import Dict, List, Optional
 
-import aiohttp
-import requests
 from langchain_community.utilities.tavily_search import TAVILY_API_URL
 from langchain_community.utilities.tavily_search import (
     TavilySearchAPIWrapper as OriginalTavilySearchAPIWrapper,
 )
 
+from src.utils.http_client import arequest, request
+
 
 class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
     def raw_results(
@@ -34,11 +34,7 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
             "include_images": include_images,
             "include_image_descriptions": include_image_descriptions,
         }
-        response = requests.post(
-            # type: ignore
-            f"{TAVILY_API_URL}/search",
-            json=params,
-        )
+        response = request("POST", f"{TAVILY_API_URL}/search", json=params)
         response.raise_for_status()
         return response.json()
 
@@ -70,13 +66,11 @@ class EnhancedTavilySearchAPIWrapper(OriginalTavilySearchAPIWrapper):
                 "include_images": include_images,
                 "include_image_descriptions": include_image_descriptions,
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{TAVILY_API_URL}/search", json=params) as res:
-                    if res.status == 200:
-                        data = await res.text()
-                        return data
-                    else:
-                        raise Exception(f"Error {res.status}: {res.reason}")
+            res = await arequest("POST", f"{TAVILY_API_URL}/search", json=params)
+            if res.status_code == 200:
+                return res.text
+            else:
+                raise Exception(f"Error {res.status_code}: {res.reason_phrase}")
 
         results_json_str = await fetch()
         return json.loads(results_json_str)
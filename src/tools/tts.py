@@ -8,9 +8,12 @@ Text-to-Speech module using volcengine TTS API.
 import json
 import uuid
 import logging
-import requests
 from typing import Optional, Dict, Any
 
+import httpx
+
+from src.utils.http_client import get_sync_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +29,7 @@ class VolcengineTTS:
         cluster: str = "volcano_tts",
         voice_type: str = "BV700_V2_streaming",
         host: str = "openspeech.bytedance.com",
+        client: Optional[httpx.Client] = None,
     ):
         """
         Initialize the volcengine TTS client.
@@ -36,6 +40,7 @@ class VolcengineTTS:
             cluster: TTS cluster name
             voice_type: Voice type to use
             host: API host
+            client: Optional HTTP client (defaults to the shared pooled client)
         """
         self.appid = appid
         self.access_token = access_token
@@ -44,6 +49,7 @@ class VolcengineTTS:
         self.host = host
         self.api_url = f"https://{host}/api/v1/tts"
         self.header = {"Authorization": f"Bearer;{access_token}"}
+        self.client = client
 
     def text_to_speech(
         self,
@@ -56,6 +62,7 @@ class VolcengineTTS:
         with_frontend: int = 1,
         frontend_type: str = "unitTson",
         uid: Optional[str] = None,
+        voice_type: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Convert text to speech using volcengine TTS API.
@@ -70,6 +77,7 @@ class VolcengineTTS:
             with_frontend: Whether to use frontend processing
             frontend_type: Frontend type
             uid: User ID (generated if not provided)
+            voice_type: Voice type for this call (defaults to the client's voice)
 
         Returns:
             Dictionary containing the API response and base64-encoded audio data
@@ -85,7 +93,7 @@ class VolcengineTTS:
             },
             "user": {"uid": uid},
             "audio": {
-                "voice_type": self.voice_type,
+                "voice_type": voice_type or self.voice_type,
                 "encoding": encoding,
                 "speed_ratio": speed_ratio,
                 "volume_ratio": volume_ratio,
@@ -103,8 +111,9 @@ class VolcengineTTS:
 
         try:
             logger.debug(f"Sending TTS request for text: {text[:50]}...")
-            response = requests.post(
-                self.api_url, json.dumps(request_json), headers=self.header
+            client = self.client or get_sync_client()
+            response = client.post(
+                self.api_url, content=json.dumps(request_json), headers=self.header
             )
             response_json = response.json()
 
@@ -0,0 +1,56 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+阻塞调用检测
+
+在事件循环线程中发起同步 LLM 调用会冻结整个 uvicorn 事件循环，
+所有其他 SSE 流和 API 请求都会被卡住。check_blocking_call 用于在同步调用入口处
+检测这种情况，行为由环境变量 BLOCKING_CALL_GUARD 控制：
+
+- warn（默认）：记录一条带调用栈的警告
+- raise：抛出 BlockingCallError，适合测试和开发环境
+- off：不做检测
+"""
+
+import asyncio
+import logging
+import os
+import traceback
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingCallError(RuntimeError):
+    """在事件循环线程中发起了阻塞调用"""
+
+
+def get_guard_mode() -> str:
+    """获取当前检测模式"""
+    mode = os.getenv("BLOCKING_CALL_GUARD", "warn").strip().lower()
+    return mode if mode in ("warn", "raise", "off") else "warn"
+
+
+def check_blocking_call(call_name: str) -> None:
+    """
+    检测当前线程是否正在运行事件循环
+
+    Args:
+        call_name: 被检测的同步调用名称，用于日志
+    """
+    mode = get_guard_mode()
+    if mode == "off":
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # 当前线程没有运行中的事件循环（例如 LangGraph 在线程池中执行同步节点），不会阻塞
+        return
+
+    message = (
+        f"检测到在事件循环中同步调用 {call_name}，这会阻塞所有并发请求，请改用异步接口（如 ainvoke）"
+    )
+    if mode == "raise":
+        raise BlockingCallError(message)
+    stack = "".join(traceback.format_stack(limit=8)[:-1])
+    logger.warning(f"⚠️ {message}\n{stack}")
@@ -0,0 +1,178 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+并发研究方向生成引擎
+
+将多个独立的 LLM 生成任务并发执行：
+- 通过信号量限制同时进行的请求数
+- 通过共享令牌桶遵守提供方的速率限制
+- 单个任务失败只重试该任务，不影响整个批次
+- 指定章节标题格式时，被长度限制截断的输出从最后一个完整章节处续写，而不是整段重试
+- 结果按任务顺序返回，并记录每个任务的耗时
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from src.utils.continuation import SectionTracker, generate_with_continuation
+from src.utils.rate_limiter import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GenerationTask:
+    """单个生成任务"""
+
+    index: int
+    direction: str
+    prompt: str
+
+
+@dataclass
+class GenerationResult:
+    """单个生成任务的结果"""
+
+    index: int
+    direction: str
+    content: str = ""
+    success: bool = False
+    attempts: int = 0
+    continuations: int = 0
+    latency: float = 0.0
+    error: Optional[str] = None
+
+
+def extract_response_text(response: Any) -> str:
+    """兼容不同 LLM 响应格式，提取文本内容"""
+    if hasattr(response, "content"):
+        content = response.content
+    elif isinstance(response, dict) and "content" in response:
+        content = response["content"]
+    else:
+        content = response
+    return content if isinstance(content, str) else str(content)
+
+
+class ConcurrentGenerationEngine:
+    """有界并发 + 限流 + 单任务重试的生成引擎"""
+
+    def __init__(
+        self,
+        llm,
+        max_concurrency: int = 4,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 2.0,
+        min_content_length: int = 100,
+        timeout: Optional[float] = None,
+        section_pattern: Optional[str] = None,
+        max_continuations: int = 2,
+    ):
+        """
+        Args:
+            llm: 支持 ainvoke 的 LLM 实例
+            max_concurrency: 同时进行的最大请求数
+            rate_limiter: 提供方共享的限流器，None 表示不限流
+            max_retries: 单个任务失败后的最大重试次数
+            retry_backoff: 重试的指数退避基数（秒）
+            min_content_length: 低于该长度的响应视为失败并重试
+            timeout: 单次请求超时时间（秒，包含续写），None 表示不限制
+            section_pattern: 章节标题的正则（第1组为章节号），设置后流式生成并在截断时续写
+            max_continuations: 单次请求最多续写次数
+        """
+        self.llm = llm
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.rate_limiter = rate_limiter
+        self.max_retries = max(0, int(max_retries))
+        self.retry_backoff = retry_backoff
+        self.min_content_length = min_content_length
+        self.timeout = timeout
+        self.section_pattern = section_pattern
+        self.max_continuations = max_continuations
+
+    async def _generate(self, prompt: str) -> Tuple[str, int]:
+        messages = [{"role": "user", "content": prompt}]
+        if self.section_pattern is None:
+            return extract_response_text(await self.llm.ainvoke(messages)), 0
+        result = await generate_with_continuation(
+            self.llm, messages, SectionTracker(self.section_pattern), self.max_continuations
+        )
+        return result.content, result.continuations
+
+    async def _call_llm(self, prompt: str) -> Tuple[str, int]:
+        """返回 (生成内容, 续写次数)"""
+        if self.timeout:
+            return await asyncio.wait_for(self._generate(prompt), timeout=self.timeout)
+        return await self._generate(prompt)
+
+    async def _run_task(
+        self, task: GenerationTask, semaphore: asyncio.Semaphore
+    ) -> GenerationResult:
+        result = GenerationResult(index=task.index, direction=task.direction)
+        start = time.perf_counter()
+
+        for attempt in range(self.max_retries + 1):
+            result.attempts = attempt + 1
+            try:
+                async with semaphore:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire()
+                    content, continuations = await self._call_llm(task.prompt)
+                result.continuations += continuations
+
+                if len(content.strip()) < self.min_content_length:
+                    raise ValueError(f"生成内容过短，长度: {len(content.strip())}")
+
+                result.content = content
+                result.success = True
+                result.error = None
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result.error = str(e)
+                logger.warning(
+                    f"⚠️ 第{task.index}个方向第{attempt + 1}次生成失败: {e}"
+                )
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self.retry_backoff * (2**attempt))
+
+        result.latency = time.perf_counter() - start
+        status = "✅" if result.success else "❌"
+        logger.info(
+            f"{status} 第{task.index}个方向完成，耗时 {result.latency:.1f}s，尝试 {result.attempts} 次"
+        )
+        return result
+
+    async def run(
+        self,
+        tasks: List[GenerationTask],
+        on_result: Optional[Callable[[GenerationResult], Awaitable[None]]] = None,
+    ) -> List[GenerationResult]:
+        """
+        并发执行所有任务
+
+        Args:
+            tasks: 生成任务列表
+            on_result: 每个任务完成时的异步回调（按完成顺序触发）
+
+        Returns:
+            List[GenerationResult]: 与 tasks 顺序一致的结果列表
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info(
+            f"🚀 并发生成 {len(tasks)} 个任务，最大并发 {self.max_concurrency}"
+        )
+
+        async def run_and_notify(task: GenerationTask) -> GenerationResult:
+            result = await self._run_task(task, semaphore)
+            if on_result is not None:
+                await on_result(result)
+            return result
+
+        return list(await asyncio.gather(*(run_and_notify(t) for t in tasks)))
@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+截断感知的续写
+
+流式读取模型输出，边读边用 SectionTracker 记录章节标题（只扫描新到达的完整行）。
+输出因长度限制被截断（finish_reason == "length"）时，丢弃最后一个不完整的章节，
+让模型从该章节开始续写，再把各段拼接起来；已经写完的章节不会重新生成。
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, HumanMessage, convert_to_messages
+
+logger = logging.getLogger(__name__)
+
+# 报告中的研究方向标题，如 "### 研究方向3：..." 或 "## 方向12"
+DIRECTION_SECTION_PATTERN = r"^#{2,4}\s*(?:研究)?方向\s*(\d+)"
+# 单个研究方向内的小节标题，如 "#### 3.5 研究内容"
+DIRECTION_PART_PATTERN = r"^#{3,4}\s*\d+\.(\d+)"
+
+
+class SectionTracker:
+    """
+    增量记录文本中的章节标题
+
+    标题只在整行到达后匹配，每行只扫描一次；sections 为 (章节号, 起始位置, 标题行) 列表。
+    """
+
+    def __init__(self, pattern: str = DIRECTION_SECTION_PATTERN):
+        self.pattern = re.compile(pattern, re.MULTILINE)
+        self.text = ""
+        self.sections: List[Tuple[str, int, str]] = []
+        self._scanned = 0
+
+    def _scan(self, end: int) -> None:
+        for match in self.pattern.finditer(self.text, self._scanned, end):
+            line_end = self.text.find("\n", match.start())
+            heading = self.text[match.start(): line_end if line_end != -1 else len(self.text)]
+            self.sections.append((match.group(1), match.start(), heading.strip()))
+        self._scanned = end
+
+    def feed(self, text: str) -> None:
+        """追加一段输出，扫描其中新完成的行"""
+        if not text:
+            return
+        self.text += text
+        last_newline = self.text.rfind("\n", self._scanned)
+        if last_newline != -1:
+            self._scan(last_newline + 1)
+
+    def finish(self) -> None:
+        """输出结束，扫描最后一行"""
+        self._scan(len(self.text))
+
+    @property
+    def ids(self) -> List[str]:
+        """出现过的章节号（去重，按首次出现的顺序）"""
+        return list(dict.fromkeys(section_id for section_id, _, _ in self.sections))
+
+    def resume_point(self) -> Tuple[int, Optional[str]]:
+        """
+        续写的起点：最后一个章节之前都是完整的，返回 (该章节起始位置, 标题行)
+
+        没有可丢弃的章节（没有标题或唯一的标题在开头）时返回 (文本末尾, None)。
+        """
+        if self.sections and self.sections[-1][1] > 0:
+            _, offset, heading = self.sections[-1]
+            return offset, heading
+        return len(self.text), None
+
+    def truncate(self, offset: int) -> None:
+        """丢弃 offset 之后的文本和章节"""
+        self.text = self.text[:offset]
+        self.sections = [section for section in self.sections if section[1] < offset]
+        self._scanned = min(self._scanned, offset)
+
+
+@dataclass
+class ContinuationResult:
+    """续写生成的结果"""
+
+    content: str
+    sections: List[str] = field(default_factory=list)
+    continuations: int = 0
+    truncated: bool = False
+    finish_reason: Optional[str] = None
+
+
+def _continue_prompt(heading: Optional[str]) -> str:
+    if heading:
+        return (
+            f"上面的输出因长度限制被截断，已保留「{heading}」之前的完整内容。"
+            f"请从「{heading}」开始继续输出（包含该标题），不要重复之前的内容，也不要添加任何说明。"
+        )
+    return "上面的输出因长度限制被截断。请从截断处直接继续输出，不要重复已输出的内容，也不要添加任何说明。"
+
+
+async def generate_with_continuation(
+    llm: Any,
+    messages: Sequence[Any],
+    tracker: Optional[SectionTracker] = None,
+    max_continuations: int = 2,
+) -> ContinuationResult:
+    """
+    流式生成，输出被截断时从最后一个完整章节处续写
+
+    Args:
+        llm: 支持 astream 的聊天模型
+        messages: 输入消息（消息对象或 {"role", "content"} 字典）
+        tracker: 章节记录器，None 时按研究方向标题划分章节
+        max_continuations: 最多续写次数
+
+    Returns:
+        ContinuationResult，content 为拼接后的完整输出
+    """
+    tracker = tracker or SectionTracker()
+    messages = convert_to_messages(messages)
+    request = messages
+    continuations = 0
+
+    while True:
+        finish_reason = None
+        async for chunk in llm.astream(request):
+            content = chunk.content
+            tracker.feed(content if isinstance(content, str) else str(content))
+            finish_reason = (chunk.response_metadata or {}).get("finish_reason") or finish_reason
+        tracker.finish()
+
+        if finish_reason != "length":
+            break
+        if continuations >= max_continuations:
+            logger.warning(f"⚠️ 已续写 {continuations} 次，输出仍被截断")
+            break
+
+        continuations += 1
+        offset, heading = tracker.resume_point()
+        logger.info(
+            f"✂️ 输出被截断（{len(tracker.text)} 字符），从{f'「{heading}」' if heading else '截断处'}续写 "
+            f"({continuations}/{max_continuations})"
+        )
+        tracker.truncate(offset)
+        request = messages + [AIMessage(content=tracker.text), HumanMessage(content=_continue_prompt(heading))]
+
+    return ContinuationResult(
+        content=tracker.text,
+        sections=tracker.ids,
+        continuations=continuations,
+        truncated=finish_reason == "length",
+        finish_reason=finish_reason,
+    )
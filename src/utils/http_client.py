@@ -0,0 +1,766 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+统一的出站 HTTP 客户端层
+
+所有外部集成（搜索引擎、Jina、豆包、MiniMax、火山TTS、翻译等）共用这里的客户端：
+- keep-alive 连接池：httpx 的连接池按 (scheme, host, port) 分组复用连接，TLS 握手只做一次
+- HTTP/2：安装了 h2 时自动启用，同一主机的并发请求复用一条连接
+- DNS 缓存：域名解析得到的全部地址按 TTL 缓存，连接时依次尝试，全部失败时缓存失效；
+  TLS 仍使用原域名做 SNI 和证书校验
+- 代理：trust_env 为真时读取 HTTP(S)_PROXY/NO_PROXY 等环境变量，也可用 proxy 显式指定；
+  经代理访问时由代理解析域名，不使用 DNS 缓存
+- 统一的超时与重试：request()/arequest() 对连接失败、429/5xx 做指数退避重试
+- 预热：服务启动时提前与 prewarm_hosts 中的主机建立连接（默认不预热）
+- 按主机统计请求数、错误数和延迟（首字节时间）
+
+同步客户端进程内唯一（httpx.Client 线程安全）；异步客户端按事件循环各建一个，
+因为 httpx.AsyncClient 的连接池绑定在创建它的事件循环上。事件循环结束时
+（asyncio.run 退出前关闭异步生成器）该循环的异步客户端随之关闭。
+
+可在 conf.yaml 的 HTTP_CLIENT 段配置：
+
+```yaml
+HTTP_CLIENT:
+  timeout: 30               # 默认读写超时（秒）
+  connect_timeout: 10
+  max_connections: 100
+  max_keepalive_connections: 20
+  keepalive_expiry: 60
+  http2: true
+  retries: 2                # request()/arequest() 的默认重试次数
+  retry_backoff: 0.5
+  dns_cache_ttl: 300        # 0 表示不缓存
+  trust_env: true           # 读取代理、SSL_CERT_FILE 等环境变量
+  proxy: null               # 显式指定代理，如 http://127.0.0.1:7890
+  prewarm_hosts:            # 启动时预热的地址（默认为空）
+    - https://api.tavily.com
+    - https://r.jina.ai
+```
+"""
+
+import asyncio
+import contextlib
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import urllib.request
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 非幂等请求（POST 等）只在请求确定未被服务器处理时重试
+_RETRY_STATUS_IDEMPOTENT = {429, 500, 502, 503, 504}
+_RETRY_STATUS_NON_IDEMPOTENT = {429, 503}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass
+class HttpClientSettings:
+    """共享 HTTP 客户端配置"""
+
+    timeout: float = 30.0
+    connect_timeout: float = 10.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = True
+    retries: int = 2
+    retry_backoff: float = 0.5
+    dns_cache_ttl: float = 300.0
+    trust_env: bool = True
+    proxy: Optional[str] = None
+    prewarm_hosts: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, values: Optional[Dict[str, Any]]) -> "HttpClientSettings":
+        known = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in (values or {}).items() if k in known})
+
+    @property
+    def http2_enabled(self) -> bool:
+        if not self.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+
+def load_http_client_settings() -> HttpClientSettings:
+    from src.config.loader import load_yaml_config
+
+    conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+    return HttpClientSettings.from_dict(load_yaml_config(conf_path).get("HTTP_CLIENT"))
+
+
+# ----------------------------------------------------------------------
+# DNS 缓存
+# ----------------------------------------------------------------------
+
+
+class DNSCache:
+    """按 TTL 缓存域名解析结果（保留 getaddrinfo 返回的全部地址，按原顺序）"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_ip(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    def lookup(self, host: str, port: int) -> Optional[List[str]]:
+        if self.ttl <= 0 or self._is_ip(host):
+            return [host]
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+        return None
+
+    def store(self, host: str, port: int, infos: Sequence[tuple]) -> List[str]:
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            addresses = self.store(host, port, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        return addresses
+
+    async def aresolve(self, host: str, port: int) -> List[str]:
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = self.store(host, port, infos)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class _CachingNetworkBackend(httpcore.NetworkBackend):
+    """依次尝试缓存的地址建立 TCP 连接；TLS 握手仍由 httpcore 使用原域名完成"""
+
+    def __init__(self, dns_cache: DNSCache):
+        self._dns = dns_cache
+        self._inner = httpcore.SyncBackend()
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = self._dns.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error = None
+        for address in addresses:
+            try:
+                return self._inner.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        self._dns.invalidate(host, port)
+        raise error
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    def sleep(self, seconds: float) -> None:
+        self._inner.sleep(seconds)
+
+
+class _AsyncCachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, dns_cache: DNSCache):
+        self._dns = dns_cache
+        self._inner = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self._dns.aresolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error = None
+        for address in addresses:
+            try:
+                return await self._inner.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        self._dns.invalidate(host, port)
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+# ----------------------------------------------------------------------
+# 传输层
+# ----------------------------------------------------------------------
+
+# httpcore 异常到 httpx 异常的映射，子类在前
+_HTTPCORE_ERRORS = (
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextlib.contextmanager
+def _map_httpcore_errors():
+    try:
+        yield
+    except Exception as e:
+        for source, target in _HTTPCORE_ERRORS:
+            if isinstance(e, source):
+                raise target(str(e)) from e
+        raise
+
+
+def _to_httpcore_request(request: httpx.Request) -> httpcore.Request:
+    return httpcore.Request(
+        method=request.method,
+        url=httpcore.URL(
+            scheme=request.url.raw_scheme,
+            host=request.url.raw_host,
+            port=request.url.port,
+            target=request.url.raw_path,
+        ),
+        headers=request.headers.raw,
+        content=request.stream,
+        extensions=request.extensions,
+    )
+
+
+def _connection_pool_options(settings: HttpClientSettings) -> Dict[str, Any]:
+    return {
+        # trust_env 为真时 SSL_CERT_FILE/SSL_CERT_DIR 生效，与 httpx 默认行为一致
+        "ssl_context": httpx.create_ssl_context(trust_env=settings.trust_env),
+        "max_connections": settings.max_connections,
+        "max_keepalive_connections": settings.max_keepalive_connections,
+        "keepalive_expiry": settings.keepalive_expiry,
+        "http1": True,
+        "http2": settings.http2_enabled,
+    }
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __iter__(self):
+        with _map_httpcore_errors():
+            yield from self._stream
+
+    def close(self) -> None:
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+
+
+class _AsyncResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def __aiter__(self):
+        with _map_httpcore_errors():
+            async for chunk in self._stream:
+                yield chunk
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class _DNSCachingTransport(httpx.BaseTransport):
+    """基于 httpcore 连接池的传输层，建立连接时使用带 DNS 缓存的网络后端"""
+
+    def __init__(self, settings: HttpClientSettings, dns_cache: DNSCache):
+        self._pool = httpcore.ConnectionPool(
+            network_backend=_CachingNetworkBackend(dns_cache), **_connection_pool_options(settings)
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with _map_httpcore_errors():
+            response = self._pool.handle_request(_to_httpcore_request(request))
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+class _AsyncDNSCachingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, settings: HttpClientSettings, dns_cache: DNSCache):
+        self._pool = httpcore.AsyncConnectionPool(
+            network_backend=_AsyncCachingNetworkBackend(dns_cache), **_connection_pool_options(settings)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with _map_httpcore_errors():
+            response = await self._pool.handle_async_request(_to_httpcore_request(request))
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_AsyncResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+# ----------------------------------------------------------------------
+# 按主机统计
+# ----------------------------------------------------------------------
+
+
+class HostMetrics:
+    """按主机统计请求数、错误数、状态码和延迟分布"""
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, host: str, elapsed: float, status: Optional[int] = None, error: bool = False) -> None:
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = {"requests": 0, "errors": 0, "status": {}, "latencies": deque(maxlen=self.window)}
+                self._hosts[host] = stats
+            stats["requests"] += 1
+            stats["latencies"].append(elapsed)
+            if error:
+                stats["errors"] += 1
+            if status is not None:
+                bucket = f"{status // 100}xx"
+                stats["status"][bucket] = stats["status"].get(bucket, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for host, stats in self._hosts.items():
+                latencies: Deque[float] = stats["latencies"]
+                ordered = sorted(latencies)
+                result[host] = {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "status": dict(stats["status"]),
+                    "avg_ms": round(sum(ordered) / len(ordered) * 1000, 1) if ordered else 0.0,
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else 0.0,
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1)
+                    if ordered
+                    else 0.0,
+                    "max_ms": round(ordered[-1] * 1000, 1) if ordered else 0.0,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+host_metrics = HostMetrics()
+
+
+class _MetricsTransport(httpx.BaseTransport):
+    """记录每个请求到收到响应头的耗时"""
+
+    def __init__(self, inner: httpx.BaseTransport):
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = self._inner.handle_request(request)
+        except Exception:
+            host_metrics.record(request.url.host, time.perf_counter() - start, error=True)
+            raise
+        host_metrics.record(request.url.host, time.perf_counter() - start, status=response.status_code)
+        return response
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+class _AsyncMetricsTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception:
+            host_metrics.record(request.url.host, time.perf_counter() - start, error=True)
+            raise
+        host_metrics.record(request.url.host, time.perf_counter() - start, status=response.status_code)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+# ----------------------------------------------------------------------
+# 客户端构建
+# ----------------------------------------------------------------------
+
+_lock = threading.Lock()
+_settings: Optional[HttpClientSettings] = None
+_dns_cache: Optional[DNSCache] = None
+_sync_client: Optional[httpx.Client] = None
+# 事件循环 -> (异步客户端, 随循环结束关闭客户端的异步生成器)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[httpx.AsyncClient, AsyncIterator[None]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_settings() -> HttpClientSettings:
+    global _settings, _dns_cache
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = load_http_client_settings()
+                _dns_cache = DNSCache(_settings.dns_cache_ttl)
+    return _settings
+
+
+def configure_http_clients(settings: HttpClientSettings) -> None:
+    """替换客户端配置（已创建的客户端会被丢弃，下次获取时按新配置创建）"""
+    global _settings, _dns_cache, _sync_client
+    with _lock:
+        _settings = settings
+        _dns_cache = DNSCache(settings.dns_cache_ttl)
+        _sync_client = None
+        _async_clients.clear()
+
+
+def _limits(settings: HttpClientSettings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.max_connections,
+        max_keepalive_connections=settings.max_keepalive_connections,
+        keepalive_expiry=settings.keepalive_expiry,
+    )
+
+
+def _timeout(settings: HttpClientSettings) -> httpx.Timeout:
+    return httpx.Timeout(settings.timeout, connect=settings.connect_timeout)
+
+
+def _uses_proxy(settings: HttpClientSettings) -> bool:
+    if settings.proxy:
+        return True
+    return settings.trust_env and any(key != "no" for key in urllib.request.getproxies())
+
+
+def _record_start(request: httpx.Request) -> None:
+    request.extensions["metrics_start"] = time.perf_counter()
+
+
+def _record_response(response: httpx.Response) -> None:
+    start = response.request.extensions.get("metrics_start")
+    if start is not None:
+        host_metrics.record(response.request.url.host, time.perf_counter() - start, status=response.status_code)
+
+
+async def _arecord_start(request: httpx.Request) -> None:
+    _record_start(request)
+
+
+async def _arecord_response(response: httpx.Response) -> None:
+    _record_response(response)
+
+
+def _build_sync_client(settings: HttpClientSettings) -> httpx.Client:
+    if _uses_proxy(settings):
+        # 经代理访问时由代理解析域名，使用 httpx 自带的传输层（按 NO_PROXY 等规则选择代理）
+        return httpx.Client(
+            proxy=settings.proxy,
+            trust_env=settings.trust_env,
+            http2=settings.http2_enabled,
+            limits=_limits(settings),
+            timeout=_timeout(settings),
+            event_hooks={"request": [_record_start], "response": [_record_response]},
+        )
+    return httpx.Client(
+        transport=_MetricsTransport(_DNSCachingTransport(settings, _dns_cache)),
+        trust_env=settings.trust_env,
+        timeout=_timeout(settings),
+    )
+
+
+def _build_async_client(settings: HttpClientSettings) -> httpx.AsyncClient:
+    if _uses_proxy(settings):
+        return httpx.AsyncClient(
+            proxy=settings.proxy,
+            trust_env=settings.trust_env,
+            http2=settings.http2_enabled,
+            limits=_limits(settings),
+            timeout=_timeout(settings),
+            event_hooks={"request": [_arecord_start], "response": [_arecord_response]},
+        )
+    return httpx.AsyncClient(
+        transport=_AsyncMetricsTransport(_AsyncDNSCachingTransport(settings, _dns_cache)),
+        trust_env=settings.trust_env,
+        timeout=_timeout(settings),
+    )
+
+
+def get_sync_client() -> httpx.Client:
+    """获取进程内共享的同步 HTTP 客户端"""
+    global _sync_client
+    settings = get_http_settings()
+    if _sync_client is None or _sync_client.is_closed:
+        with _lock:
+            if _sync_client is None or _sync_client.is_closed:
+                _sync_client = _build_sync_client(settings)
+    return _sync_client
+
+
+async def _client_lifetime(loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> AsyncIterator[None]:
+    """
+    挂起直到被关闭，关闭时关闭 client
+
+    事件循环会跟踪已开始的异步生成器，asyncio.run 退出前通过 shutdown_asyncgens
+    关闭它们，工作线程里用 asyncio.run 临时创建的事件循环因此不会遗留未关闭的连接池。
+    """
+    try:
+        yield
+    finally:
+        with _lock:
+            entry = _async_clients.get(loop)
+            if entry is not None and entry[0] is client:
+                del _async_clients[loop]
+        await client.aclose()
+
+
+async def _start_lifetime(lifetime: AsyncIterator[None]) -> None:
+    # 启动前已被 aclose_async_client 关闭时生成器直接结束
+    with contextlib.suppress(StopAsyncIteration):
+        await lifetime.asend(None)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """获取当前事件循环共享的异步 HTTP 客户端（必须在事件循环中调用）"""
+    settings = get_http_settings()
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        client = _build_async_client(settings)
+        lifetime = _client_lifetime(loop, client)
+        _async_clients[loop] = (client, lifetime)
+    # 在当前循环中启动生成器，让循环开始跟踪它
+    asyncio.ensure_future(_start_lifetime(lifetime))
+    return client
+
+
+async def aclose_async_client() -> None:
+    """关闭当前事件循环的异步客户端（服务关闭时调用）"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.pop(loop, None)
+    if entry is not None:
+        await entry[1].aclose()
+        await entry[0].aclose()
+
+
+def close_sync_client() -> None:
+    global _sync_client
+    with _lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+# ----------------------------------------------------------------------
+# 带重试的请求
+# ----------------------------------------------------------------------
+
+
+def _retry_delay(attempt: int, backoff: float, response: Optional[httpx.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), 30.0)
+    return backoff * (2 ** attempt)
+
+
+def _should_retry(method: str, response: Optional[httpx.Response], error: Optional[Exception]) -> bool:
+    idempotent = method.upper() in _IDEMPOTENT_METHODS
+    if error is not None:
+        return isinstance(error, _CONNECT_ERRORS) or (idempotent and isinstance(error, httpx.TransportError))
+    statuses = _RETRY_STATUS_IDEMPOTENT if idempotent else _RETRY_STATUS_NON_IDEMPOTENT
+    return response.status_code in statuses
+
+
+def request(
+    method: str, url: str, *, retries: Optional[int] = None, stream: bool = False, **kwargs: Any
+) -> httpx.Response:
+    """
+    通过共享同步客户端发送请求，失败时按统一策略重试
+
+    幂等请求对传输错误和 429/5xx 重试；POST 等非幂等请求只对连接失败和 429/503 重试。
+    返回最后一次的响应（不会对非 2xx 状态码抛异常）。
+
+    stream=True 时只读取响应头就返回，响应体由调用方通过 iter_lines() 等逐步读取，
+    读完后必须调用 response.close()；重试只发生在收到响应头之前。
+    """
+    settings = get_http_settings()
+    retries = settings.retries if retries is None else retries
+    client = get_sync_client()
+    for attempt in range(retries + 1):
+        response, error = None, None
+        try:
+            if stream:
+                response = client.send(client.build_request(method, url, **kwargs), stream=True)
+            else:
+                response = client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            error = e
+        if attempt == retries or not _should_retry(method, response, error):
+            if error is not None:
+                raise error
+            return response
+        delay = _retry_delay(attempt, settings.retry_backoff, response)
+        logger.warning(
+            f"🔁 {method} {httpx.URL(url).host} 失败（{error or response.status_code}），"
+            f"{delay:.1f}秒后重试 ({attempt + 1}/{retries})"
+        )
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+
+async def arequest(
+    method: str, url: str, *, retries: Optional[int] = None, stream: bool = False, **kwargs: Any
+) -> httpx.Response:
+    """
+    request() 的异步版本，使用当前事件循环的共享异步客户端
+
+    stream=True 时读完后必须调用 await response.aclose()；取消正在读取的任务会直接关闭连接。
+    """
+    settings = get_http_settings()
+    retries = settings.retries if retries is None else retries
+    client = get_async_client()
+    for attempt in range(retries + 1):
+        response, error = None, None
+        try:
+            if stream:
+                response = await client.send(client.build_request(method, url, **kwargs), stream=True)
+            else:
+                response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            error = e
+        if attempt == retries or not _should_retry(method, response, error):
+            if error is not None:
+                raise error
+            return response
+        delay = _retry_delay(attempt, settings.retry_backoff, response)
+        logger.warning(
+            f"🔁 {method} {httpx.URL(url).host} 失败（{error or response.status_code}），"
+            f"{delay:.1f}秒后重试 ({attempt + 1}/{retries})"
+        )
+        if response is not None:
+            await response.aclose()
+        await asyncio.sleep(delay)
+
+
+# ----------------------------------------------------------------------
+# 预热与统计
+# ----------------------------------------------------------------------
+
+
+def prewarm(hosts: Optional[Sequence[str]] = None) -> Dict[str, bool]:
+    """与给定主机（默认读取配置）提前建立同步客户端连接，返回各主机是否成功"""
+    settings = get_http_settings()
+    hosts = list(settings.prewarm_hosts if hosts is None else hosts)
+    if not hosts:
+        return {}
+    client = get_sync_client()
+
+    def warm(url: str) -> bool:
+        try:
+            client.head(url, timeout=settings.connect_timeout)
+            return True
+        except httpx.HTTPError as e:
+            logger.debug(f"预热 {url} 失败: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(8, len(hosts))) as executor:
+        results = dict(zip(hosts, executor.map(warm, hosts)))
+    logger.info(f"🔥 同步HTTP客户端预热完成: {sum(results.values())}/{len(hosts)}")
+    return results
+
+
+async def aprewarm(hosts: Optional[Sequence[str]] = None) -> Dict[str, bool]:
+    """与给定主机提前建立当前事件循环异步客户端的连接"""
+    settings = get_http_settings()
+    hosts = list(settings.prewarm_hosts if hosts is None else hosts)
+    if not hosts:
+        return {}
+    client = get_async_client()
+
+    async def warm(url: str) -> bool:
+        try:
+            await client.head(url, timeout=settings.connect_timeout)
+            return True
+        except httpx.HTTPError as e:
+            logger.debug(f"预热 {url} 失败: {e}")
+            return False
+
+    results = dict(zip(hosts, await asyncio.gather(*(warm(url) for url in hosts))))
+    logger.info(f"🔥 异步HTTP客户端预热完成: {sum(results.values())}/{len(hosts)}")
+    return results
+
+
+def get_http_metrics() -> Dict[str, Any]:
+    """返回按主机的请求统计以及当前客户端配置"""
+    settings = get_http_settings()
+    return {
+        "http2": settings.http2_enabled,
+        "dns_cache_ttl": settings.dns_cache_ttl,
+        "proxy": _uses_proxy(settings),
+        "hosts": host_metrics.snapshot(),
+    }
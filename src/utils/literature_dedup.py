@@ -0,0 +1,220 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+文献去重引擎
+
+PubMed、Google Scholar、Tavily 等来源返回的同一篇文献，标题大小写、标点、
+副标题分隔符往往不同。这里按以下顺序识别重复：
+1. 标识符一致：DOI、PMID、规范化后的 URL
+2. 标题指纹一致：Unicode 规范化、小写、去掉标点和多余空白后的标题
+3. 近似重复：标题词 shingle 的 MinHash + LSH 分桶找出候选对，
+   再以实际 Jaccard 相似度确认
+
+每条记录只做一次哈希，候选对只在同一个 LSH 桶内比较，
+几千条记录的去重时间基本与记录数成线性关系。
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+_DOI_PATTERN = re.compile(r"10\.\d{4,9}/\S+", re.IGNORECASE)
+_URL_PREFIX = re.compile(r"^(https?://)?(www\.)?", re.IGNORECASE)
+
+def normalize_title(title: str) -> str:
+    """标题指纹：NFKD 规范化、去掉重音符号和标点、小写、合并空白"""
+    if not title:
+        return ""
+    text = unicodedata.normalize("NFKD", title)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def normalize_doi(doi: str) -> str:
+    """从 DOI 字符串或 doi.org 链接中取出规范化的 DOI"""
+    if not doi:
+        return ""
+    match = _DOI_PATTERN.search(doi)
+    return match.group(0).rstrip(".,;)").lower() if match else ""
+
+
+def normalize_pmid(pmid: Any) -> str:
+    digits = re.sub(r"\D", "", str(pmid or ""))
+    return digits.lstrip("0")
+
+
+def normalize_url(url: str) -> str:
+    """去掉协议、www 前缀、锚点和末尾斜杠，保留查询参数"""
+    if not url:
+        return ""
+    url = _URL_PREFIX.sub("", url.strip()).split("#", 1)[0]
+    return url.rstrip("/").lower()
+
+
+def default_fields(item: Any) -> Dict[str, Any]:
+    """从 dict 或带属性的对象中取出去重所需字段"""
+    if isinstance(item, dict):
+        get = item.get
+    else:
+        get = lambda name, default=None: getattr(item, name, default)  # noqa: E731
+    return {
+        "title": get("title", "") or "",
+        "doi": get("doi", "") or "",
+        "pmid": get("pmid", "") or "",
+        "url": get("url", "") or get("link", "") or "",
+    }
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 以较早出现的记录为代表
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+class LiteratureDeduplicator:
+    """
+    标识符 + 标题指纹 + MinHash/LSH 的文献去重器
+
+    Args:
+        threshold: 判定为近似重复的标题词 shingle Jaccard 相似度下限
+        num_perm: MinHash 签名长度，必须能被 bands 整除
+        bands: LSH 分桶数，bands 越多召回越高、候选对越多
+        shingle_size: 标题词 shingle 长度（连续词数）
+        min_title_length: 标题指纹短于该长度时不做近似匹配（短标题容易误判）
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 2,
+        min_title_length: int = 20,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_title_length = min_title_length
+        rng = random.Random(seed)
+        # 32 位 shingle 哈希异或随机种子作为一族置换，min 在 C 层完成
+        self._seeds = [rng.getrandbits(32) for _ in range(num_perm)]
+
+    def _shingles(self, fingerprint: str) -> set:
+        words = fingerprint.split()
+        size = self.shingle_size
+        return {
+            zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+            for i in range(max(1, len(words) - size + 1))
+        }
+
+    def _signature(self, shingles: set) -> List[int]:
+        hashes = list(shingles)
+        return [min(map(seed.__xor__, hashes)) for seed in self._seeds]
+
+    def find_duplicate_groups(
+        self, items: Sequence[T], fields: Optional[Callable[[T], Dict[str, Any]]] = None
+    ) -> List[List[int]]:
+        """返回重复记录分组（按原始下标），每组第一个下标为最早出现的记录"""
+        fields = fields or default_fields
+        uf = _UnionFind(len(items))
+        owners: Dict[tuple, int] = {}
+
+        def claim(key: tuple, index: int) -> None:
+            owner = owners.setdefault(key, index)
+            if owner != index:
+                uf.union(owner, index)
+
+        shingle_sets: Dict[int, set] = {}
+        buckets: Dict[tuple, List[int]] = {}
+        for index, item in enumerate(items):
+            info = fields(item)
+            doi = normalize_doi(info.get("doi", "")) or normalize_doi(info.get("url", ""))
+            if doi:
+                claim(("doi", doi), index)
+            pmid = normalize_pmid(info.get("pmid", ""))
+            if pmid:
+                claim(("pmid", pmid), index)
+            url = normalize_url(info.get("url", ""))
+            # 只有域名的链接（如期刊首页）不能标识具体文献
+            if "/" in url:
+                claim(("url", url), index)
+
+            fingerprint = normalize_title(info.get("title", ""))
+            if not fingerprint:
+                continue
+            claim(("title", fingerprint), index)
+            if len(fingerprint) < self.min_title_length:
+                continue
+
+            shingles = self._shingles(fingerprint)
+            shingle_sets[index] = shingles
+            signature = self._signature(shingles)
+            for band in range(self.bands):
+                key = (band, *signature[band * self.rows:(band + 1) * self.rows])
+                buckets.setdefault(key, []).append(index)
+
+        checked = set()
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for pos, a in enumerate(members):
+                for b in members[pos + 1:]:
+                    if (a, b) in checked or uf.find(a) == uf.find(b):
+                        continue
+                    checked.add((a, b))
+                    sa, sb = shingle_sets[a], shingle_sets[b]
+                    if len(sa & sb) / len(sa | sb) >= self.threshold:
+                        uf.union(a, b)
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(items)):
+            groups.setdefault(uf.find(index), []).append(index)
+        return list(groups.values())
+
+    def deduplicate(
+        self, items: Iterable[T], fields: Optional[Callable[[T], Dict[str, Any]]] = None
+    ) -> List[T]:
+        """去重并保持原有顺序，每组保留最早出现的记录"""
+        items = list(items)
+        keep = {group[0] for group in self.find_duplicate_groups(items, fields)}
+        return [item for index, item in enumerate(items) if index in keep]
+
+
+_default_deduplicator = LiteratureDeduplicator()
+
+
+def deduplicate_literature(
+    items: Iterable[T], fields: Optional[Callable[[T], Dict[str, Any]]] = None
+) -> List[T]:
+    """
+    使用默认参数去重文献记录
+
+    Args:
+        items: 文献记录，dict 或带 title/doi/pmid/url 属性的对象
+        fields: 自定义字段提取函数，返回包含 title/doi/pmid/url 的字典
+    """
+    return _default_deduplicator.deduplicate(items, fields)
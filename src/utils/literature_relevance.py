@@ -0,0 +1,148 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+文献相关性批量打分
+
+研究方向与文献各分词计数一次，构建 TF-IDF 稀疏表示（文档号、词号、权重三个数组），
+再用一次矩阵乘法得到 方向数 × 文献数 的余弦相似度矩阵，
+每个方向的 top-k 用 argpartition 选出，不需要对全部文献排序。
+
+只有出现在查询中的词参与乘法：文献矩阵按查询词表切出 N × V_q 的稠密子矩阵，
+V_q 通常只有几十到几百列；文献向量的范数仍按全部词计算。
+"""
+
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# 分词规则（分隔符、停用词、过滤条件）变化时递增，持久化的倒排索引据此判断是否需要重建
+TOKENIZER_VERSION = 2
+
+# 除字母、数字、连字符以外的 ASCII 字符都视为分隔符；translate + split 都在 C 中完成，比正则分词快
+_SEPARATORS = str.maketrans({chr(i): " " for i in range(128) if not (chr(i).isalnum() or chr(i) == "-")})
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or that the their this to was were with "
+    "we our using based study studies via vs".split()
+)
+
+
+def _split(text: str) -> List[str]:
+    return (text or "").lower().translate(_SEPARATORS).split()
+
+
+def _is_term(token: str) -> bool:
+    return len(token) > 1 and token not in _STOPWORDS and token.strip("-") == token
+
+
+def tokenize(text: str) -> List[str]:
+    """小写分词并去掉停用词、单字符词和首尾带连字符的片段"""
+    return [t for t in _split(text) if _is_term(t)]
+
+
+def term_counts(text: str) -> Counter:
+    """文本的词频；先整体计数再过滤，每个不同的词只需判断一次"""
+    counts = Counter(_split(text))
+    for token in [t for t in counts if not _is_term(t)]:
+        del counts[token]
+    return counts
+
+
+def paper_terms(paper: Dict) -> Counter:
+    """文献的词频：标题词计两次，标题命中比摘要命中权重更高"""
+    counts = term_counts(paper.get("abstract", ""))
+    for term, count in term_counts(paper.get("title", "")).items():
+        counts[term] += 2 * count
+    return counts
+
+
+class TfidfMatrix:
+    """
+    文献集合的 TF-IDF 稀疏矩阵
+
+    权重为 (1 + log tf) * idf，idf = log((1 + N) / (1 + df)) + 1；
+    每个文档的向量在 similarity 中做 L2 归一化。
+    """
+
+    def __init__(self, documents: Sequence[Mapping[str, int]]):
+        self.vocabulary: Dict[str, int] = {}
+        rows, cols, counts = [], [], []
+        for row, terms in enumerate(documents):
+            rows.extend([row] * len(terms))
+            cols.extend(self.vocabulary.setdefault(term, len(self.vocabulary)) for term in terms)
+            counts.extend(terms.values())
+
+        self.shape = (len(documents), len(self.vocabulary))
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        tf = np.asarray(counts, dtype=float)
+
+        df = np.bincount(self.cols, minlength=self.shape[1])
+        self.idf = np.log((1 + self.shape[0]) / (1 + df)) + 1
+        self.data = (1 + np.log(tf)) * self.idf[self.cols]
+        self.norms = np.sqrt(np.bincount(self.rows, weights=self.data ** 2, minlength=self.shape[0]))
+
+    def similarity(self, queries: Sequence[Sequence[str]]) -> np.ndarray:
+        """查询（词序列）与每个文档的余弦相似度，形状为 (查询数, 文档数)"""
+        query_terms: Dict[int, int] = {}
+        q_rows, q_cols = [], []
+        for row, tokens in enumerate(queries):
+            for token in tokens:
+                term = self.vocabulary.get(token)
+                if term is not None:
+                    q_rows.append(row)
+                    q_cols.append(query_terms.setdefault(term, len(query_terms)))
+
+        scores = np.zeros((len(queries), self.shape[0]))
+        if not query_terms:
+            return scores
+
+        terms = np.fromiter(query_terms, dtype=np.int64, count=len(query_terms))
+        local = np.full(self.shape[1], -1, dtype=np.int64)
+        local[terms] = np.arange(len(terms))
+
+        counts = np.zeros((len(queries), len(terms)))
+        np.add.at(counts, (np.asarray(q_rows), np.asarray(q_cols)), 1.0)
+        log_tf = np.zeros_like(counts)
+        np.log(counts, out=log_tf, where=counts > 0)
+        query_matrix = np.where(counts > 0, 1 + log_tf, 0.0) * self.idf[terms]
+
+        mask = local[self.cols] >= 0
+        doc_matrix = np.zeros((self.shape[0], len(terms)))
+        doc_matrix[self.rows[mask], local[self.cols[mask]]] = self.data[mask]
+
+        scores = query_matrix @ doc_matrix.T
+        query_norms = np.linalg.norm(query_matrix, axis=1)
+        denominator = np.outer(query_norms, self.norms)
+        np.divide(scores, denominator, out=scores, where=denominator > 0)
+        return scores
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> List[List[int]]:
+    """每行得分最高的 k 个下标（按得分降序，得分为 0 的不返回）"""
+    if scores.size == 0 or k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    k = min(k, scores.shape[1])
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    result = []
+    for row, cols in zip(scores, candidates):
+        cols = cols[np.argsort(-row[cols], kind="stable")]
+        result.append([int(c) for c in cols if row[c] > 0])
+    return result
+
+
+def match_papers(
+    queries: Sequence[str],
+    papers: Sequence[Dict],
+    k: int = 3,
+    terms: Callable[[Dict], Mapping[str, int]] = paper_terms,
+) -> List[List[Dict]]:
+    """为每个查询（如研究方向）挑出最相关的 k 篇文献"""
+    if not queries:
+        return []
+    if not papers:
+        return [[] for _ in queries]
+    matrix = TfidfMatrix([terms(paper) for paper in papers])
+    scores = matrix.similarity([tokenize(query) for query in queries])
+    return [[papers[i] for i in row] for row in top_k_indices(scores, k)]
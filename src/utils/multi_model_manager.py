@@ -15,7 +15,6 @@ import time
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import re
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -24,8 +23,15 @@ current_dir = Path(__file__).parent.parent.parent
 if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
-from src.llms.llm import get_llm_by_model_name, get_all_available_models, is_multi_model_enabled
+from src.llms.hedging import HedgedRouter, get_hedged_router
+from src.llms.llm import (
+    get_all_available_models,
+    get_llm_by_model_name,
+    is_multi_model_enabled,
+    with_generation_params,
+)
 from src.config import load_yaml_config
+from src.utils.continuation import DIRECTION_SECTION_PATTERN, SectionTracker, generate_with_continuation
 
 logger = logging.getLogger(__name__)
 
@@ -176,33 +182,8 @@ class MultiModelReportManager:
             display_name = self.model_display_names.get(model_name, model_name)
             logger.info(f"开始使用 {display_name} 生成报告...")
             
-            # 设置更高的输出长度限制 - 大幅增加
-            if hasattr(llm, 'max_tokens'):
-                llm.max_tokens = 12000  # 修复：使用合理的数值
-            elif hasattr(llm, 'model_kwargs'):
-                llm.model_kwargs = llm.model_kwargs or {}
-                llm.model_kwargs['max_tokens'] = 12000
-            
-            # 设置其他参数以确保完整输出
-            if hasattr(llm, 'temperature'):
-                llm.temperature = 0.7  # 适中的创造性
-            elif hasattr(llm, 'model_kwargs'):
-                llm.model_kwargs['temperature'] = 0.7
-            
-            # 针对不同模型使用不同的参数名称
-            try:
-                # 尝试设置豆包模型的特定参数
-                if model_name == "doubao" and hasattr(llm, 'model_kwargs'):
-                    llm.model_kwargs['max_completion_tokens'] = 12000
-                    llm.model_kwargs['temperature'] = 0.7
-                # 尝试设置其他模型的参数
-                elif hasattr(llm, 'model_kwargs'):
-                    if 'max_tokens' not in llm.model_kwargs:
-                        llm.model_kwargs['max_tokens'] = 12000
-                    if 'temperature' not in llm.model_kwargs:
-                        llm.model_kwargs['temperature'] = 0.7
-            except Exception as e:
-                logger.warning(f"设置模型参数时出现警告: {e}")
+            # 本次调用专用的参数视图：共享HTTP客户端，不修改缓存中的共享实例，可安全并发
+            report_llm = self._with_report_params(llm, model_name, 12000)
                 
             # 添加强制完成指令
             completion_instruction = """
@@ -220,42 +201,24 @@ class MultiModelReportManager:
             
             messages.append(HumanMessage(content=completion_instruction))
             
-            response = await llm.ainvoke(messages)
+            # 流式生成，边读边记录研究方向标题；被长度限制截断时从最后一个完整方向续写
+            generation = await generate_with_continuation(
+                report_llm, messages, SectionTracker(DIRECTION_SECTION_PATTERN)
+            )
             
             execution_time = time.time() - start_time
             
-            # 检查输出是否完整
-            content = response.content
-            direction_count = content.count("研究方向") + content.count("### 研究方向") + content.count("## 研究方向")
-            
-            # 更精确的方向计数
-            detailed_direction_patterns = [
-                r"### 方向\d+",
-                r"## 方向\d+", 
-                r"### 研究方向\d+",
-                r"## 研究方向\d+",
-                r"方向\d+：.*?背景与意义",
-                r"研究方向\d+：.*?背景与意义"
-            ]
+            content = generation.content
+            generated_directions = {int(number) for number in generation.sections}
+            continuations = generation.continuations
+            detailed_count = len(generated_directions & set(range(1, 21)))
             
-            detailed_count = 0
-            for pattern in detailed_direction_patterns:
-                matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
-                detailed_count = max(detailed_count, len(matches))
+            logger.info(f"{display_name} 检测到 {detailed_count} 个详细方向，续写 {continuations} 次")
             
-            logger.info(f"{display_name} 检测到 {direction_count} 个研究方向提及，{detailed_count} 个详细方向")
-            
-            # 如果方向数量不足，尝试补充生成
+            # 模型正常结束但遗漏了方向时，只补充缺失的方向
             if detailed_count < 20:
                 logger.warning(f"{display_name} 生成的详细方向不足({detailed_count}/20)，尝试补充生成...")
                 
-                # 分析已生成的内容，找出缺失的方向
-                generated_directions = set()
-                for i in range(1, 21):
-                    direction_pattern = f"研究方向{i}：.*?背景与意义"
-                    if re.search(direction_pattern, content, re.DOTALL | re.IGNORECASE):
-                        generated_directions.add(i)
-                
                 missing_directions = [i for i in range(1, 21) if i not in generated_directions]
                 
                 if missing_directions:
@@ -313,40 +276,27 @@ class MultiModelReportManager:
                     ]
                     
                     try:
-                        # 设置更高的输出限制用于补充生成
-                        if hasattr(llm, 'max_tokens'):
-                            original_max_tokens = llm.max_tokens
-                            llm.max_tokens = 15000  # 更高的限制
-                        elif hasattr(llm, 'model_kwargs'):
-                            original_max_tokens = llm.model_kwargs.get('max_tokens', 12000)
-                            llm.model_kwargs['max_tokens'] = 15000
-                        
-                        supplement_response = await llm.ainvoke(supplement_messages)
-                        
-                        # 恢复原始设置
-                        if hasattr(llm, 'max_tokens'):
-                            llm.max_tokens = original_max_tokens
-                        elif hasattr(llm, 'model_kwargs'):
-                            llm.model_kwargs['max_tokens'] = original_max_tokens
+                        # 补充生成使用更高的输出限制
+                        supplement_llm = self._with_report_params(llm, model_name, 15000)
+                        supplement = await generate_with_continuation(
+                            supplement_llm, supplement_messages, SectionTracker(DIRECTION_SECTION_PATTERN)
+                        )
                         
                         # 合并内容
-                        supplement_content = supplement_response.content
-                        content += "\n\n## 补充生成的研究方向详细阐述\n\n" + supplement_content
-                        
-                        # 重新计算方向数量
-                        direction_count = content.count("研究方向") + content.count("### 研究方向") + content.count("## 研究方向")
-                        detailed_count = 0
-                        for pattern in detailed_direction_patterns:
-                            matches = re.findall(pattern, content, re.DOTALL | re.IGNORECASE)
-                            detailed_count = max(detailed_count, len(matches))
+                        content += "\n\n## 补充生成的研究方向详细阐述\n\n" + supplement.content
+                        generated_directions.update(int(number) for number in supplement.sections)
+                        continuations += supplement.continuations
+                        detailed_count = len(generated_directions & set(range(1, 21)))
                         
-                        logger.info(f"{display_name} 补充生成后：{direction_count} 个研究方向提及，{detailed_count} 个详细方向")
+                        logger.info(f"{display_name} 补充生成后：{detailed_count} 个详细方向")
                         
                     except Exception as e:
                         logger.error(f"{display_name} 补充生成失败: {e}")
                 else:
                     logger.info("未能识别缺失的具体方向编号")
             
+            direction_count = content.count("研究方向") + content.count("### 研究方向") + content.count("## 研究方向")
+            
             result = {
                 "model_name": model_name,
                 "model_display_name": display_name,
@@ -356,7 +306,8 @@ class MultiModelReportManager:
                 "error": None,
                 "timestamp": datetime.now().isoformat(),
                 "direction_count": direction_count,
-                "detailed_direction_count": detailed_count  # 添加详细方向计数
+                "detailed_direction_count": detailed_count,  # 添加详细方向计数
+                "continuations": continuations
             }
             
             logger.info(f"{display_name} 报告生成完成 (耗时: {execution_time:.2f}秒, 详细方向: {detailed_count}/20)")
@@ -377,6 +328,15 @@ class MultiModelReportManager:
                 "timestamp": datetime.now().isoformat()
             }
     
+    @staticmethod
+    def _with_report_params(llm: Any, model_name: str, max_tokens: int) -> Any:
+        """报告生成使用的参数视图：更高的输出长度限制和适中的创造性"""
+        params = {"max_tokens": max_tokens, "temperature": 0.7}
+        if model_name == "doubao":
+            # 豆包使用 max_completion_tokens 限制输出长度
+            params["max_completion_tokens"] = max_tokens
+        return with_generation_params(llm, **params)
+    
     def _build_report_messages(
         self, 
         task_description: str, 
@@ -594,6 +554,67 @@ class MultiModelReportManager:
             "reports": report_results
         }
     
+    async def generate_hedged_report(
+        self,
+        task_description: str,
+        research_findings: List[str] = None,
+        locale: str = "zh-CN",
+        models: List[str] = None,
+        router: Optional[HedgedRouter] = None
+    ) -> Dict[str, Any]:
+        """
+        只需要一份报告时使用：先用主模型生成，超过其报告耗时的 p95 仍未完成时
+        对冲到等价模型，采用先完成的报告并取消其余的
+        
+        Args:
+            task_description: 任务描述
+            research_findings: 研究发现
+            locale: 语言区域
+            models: 候选模型列表，第一个为主模型；None表示使用所有可用模型
+            router: 对冲路由，None时使用共享路由
+            
+        Returns:
+            Dict[str, Any]: 采用的报告结果，另含 hedge_candidates 字段
+        """
+        available_models = MultiModelConfigManager().get_available_models()
+        target_models = [m for m in (models or available_models) if m in available_models]
+        if not target_models:
+            raise ValueError("没有可用的模型")
+        
+        router = router or get_hedged_router()
+        primary = target_models[0]
+        if router is None:
+            candidates = [primary]
+        else:
+            candidates = [primary] + router.alternatives(primary, target_models[1:], prefix="report:")
+        
+        attempts = [
+            (f"report:{model}", (lambda model=model: self.generate_report_with_model(
+                model, task_description, research_findings, locale
+            )))
+            for model in candidates
+        ]
+        
+        if router is None:
+            result = await attempts[0][1]()
+        else:
+            try:
+                result, _ = await router.run(attempts)
+            except Exception as e:
+                # 全部失败：返回最后一个失败结果的格式
+                result = {
+                    "model_name": primary,
+                    "model_display_name": self.model_display_names.get(primary, primary),
+                    "content": None,
+                    "execution_time": 0,
+                    "success": False,
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat()
+                }
+        
+        result["hedge_candidates"] = candidates
+        return result
+    
     def save_reports(self, results: Dict[str, Any], filename_prefix: str = None) -> Dict[str, str]:
         """
         保存报告到文件
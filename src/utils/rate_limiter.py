@@ -0,0 +1,102 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+异步令牌桶限流器
+
+按提供方（模型服务商、搜索引擎等）共享限流状态，供并发生成和并发检索使用。
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRateLimiter:
+    """令牌桶限流器，rate 为每秒补充的令牌数，burst 为桶容量"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None, name: str = "default"):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else max(1, rate)))
+        self.name = name
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        # 线程锁保证多个事件循环（如线程池中的 asyncio.run）共享同一个桶时也是安全的
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float, burst: Optional[int] = None) -> None:
+        """调整速率和桶容量，已积累的令牌不超过新的容量"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = max(1, int(burst if burst is not None else max(1, rate)))
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def _reserve(self) -> float:
+        """预占一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> float:
+        """获取一个令牌，返回实际等待的秒数"""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"⏱️ 限流器[{self.name}]等待 {wait:.2f} 秒")
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_sync(self) -> float:
+        """同步版本的 acquire，供线程中的阻塞调用使用"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def model_rate_limit_key(llm: Any) -> str:
+    """模型共享限流器的键：模型名（model_name 或 model 字段），都没有时用类名"""
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+_limiters: Dict[str, AsyncRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    provider: str, requests_per_minute: float, burst: Optional[int] = None
+) -> AsyncRateLimiter:
+    """
+    获取（或创建）某个提供方共享的限流器
+
+    已存在的限流器速率与本次请求不一致时按新速率更新（最近一次配置生效）。
+
+    Args:
+        provider: 提供方名称，如模型名或搜索引擎名
+        requests_per_minute: 每分钟允许的请求数
+        burst: 允许的突发请求数，默认与每秒速率一致（至少为1）
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        rate = requests_per_minute / 60.0
+        if limiter is None:
+            limiter = AsyncRateLimiter(rate, burst, name=provider)
+            _limiters[provider] = limiter
+        elif limiter.rate != rate or (burst is not None and limiter.burst != max(1, int(burst))):
+            logger.warning(
+                f"⚠️ 限流器[{provider}]配置变化: {limiter.rate * 60:g} → {requests_per_minute:g} 次/分钟，按新配置更新"
+            )
+            limiter.configure(rate, burst)
+        return limiter
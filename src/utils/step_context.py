@@ -0,0 +1,213 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+研究步骤历史的滚动压缩
+
+researcher/coder 执行每一步时，会把之前所有步骤的结果放进提示词。步骤越多提示词越长，
+总开销随步骤数平方增长。这里用本地分词器计 token，超出预算时：
+1. 最近 keep_recent 个步骤保持原文；
+2. 更早的步骤从最旧的开始替换为摘要（每个步骤只生成一次，按内容缓存）；
+3. 仍然超出时按预算平均截断各条结果。
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """请将下面的研究发现压缩为不超过 {max_tokens} 个 token 的要点摘要。
+保留关键数据、结论和文献信息（作者、年份、期刊、DOI、链接），不要添加原文没有的内容，直接输出摘要。
+
+## 步骤：{title}
+
+{finding}"""
+
+Summarizer = Callable[[str, str, int], Awaitable[str]]
+
+
+@dataclass
+class StepContextSettings:
+    """conf.yaml 中 RESEARCH_CONTEXT 段的配置"""
+
+    enabled: bool = True
+    max_tokens: int = 8000
+    keep_recent: int = 2
+    summary_tokens: int = 400
+    cache_size: int = 256
+
+    @classmethod
+    def from_dict(cls, values: Optional[Dict[str, Any]]) -> "StepContextSettings":
+        values = values or {}
+        known = {name: values[name] for name in cls.__dataclass_fields__ if name in values}
+        return cls(**known)
+
+
+async def llm_summarizer(title: str, finding: str, max_tokens: int) -> str:
+    """使用 context_summarizer agent 的模型生成摘要"""
+    from src.llms.llm import get_llm_for_agent
+
+    prompt = SUMMARY_PROMPT.format(max_tokens=max_tokens, title=title, finding=finding)
+    response = await get_llm_for_agent("context_summarizer").ainvoke([HumanMessage(content=prompt)])
+    return str(response.content).strip()
+
+
+def _format(index: int, title: str, finding: str, summarized: bool = False) -> str:
+    label = "（摘要）" if summarized else ""
+    return f"## Existing Finding {index}: {title}{label}\n\n<finding>\n{finding}\n</finding>\n\n"
+
+
+class StepContextCompactor:
+    """构建 "Existing Research Findings" 部分，并把它控制在 token 预算以内"""
+
+    HEADER = "# Existing Research Findings\n\n"
+
+    def __init__(self, settings: Optional[StepContextSettings] = None, summarizer: Optional[Summarizer] = None):
+        self.settings = settings or StepContextSettings()
+        self.summarizer = summarizer or llm_summarizer
+        self._summaries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(title: str, finding: str) -> str:
+        return hashlib.sha256(f"{title}\0{finding}".encode("utf-8")).hexdigest()
+
+    async def summarize(self, title: str, finding: str) -> str:
+        """步骤结果的摘要；相同内容只生成一次，生成失败时退回到截断"""
+        key = self._key(title, finding)
+        with self._lock:
+            if key in self._summaries:
+                self._summaries.move_to_end(key)
+                return self._summaries[key]
+
+        max_tokens = self.settings.summary_tokens
+        try:
+            summary = await self.summarizer(title, finding, max_tokens)
+        except Exception as e:
+            logger.warning(f"⚠️ 步骤 '{title}' 摘要生成失败，改为截断: {e}")
+            summary = ""
+        # 摘要为空或比原文还长时没有意义，截断即可
+        summary = truncate_to_tokens(summary or finding, max_tokens)
+
+        with self._lock:
+            self._summaries[key] = summary
+            while len(self._summaries) > self.settings.cache_size:
+                self._summaries.popitem(last=False)
+        return summary
+
+    async def build(self, steps: Sequence[Tuple[str, str]]) -> str:
+        """
+        把已完成步骤的 (标题, 结果) 格式化为提示词中的研究发现部分
+
+        Args:
+            steps: 按执行顺序排列的已完成步骤
+
+        Returns:
+            不超过 max_tokens 个 token 的研究发现文本（无步骤时为空字符串）
+        """
+        if not steps:
+            return ""
+        budget = self.settings.max_tokens - count_tokens(self.HEADER)
+        findings = [finding or "" for _, finding in steps]
+        summarized = [False] * len(steps)
+        costs = [count_tokens(_format(i + 1, title, finding)) for i, ((title, _), finding) in enumerate(zip(steps, findings))]
+        original = sum(costs)
+
+        if self.settings.enabled and original > budget:
+            # 从最旧的步骤开始替换为摘要，直到满足预算
+            older = max(0, len(steps) - self.settings.keep_recent)
+            for i in range(older):
+                if sum(costs) <= budget:
+                    break
+                title = steps[i][0]
+                summary = await self.summarize(title, findings[i])
+                summary_cost = count_tokens(_format(i + 1, title, summary, summarized=True))
+                if summary_cost < costs[i]:
+                    findings[i], summarized[i], costs[i] = summary, True, summary_cost
+
+            if sum(costs) > budget:
+                # 仍然超出：每条结果截断到平均份额
+                share = max(budget // len(steps) - 32, 1)
+                for i, (title, _) in enumerate(steps):
+                    if costs[i] > share:
+                        findings[i] = truncate_to_tokens(findings[i], share)
+                        costs[i] = count_tokens(_format(i + 1, title, findings[i], summarized[i]))
+
+            compacted = sum(costs)
+            logger.info(
+                f"🗜️ 研究步骤上下文压缩: {original} → {compacted} tokens "
+                f"（{compacted / original:.0%}，{sum(summarized)}/{len(steps)} 个步骤使用摘要）"
+            )
+
+        return self.HEADER + "".join(
+            _format(i + 1, title, finding, summarized[i])
+            for i, ((title, _), finding) in enumerate(zip(steps, findings))
+        )
+
+
+def completed_steps(plan_steps: Sequence[Any], current_step_index: int) -> List[Tuple[str, str]]:
+    """当前步骤之前各步骤的 (标题, 执行结果)，兼容字典和 Step 对象"""
+    result = []
+    for i in range(min(current_step_index, len(plan_steps))):
+        step = plan_steps[i]
+        if isinstance(step, dict):
+            result.append((step.get("title", f"步骤{i+1}"), step.get("execution_res") or ""))
+        else:
+            result.append((getattr(step, "title", f"步骤{i+1}"), getattr(step, "execution_res", None) or ""))
+    return result
+
+
+# ----------------------------------------------------------------------
+# 进程内共享的压缩器（摘要缓存跨步骤、跨请求复用）
+# ----------------------------------------------------------------------
+
+_compactor: Optional[StepContextCompactor] = None
+_compactor_lock = threading.Lock()
+
+
+def create_step_context_compactor(settings: Optional[dict] = None) -> StepContextCompactor:
+    """
+    根据 conf.yaml 的 RESEARCH_CONTEXT 段创建压缩器
+
+    Args:
+        settings: 显式传入的配置，None 时读取 conf.yaml
+    """
+    if settings is None:
+        from src.config.loader import load_yaml_config
+
+        conf_path = str((Path(__file__).parent.parent.parent / "conf.yaml").resolve())
+        settings = load_yaml_config(conf_path).get("RESEARCH_CONTEXT") or {}
+
+    context_settings = StepContextSettings.from_dict(settings)
+    if context_settings.enabled:
+        logger.info(
+            f"🗜️ 研究步骤上下文预算 {context_settings.max_tokens} tokens，"
+            f"保留最近 {context_settings.keep_recent} 个步骤原文"
+        )
+    return StepContextCompactor(context_settings)
+
+
+def get_step_context_compactor() -> StepContextCompactor:
+    """获取进程内共享的压缩器（首次调用时创建）"""
+    global _compactor
+    if _compactor is None:
+        with _compactor_lock:
+            if _compactor is None:
+                _compactor = create_step_context_compactor()
+    return _compactor
+
+
+def set_step_context_compactor(compactor: Optional[StepContextCompactor]) -> None:
+    """替换共享的压缩器（传入 None 时下次使用会按配置重新创建）"""
+    global _compactor
+    with _compactor_lock:
+        _compactor = compactor
@@ -0,0 +1,77 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+本地 token 计数
+
+优先使用 tiktoken（cl100k_base）；tiktoken 未安装或编码文件无法加载时，
+退回到按字符估算：中日韩字符按 1 个 token 计，其余字符按 4 个字符 1 个 token 计。
+"""
+
+import logging
+import re
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"
+CHARS_PER_TOKEN = 4
+
+_CJK_PATTERN = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+
+                    _encoding = tiktoken.get_encoding(ENCODING_NAME)
+                except Exception as e:
+                    logger.info(f"tiktoken 不可用，使用字符数估算 token: {e!r}")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def _estimate(text: str) -> int:
+    cjk = len(_CJK_PATTERN.findall(text))
+    other = len(text) - cjk
+    return cjk + (other + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """计算文本的 token 数"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _estimate(text)
+
+
+def truncate_to_tokens(text: Optional[str], max_tokens: int) -> str:
+    """把文本截断到不超过 max_tokens 个 token"""
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    if _estimate(text) <= max_tokens:
+        return text
+    # 估算模式下按字符累计开销
+    budget = max_tokens * CHARS_PER_TOKEN
+    for index, char in enumerate(text):
+        budget -= CHARS_PER_TOKEN if _CJK_PATTERN.match(char) else 1
+        if budget < 0:
+            return text[:index]
+    return text
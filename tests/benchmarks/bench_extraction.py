@@ -0,0 +1,79 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+"""
+正文提取基准：lxml 快速路径 vs readabilipy
+
+用法:
+    python tests/benchmarks/bench_extraction.py [--paragraphs 200] [--rounds 20] [--python-only]
+
+--python-only 让 readabilipy 使用纯 Python 实现（不调用 Node.js 的 Readability.js）。
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from markdownify import markdownify as md  # noqa: E402
+from readabilipy import simple_json_from_html_string  # noqa: E402
+
+from src.crawler.readability_extractor import LxmlExtractor  # noqa: E402
+
+
+def build_page(paragraphs: int) -> str:
+    nav = "".join(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(40))
+    body = "".join(
+        f"<h2>Heading {i}</h2>" if i % 10 == 0 else f"<p>Paragraph {i}: " + "lorem ipsum dolor sit amet " * 15 + "</p>"
+        for i in range(paragraphs)
+    )
+    sidebar = "".join(f"<div class='ad'><a href='/promo/{i}'>Promo {i}</a></div>" for i in range(30))
+    return (
+        "<html><head><title>Benchmark article</title><script>window.x = 1;</script></head><body>"
+        f"<header><nav><ul>{nav}</ul></nav></header>"
+        f"<main><article><h1>Benchmark article</h1>{body}</article></main>"
+        f"<aside>{sidebar}</aside><footer>Footer</footer></body></html>"
+    )
+
+
+def timed(func, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list) -> None:
+    print(f"{name:<28} median {statistics.median(samples):8.2f} ms   min {min(samples):8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--python-only", action="store_true")
+    args = parser.parse_args()
+
+    html = build_page(args.paragraphs)
+    print(f"page size: {len(html) / 1024:.1f} KiB, rounds: {args.rounds}")
+
+    extractor = LxmlExtractor()
+    assert extractor.extract_article(html) is not None, "benchmark page should take the fast path"
+
+    report("lxml fast path", timed(lambda: extractor.extract_article(html), args.rounds))
+    report(
+        "readabilipy",
+        timed(lambda: simple_json_from_html_string(html, use_readability=not args.python_only), args.rounds),
+    )
+
+    content = extractor.extract_article(html).html_content
+    report("markdownify (article body)", timed(lambda: md(content), args.rounds))
+
+
+if __name__ == "__main__":
+    main()
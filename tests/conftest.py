@@ -0,0 +1,23 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from src.crawler.page_cache import set_page_cache
+from src.llms.llm_cache import set_response_cache
+from src.tools.literature_corpus import set_literature_corpus
+from src.tools.search_cache import set_search_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores():
+    """测试默认不使用 ./data 下的共享持久化存储，需要的测试自行用 tmp_path 创建"""
+    set_literature_corpus(None)
+    set_response_cache(None)
+    set_search_cache(None)
+    set_page_cache(None)
+    yield
+    set_literature_corpus(None)
+    set_response_cache(None)
+    set_search_cache(None)
+    set_page_cache(None)
@@ -0,0 +1,46 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.utils.async_guard import BlockingCallError, check_blocking_call
+
+
+def test_guard_ignores_calls_outside_event_loop(monkeypatch):
+    """Sync calls from a thread without a running loop are allowed."""
+    monkeypatch.setenv("BLOCKING_CALL_GUARD", "raise")
+    check_blocking_call("llm.invoke")
+
+
+def test_guard_raises_inside_event_loop(monkeypatch):
+    """Sync calls made on the event loop thread raise in strict mode."""
+    monkeypatch.setenv("BLOCKING_CALL_GUARD", "raise")
+
+    async def call():
+        check_blocking_call("llm.invoke")
+
+    with pytest.raises(BlockingCallError):
+        asyncio.run(call())
+
+
+def test_guard_allows_calls_from_worker_thread(monkeypatch):
+    """Sync calls pushed to a worker thread do not block the loop."""
+    monkeypatch.setenv("BLOCKING_CALL_GUARD", "raise")
+
+    async def call():
+        await asyncio.to_thread(check_blocking_call, "llm.invoke")
+
+    asyncio.run(call())
+
+
+def test_guard_warns_by_default(monkeypatch, caplog):
+    """The default mode logs a warning instead of raising."""
+    monkeypatch.delenv("BLOCKING_CALL_GUARD", raising=False)
+
+    async def call():
+        check_blocking_call("llm.invoke")
+
+    asyncio.run(call())
+    assert "llm.invoke" in caplog.text
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import httpx
+
+from src.crawler import crawler as crawler_module
+from src.crawler import Article, Crawler, PageCache
+
+PAGE = "<html><body><article><h1>{title}</h1><p>{body}</p></article></body></html>"
+
+
+class FakeJina:
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+
+    async def acrawl(self, url, return_format="html", timeout=None):
+        host = httpx.URL(url).host
+        self.calls.append(url)
+        self.active[host] = self.active.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        try:
+            await asyncio.sleep(self.delays.get(url, 0.02))
+        finally:
+            self.active[host] -= 1
+        return PAGE.format(title=url, body="content " * 20)
+
+    def crawl(self, url, return_format="html", timeout=None):
+        self.calls.append(url)
+        return PAGE.format(title=url, body="content " * 20)
+
+
+class FakeExtractor:
+    def extract_article(self, html):
+        return Article(title="page", html_content=html)
+
+    async def aextract_article(self, html):
+        return self.extract_article(html)
+
+
+def _crawler(jina, **kwargs):
+    crawler = Crawler(jina_client=jina, **kwargs)
+    crawler.extractor = FakeExtractor()
+    return crawler
+
+
+def _patch_head(monkeypatch, status=200, headers=None):
+    def handler(method, url, **kwargs):
+        return httpx.Response(status, headers=headers or {}, request=httpx.Request(method, url))
+
+    async def ahandler(*args, **kwargs):
+        return handler(*args, **kwargs)
+
+    monkeypatch.setattr(crawler_module, "request", handler)
+    monkeypatch.setattr(crawler_module, "arequest", ahandler)
+
+
+def test_crawl_many_respects_per_host_limit(monkeypatch):
+    _patch_head(monkeypatch)
+    jina = FakeJina()
+    crawler = _crawler(jina, page_cache=None, max_concurrency=10, per_host_limit=2)
+    urls = [f"https://a.example.com/{i}" for i in range(6)] + [f"https://b.example.com/{i}" for i in range(3)]
+
+    result = asyncio.run(crawler.crawl_many(urls + urls[:2]))
+
+    assert result.complete
+    assert list(result.articles) == urls
+    assert len(jina.calls) == len(urls)
+    assert jina.peak["a.example.com"] == 2
+    assert jina.peak["b.example.com"] == 2
+
+
+def test_crawl_many_returns_partial_results_at_deadline(monkeypatch):
+    _patch_head(monkeypatch)
+    slow = "https://slow.example.com/page"
+    jina = FakeJina(delays={slow: 5})
+    crawler = _crawler(jina, page_cache=None)
+
+    result = asyncio.run(crawler.crawl_many(["https://fast.example.com/page", slow], deadline=0.5))
+
+    assert list(result.articles) == ["https://fast.example.com/page"]
+    assert result.timed_out == [slow]
+    assert not result.complete
+    assert result.elapsed < 2
+
+
+def test_page_cache_revalidates_with_conditional_request(monkeypatch, tmp_path):
+    url = "https://docs.example.com/guide"
+    cache = PageCache(tmp_path / "pages.sqlite", fresh_seconds=0)
+    jina = FakeJina()
+    crawler = _crawler(jina, page_cache=cache)
+
+    _patch_head(monkeypatch, headers={"etag": '"v1"'})
+    asyncio.run(crawler.acrawl(url))
+    assert cache.get(url).etag == '"v1"'
+
+    sent = {}
+
+    async def not_modified(method, target, headers=None, **kwargs):
+        sent.update(headers or {})
+        return httpx.Response(304, request=httpx.Request(method, target))
+
+    monkeypatch.setattr(crawler_module, "arequest", not_modified)
+    result = asyncio.run(crawler.crawl_many([url]))
+
+    assert sent == {"If-None-Match": '"v1"'}
+    assert result.cache_hits == 1
+    assert len(jina.calls) == 1
+
+    # 源站返回新的 ETag 时重新抓取
+    _patch_head(monkeypatch, headers={"etag": '"v2"'})
+    result = asyncio.run(crawler.crawl_many([url]))
+    assert result.cache_hits == 0
+    assert len(jina.calls) == 2
+    assert cache.get(url).etag == '"v2"'
+
+
+def test_sync_crawl_uses_fresh_cache(monkeypatch, tmp_path):
+    _patch_head(monkeypatch, headers={"last-modified": "Wed, 01 Jan 2025 00:00:00 GMT"})
+    cache = PageCache(tmp_path / "pages.sqlite", fresh_seconds=600)
+    jina = FakeJina()
+    crawler = _crawler(jina, page_cache=cache)
+
+    crawler.crawl("https://docs.example.com/a")
+    html, cached = crawler.fetch_html("https://docs.example.com/a")
+
+    assert cached
+    assert "docs.example.com/a" in html
+    assert len(jina.calls) == 1
+
+
+def test_slow_origin_head_does_not_delay_the_crawl(monkeypatch, tmp_path):
+    import threading
+    import time
+
+    released = threading.Event()
+
+    def slow_head(method, url, **kwargs):
+        released.wait(5)
+        return httpx.Response(200, headers={"etag": '"late"'}, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(crawler_module, "request", slow_head)
+    monkeypatch.setattr(crawler_module, "VALIDATION_GRACE", 0.05)
+    cache = PageCache(tmp_path / "pages.sqlite", fresh_seconds=600)
+    crawler = _crawler(FakeJina(), page_cache=cache)
+    url = "https://docs.example.com/slow"
+
+    start = time.perf_counter()
+    crawler.crawl(url)
+    assert time.perf_counter() - start < 1
+    assert cache.get(url).etag is None
+
+    # HEAD 完成后在后台补写校验信息
+    released.set()
+    for _ in range(100):
+        if cache.get(url).etag:
+            break
+        time.sleep(0.01)
+    assert cache.get(url).etag == '"late"'
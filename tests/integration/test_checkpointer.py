@@ -0,0 +1,133 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+
+from src.graph.checkpointer import SQLiteCheckpointSaver, create_checkpointer
+
+
+class CounterState(TypedDict):
+    count: int
+    feedback: str
+
+
+def _build(saver):
+    def step(state: CounterState):
+        return {"count": state["count"] + 1}
+
+    def ask(state: CounterState):
+        return {"feedback": interrupt("accept plan?")}
+
+    builder = StateGraph(CounterState)
+    builder.add_node("step", step)
+    builder.add_node("ask", ask)
+    builder.add_edge(START, "step")
+    builder.add_edge("step", "ask")
+    builder.add_edge("ask", END)
+    return builder.compile(checkpointer=saver)
+
+
+def test_interrupted_thread_survives_restart(tmp_path):
+    """A thread waiting for human feedback can be resumed by a new process."""
+    db = tmp_path / "checkpoints.sqlite"
+    config = {"configurable": {"thread_id": "t1"}}
+
+    saver = SQLiteCheckpointSaver(str(db), batch_size=100, flush_interval=60)
+    _build(saver).invoke({"count": 0, "feedback": ""}, config)
+    saver.close()
+
+    reopened = SQLiteCheckpointSaver(str(db))
+    graph = _build(reopened)
+    assert graph.get_state(config).next == ("ask",)
+    result = graph.invoke(Command(resume="[ACCEPTED]"), config)
+    assert result == {"count": 1, "feedback": "[ACCEPTED]"}
+    reopened.close()
+
+
+def test_async_graph_run(tmp_path):
+    """The async checkpoint API works with graph.ainvoke."""
+    saver = SQLiteCheckpointSaver(str(tmp_path / "a.sqlite"))
+    graph = _build(saver)
+    config = {"configurable": {"thread_id": "async"}}
+    asyncio.run(graph.ainvoke({"count": 5, "feedback": ""}, config))
+    state = asyncio.run(graph.aget_state(config))
+    assert state.values["count"] == 6
+    saver.close()
+
+
+def test_history_is_pruned_per_thread(tmp_path):
+    """Only the newest checkpoints of a thread are kept."""
+    saver = SQLiteCheckpointSaver(str(tmp_path / "p.sqlite"), max_checkpoints_per_thread=2)
+    graph = _build(saver)
+    config = {"configurable": {"thread_id": "p"}}
+    graph.invoke({"count": 0, "feedback": ""}, config)
+    graph.invoke(Command(resume="ok"), config)
+    assert len(list(saver.list(config))) == 2
+    assert graph.get_state(config).values["feedback"] == "ok"
+    saver.close()
+
+
+def test_expired_and_excess_threads_are_evicted(tmp_path):
+    """Threads beyond the TTL or the thread cap are removed."""
+    saver = SQLiteCheckpointSaver(
+        str(tmp_path / "e.sqlite"), thread_ttl_seconds=3600, max_threads=2
+    )
+    graph = _build(saver)
+    for name in ("old", "a", "b", "c"):
+        graph.invoke({"count": 0, "feedback": ""}, {"configurable": {"thread_id": name}})
+    saver._conn.execute(
+        "UPDATE threads SET updated_at = ? WHERE thread_id = 'old'", (time.time() - 7200,)
+    )
+    assert saver.evict_expired_threads() == 2
+    remaining = {t.config["configurable"]["thread_id"] for t in saver.list(None)}
+    assert remaining == {"b", "c"}
+    saver.close()
+
+
+def test_create_checkpointer_defaults_to_memory(tmp_path):
+    """Without a sqlite setting the in-memory saver is used."""
+    assert not isinstance(create_checkpointer({}), SQLiteCheckpointSaver)
+    saver = create_checkpointer({"type": "sqlite", "path": str(tmp_path / "c.sqlite")})
+    assert isinstance(saver, SQLiteCheckpointSaver)
+    saver.close()
+
+
+def test_writes_are_committed_by_default_and_touch_the_thread(tmp_path):
+    """By default every write is durable when put/put_writes returns."""
+    import sqlite3
+
+    db = tmp_path / "d.sqlite"
+    saver = SQLiteCheckpointSaver(str(db))
+    graph = _build(saver)
+    config = {"configurable": {"thread_id": "d"}}
+    graph.invoke({"count": 0, "feedback": ""}, config)
+    saver._conn.execute("UPDATE threads SET updated_at = 0 WHERE thread_id = 'd'")
+
+    latest = saver.get_tuple(config).config
+    saver.put_writes(latest, [("count", 2)], task_id="task")
+
+    # 另一个连接（相当于崩溃后重启的进程）能看到全部写入
+    other = sqlite3.connect(str(db))
+    assert other.execute("SELECT COUNT(*) FROM writes WHERE task_id = 'task'").fetchone()[0] == 1
+    assert other.execute("SELECT updated_at FROM threads WHERE thread_id = 'd'").fetchone()[0] > 0
+    other.close()
+    saver.close()
+
+
+def test_list_filters_before_applying_the_limit(tmp_path):
+    """limit counts matching checkpoints, not the newest rows scanned."""
+    saver = SQLiteCheckpointSaver(str(tmp_path / "list.sqlite"))
+    config = {"configurable": {"thread_id": "listed"}}
+    _build(saver).invoke({"count": 0, "feedback": ""}, config)
+
+    newest = list(saver.list(config, limit=2))
+    assert len(newest) == 2 and newest[0].metadata["source"] == "loop"
+    inputs = list(saver.list(config, filter={"source": "input"}, limit=1))
+    assert len(inputs) == 1 and inputs[0].metadata["source"] == "input"
+    assert list(saver.list(config, filter={"source": "missing"}, limit=1)) == []
+    saver.close()
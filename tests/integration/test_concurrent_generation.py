@@ -0,0 +1,123 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.graph.nodes import SimpleBatchGenerator
+from src.utils.concurrent_generation import (
+    ConcurrentGenerationEngine,
+    GenerationTask,
+)
+from src.utils.rate_limiter import AsyncRateLimiter, get_rate_limiter, model_rate_limit_key
+
+
+class FakeLLM:
+    """Fake async LLM that records concurrency and can fail on demand."""
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = dict(failures or {})
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        prompt = messages[0]["content"]
+        self.calls.append(prompt)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(prompt, 0.01))
+            if self.failures.get(prompt, 0) > 0:
+                self.failures[prompt] -= 1
+                raise RuntimeError("provider error")
+            return AIMessage(content=f"{prompt} " + "x" * 200)
+        finally:
+            self.active -= 1
+
+
+def _tasks(n):
+    return [GenerationTask(index=i, direction=f"d{i}", prompt=f"p{i}") for i in range(1, n + 1)]
+
+
+def test_results_keep_task_order():
+    """Results are returned in task order even if later tasks finish first."""
+    llm = FakeLLM(delays={"p1": 0.05, "p2": 0.01, "p3": 0.02})
+    engine = ConcurrentGenerationEngine(llm, max_concurrency=3)
+    results = asyncio.run(engine.run(_tasks(3)))
+    assert [r.index for r in results] == [1, 2, 3]
+    assert all(r.success for r in results)
+    assert all(r.latency > 0 for r in results)
+
+
+def test_concurrency_limit_is_respected():
+    """No more than max_concurrency requests run at the same time."""
+    llm = FakeLLM()
+    engine = ConcurrentGenerationEngine(llm, max_concurrency=2)
+    asyncio.run(engine.run(_tasks(6)))
+    assert llm.max_active == 2
+
+
+def test_failed_task_is_retried_alone():
+    """A failing task is retried without re-running the others."""
+    llm = FakeLLM(failures={"p2": 1})
+    engine = ConcurrentGenerationEngine(llm, max_concurrency=4, retry_backoff=0)
+    results = asyncio.run(engine.run(_tasks(3)))
+    assert all(r.success for r in results)
+    assert results[1].attempts == 2
+    assert llm.calls.count("p1") == 1
+    assert llm.calls.count("p2") == 2
+
+
+def test_exhausted_retries_report_error():
+    """A task that keeps failing is reported as unsuccessful with its error."""
+    llm = FakeLLM(failures={"p1": 5})
+    engine = ConcurrentGenerationEngine(llm, max_retries=1, retry_backoff=0)
+    (result,) = asyncio.run(engine.run(_tasks(1)))
+    assert not result.success
+    assert result.attempts == 2
+    assert "provider error" in result.error
+
+
+def test_rate_limiter_spaces_requests():
+    """The shared token bucket throttles requests beyond the burst size."""
+    limiter = AsyncRateLimiter(rate=20, burst=1)
+    llm = FakeLLM(delays={f"p{i}": 0 for i in range(1, 5)})
+    engine = ConcurrentGenerationEngine(llm, max_concurrency=4, rate_limiter=limiter)
+    start = time.perf_counter()
+    asyncio.run(engine.run(_tasks(4)))
+    assert time.perf_counter() - start >= 0.14
+
+
+def test_shared_limiter_follows_the_latest_rate():
+    """Asking for a provider's limiter with a different rate updates the shared bucket."""
+    limiter = get_rate_limiter("test-provider-rpm", 60)
+    assert get_rate_limiter("test-provider-rpm", 120, burst=4) is limiter
+    assert limiter.rate == 2.0 and limiter.burst == 4
+
+
+def test_limiter_is_keyed_on_the_model_actually_called():
+    """The limiter key is the reporter model's name, not the configured agent name."""
+    assert model_rate_limit_key(SimpleNamespace(model_name="deepseek-chat")) == "deepseek-chat"
+    assert model_rate_limit_key(SimpleNamespace(model_name=None, model="doubao")) == "doubao"
+
+
+def test_batch_generator_sync_entry_refuses_a_running_loop(tmp_path):
+    """Async callers must await generate_all_directions instead of blocking the loop."""
+    generator = SimpleBatchGenerator(output_dir=str(tmp_path))
+
+    async def call_sync():
+        generator.generate_all_directions_sync(["direction"], "context")
+
+    with pytest.raises(RuntimeError, match="await generate_all_directions"):
+        asyncio.run(call_sync())
+
+
+def test_pause_between_is_deprecated(tmp_path):
+    with pytest.warns(DeprecationWarning, match="pause_between"):
+        SimpleBatchGenerator(output_dir=str(tmp_path), pause_between=2.0)
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+
+from src.utils.concurrent_generation import ConcurrentGenerationEngine, GenerationTask
+from src.utils.continuation import (
+    DIRECTION_PART_PATTERN,
+    SectionTracker,
+    generate_with_continuation,
+)
+
+
+class ScriptedModel(GenericFakeChatModel):
+    """按顺序返回预设的 (文本, finish_reason)，逐行流式输出，并记录每次收到的消息"""
+
+    replies: list = []
+    requests: list = []
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.requests.append(messages)
+        text, finish_reason = self.replies.pop(0)
+        lines = text.splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            metadata = {"finish_reason": finish_reason} if i == len(lines) - 1 else {}
+            yield ChatGenerationChunk(message=AIMessageChunk(content=line, response_metadata=metadata))
+
+
+def _model(*replies):
+    return ScriptedModel(messages=iter([]), replies=list(replies), requests=[])
+
+
+def _direction(n, body="内容完整。"):
+    return f"### 研究方向{n}：方向{n}\n{body}\n"
+
+
+def test_tracker_scans_lines_incrementally():
+    tracker = SectionTracker()
+    for piece in ["### 研究", "方向1：A\n正文", "\n## 方向2", "：B"]:
+        tracker.feed(piece)
+    assert tracker.ids == ["1"]
+    tracker.finish()
+    assert tracker.ids == ["1", "2"]
+    assert tracker.resume_point() == (tracker.text.index("## 方向2"), "## 方向2：B")
+
+
+def test_truncated_output_resumes_from_last_complete_section():
+    model = _model(
+        (_direction(1) + _direction(2) + "### 研究方向3：方向3\n写到一半", "length"),
+        (_direction(3) + _direction(4), "stop"),
+    )
+    result = asyncio.run(generate_with_continuation(model, [{"role": "user", "content": "写报告"}]))
+
+    assert result.content == "".join(_direction(n) for n in range(1, 5))
+    assert result.sections == ["1", "2", "3", "4"]
+    assert (result.continuations, result.truncated) == (1, False)
+
+    resumed = model.requests[1]
+    assert isinstance(resumed[-2], AIMessage)
+    assert resumed[-2].content == _direction(1) + _direction(2)
+    assert "### 研究方向3：方向3" in resumed[-1].content
+
+
+def test_continuations_are_bounded():
+    model = _model(*[(_direction(n) + "截断", "length") for n in range(1, 4)])
+    result = asyncio.run(generate_with_continuation(model, [{"role": "user", "content": "q"}], max_continuations=1))
+    assert (result.continuations, result.truncated) == (1, True)
+    assert len(model.requests) == 2
+
+
+def test_engine_continues_truncated_direction():
+    part = lambda n: f"#### 1.{n} 小节{n}\n" + "正文" * 30 + "\n"
+    model = _model(
+        (part(1) + part(2) + "#### 1.3 小节3\n半", "length"),
+        (part(3), "stop"),
+    )
+    engine = ConcurrentGenerationEngine(model, max_retries=0, section_pattern=DIRECTION_PART_PATTERN)
+    [result] = asyncio.run(engine.run([GenerationTask(index=1, direction="d", prompt="p")]))
+    assert result.success and result.continuations == 1
+    assert result.content == part(1) + part(2) + part(3)
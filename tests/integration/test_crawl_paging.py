@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from markdownify import markdownify as md
+
+from src.crawler import Article
+from src.tools import crawl as crawl_module
+from src.crawler.document_store import DocumentStore
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+HTML = "<div><div><h1>Title</h1>" + "".join(
+    f"<p>Paragraph {i} with <b>bold</b> and <a href='/x/{i}'>a link</a>.</p><ul><li>one</li><li>two</li></ul>"
+    for i in range(200)
+) + "<pre>code\n  block</pre></div></div>"
+
+
+def test_incremental_markdown_matches_full_conversion():
+    assert Article("Title", HTML).to_markdown(including_title=False) == md(HTML).strip()
+
+
+def test_budget_stops_conversion_early():
+    article = Article("Title", HTML)
+
+    markdown = article.to_markdown(max_chars=300)
+
+    assert len(markdown) == 300
+    assert markdown.startswith("# Title\n\n")
+    assert article._next_block < len(article._blocks) // 10
+    assert not article.markdown_complete
+
+    limited = Article("Title", HTML).to_markdown(max_tokens=50)
+    assert count_tokens(limited) <= 50
+
+
+def test_paged_reads_cover_the_whole_document():
+    article = Article("Title", HTML)
+    pages, offset = [], 0
+    while offset is not None:
+        content, offset = article.read_markdown(offset, 1500)
+        pages.append(content)
+
+    assert "".join(pages) == md(HTML).strip()
+    assert article.markdown_complete
+
+
+def test_crawl_tool_reads_further_pages_from_the_document_store(monkeypatch):
+    crawls = []
+
+    class FakeCrawler:
+        def crawl(self, url):
+            crawls.append(url)
+            article = Article("Title", HTML)
+            article.url = url
+            return article
+
+    store = DocumentStore()
+    monkeypatch.setattr(crawl_module, "Crawler", FakeCrawler)
+    monkeypatch.setattr(crawl_module, "get_document_store", lambda: store)
+
+    first = crawl_module.crawl_tool.invoke({"url": "https://example.com/paper"})
+    second = crawl_module.crawl_tool.invoke(
+        {"url": "https://example.com/paper", "offset": first["next_offset"], "limit": 500}
+    )
+
+    assert crawls == ["https://example.com/paper"]
+    assert len(first["crawled_content"]) == crawl_module.CRAWL_PAGE_CHARS
+    assert second["offset"] == crawl_module.CRAWL_PAGE_CHARS
+    assert second["next_offset"] == crawl_module.CRAWL_PAGE_CHARS + 500
+    assert (first["crawled_content"] + second["crawled_content"]) == md(HTML).strip()[:1500]
+
+
+def test_truncate_to_tokens():
+    text = "研究表明 " * 50 + "word " * 200
+    truncated = truncate_to_tokens(text, 40)
+
+    assert count_tokens(truncated) <= 40
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("short", 40) == "short"
+
+
+def test_batch_reads_convert_pages_off_the_event_loop(monkeypatch):
+    import asyncio
+    import threading
+
+    from src.crawler.crawler import BatchCrawlResult
+
+    urls = [f"https://example.com/{i}" for i in range(3)]
+
+    class FakeCrawler:
+        async def crawl_many(self, urls, deadline=None):
+            result = BatchCrawlResult()
+            for url in urls:
+                result.articles[url] = Article("Title", HTML)
+                result.articles[url].url = url
+            return result
+
+    threads = []
+    read_page = crawl_module._read_page
+
+    def recording_read_page(article, *args):
+        threads.append(threading.current_thread())
+        return read_page(article, *args)
+
+    monkeypatch.setattr(crawl_module, "Crawler", FakeCrawler)
+    monkeypatch.setattr(crawl_module, "get_document_store", DocumentStore)
+    monkeypatch.setattr(crawl_module, "_read_page", recording_read_page)
+
+    pages = asyncio.run(crawl_module.batch_crawl_tool.ainvoke({"urls": urls}))
+
+    assert [page["url"] for page in pages] == urls
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,107 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from src.crawler import readability_extractor
+from src.crawler.extraction_pool import ExtractionPool
+from src.crawler.readability_extractor import LxmlExtractor, ReadabilityExtractor
+
+ARTICLE_PAGE = (
+    "<html><head><title>Site | Story</title><meta property='og:title' content='Story'></head><body>"
+    "<nav><a href='/'>Home</a><a href='/news'>News</a></nav>"
+    "<script>var tracking = 1;</script>"
+    "<article><h1>Story</h1>"
+    + "".join(f"<p>Paragraph {i} " + "lorem ipsum dolor sit amet " * 12 + "</p>" for i in range(4))
+    + "</article><footer>Copyright</footer></body></html>"
+)
+LINK_PAGE = (
+    "<html><body><main>"
+    + "".join(f"<p><a href='/{i}'>" + "a link to another page " * 3 + "</a></p>" for i in range(10))
+    + "</main></body></html>"
+)
+
+
+@pytest.fixture
+def no_readability(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("readabilipy should not be used")
+
+    monkeypatch.setattr(readability_extractor, "simple_json_from_html_string", fail)
+
+
+def test_lxml_extractor_takes_semantic_container():
+    article = LxmlExtractor().extract_article(ARTICLE_PAGE)
+
+    assert article.title == "Story"
+    assert "Paragraph 3" in article.html_content
+    assert "Home" not in article.html_content
+    assert "tracking" not in article.html_content
+
+
+def test_lxml_extractor_defers_unclear_pages():
+    extractor = LxmlExtractor()
+
+    assert extractor.extract_article(LINK_PAGE) is None
+    assert extractor.extract_article("<html><body><div>short</div></body></html>") is None
+    assert "short" in extractor.extract_article("<html><body><div>short</div></body></html>", strict=False).html_content
+
+
+def test_readability_extractor_uses_fast_path(no_readability):
+    article = ReadabilityExtractor().extract_article(ARTICLE_PAGE)
+    assert article.title == "Story"
+
+
+def test_oversized_pages_skip_readability(no_readability):
+    pool = ExtractionPool(max_html_chars=200, use_processes=False)
+    page = "<html><body><div>" + "plain text without structure " * 100 + "</div></body></html>"
+
+    article = asyncio.run(pool.aextract_article(page))
+
+    assert article.to_markdown(including_title=False).startswith("plain text")
+    assert len(article.html_content) < 250
+
+
+def test_process_pool_extracts_articles():
+    pool = ExtractionPool(max_workers=1, timeout=60)
+    try:
+        article = pool.extract_article(ARTICLE_PAGE)
+        async_article = asyncio.run(pool.aextract_article(ARTICLE_PAGE))
+    finally:
+        pool.shutdown()
+
+    assert article.to_markdown().startswith("# Story")
+    assert async_article.to_markdown() == article.to_markdown()
+
+
+def test_timeout_does_not_cancel_other_callers(monkeypatch):
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from src.crawler import extraction_pool
+
+    def fake_extract(html, allow_readability=True):
+        if allow_readability and "slow" in html:
+            time.sleep(1)
+        return ("worker" if allow_readability else "fallback"), html
+
+    monkeypatch.setattr(extraction_pool, "extract_document", fake_extract)
+    monkeypatch.setattr(
+        extraction_pool, "ProcessPoolExecutor", lambda max_workers, mp_context: ThreadPoolExecutor(max_workers)
+    )
+    pool = ExtractionPool(max_workers=1, timeout=0.4)
+
+    async def run():
+        return await asyncio.gather(
+            pool.aextract_article("<p>slow</p>"),
+            *(pool.aextract_article(f"<p>fast {i}</p>") for i in range(6)),
+        )
+
+    slow, *fast = asyncio.run(run())
+    assert slow.title == "fallback"
+    # 排队的任务不计入超时，也不会因为其他调用方超时被取消
+    assert [article.title for article in fast] == ["worker"] * 6
+    assert pool.extract_article("<p>fast</p>").title == "worker"
+    pool.shutdown()
@@ -0,0 +1,111 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import src.tools.google_scholar_search as scholar
+from src.tools.google_scholar_search import GoogleScholarSearchTool
+
+
+def _page(request: httpx.Request) -> dict:
+    start = int(request.url.params["start"])
+    num = int(request.url.params["num"])
+    available = max(0, min(num, 25 - start))
+    return {
+        "organic_results": [
+            {
+                "title": f"Paper {start + i}",
+                "link": f"https://example.org/{start + i}",
+                "publication_info": {
+                    "summary": "A Author - Bone, 2024",
+                    "authors": [{"name": "A Author"}],
+                },
+                "inline_links": {"cited_by": {"total": start + i}},
+            }
+            for i in range(available)
+        ]
+    }
+
+
+@pytest.fixture
+def requests_seen(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json=_page(request))
+
+    async def async_handler(request):
+        seen.append(request)
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, json=_page(request))
+
+    sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scholar, "get_sync_client", lambda: sync_client)
+    monkeypatch.setattr(
+        scholar,
+        "get_async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(async_handler)),
+    )
+    return seen
+
+
+def test_structured_results_are_paged(requests_seen):
+    tool = GoogleScholarSearchTool(serpapi_api_key="k", top_k_results=30)
+    results = tool.search("bone density")
+    assert [r.title for r in results] == [f"Paper {i}" for i in range(25)]
+    assert results[3].cited_by == 3 and results[3].authors == ["A Author"]
+    assert [r.url.params["start"] for r in requests_seen] == ["0", "20"]
+    assert "Title: Paper 0\n" in tool.invoke({"query": "bone density"})
+
+
+def test_async_queries_overlap(requests_seen):
+    tool = GoogleScholarSearchTool(serpapi_api_key="k", top_k_results=5)
+
+    async def run():
+        start = time.perf_counter()
+        outputs = await asyncio.gather(*(tool.ainvoke({"query": f"q{i}"}) for i in range(5)))
+        return outputs, time.perf_counter() - start
+
+    outputs, elapsed = asyncio.run(run())
+    assert all(output.startswith("Title: Paper 0") for output in outputs)
+    assert elapsed < 0.6
+
+
+def test_errors_are_reported_as_text(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectTimeout("timed out")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scholar, "get_sync_client", lambda: client)
+    output = GoogleScholarSearchTool(serpapi_api_key="k").invoke({"query": "q"})
+    assert output.startswith("Google Scholar搜索出现错误") and "网络连接问题" in output
+
+
+def test_record_mode_returns_typed_records(requests_seen):
+    tool = GoogleScholarSearchTool(serpapi_api_key="k", top_k_results=3, return_records=True)
+    records = tool.invoke({"query": "bone density"})
+    assert [r.title for r in records] == ["Paper 0", "Paper 1", "Paper 2"]
+    assert records[1].journal == "Bone" and records[1].year == 2024 and records[1].cited_by == 1
+    text = GoogleScholarSearchTool(serpapi_api_key="k", top_k_results=3).invoke({"query": "bone density"})
+    assert str(records) == text
+
+    async_records = asyncio.run(tool.ainvoke({"query": "bone density"}))
+    assert [r.url for r in async_records] == [r.url for r in records]
+
+
+def test_http_errors_do_not_leak_the_api_key(monkeypatch, caplog):
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(401, json={})))
+    monkeypatch.setattr(scholar, "get_sync_client", lambda: client)
+    tool = GoogleScholarSearchTool(serpapi_api_key="SECRET123")
+
+    output = tool.invoke({"query": "q"})
+    assert "401" in output and "api_key=***" in output
+    assert "SECRET123" not in output and "SECRET123" not in caplog.text
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        GoogleScholarSearchTool(serpapi_api_key="SECRET123", return_records=True).invoke({"query": "q"})
+    assert "SECRET123" not in str(excinfo.value)
@@ -0,0 +1,121 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.server.graph_registry import GraphRegistry, JobManager, WorkerPoolBusyError
+
+
+class SlowGraph:
+    def __init__(self):
+        self.threads = set()
+
+    def invoke(self, graph_input, config=None):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(0.1)
+        return {"output": graph_input["input"]}
+
+
+def test_graph_is_compiled_once():
+    """Every caller shares the graph compiled on first access."""
+    builds = []
+    registry = GraphRegistry()
+    registry.register("podcast", lambda: builds.append(1) or SlowGraph())
+    assert registry.get("podcast") is registry.get("podcast")
+    registry.warm_up()
+    assert len(builds) == 1
+
+
+def test_sync_graph_runs_off_the_event_loop():
+    """Sync workflows run on the worker pool and overlap with each other."""
+    registry = GraphRegistry(max_workers=4)
+    graph = SlowGraph()
+    registry.register("podcast", lambda: graph)
+
+    async def run():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(registry.invoke("podcast", {"input": i}) for i in range(4))
+        )
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(run())
+    assert [r["output"] for r in results] == [0, 1, 2, 3]
+    assert elapsed < 0.3
+    assert all(name.startswith("graph-worker") for name in graph.threads)
+
+
+def test_worker_pool_rejects_when_full():
+    """Submissions beyond max_pending are rejected instead of queued forever."""
+    registry = GraphRegistry(max_workers=1, max_pending=1)
+    registry.register("podcast", SlowGraph)
+
+    async def run():
+        first = asyncio.create_task(registry.invoke("podcast", {"input": 1}))
+        await asyncio.sleep(0)
+        with pytest.raises(WorkerPoolBusyError):
+            await registry.invoke("podcast", {"input": 2})
+        await first
+
+    asyncio.run(run())
+
+
+def test_job_lifecycle():
+    """Jobs are submitted immediately and can be awaited for their result."""
+    manager = JobManager()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return b"audio"
+
+    async def fail():
+        raise ValueError("tts failed")
+
+    async def run():
+        job = manager.submit("podcast", work, media_type="audio/mp3")
+        assert job.status in ("pending", "running")
+        done = await manager.wait(job.id, timeout=1)
+        failed = manager.submit("podcast", fail)
+        await manager.wait(failed.id, timeout=1)
+        return done, failed
+
+    done, failed = asyncio.run(run())
+    assert done.status == "completed" and done.result == b"audio"
+    assert failed.status == "failed" and "tts failed" in failed.error
+
+
+def test_job_slots_are_reserved_at_submit_and_held_until_the_worker_finishes():
+    """A burst of submissions is rejected up front; cancelled jobs keep their slot while the thread runs."""
+    registry = GraphRegistry(max_workers=1, max_pending=2)
+    manager = JobManager()
+    release = threading.Event()
+
+    async def run():
+        jobs = []
+        for _ in range(2):
+            slot = registry.reserve()
+            jobs.append(manager.submit("podcast", lambda: registry.run_in_worker(release.wait, 5), slot=slot))
+        # 任务还没开始执行，名额已经预留
+        with pytest.raises(WorkerPoolBusyError):
+            registry.reserve()
+
+        await asyncio.sleep(0.05)
+        manager.cancel(jobs[0].id)
+        await manager.wait(jobs[0].id, timeout=1)
+        assert registry.pending == 2
+
+        release.set()
+        await manager.wait(jobs[1].id, timeout=1)
+        for _ in range(100):
+            if registry.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert jobs[0].error == "cancelled" and jobs[1].status == "completed"
+    assert registry.pending == 0
@@ -0,0 +1,140 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils import http_client
+from src.utils.http_client import (
+    HttpClientSettings,
+    arequest,
+    configure_http_clients,
+    get_http_metrics,
+    host_metrics,
+    prewarm,
+    request,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    statuses = []
+    client_ports = set()
+
+    def _reply(self):
+        Handler.client_ports.add(self.client_address[1])
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status = Handler.statuses.pop(0) if Handler.statuses else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_HEAD = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    Handler.statuses = []
+    Handler.client_ports = set()
+    configure_http_clients(
+        HttpClientSettings(retry_backoff=0, http2=False, prewarm_hosts=[], dns_cache_ttl=60)
+    )
+    host_metrics.reset()
+    yield f"http://localhost:{httpd.server_address[1]}"
+    http_client.close_sync_client()
+    httpd.shutdown()
+
+
+def test_connections_are_reused_and_dns_is_cached(server, monkeypatch):
+    lookups = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def counting_getaddrinfo(host, *args, **kwargs):
+        if host != "127.0.0.1":
+            lookups.append(host)
+        return real_getaddrinfo("127.0.0.1", *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    for _ in range(5):
+        assert request("GET", f"{server}/ping").text == "ok"
+    assert len(Handler.client_ports) == 1
+    assert lookups == ["localhost"]
+
+    stats = get_http_metrics()["hosts"]["localhost"]
+    assert stats["requests"] == 5 and stats["status"] == {"2xx": 5}
+
+
+def test_retry_policy_depends_on_method(server):
+    Handler.statuses = [503, 502, 200]
+    assert request("GET", f"{server}/flaky").status_code == 200
+
+    Handler.statuses = [500, 200]
+    assert request("POST", f"{server}/submit", json={}).status_code == 500
+
+    Handler.statuses = [503, 200]
+    assert request("POST", f"{server}/submit", json={}).status_code == 200
+
+
+def test_async_requests_and_prewarm(server):
+    async def run():
+        responses = await asyncio.gather(*(arequest("GET", f"{server}/a") for _ in range(3)))
+        await http_client.aclose_async_client()
+        return [r.status_code for r in responses]
+
+    assert asyncio.run(run()) == [200, 200, 200]
+    assert prewarm([server, "http://127.0.0.1:1"]) == {server: True, "http://127.0.0.1:1": False}
+
+
+def test_dns_cache_tries_every_address(server, monkeypatch):
+    port = int(server.rsplit(":", 1)[1])
+    lookups = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def fake_getaddrinfo(host, *args, **kwargs):
+        if host.startswith("127."):
+            return real_getaddrinfo(host, *args, **kwargs)
+        lookups.append(host)
+        # 第一个地址上没有服务，连接被拒绝后应尝试下一个
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.2", port)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+    monkeypatch.setattr(socket, "getaddrinfo", fake_getaddrinfo)
+    for _ in range(2):
+        assert request("GET", f"{server}/ping", retries=0).text == "ok"
+    assert lookups == ["localhost"]
+
+
+def test_environment_proxy_is_honoured(server, monkeypatch):
+    for name in ("NO_PROXY", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("HTTP_PROXY", server)
+    configure_http_clients(HttpClientSettings(retry_backoff=0, http2=False))
+
+    # 请求经测试服务器转发，代理负责解析不存在的域名
+    assert request("GET", "http://upstream.invalid/page", retries=0).text == "ok"
+    assert get_http_metrics()["hosts"]["upstream.invalid"]["status"] == {"2xx": 1}
+
+
+def test_async_client_is_closed_with_its_event_loop(server):
+    async def run():
+        await arequest("GET", f"{server}/a")
+        return http_client.get_async_client()
+
+    clients = [asyncio.run(run()) for _ in range(2)]
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed for client in clients)
+    assert len(http_client._async_clients) == 0
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import csv
+import time
+
+from src.tools.journal_catalog import AhoCorasickMatcher, JournalCatalog, JournalTier, load_journal_catalog
+from src.tools.journal_quality_controller import JournalQualityController
+
+
+def test_matcher_finds_overlapping_patterns_on_word_boundaries():
+    matcher = AhoCorasickMatcher([("nature", "n"), ("nature medicine", "nm"), ("cell", "c")]).build()
+    hits = matcher.search("Published in Nature Medicine; see cellular Cell reports")
+    assert [value for _, _, value in hits] == ["n", "nm", "c"]
+
+
+def test_builtin_catalog_matches_names_and_domains():
+    controller = JournalQualityController(load_journal_catalog())
+    assert "nature_medicine" in controller.journal_database
+
+    quality = controller._assess_journal_quality({"title": "DXA AI", "content": "Nature Medicine (2024)", "url": ""})
+    assert quality["name"] == "Nature Medicine" and quality["tier"] is JournalTier.TOP_TIER
+
+    heuristic = controller._assess_journal_quality({"title": "x", "content": "y", "url": "https://link.springer.com/a/1"})
+    assert heuristic["tier"] is JournalTier.HIGH_TIER and heuristic["confidence"] == 0.6
+
+
+def test_csv_catalog_with_tiers_from_impact_factor(tmp_path):
+    path = tmp_path / "journals.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "impact_factor", "fields", "domains", "aliases"])
+        writer.writeheader()
+        writer.writerow({"name": "Bone Reports", "impact_factor": "3.1", "fields": "bone_health;biomedical",
+                         "domains": "bonereports.example", "aliases": "Bone Rep"})
+        writer.writerow({"name": "Journal of Osteo AI", "impact_factor": "16", "fields": "ai_ml"})
+
+    catalog = load_journal_catalog(str(path))
+    assert catalog.get("bone_reports").tier is JournalTier.MID_TIER
+    assert catalog.get("bone_reports").fields == ["bone_health", "biomedical"]
+    assert catalog.get("journal_of_osteo_ai").tier is JournalTier.TOP_TIER
+    assert catalog.find_in_text("as shown in Bone Rep 2023").name == "Bone Reports"
+    assert catalog.find_by_url("https://www.sub.bonereports.example/x").name == "Bone Reports"
+
+
+def test_bad_catalog_fields_do_not_discard_the_catalog(tmp_path):
+    path = tmp_path / "journals.csv"
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["name", "impact_factor", "tier"])
+        writer.writeheader()
+        writer.writerow({"name": "Bone Reports", "impact_factor": "3.1", "tier": ""})
+        writer.writerow({"name": "Osteo Letters", "impact_factor": "N/A", "tier": ""})
+        writer.writerow({"name": "Density Review", "impact_factor": "12", "tier": "unknown"})
+
+    catalog = load_journal_catalog(str(path))
+    assert len(catalog) == 3
+    assert catalog.get("bone_reports").tier is JournalTier.MID_TIER
+    assert catalog.get("osteo_letters").impact_factor == 0.0
+    assert catalog.get("density_review").tier is JournalTier.HIGH_TIER
+
+def test_filtering_cost_does_not_grow_with_catalog_size():
+    entries = [{"name": f"Journal of Topic {i} Studies", "impact_factor": i % 30} for i in range(20000)]
+    entries.append({"name": "Nature Medicine", "impact_factor": 87.2})
+    controller = JournalQualityController(JournalCatalog(entries))
+    results = [
+        {"title": f"Paper {i}", "content": "Published in Nature Medicine. " * 20, "url": f"https://example.org/{i}"}
+        for i in range(500)
+    ]
+
+    start = time.perf_counter()
+    filtered = controller.filter_results_by_journal_quality(results, JournalTier.HIGH_TIER)
+
+    assert len(filtered) == 500
+    assert all(r["journal_quality"]["name"] == "Nature Medicine" for r in filtered)
+    assert time.perf_counter() - start < 2
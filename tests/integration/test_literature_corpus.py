@@ -0,0 +1,117 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import time
+
+import pytest
+
+import src.graph.literature_preresearch_node as preresearch
+from src.graph.literature_preresearch_node import SEARCH_STRATEGIES, execute_literature_search
+from src.tools.literature_corpus import LiteratureCorpus, literature_corpus_tool, set_literature_corpus
+from src.tools.literature_record import LiteratureRecord
+from src.utils.literature_relevance import TOKENIZER_VERSION
+
+
+@pytest.fixture
+def corpus():
+    corpus = LiteratureCorpus()
+    set_literature_corpus(corpus, {"refresh_days": 30, "min_term_coverage": 0.6})
+    yield corpus
+    set_literature_corpus(None)
+    corpus.close()
+
+
+def test_upsert_merges_by_identifier(corpus):
+    corpus.upsert([
+        LiteratureRecord(title="Deep learning for bone mineral density", pmid="123", source="pubmed"),
+        {"title": "Radiomics of DXA images", "doi": "10.1000/abc", "source": "google_scholar", "year": "2022"},
+    ])
+    corpus.upsert([
+        LiteratureRecord(title="Deep Learning for Bone Mineral Density.", pmid="123", doi="https://doi.org/10.1038/XYZ",
+                         abstract="A convolutional network estimates BMD.", source="pubmed"),
+        {"title": "Radiomics of DXA images (preprint)", "doi": "10.1000/ABC", "cited_by": 7},
+    ])
+
+    assert corpus.stats()["papers"] == 2
+    bmd = corpus.search("convolutional network BMD")[0].record
+    assert bmd.pmid == "123" and bmd.doi == "https://doi.org/10.1038/XYZ"
+    radiomics = corpus.search("radiomics")[0].record
+    assert radiomics.title == "Radiomics of DXA images" and radiomics.cited_by == 7 and radiomics.year == 2022
+
+
+def test_bm25_ranking_and_local_sufficiency(corpus):
+    corpus.upsert(
+        [LiteratureRecord(title=f"Osteoporosis screening cohort {i}", abstract="Hip fracture risk.", pmid=str(i),
+                          source="pubmed") for i in range(5)]
+        + [LiteratureRecord(title="Cardiovascular risk from bone density", abstract="osteoporosis", pmid="99",
+                            source="pubmed")]
+    )
+
+    hits = corpus.search("osteoporosis screening")
+    assert hits[0].record.title.startswith("Osteoporosis screening") and hits[-1].record.pmid == "99"
+    assert len(corpus.search_local("osteoporosis screening", 5)) == 5
+    assert corpus.search_local("osteoporosis screening", 10) is None
+    assert corpus.search_local("osteoporosis screening", 5, sources=["google_scholar"]) is None
+    assert corpus.search_local("osteoporosis screening", 5, refresh_days=-1) is None
+    assert "Osteoporosis screening cohort" in literature_corpus_tool.invoke({"query": "osteoporosis", "limit": 2})
+
+
+def test_corpus_persists_and_searches_quickly(tmp_path):
+    path = tmp_path / "corpus.sqlite"
+    corpus = LiteratureCorpus(str(path))
+    corpus.upsert(
+        LiteratureRecord(title=f"Study {i} of topic{i % 200} and bone density", abstract=f"cohort{i % 50} analysis",
+                         pmid=str(i), source="pubmed")
+        for i in range(5000)
+    )
+    corpus.close()
+
+    reopened = LiteratureCorpus(str(path))
+    start = time.perf_counter()
+    hits = reopened.search("topic7 cohort7", limit=10)
+    assert time.perf_counter() - start < 0.5
+    assert hits and "topic7 " in hits[0].record.title
+    reopened.close()
+
+
+def test_index_from_another_tokenizer_version_is_rebuilt(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "corpus.sqlite")
+    corpus = LiteratureCorpus(path)
+    corpus.upsert([LiteratureRecord(title="Trabecular bone score in DXA", pmid="1", source="pubmed")])
+    corpus.close()
+
+    # 模拟旧版分词规则写入的倒排表
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE postings SET term = 'old-' || term")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    reopened = LiteratureCorpus(path)
+    assert [hit.record.pmid for hit in reopened.search("trabecular dxa")] == ["1"]
+    assert reopened._conn.execute("PRAGMA user_version").fetchone()[0] == TOKENIZER_VERSION
+    reopened.close()
+
+
+def test_preresearch_is_served_from_corpus(corpus, monkeypatch):
+    def offline(**kwargs):
+        raise AssertionError("network search should not run")
+
+    monkeypatch.setattr(preresearch, "get_pubmed_search_tool", offline)
+    monkeypatch.setattr(preresearch, "get_google_scholar_search_tool", offline)
+    for strategy in SEARCH_STRATEGIES:
+        query = " ".join(strategy["keywords"])
+        corpus.upsert(
+            LiteratureRecord(title=f"{query} {source} paper {i}", source=source)
+            for source in ("pubmed", "google_scholar")
+            for i in range(strategy["max_results"])
+        )
+
+    results = execute_literature_search("", deadline=1)
+    reports = {report["engine"]: report for report in results["search_report"]}
+    assert reports["local_corpus"]["succeeded"] == 2 * len(SEARCH_STRATEGIES)
+    assert reports["local_corpus"]["papers"] == 2 * sum(s["max_results"] for s in SEARCH_STRATEGIES)
+    assert reports["pubmed"]["queries"] == reports["google_scholar"]["queries"] == 0
+    assert results["literature_count"] > 0
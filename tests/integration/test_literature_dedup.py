@@ -0,0 +1,73 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import random
+import time
+from dataclasses import dataclass
+
+from src.utils.literature_dedup import (
+    LiteratureDeduplicator,
+    deduplicate_literature,
+    normalize_doi,
+    normalize_title,
+)
+
+
+@dataclass
+class Result:
+    title: str
+    url: str = ""
+
+
+def test_normalizers():
+    assert normalize_title("Deep-Learning for  DXA: A Review.") == "deep learning for dxa a review"
+    assert normalize_title("Ostéoporose") == "osteoporose"
+    assert normalize_doi("https://doi.org/10.1038/S41591-020-0001-X.") == "10.1038/s41591-020-0001-x"
+
+
+def test_identifiers_and_title_variants_collapse():
+    papers = [
+        {"title": "Deep learning for DXA bone density estimation", "pmid": "12345", "source": "pubmed"},
+        {"title": "DEEP LEARNING FOR DXA BONE-DENSITY ESTIMATION.", "source": "google_scholar"},
+        {"title": "A completely different title", "pmid": "012345", "source": "pubmed"},
+        {"title": "Radiomics of trabecular bone", "doi": "10.1000/xyz1", "source": "pubmed"},
+        {"title": "Trabecular bone radiomics", "url": "https://doi.org/10.1000/XYZ1", "source": "tavily"},
+        {"title": "Fracture risk prediction with CNNs", "source": "pubmed"},
+    ]
+
+    unique = deduplicate_literature(papers)
+
+    assert [paper["source"] for paper in unique] == ["pubmed", "pubmed", "pubmed"]
+    assert unique[0]["pmid"] == "12345"
+    assert unique[2]["title"] == "Fracture risk prediction with CNNs"
+
+
+def test_near_duplicate_titles_are_detected():
+    items = [
+        Result("Machine learning approaches to osteoporosis screening from DXA images: a systematic review"),
+        Result("Machine learning approaches to osteoporosis screening from DXA images - a systematic review [PDF]"),
+        Result("Machine learning approaches to sarcopenia screening from CT images"),
+    ]
+
+    unique = LiteratureDeduplicator().deduplicate(items)
+
+    assert unique == [items[0], items[2]]
+
+
+def test_bare_domain_urls_do_not_merge_records():
+    items = [Result("Bone health and AI", "https://www.nature.com/"), Result("Osteocalcin signalling", "nature.com")]
+
+    assert len(deduplicate_literature(items)) == 2
+
+
+def test_scales_to_thousands_of_records():
+    rng = random.Random(0)
+    vocabulary = [f"term{i}" for i in range(2000)]
+    papers = [{"title": " ".join(rng.sample(vocabulary, 10))} for _ in range(3000)]
+    papers += [{"title": paper["title"].upper() + "."} for paper in papers[:500]]
+
+    start = time.perf_counter()
+    unique = deduplicate_literature(papers)
+
+    assert len(unique) == 3000
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+import pytest
+
+import src.graph.literature_preresearch_node as preresearch
+from src.graph.literature_preresearch_node import (
+    SEARCH_STRATEGIES,
+    aexecute_literature_search,
+    build_search_strategies,
+    execute_literature_search,
+)
+from src.tools.literature_record import LiteratureRecord, LiteratureRecords
+
+QUERIES = [" ".join(strategy["keywords"]) for strategy in SEARCH_STRATEGIES]
+
+
+class FakeRecord:
+    def __init__(self, query, index):
+        self.query, self.index = query, index
+
+    def to_literature_record(self):
+        return LiteratureRecord(
+            title=f"PubMed paper {self.index} on {self.query}",
+            authors="Li W",
+            abstract="Bone density matters.",
+            pmid=f"{abs(hash(self.query)) % 10000}{self.index}",
+            journal="Nature Medicine",
+            source="pubmed",
+        )
+
+
+class FakePubMedWrapper:
+    def search_many_records(self, queries, max_results=10, errors=None):
+        time.sleep(0.3)
+        errors[queries[1]] = "ConnectError('boom')"
+        return {query: [FakeRecord(query, i) for i in range(3)] if query != queries[1] else [] for query in queries}
+
+
+class FakePubMedTool:
+    pubmed_api_wrapper = FakePubMedWrapper()
+
+
+class FakeScholarTool:
+    async def ainvoke(self, args):
+        query = args["query"]
+        if query == QUERIES[2]:
+            raise RuntimeError("429 Too Many Requests")
+        await asyncio.sleep(5 if query == QUERIES[3] else 0.3)
+        return LiteratureRecords([
+            LiteratureRecord(title=f"Scholar paper on {query}", journal="Springer", source="google_scholar")
+        ])
+
+
+async def _no_local_records(*args, **kwargs):
+    return None
+
+
+def _patch(monkeypatch, deadline=2):
+    monkeypatch.setattr(preresearch, "get_pubmed_search_tool", lambda **kwargs: FakePubMedTool())
+    monkeypatch.setattr(preresearch, "get_google_scholar_search_tool", lambda **kwargs: FakeScholarTool())
+    monkeypatch.setattr(preresearch, "asearch_corpus_first", _no_local_records)
+    monkeypatch.setattr(
+        preresearch,
+        "get_literature_search_settings",
+        lambda: {"deadline_seconds": deadline, "scholar_requests_per_minute": 6000},
+    )
+
+
+def test_searches_run_concurrently_and_report_per_engine(monkeypatch):
+    _patch(monkeypatch, deadline=1.5)
+
+    start = time.perf_counter()
+    results = execute_literature_search("")
+    elapsed = time.perf_counter() - start
+
+    # 8 个查询串行至少需要 2.4 秒；并发时在截止时间附近返回
+    assert elapsed < 2.5
+    reports = {report["engine"]: report for report in results["search_report"]}
+
+    pubmed = reports["pubmed"]
+    assert pubmed["succeeded"] == 3
+    assert pubmed["papers"] == 9
+    assert list(pubmed["failures"]) == [QUERIES[1]]
+
+    scholar = reports["google_scholar"]
+    assert scholar["succeeded"] == 2
+    assert list(scholar["failures"]) == [QUERIES[2]]
+    assert scholar["timed_out"] == [QUERIES[3]]
+
+    sources = {paper["source"] for paper in results["literature_database"]}
+    assert sources == {"pubmed", "google_scholar"}
+    assert results["literature_count"] == 11
+
+
+def test_report_is_included_in_context(monkeypatch):
+    _patch(monkeypatch, deadline=1)
+
+    results = execute_literature_search("")
+    context = preresearch.create_literature_context(results)
+
+    assert "检索情况" in context
+    assert "google_scholar 检索超时" in context
+
+
+def test_research_topic_becomes_the_first_query(monkeypatch):
+    _patch(monkeypatch, deadline=1)
+    searched = []
+
+    async def record_local(query, *args, **kwargs):
+        searched.append(query)
+        return None
+
+    monkeypatch.setattr(preresearch, "asearch_corpus_first", record_local)
+    strategies = build_search_strategies("  DXA   vertebral\nfracture ")
+    assert strategies[0]["keywords"] == ["DXA vertebral fracture"] and strategies[1:] == SEARCH_STRATEGIES
+    assert build_search_strategies("") == SEARCH_STRATEGIES
+
+    asyncio.run(aexecute_literature_search("DXA vertebral fracture"))
+    assert searched[0] == "DXA vertebral fracture"
+
+
+def test_sync_entry_refuses_a_running_loop():
+    async def call_sync():
+        execute_literature_search("")
+
+    with pytest.raises(RuntimeError, match="await aexecute_literature_search"):
+        asyncio.run(call_sync())
@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+
+from src.graph.enhanced_literature_generator import LiteratureEnhancedReportGenerator
+from src.graph.literature_preresearch_node import rank_by_quality
+from src.utils.literature_relevance import TfidfMatrix, match_papers, paper_terms, tokenize, top_k_indices
+
+PAPERS = [
+    {"title": "Deep learning for bone mineral density estimation", "abstract": "A CNN trained on DXA scans."},
+    {"title": "Radiomics of vertebral CT", "abstract": "Texture features predict osteoporotic fracture."},
+    {"title": "Osteocalcin and cardiovascular risk", "abstract": "Bone-organ crosstalk in a large cohort."},
+    {"title": "Sleep and diet", "abstract": "Unrelated lifestyle survey."},
+]
+
+
+def test_tokenize_and_title_weighting():
+    assert tokenize("Bone-organ crosstalk, in the DXA (2024) -x") == ["bone-organ", "crosstalk", "dxa", "2024"]
+    terms = paper_terms({"title": "Bone density", "abstract": "bone loss"})
+    assert terms["bone"] == 3 and terms["density"] == 2 and terms["loss"] == 1
+
+
+def test_similarity_matches_dense_cosine():
+    docs = [paper_terms(p) for p in PAPERS]
+    matrix = TfidfMatrix(docs)
+    queries = [tokenize("bone density deep learning"), tokenize("cardiovascular osteocalcin")]
+    scores = matrix.similarity(queries)
+
+    dense = np.zeros(matrix.shape)
+    dense[matrix.rows, matrix.cols] = matrix.data
+    for q, tokens in enumerate(queries):
+        vector = np.zeros(matrix.shape[1])
+        for token in set(tokens):
+            vector[matrix.vocabulary[token]] = (1 + np.log(tokens.count(token))) * matrix.idf[matrix.vocabulary[token]]
+        expected = dense @ vector / (np.linalg.norm(dense, axis=1) * np.linalg.norm(vector))
+        assert np.allclose(scores[q], expected)
+
+
+def test_top_k_per_direction():
+    scores = np.array([[0.1, 0.0, 0.7, 0.3], [0.0, 0.0, 0.0, 0.0]])
+    assert top_k_indices(scores, 3) == [[2, 3, 0], []]
+
+    matches = match_papers(["bone density deep learning", "cardiovascular osteocalcin", "quantum gravity"], PAPERS, k=2)
+    assert matches[0][0] is PAPERS[0]
+    assert matches[1] == [PAPERS[2]]
+    assert matches[2] == []
+
+
+def test_generator_finds_papers_for_all_directions_at_once():
+    generator = LiteratureEnhancedReportGenerator.__new__(LiteratureEnhancedReportGenerator)
+    found = generator._find_relevant_papers(["radiomics fracture", "sleep diet"], {"literature": PAPERS})
+    assert found == [[PAPERS[1]], [PAPERS[3]]]
+
+
+def test_rank_by_quality_bonuses_and_stable_order():
+    papers = [
+        {"title": "A cohort", "journal": "Bone", "quality_score": 0.8},
+        {"title": "Systematic review of DXA", "journal": "Bone", "quality_score": 0.75},
+        {"title": "B cohort", "journal": "Nature Medicine", "quality_score": 0.85},
+        {"title": "C cohort", "journal": "Bone", "quality_score": 0.85},
+    ]
+    ranked = rank_by_quality(papers)
+    assert [p["title"] for p in ranked] == ["B cohort", "Systematic review of DXA", "C cohort", "A cohort"]
+    assert ranked[0]["quality_score"] == 1.0 and abs(ranked[1]["quality_score"] - 0.85) < 1e-9
+    assert rank_by_quality([]) == []
@@ -0,0 +1,100 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+import src.llms.llm as llm_module
+from src.llms.llm_cache import CachedStreamMixin, LLMResponseCache, set_response_cache
+
+
+class FakeChatModel(CachedStreamMixin, GenericFakeChatModel):
+    pass
+
+
+def _model(cache, *replies):
+    return FakeChatModel(messages=iter([AIMessage(content=r) for r in replies]), cache=cache)
+
+
+@pytest.fixture
+def store():
+    store = LLMResponseCache(memory_max_entries=8, ttl_seconds={"planner": 3600})
+    yield store
+    store.close()
+
+
+def test_invoke_is_cached_per_agent(store):
+    planner = _model(store.for_agent("planner"), "plan A", "plan B")
+    assert planner.invoke("make a plan").content == "plan A"
+    assert planner.invoke("make a plan").content == "plan A"
+    assert planner.invoke("another plan").content == "plan B"
+
+    assert store.for_agent("reporter") is None
+    stats = store.metrics()["agents"]["planner"]
+    assert stats["memory_hits"] == 1 and stats["misses"] == 2 and stats["bytes_saved"] > 0
+
+
+def test_stream_replays_cached_response(store):
+    planner = _model(store.for_agent("planner"), "the quick brown fox " * 10, "different")
+    first = [chunk.content for chunk in planner.stream("plan")]
+    second = [chunk.content for chunk in planner.stream("plan")]
+
+    assert "".join(first) == "".join(second) == "the quick brown fox " * 10
+    assert len(second) > 1
+    assert planner.invoke("plan").content == "the quick brown fox " * 10
+
+    async def astream():
+        return "".join([chunk.content async for chunk in planner.astream("plan")])
+
+    assert asyncio.run(astream()) == "the quick brown fox " * 10
+    assert store.metrics()["agents"]["planner"]["stores"] == 1
+
+
+def test_interrupted_stream_is_not_cached(store):
+    planner = _model(store.for_agent("planner"), "partial answer here", "full answer")
+    stream = planner.stream("plan")
+    next(stream)
+    stream.close()
+    assert planner.invoke("plan").content == "full answer"
+
+
+def test_disk_tier_ttl_and_selective_clear(tmp_path):
+    path = str(tmp_path / "llm.sqlite")
+    store = LLMResponseCache(path, ttl_seconds={"planner": 3600, "coordinator": 3600})
+    _model(store.for_agent("planner"), "plan").invoke("q")
+    _model(store.for_agent("coordinator"), "hello").invoke("q")
+    store.close()
+
+    reopened = LLMResponseCache(path, ttl_seconds={"planner": 3600, "coordinator": 3600})
+    assert _model(reopened.for_agent("planner"), "new plan").invoke("q").content == "plan"
+    assert reopened.metrics()["agents"]["planner"]["disk_hits"] == 1
+
+    reopened.clear("planner")
+    assert _model(reopened.for_agent("planner"), "new plan").invoke("q").content == "new plan"
+    assert _model(reopened.for_agent("coordinator"), "bye").invoke("q").content == "hello"
+    reopened.close()
+
+
+def test_memory_tier_is_bounded():
+    store = LLMResponseCache(memory_max_entries=2, memory_max_bytes=10_000, ttl_seconds={"planner": 3600})
+    model = _model(store.for_agent("planner"), *[f"reply {i}" for i in range(5)])
+    for i in range(5):
+        model.invoke(f"q{i}")
+    assert store.metrics()["memory_entries"] == 2
+
+
+def test_agent_policy_is_applied(monkeypatch, store):
+    base = GenericFakeChatModel(messages=iter([]))
+    monkeypatch.setattr(llm_module, "get_llm_by_type", lambda llm_type, force_refresh=False: base)
+    set_response_cache(store)
+    llm_module._agent_llms.clear()
+    try:
+        assert llm_module.get_llm_for_agent("planner").cache.agent == "planner"
+        assert llm_module.get_llm_for_agent("reporter").cache is False
+        assert llm_module.get_llm_for_agent("planner") is llm_module.get_llm_for_agent("planner")
+    finally:
+        set_response_cache(None)
+        llm_module._agent_llms.clear()
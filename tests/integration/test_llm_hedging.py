@@ -0,0 +1,232 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+import src.llms.llm as llm_module
+from src.llms.hedging import HedgedChatModel, HedgedRouter, HedgingSettings, set_hedged_router
+from src.utils import multi_model_manager
+from src.utils.multi_model_manager import MultiModelReportManager
+
+
+class SlowModel(GenericFakeChatModel):
+    """按给定延迟返回固定回复，并记录是否被取消"""
+
+    delay: float = 0.0
+    reply: str = "ok"
+    fail: bool = False
+    model_name: str = ""
+    calls: list = []
+    cancelled: list = []
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls.append(self.reply)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(self.reply)
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.reply} failed")
+        return self._to_result(self.reply)
+
+    @staticmethod
+    def _to_result(text):
+        from langchain_core.outputs import ChatGeneration, ChatResult
+
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def _model(reply, delay=0.0, fail=False):
+    return SlowModel(messages=iter([]), reply=reply, delay=delay, fail=fail, calls=[], cancelled=[])
+
+
+def _router(**overrides):
+    values = {"default_delay": 0.1, "min_delay": 0.01, "min_samples": 3, **overrides}
+    return HedgedRouter(HedgingSettings(**values))
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    router = _router()
+    primary, backup = _model("primary", delay=1.0), _model("backup", delay=0.05)
+    result, winner = asyncio.run(router.ainvoke([("a", primary), ("b", backup)], "q"))
+    assert (result.content, winner) == ("backup", "b")
+    assert primary.cancelled == ["primary"]
+    assert router.metrics()["hedged"] == 1 and router.metrics()["hedge_wins"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    router = _router()
+    backup = _model("backup")
+    result, winner = asyncio.run(router.ainvoke([("a", _model("primary", delay=0.01)), ("b", backup)], "q"))
+    assert winner == "a" and backup.calls == []
+    assert router.metrics()["hedged"] == 0
+
+
+def test_budget_caps_hedging():
+    router = _router(budget_ratio=0.0, burst=1)
+
+    async def run():
+        winners = []
+        for _ in range(3):
+            _, winner = await router.ainvoke([("a", _model("primary", delay=0.2)), ("b", _model("backup"))], "q")
+            winners.append(winner)
+        return winners
+
+    assert asyncio.run(run()) == ["b", "a", "a"]
+    assert router.metrics()["budget_denied"] == 2
+
+
+def test_failed_primary_fails_over_without_budget():
+    router = _router(budget_ratio=0.0, burst=1)
+    router.budget.try_acquire()
+    result, winner = asyncio.run(router.ainvoke([("a", _model("primary", fail=True)), ("b", _model("backup"))], "q"))
+    assert (result.content, winner) == ("backup", "b")
+    assert router.metrics()["failovers"] == 1
+
+    with pytest.raises(RuntimeError, match="backup failed"):
+        asyncio.run(router.ainvoke([("a", _model("primary", fail=True)), ("b", _model("backup", fail=True))], "q"))
+
+
+def test_deadline_follows_rolling_p95():
+    router = _router(percentile=95, min_samples=3, max_delay=10)
+    assert router.deadline("a") == 0.1
+    for seconds in [1.0, 1.0, 1.0, 1.0, 5.0]:
+        router.tracker.record("a", seconds)
+    assert 1.0 < router.deadline("a") <= 5.0
+    router.tracker.record("b", 0.5)
+    router.tracker.record("c", 2.0)
+    assert router.alternatives("a", ["c", "d", "b"]) == ["b", "c", "d"]
+
+
+def test_reporter_gets_hedged_model(monkeypatch):
+    models = {"BASIC_MODEL": _model("primary", delay=1.0), "deepseek": _model("backup", delay=0.01)}
+    monkeypatch.setattr(llm_module, "get_llm_by_type", lambda llm_type, force_refresh=False: models[llm_type])
+    set_hedged_router(_router(groups={"BASIC_MODEL": ["deepseek"]}))
+    llm_module._agent_llms.clear()
+    try:
+        reporter = llm_module.get_llm_for_agent("reporter")
+        assert isinstance(reporter, HedgedChatModel)
+        assert asyncio.run(reporter.ainvoke("q")).content == "backup"
+        assert not isinstance(llm_module.get_llm_for_agent("planner"), HedgedChatModel)
+    finally:
+        set_hedged_router(None)
+        llm_module._agent_llms.clear()
+
+
+def test_hedged_report_keeps_first_success(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        multi_model_manager.MultiModelConfigManager, "get_available_models", lambda self: ["doubao", "deepseek"]
+    )
+    monkeypatch.setattr(multi_model_manager.MultiModelConfigManager, "__init__", lambda self, config_path=None: None)
+    delays = {"doubao": 1.0, "deepseek": 0.01}
+
+    async def fake_generate(self, model_name, task_description, research_findings=None, locale="zh-CN"):
+        await asyncio.sleep(delays[model_name])
+        return {"model_name": model_name, "content": "report", "success": True}
+
+    monkeypatch.setattr(MultiModelReportManager, "generate_report_with_model", fake_generate)
+    manager = MultiModelReportManager(output_dir=str(tmp_path))
+    result = asyncio.run(manager.generate_hedged_report("task", router=_router()))
+    assert result["model_name"] == "deepseek"
+    assert result["hedge_candidates"] == ["doubao", "deepseek"]
+
+
+class StreamingModel(SlowModel):
+    """流式输出：等待 delay 后逐个输出 token"""
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+        from langchain_core.outputs import ChatGenerationChunk
+
+        self.calls.append(self.reply)
+        for i, token in enumerate(self.reply):
+            if i == 0:
+                await asyncio.sleep(self.delay)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def test_only_the_winner_reaches_the_graph_stream():
+    from langgraph.graph import END, START, MessagesState, StateGraph
+
+    hedged = HedgedChatModel(
+        models=[("a", StreamingModel(messages=iter([]), reply="AAA", delay=1.0)),
+                ("b", StreamingModel(messages=iter([]), reply="BBB", delay=0.01))],
+        router=_router(),
+    )
+
+    async def node(state):
+        return {"messages": [await hedged.ainvoke(state["messages"])]}
+
+    builder = StateGraph(MessagesState)
+    builder.add_node("reporter", node)
+    builder.add_edge(START, "reporter")
+    builder.add_edge("reporter", END)
+    graph = builder.compile()
+
+    async def run():
+        return [
+            message.content
+            async for message, _ in graph.astream({"messages": [("user", "q")]}, stream_mode="messages")
+        ]
+
+    assert "".join(asyncio.run(run())) == "BBB"
+
+
+def test_cancelled_primary_records_a_censored_sample():
+    router = _router()
+    asyncio.run(router.ainvoke([("a", _model("primary", delay=1.0)), ("b", _model("backup", delay=0.05))], "q"))
+    assert router.tracker.count("a") == 1
+    assert router.tracker.percentile("a", 50) >= router.settings.default_delay
+
+
+def test_candidates_are_ranked_on_every_call():
+    router = _router(budget_ratio=1.0, burst=10)
+    slow, fast = _model("slow", delay=0.3), _model("fast", delay=0.01)
+    hedged = HedgedChatModel(models=[("a", _model("primary", delay=1.0)), ("b", slow), ("c", fast)], router=router)
+    for seconds in [0.3, 0.3, 0.3]:
+        router.tracker.record("b", seconds)
+        router.tracker.record("c", seconds)
+    router.tracker.record("c", 0.01)
+    router.tracker.record("b", 1.0)
+    assert [name for name, _ in hedged._ordered_models()] == ["a", "c", "b"]
+    assert asyncio.run(hedged.ainvoke("q")).content == "fast"
+
+    for _ in range(10):
+        router.tracker.record("c", 5.0)
+    assert [name for name, _ in hedged._ordered_models()] == ["a", "b", "c"]
+
+
+def test_stream_continues_from_the_first_token_winner():
+    router = _router()
+    primary = StreamingModel(messages=iter([]), reply="AAA", delay=1.0, calls=[], cancelled=[])
+    backup = StreamingModel(messages=iter([]), reply="BBB", delay=0.01, calls=[], cancelled=[])
+    hedged = HedgedChatModel(models=[("a", primary), ("b", backup)], router=router)
+
+    async def run():
+        return [chunk.content async for chunk in hedged.astream("q")]
+
+    assert asyncio.run(run()) == ["B", "B", "B"]
+    assert router.tracker.count("stream:b") == 1 and router.tracker.count("b") == 0
+
+
+def test_each_hedged_model_uses_its_own_limiter():
+    from src.utils.rate_limiter import get_rate_limiter
+
+    router = _router()
+    primary, backup = _model("primary", delay=1.0), _model("backup", delay=0.01)
+    primary.model_name, backup.model_name = "hedge-test-primary", "hedge-test-backup"
+    hedged = HedgedChatModel(models=[("a", primary), ("b", backup)], router=router).with_rate_limit(60)
+    limiters = hedged._limiters(hedged._ordered_models())
+    assert limiters == {
+        "a": get_rate_limiter("hedge-test-primary", 60),
+        "b": get_rate_limiter("hedge-test-backup", 60),
+    }
+    assert asyncio.run(hedged.ainvoke("q")).content == "backup"
@@ -0,0 +1,54 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessageChunk, SystemMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from src.llms.llm import _create_openai_compatible_chat_model, with_generation_params
+from src.utils import multi_model_manager
+from src.utils.multi_model_manager import MultiModelReportManager
+
+
+class RecordingModel(GenericFakeChatModel):
+    """记录每次调用时生效的生成参数"""
+
+    max_tokens: int = 4096
+    temperature: float = 0.2
+    seen: list = []
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(0.01)
+        self.seen.append((self.max_tokens, self.temperature))
+        for i in range(1, 21):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=f"### 研究方向{i}：方向{i}\n1. **背景与意义**\n"))
+
+
+def test_openai_view_shares_client_and_leaves_original_untouched():
+    llm = _create_openai_compatible_chat_model("m", "k", "http://localhost", 0.2, 4096, False)
+    view = with_generation_params(llm, max_tokens=12000, temperature=0.7, top_p=None)
+    assert (llm.max_tokens, llm.temperature) == (4096, 0.2)
+    assert (view.max_tokens, view.temperature) == (12000, 0.7)
+    assert view.root_async_client is llm.root_async_client
+    assert "top_p" not in view.model_kwargs
+
+
+def test_concurrent_reports_do_not_mutate_the_shared_model(monkeypatch, tmp_path):
+    shared = RecordingModel(messages=iter([]), seen=[])
+    monkeypatch.setattr(multi_model_manager, "get_llm_by_model_name", lambda name: shared)
+    monkeypatch.setattr(
+        MultiModelReportManager, "_build_report_messages", lambda self, *args, **kwargs: [SystemMessage(content="s")]
+    )
+    manager = MultiModelReportManager(output_dir=str(tmp_path))
+
+    async def run():
+        return await asyncio.gather(
+            *(manager.generate_report_with_model("deepseek", f"task {i}") for i in range(4))
+        )
+
+    results = asyncio.run(run())
+    assert all(result["success"] and result["detailed_direction_count"] == 20 for result in results)
+    assert shared.seen == [(12000, 0.7)] * 4
+    assert (shared.max_tokens, shared.temperature) == (4096, 0.2)
@@ -0,0 +1,116 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command
+
+from src.graph.nodes import research_team_node
+from src.graph.step_scheduler import (
+    STEP_RESULTS_RESET,
+    apply_step_results,
+    critical_path_length,
+    merge_step_results,
+    ready_steps,
+    step_key,
+)
+from src.graph.types import State
+from src.prompts.planner_model import Plan, Step, StepType
+
+
+def _plan(*depends_on):
+    steps = [
+        Step(need_web_search=True, title=f"step {i}", description="", step_type=StepType.RESEARCH, depends_on=deps)
+        for i, deps in enumerate(depends_on)
+    ]
+    return Plan(locale="en-US", has_enough_context=False, thought="", title="plan", steps=steps)
+
+
+def test_ready_steps_follow_dependencies():
+    steps = _plan([], [], [], [0, 1], [3]).steps
+    assert ready_steps(steps, set()) == [0, 1, 2]
+    assert ready_steps(steps, {0, 1}) == [2, 3]
+    assert critical_path_length(steps) == 3
+
+    # 未声明依赖时保持顺序执行；指向后续步骤的依赖被忽略
+    legacy = _plan(None, None, [5]).steps
+    assert ready_steps(legacy, set()) == [0, 2]
+    assert critical_path_length(_plan(None, None, None).steps) == 3
+
+
+def _graph(calls, delay):
+    async def researcher(state):
+        index = state["current_step_index"]
+        calls.append(index)
+        await asyncio.sleep(delay)
+        return Command(
+            update={"step_results": {step_key(state["current_plan"], index): f"result {index}"}},
+            goto="research_team",
+        )
+
+    team_runs = []
+
+    def research_team(state, config):
+        team_runs.append(1)
+        return research_team_node(state, config)
+
+    builder = StateGraph(State)
+    builder.add_node("research_team", research_team)
+    builder.add_node("researcher", researcher)
+    builder.add_node("reporter", lambda state: {"final_report": "done"})
+    builder.add_edge(START, "research_team")
+    builder.add_edge("reporter", END)
+    return builder.compile(), team_runs
+
+
+def test_independent_steps_run_in_waves():
+    calls, delay = [], 0.2
+    graph, team_runs = _graph(calls, delay)
+    plan = _plan([], [], [], [0, 1], [3])
+
+    started = time.perf_counter()
+    result = asyncio.run(
+        graph.ainvoke(
+            {"messages": [], "current_plan": plan},
+            config={"configurable": {"max_parallel_steps": 3}},
+        )
+    )
+    elapsed = time.perf_counter() - started
+
+    assert sorted(calls[:3]) == [0, 1, 2] and calls[3:] == [3, 4]
+    # 关键路径 3 个步骤，顺序执行需要 5 个步骤的时间
+    assert elapsed < 4 * delay
+    # 每一轮并行分支汇合后 research_team 只运行一次
+    assert len(team_runs) == 4
+    assert result["final_report"] == "done"
+    # 结果写回计划后不再保留在状态中
+    assert result["step_results"] == {}
+    assert all(step.execution_res == f"result {i}" for i, step in enumerate(result["current_plan"].steps))
+
+
+def test_parallelism_respects_cap():
+    calls = []
+    graph, _ = _graph(calls, 0)
+    asyncio.run(
+        graph.ainvoke(
+            {"messages": [], "current_plan": _plan([], [], [], [])},
+            config={"configurable": {"max_parallel_steps": "1"}},
+        )
+    )
+    assert calls == [0, 1, 2, 3]
+
+
+def test_results_from_another_plan_are_not_reused():
+    old_plan, new_plan = _plan([], []), _plan([], [])
+    new_plan.title = "replanned"
+    results = merge_step_results({}, {step_key(old_plan, 0): "stale"})
+
+    # 同序号同标题的步骤，计划不同时不会被旧结果填充
+    assert apply_step_results(new_plan, results) == 0
+    assert new_plan.steps[0].execution_res is None
+    assert apply_step_results(old_plan, results) == 1
+
+    assert merge_step_results(results, STEP_RESULTS_RESET) == {}
+    assert merge_step_results(results, {"x": "1"}) == {**results, "x": "1"}
@@ -0,0 +1,70 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import base64
+import random
+import threading
+import time
+
+from src.podcast.graph.tts_node import synthesize_lines_in_order
+from src.podcast.types import ScriptLine
+
+
+class FakeTTS:
+    """Returns the paragraph as audio after a random delay and tracks concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.voices = []
+        self._lock = threading.Lock()
+
+    def text_to_speech(self, text, speed_ratio=1.0):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(random.uniform(0, 0.02))
+        with self._lock:
+            self.active -= 1
+        if text == "bad":
+            return {"success": False, "error": "boom", "audio_data": None}
+        return {"success": True, "audio_data": base64.b64encode(text.encode()).decode()}
+
+
+async def _collect(lines, clients, max_concurrency):
+    return [chunk async for chunk in synthesize_lines_in_order(lines, clients, max_concurrency)]
+
+
+def test_lines_are_yielded_in_script_order_with_bounded_concurrency():
+    tts = FakeTTS()
+    clients = {"male": tts, "female": tts}
+    lines = [
+        ScriptLine(speaker="male" if i % 2 else "female", paragraph=str(i)) for i in range(20)
+    ]
+    chunks = asyncio.run(_collect(lines, clients, max_concurrency=3))
+    assert chunks == [str(i).encode() for i in range(20)]
+    assert 1 < tts.peak <= 3
+
+
+def test_failed_lines_are_skipped():
+    tts = FakeTTS()
+    clients = {"male": tts, "female": tts}
+    lines = [ScriptLine(paragraph="a"), ScriptLine(paragraph="bad"), ScriptLine(paragraph="b")]
+    assert asyncio.run(_collect(lines, clients, max_concurrency=2)) == [b"a", b"b"]
+
+
+def test_missing_tts_credentials_are_reported_before_streaming(monkeypatch):
+    from src.podcast.graph.tts_node import create_tts_clients
+
+    monkeypatch.delenv("VOLCENGINE_TTS_APPID", raising=False)
+    try:
+        create_tts_clients()
+    except Exception as e:
+        assert "VOLCENGINE_TTS_APPID" in str(e)
+    else:
+        raise AssertionError("missing credentials should raise")
+
+    monkeypatch.setenv("VOLCENGINE_TTS_APPID", "app")
+    monkeypatch.setenv("VOLCENGINE_TTS_ACCESS_TOKEN", "token")
+    assert set(create_tts_clients()) == {"male", "female"}
@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+import src.tools.pubmed_search as pubmed
+from src.tools.pubmed_search import PubMedAPIWrapper, iter_pubmed_articles
+
+
+def _article(pmid: str) -> str:
+    return f"""
+<PubmedArticle>
+  <MedlineCitation>
+    <PMID Version="1">{pmid}</PMID>
+    <Article>
+      <Journal>
+        <JournalIssue><PubDate><Year>2024</Year><Month>Mar</Month></PubDate></JournalIssue>
+        <Title>Journal of Bone and Mineral Research</Title>
+      </Journal>
+      <ArticleTitle>Deep learning on <i>DXA</i> scans {pmid}</ArticleTitle>
+      <Abstract>
+        <AbstractText Label="BACKGROUND">Bone density matters.</AbstractText>
+        <AbstractText Label="RESULTS">AUC 0.9.</AbstractText>
+      </Abstract>
+      <AuthorList>
+        <Author><LastName>Li</LastName><ForeName>Wei</ForeName></Author>
+        <Author><CollectiveName>DXA Consortium</CollectiveName></Author>
+      </AuthorList>
+    </Article>
+  </MedlineCitation>
+  <PubmedData>
+    <ArticleIdList>
+      <ArticleId IdType="pubmed">{pmid}</ArticleId>
+      <ArticleId IdType="doi">10.1000/{pmid}</ArticleId>
+    </ArticleIdList>
+  </PubmedData>
+</PubmedArticle>"""
+
+
+def _articles_xml(pmids) -> bytes:
+    body = "".join(_article(pmid) for pmid in pmids)
+    return f'<?xml version="1.0"?>\n<PubmedArticleSet>{body}</PubmedArticleSet>'.encode()
+
+
+SEARCH_IDS = {
+    "bone density": [str(i) for i in range(1, 6)],
+    "osteocalcin": ["4", "5", "6"],
+}
+
+
+@pytest.fixture
+def eutils(monkeypatch):
+    calls = []
+
+    def handler(request):
+        if request.url.path.endswith("esearch.fcgi"):
+            term = request.url.params["term"]
+            retmax = int(request.url.params["retmax"])
+            calls.append(("esearch", term, request.url.params.get("usehistory")))
+            ids = SEARCH_IDS.get(term, [])
+            return httpx.Response(200, json={"esearchresult": {
+                "count": str(len(ids)), "idlist": ids[:retmax],
+                "webenv": "ENV1", "querykey": str(len(calls)),
+            }})
+        form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        calls.append(("efetch", form))
+        if "id" in form:
+            pmids = form["id"].split(",")
+        else:
+            ids = SEARCH_IDS["bone density"]
+            start = int(form["retstart"])
+            pmids = ids[start:start + int(form["retmax"])]
+        return httpx.Response(200, content=_articles_xml(pmids))
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(pubmed, "get_sync_client", lambda: client)
+    return calls
+
+
+def test_incremental_parser_builds_compact_records():
+    xml = _articles_xml(["42"])
+    chunks = [xml[i:i + 37] for i in range(0, len(xml), 37)]
+    (record,) = list(iter_pubmed_articles(chunks))
+    assert record.pmid == "42"
+    assert record.title == "Deep learning on DXA scans 42"
+    assert record.abstract == "BACKGROUND: Bone density matters. RESULTS: AUC 0.9."
+    assert record.authors == "Wei Li, DXA Consortium"
+    assert record.publication_date == "2024-Mar"
+    assert record.doi == "10.1000/42"
+    assert record.to_dict()["url"] == "https://pubmed.ncbi.nlm.nih.gov/42/"
+
+
+def test_search_pages_through_history_server(eutils):
+    wrapper = PubMedAPIWrapper(fetch_batch_size=2)
+    papers = wrapper.search("bone density", max_results=5)
+    assert [p["pmid"] for p in papers] == ["1", "2", "3", "4", "5"]
+    fetches = [c[1] for c in eutils if c[0] == "efetch"]
+    assert [f["retstart"] for f in fetches] == ["0", "2", "4"]
+    assert all(f["WebEnv"] == "ENV1" for f in fetches)
+
+
+def test_search_many_deduplicates_and_batches_efetch(eutils):
+    wrapper = PubMedAPIWrapper(fetch_batch_size=200)
+    results = wrapper.search_many(["bone density", "osteocalcin", "nothing"], max_results=5)
+    assert [p["pmid"] for p in results["osteocalcin"]] == ["4", "5", "6"]
+    assert results["nothing"] == []
+    fetches = [c[1] for c in eutils if c[0] == "efetch"]
+    assert len(fetches) == 1 and fetches[0]["id"] == "1,2,3,4,5,6"
+    # the batch path fetches by ID, so nothing is stored on the history server
+    assert [c[2] for c in eutils if c[0] == "esearch"] == [None, None, None]
+
+
+def test_search_many_uses_the_shared_search_cache(eutils, tmp_path):
+    from src.tools.search_cache import SearchCache, set_search_cache
+
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    set_search_cache(cache)
+    wrapper = PubMedAPIWrapper()
+    first = wrapper.search_many_records(["bone density", "osteocalcin"], max_results=5)
+    eutils.clear()
+
+    again = wrapper.search_many_records(["osteocalcin", "bone density", "nothing"], max_results=5)
+    assert [c[1] for c in eutils if c[0] == "esearch"] == ["nothing"]
+    assert not [c for c in eutils if c[0] == "efetch"]
+    assert again["bone density"] == first["bone density"]
+    assert list(again) == ["osteocalcin", "bone density", "nothing"]
+    cache.close()
+
+
+def test_all_wrappers_share_one_rate_limiter():
+    assert PubMedAPIWrapper().rate_limiter is PubMedAPIWrapper().rate_limiter
+
+
+def test_record_mode_returns_typed_records_with_lazy_text(eutils):
+    tool = pubmed.PubMedSearchTool(return_records=True)
+    records = tool.invoke({"query": "bone density", "max_results": 2})
+    assert [r.pmid for r in records] == ["1", "2"]
+    assert records[0].year == 2024 and records[0].doi == "10.1000/1"
+    assert records[0].journal == "Journal of Bone and Mineral Research"
+    text_tool = pubmed.PubMedSearchTool()
+    assert str(records) == text_tool.invoke({"query": "bone density", "max_results": 2})
+
+
+def test_record_mode_raises_instead_of_returning_error_text(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectTimeout("timed out")
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(pubmed, "get_sync_client", lambda: client)
+    with pytest.raises(httpx.ConnectTimeout):
+        pubmed.PubMedSearchTool(return_records=True).invoke({"query": "q"})
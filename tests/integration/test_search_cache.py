@@ -0,0 +1,153 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.tools import BaseTool
+
+from src.tools.decorators import create_logged_tool
+from src.tools.search_cache import SearchCache, make_cache_key, set_search_cache
+
+CALLS = []
+
+
+class FakeSearchTool(BaseTool):
+    name: str = "fake_search"
+    description: str = "fake search"
+    max_results: int = 5
+
+    def _run(self, query: str, run_manager=None) -> str:
+        CALLS.append(query)
+        time.sleep(0.05)
+        if query == "broken":
+            return "PubMed搜索出现错误: timeout"
+        return f"results for {query} ({self.max_results})"
+
+    async def _arun(self, query: str, run_manager=None) -> str:
+        CALLS.append(query)
+        await asyncio.sleep(0.05)
+        return f"async results for {query}"
+
+
+CachedFakeSearch = create_logged_tool(FakeSearchTool, cache_engine="fake")
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds={"fake": 60})
+    set_search_cache(cache)
+    CALLS.clear()
+    yield cache
+    set_search_cache(None)
+    cache.close()
+
+
+def test_normalized_queries_share_an_entry(cache):
+    tool = CachedFakeSearch()
+    assert tool.invoke({"query": "DXA  Bone Density"}) == tool.invoke({"query": "dxa bone density "})
+    assert len(CALLS) == 1
+    stats = cache.metrics()["engines"]["fake"]
+    assert stats["misses"] == 1 and stats["memory_hits"] == 1
+
+
+def test_tool_parameters_are_part_of_the_key(cache):
+    CachedFakeSearch(max_results=5).invoke({"query": "q"})
+    CachedFakeSearch(max_results=10).invoke({"query": "q"})
+    assert len(CALLS) == 2
+
+
+def test_concurrent_identical_requests_are_merged(cache):
+    tool = CachedFakeSearch()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: tool.invoke({"query": "osteocalcin"}), range(8)))
+    assert len(set(results)) == 1
+    assert CALLS == ["osteocalcin"]
+
+    async def run_async():
+        return await asyncio.gather(*(tool.ainvoke({"query": "fgf23"}) for _ in range(5)))
+
+    assert len(set(asyncio.run(run_async()))) == 1
+    assert CALLS.count("fgf23") == 1
+
+
+def test_disk_entries_survive_restart_and_expire(cache, tmp_path):
+    CachedFakeSearch().invoke({"query": "radiomics"})
+    cache.close()
+
+    reopened = SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds={"fake": 60})
+    set_search_cache(reopened)
+    CachedFakeSearch().invoke({"query": "radiomics"})
+    assert len(CALLS) == 1
+    assert reopened.metrics()["engines"]["fake"]["disk_hits"] == 1
+
+    key = make_cache_key("fake", "radiomics", {"x": 1})
+    reopened.ttl_seconds["fake"] = -1
+    reopened.set("fake", key, "stale")
+    assert reopened.get("fake", key) == (False, None)
+    reopened.close()
+
+
+def test_error_results_are_not_cached(cache):
+    tool = CachedFakeSearch()
+    tool.invoke({"query": "broken"})
+    tool.invoke({"query": "broken"})
+    assert len(CALLS) == 2
+
+
+def test_uncached_tool_is_unchanged():
+    LoggedFake = create_logged_tool(FakeSearchTool)
+    CALLS.clear()
+    LoggedFake().invoke({"query": "a"})
+    LoggedFake().invoke({"query": "a"})
+    assert len(CALLS) == 2
+
+
+def test_cancelled_leader_hands_the_request_to_a_waiter(cache):
+    calls = []
+
+    async def compute(label):
+        calls.append(label)
+        await asyncio.sleep(0.1)
+        return f"result from {label}"
+
+    async def run():
+        leader = asyncio.create_task(cache.aget_or_compute("fake", "q", None, lambda: compute("leader")))
+        await asyncio.sleep(0.01)
+        waiters = [
+            asyncio.create_task(cache.aget_or_compute("fake", "q", None, lambda i=i: compute(f"waiter {i}")))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        # 等待者被取消也不影响共享结果
+        waiters[0].cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    leader, cancelled, *results = asyncio.run(run())
+    assert isinstance(leader, asyncio.CancelledError) and isinstance(cancelled, asyncio.CancelledError)
+    # 只有一个等待者接手重新发起请求，其余等待者共享它的结果
+    assert len(calls) == 2 and len(set(results)) == 1
+    assert results[0] == f"result from {calls[1]}"
+    assert cache.metrics()["inflight"] == 0
+
+
+def test_async_lookups_do_not_touch_sqlite_on_the_event_loop(cache, monkeypatch):
+    loop_threads, store_threads = [], []
+    get, set_ = cache.get, cache.set
+    monkeypatch.setattr(cache, "get", lambda *args: store_threads.append(threading.get_ident()) or get(*args))
+    monkeypatch.setattr(cache, "set", lambda *args, **kwargs: store_threads.append(threading.get_ident()) or set_(*args, **kwargs))
+
+    async def compute():
+        return "value"
+
+    async def run():
+        loop_threads.append(threading.get_ident())
+        await cache.aget_or_compute("fake", "q", None, compute)
+        return await cache.aget_or_compute("fake", "q", None, compute)
+
+    assert asyncio.run(run()) == "value"
+    assert len(store_threads) == 3 and loop_threads[0] not in store_threads
@@ -0,0 +1,69 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from src.prompts.planner_model import Step, StepType
+from src.utils.step_context import (
+    StepContextCompactor,
+    StepContextSettings,
+    completed_steps,
+)
+from src.utils.tokens import count_tokens
+
+
+def _compactor(calls, fail=False, **settings):
+    async def summarizer(title, finding, max_tokens):
+        calls.append(title)
+        if fail:
+            raise RuntimeError("provider down")
+        return f"summary of {title}"
+
+    values = {"max_tokens": 600, "keep_recent": 2, "summary_tokens": 50, **settings}
+    return StepContextCompactor(StepContextSettings(**values), summarizer=summarizer)
+
+
+def _steps(n, words=150):
+    return [(f"step {i}", f"finding {i} " + "evidence " * words) for i in range(1, n + 1)]
+
+
+def test_small_history_is_kept_verbatim():
+    calls = []
+    steps = _steps(2, words=10)
+    text = asyncio.run(_compactor(calls).build(steps))
+    assert calls == []
+    assert all(finding in text for _, finding in steps)
+    assert asyncio.run(_compactor(calls).build([])) == ""
+
+
+def test_older_steps_are_summarized_once_within_budget():
+    calls = []
+    compactor = _compactor(calls)
+    steps = _steps(5, words=60)
+
+    text = asyncio.run(compactor.build(steps))
+    assert count_tokens(text) <= 600
+    assert steps[-1][1] in text and steps[-2][1] in text
+    assert "summary of step 1" in text and "（摘要）" in text
+    # 从最旧的步骤开始摘要，最近的步骤保持原文
+    assert calls and calls == [f"step {i}" for i in range(1, len(calls) + 1)] and len(calls) <= 3
+
+    # 下一步骤复用已有摘要，不会重复生成
+    asyncio.run(compactor.build(_steps(6, words=60)))
+    assert len(calls) == len(set(calls))
+
+
+def test_failed_summaries_fall_back_to_truncation():
+    calls = []
+    text = asyncio.run(_compactor(calls, fail=True, max_tokens=400).build(_steps(5)))
+    assert count_tokens(text) <= 400
+    assert "finding 1" in text
+
+
+def test_completed_steps_accepts_dicts_and_models():
+    steps = [
+        {"title": "A", "execution_res": "a"},
+        Step(need_web_search=True, title="B", description="", step_type=StepType.RESEARCH, execution_res="b"),
+        {"title": "C"},
+    ]
+    assert completed_steps(steps, 2) == [("A", "a"), ("B", "b")]
@@ -0,0 +1,155 @@
+# Copyright (c) 2025 Bytedance Ltd. and/or its affiliates
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import src.llms.doubao_llm as doubao
+import src.utils.http_client as http_client
+from src.llms.doubao_llm import DoubaoMultimodalLLM
+from src.llms.minimax_llm import MiniMaxChatModel
+from src.llms.sse import StreamError
+
+WORDS = ["Bone ", "density ", "rises."]
+
+
+def _event(payload) -> bytes:
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+def _events(final_message: bool = False):
+    events = [_event({"choices": [{"index": 0, "delta": {"content": word}}]}) for word in WORDS]
+    last = {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}], "usage": {"total_tokens": 7}}
+    if final_message:
+        # MiniMax 在最后一个事件中附带完整 message
+        last["choices"][0]["message"] = {"role": "assistant", "content": "".join(WORDS)}
+    return events + [_event(last), b"data: [DONE]\n\n"]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    state = {"delay": 0.0, "sent": 0, "closed": False, "final_message": False, "status": 200, "bodies": []}
+
+    def handler(request):
+        body = json.loads(request.content)
+        state["bodies"].append(body)
+        if not body["stream"]:
+            return httpx.Response(200, json={"choices": [{"message": {"content": "".join(WORDS)}, "finish_reason": "stop"}]})
+        if state["status"] != 200:
+            return httpx.Response(state["status"], text="rate limited")
+
+        def stream():
+            for event in _events(state["final_message"]):
+                time.sleep(state["delay"])
+                state["sent"] += 1
+                yield event
+
+        return httpx.Response(200, content=stream())
+
+    async def async_handler(request):
+        body = json.loads(request.content)
+        state["bodies"].append(body)
+        if not body["stream"]:
+            return httpx.Response(200, json={"choices": [{"message": {"content": "".join(WORDS)}, "finish_reason": "stop"}]})
+
+        async def stream():
+            try:
+                for event in _events(state["final_message"]):
+                    await asyncio.sleep(state["delay"])
+                    state["sent"] += 1
+                    yield event
+            finally:
+                state["closed"] = True
+
+        return httpx.Response(200, content=stream())
+
+    sync_client = httpx.Client(transport=httpx.MockTransport(handler))
+    async_clients = {}
+
+    def get_async_client():
+        loop = asyncio.get_running_loop()
+        if loop not in async_clients:
+            async_clients[loop] = httpx.AsyncClient(transport=httpx.MockTransport(async_handler))
+        return async_clients[loop]
+
+    monkeypatch.setattr(http_client, "get_sync_client", lambda: sync_client)
+    monkeypatch.setattr(http_client, "get_async_client", get_async_client)
+    monkeypatch.setattr(doubao, "get_sync_client", lambda: sync_client)
+    monkeypatch.setattr(doubao, "get_async_client", get_async_client)
+    return state
+
+
+def _doubao():
+    return DoubaoMultimodalLLM(base_url="https://doubao.test/api/v3", model="doubao", api_key="k")
+
+
+def _minimax():
+    return MiniMaxChatModel(base_url="https://minimax.test/v1", api_key="k")
+
+
+def test_first_token_arrives_before_stream_ends(server):
+    server["delay"] = 0.2
+    llm = _doubao()
+
+    async def run():
+        start = time.perf_counter()
+        arrivals, chunks = [], []
+        async for chunk in llm.astream("bone density?"):
+            arrivals.append(time.perf_counter() - start)
+            chunks.append(chunk)
+        return arrivals, chunks
+
+    arrivals, chunks = asyncio.run(run())
+    assert "".join(c.content for c in chunks) == "".join(WORDS)
+    assert arrivals[0] < 0.4 < arrivals[-1]
+    assert chunks[-1].response_metadata["finish_reason"] == "stop"
+    assert server["bodies"][0]["stream"] is True
+
+
+def test_cancelling_astream_closes_the_connection(server):
+    server["delay"] = 0.2
+    llm = _doubao()
+
+    async def consume(received):
+        async for chunk in llm.astream("bone density?"):
+            received.append(chunk.content)
+
+    async def run():
+        received = []
+        task = asyncio.create_task(consume(received))
+        while not received:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return received
+
+    received = asyncio.run(run())
+    assert received == WORDS[:1]
+    assert server["closed"] and server["sent"] < len(WORDS) + 2
+
+
+def test_minimax_streams_deltas_without_duplicating_final_message(server):
+    server["final_message"] = True
+    chunks = list(_minimax().stream("bone density?"))
+    assert [c.content for c in chunks if c.content] == WORDS
+    assert server["bodies"][0]["stream"] is True
+
+
+def test_async_generate_uses_the_async_client(server):
+    async def run():
+        return await asyncio.gather(_doubao().ainvoke("q"), _minimax().ainvoke("q"))
+
+    doubao_reply, minimax_reply = asyncio.run(run())
+    assert doubao_reply.content == minimax_reply.content == "".join(WORDS)
+    assert [body["stream"] for body in server["bodies"]] == [False, False]
+
+
+def test_stream_status_errors_are_raised(server):
+    server["status"] = 400
+    with pytest.raises(StreamError, match="400"):
+        list(_minimax().stream("q"))
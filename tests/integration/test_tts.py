@@ -45,9 +45,10 @@ class TestVolcengineTTS:
         assert tts.host == "openspeech.bytedance.com"
         assert tts.api_url == "https://openspeech.bytedance.com/api/v1/tts"
 
-    @patch("src.tools.tts.requests.post")
-    def test_text_to_speech_success(self, mock_post):
+    @patch("src.tools.tts.get_sync_client")
+    def test_text_to_speech_success(self, mock_get_client):
         """Test successful text-to-speech conversion."""
+        mock_post = mock_get_client.return_value.post
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -76,11 +77,11 @@ class TestVolcengineTTS:
 
         # Verify the request
         mock_post.assert_called_once()
-        args, _ = mock_post.call_args
+        args, kwargs = mock_post.call_args
         assert args[0] == "https://openspeech.bytedance.com/api/v1/tts"
 
-        # Verify request JSON - the data is passed as the second positional argument
-        request_json = json.loads(args[1])
+        # Verify request JSON - the data is passed as the request content
+        request_json = json.loads(kwargs["content"])
         assert request_json["app"]["appid"] == "test_appid"
         assert request_json["app"]["token"] == "test_token"
         assert request_json["app"]["cluster"] == "volcano_tts"
@@ -88,9 +89,10 @@ class TestVolcengineTTS:
         assert request_json["audio"]["encoding"] == "mp3"
         assert request_json["request"]["text"] == "Hello, world!"
 
-    @patch("src.tools.tts.requests.post")
-    def test_text_to_speech_api_error(self, mock_post):
+    @patch("src.tools.tts.get_sync_client")
+    def test_text_to_speech_api_error(self, mock_get_client):
         """Test error handling when API returns an error."""
+        mock_post = mock_get_client.return_value.post
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 400
@@ -114,9 +116,10 @@ class TestVolcengineTTS:
         assert result["error"] == {"code": 400, "message": "Bad request"}
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
-    def test_text_to_speech_no_data(self, mock_post):
+    @patch("src.tools.tts.get_sync_client")
+    def test_text_to_speech_no_data(self, mock_get_client):
         """Test error handling when API response doesn't contain data."""
+        mock_post = mock_get_client.return_value.post
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -141,9 +144,10 @@ class TestVolcengineTTS:
         assert result["error"] == "No audio data returned"
         assert result["audio_data"] is None
 
-    @patch("src.tools.tts.requests.post")
-    def test_text_to_speech_with_custom_parameters(self, mock_post):
+    @patch("src.tools.tts.get_sync_client")
+    def test_text_to_speech_with_custom_parameters(self, mock_get_client):
         """Test text_to_speech with custom parameters."""
+        mock_post = mock_get_client.return_value.post
         # Mock response
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -179,9 +183,9 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify request JSON - the data is passed as the second positional argument
+        # Verify request JSON - the data is passed as the request content
         args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        request_json = json.loads(kwargs["content"])
         assert request_json["audio"]["encoding"] == "wav"
         assert request_json["audio"]["speed_ratio"] == 1.2
         assert request_json["audio"]["volume_ratio"] == 0.8
@@ -192,10 +196,11 @@ class TestVolcengineTTS:
         assert request_json["request"]["frontend_type"] == "custom"
         assert request_json["user"]["uid"] == "custom-uid"
 
-    @patch("src.tools.tts.requests.post")
+    @patch("src.tools.tts.get_sync_client")
     @patch("src.tools.tts.uuid.uuid4")
-    def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_post):
+    def test_text_to_speech_auto_generated_uid(self, mock_uuid, mock_get_client):
         """Test that UUID is auto-generated if not provided."""
+        mock_post = mock_get_client.return_value.post
         # Mock UUID
         mock_uuid_value = "test-uuid-value"
         mock_uuid.return_value = mock_uuid_value
@@ -225,7 +230,7 @@ class TestVolcengineTTS:
         assert result["success"] is True
         assert result["audio_data"] == mock_audio_data
 
-        # Verify the request JSON - the data is passed as the second positional argument
+        # Verify the request JSON - the data is passed as the request content
         args, kwargs = mock_post.call_args
-        request_json = json.loads(args[1])
+        request_json = json.loads(kwargs["content"])
         assert request_json["user"]["uid"] == str(mock_uuid_value)